@@ -17,9 +17,7 @@ class FieldOrientedController:
     def __init__(self, environment, stages, _controllers, ref_states, external_ref_plots=(), **controller_kwargs):
         assert isinstance(environment.physical_system, SynchronousMotorSystem), 'No suitable Environment for FOC Controller'
 
-        t32 = environment.physical_system.electrical_motor.t_32
-        q = environment.physical_system.electrical_motor.q
-        self.backward_transformation = (lambda quantities, eps: t32(q(quantities, eps)))
+        self.backward_transformation = environment.physical_system.electrical_motor.dq_to_abc
 
         self.tau = environment.physical_system.tau
 
@@ -0,0 +1,64 @@
+import time
+
+import numpy as np
+import gym_electric_motor as gem
+
+'''
+This code example compares the accuracy and the throughput of the available ode solvers for every motor.
+
+The physical systems of the continuous current control environments are simulated with the same random actions.
+A scipy.ode dopri5 solver with very tight tolerances serves as the ground truth.
+For each solver, the maximal deviation of the normalized states from the ground truth and the simulated steps per
+second are printed.
+
+The fixed step Runge-Kutta solvers (heun, rk4, rk45) are considerably more accurate than the euler solver at the same
+step size. They do not perform any error estimation, step size control or allocation of arrays during the integration.
+The zero-order hold solver (zoh) is exact in these constant speed environments.
+'''
+
+env_ids = [
+    'Cont-CC-SeriesDc-v0', 'Cont-CC-ShuntDc-v0', 'Cont-CC-PermExDc-v0', 'Cont-CC-ExtExDc-v0', 'Cont-CC-PMSM-v0',
+    'Cont-CC-SynRM-v0', 'Cont-CC-EESM-v0', 'Cont-CC-SCIM-v0', 'Cont-CC-DFIM-v0',
+]
+solvers = {
+    'euler': 'euler',
+    'heun': 'heun',
+    'rk4': 'rk4',
+    'rk45': 'rk45',
+    'zoh': 'zoh',
+    'scipy.ode dopri5': 'scipy.ode',
+}
+steps = 2000
+
+
+def simulate(env_id, ode_solver, actions, initial_ode_state):
+    """Simulates the physical system of an environment with the passed actions.
+
+    Returns:
+        Tuple(ndarray(float), float): The normalized states of all steps and the simulated steps per second.
+    """
+    physical_system = gem.make(env_id, ode_solver=ode_solver, visualization=()).physical_system
+    physical_system.reset()
+    physical_system._ode_solver.set_initial_value(initial_ode_state.copy(), 0.0)
+    states = np.zeros((len(actions), len(physical_system.state_names)))
+    start = time.perf_counter()
+    for k, action in enumerate(actions):
+        states[k] = physical_system.simulate(action)
+    return states, len(actions) / (time.perf_counter() - start)
+
+
+for env_id in env_ids:
+    env = gem.make(env_id, visualization=())
+    env.action_space.seed(0)
+    actions = [env.action_space.sample() for _ in range(steps)]
+    env.reset()
+    initial_ode_state = np.array(env.physical_system._ode_solver.y)
+    reference_solver = gem.physical_systems.ScipyOdeSolver('dopri5', rtol=1e-12, atol=1e-12, nsteps=100000)
+    reference_states, _ = simulate(env_id, reference_solver, actions, initial_ode_state)
+    print(env_id)
+    print(f'{"solver":>20} {"max. error":>12} {"steps/s":>10}')
+    for name, solver in solvers.items():
+        states, steps_per_second = simulate(env_id, solver, actions, initial_ode_state)
+        error = np.max(np.abs(states - reference_states))
+        print(f'{name:>20} {error:>12.2e} {steps_per_second:>10.0f}')
+    print()
@@ -4,8 +4,10 @@ from .core import RewardFunction
 from .core import ElectricMotorVisualization
 from .core import ConstraintMonitor
 from .random_component import RandomComponent
+from .stateful_component import StatefulComponent
 from .constraints import Constraint, LimitConstraint
-from .utils import make, register_superclass
+from .profiling import StepProfiler
+from .utils import make, make_vec, register_superclass
 
 register_superclass(RewardFunction)
 register_superclass(ElectricMotorVisualization)
@@ -18,6 +20,8 @@ import gym_electric_motor.visualization
 import gym_electric_motor.physical_systems
 import gym_electric_motor.envs
 import gym_electric_motor.physical_system_wrappers
+from .vector_env import VectorElectricMotorEnvironment
+from .rollout import BranchRollout
 
 from gym.envs.registration import register
 import gym
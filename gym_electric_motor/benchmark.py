@@ -0,0 +1,354 @@
+"""Benchmark suite for all registered gym-electric-motor environments.
+
+The benchmark measures the construction time, the reset latency, the simulated steps per second and the peak memory
+of each combination of environment id, ode solver and physical system wrapper stack. The results are written as JSON
+and can be compared against a stored baseline to detect performance regressions.
+
+Usage::
+
+    # Measure all environments and store the results as baseline
+    python -m gym_electric_motor.benchmark --output baseline.json
+
+    # Measure again and compare against the baseline. The exit code is 1, if a regression has been detected.
+    python -m gym_electric_motor.benchmark --output results.json --baseline baseline.json --tolerance 0.2
+
+    # Restrict the sweep
+    python -m gym_electric_motor.benchmark --envs Cont-CC-PMSM-v0 Finite-CC-SCIM-v0 --solvers euler --wrappers none
+
+Each configuration is warmed up with an untimed construction, reset and steps before it is measured. The times are
+measured several times (``--repeats``) and the best values are stored, so that the results do not depend on the order of
+the sweep. The baseline has to be recorded on the same machine, because the absolute values depend on the hardware.
+"""
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import gym
+import numpy as np
+
+import gym_electric_motor as gem
+from gym_electric_motor.physical_system_wrappers import DeadTimeProcessor, CosSinProcessor, \
+    DqToAbcActionProcessor, FluxObserver
+
+#: The ode solvers that are benchmarked by default
+SOLVERS = ('euler', 'scipy.ode', 'scipy.solve_ivp', 'scipy.odeint')
+
+#: Metrics and the direction in which they regress. 1: Higher values are worse. -1: Lower values are worse.
+METRICS = dict(construction_time=1, reset_time=1, steps_per_second=-1, peak_memory=1)
+
+_THREE_PHASE_MOTORS = ('PMSM', 'SynRM', 'EESM', 'SCIM', 'DFIM')
+
+
+def _dead_time_stack(env_id):
+    return DeadTimeProcessor(),
+
+
+def _cos_sin_stack(env_id):
+    if _motor(env_id) not in _THREE_PHASE_MOTORS:
+        return None
+    return CosSinProcessor('epsilon'),
+
+
+def _dq_to_abc_stack(env_id):
+    motor = _motor(env_id)
+    if not env_id.startswith('Cont-') or motor not in ('PMSM', 'SCIM', 'DFIM'):
+        return None
+    if motor == 'PMSM':
+        return DqToAbcActionProcessor.make(motor),
+    return FluxObserver(), DqToAbcActionProcessor.make(motor)
+
+
+#: Physical system wrapper stacks. Each function returns the wrappers for an environment id or None, if the stack is
+#: not applicable to the environment.
+WRAPPER_STACKS = dict(
+    none=lambda env_id: (),
+    dead_time=_dead_time_stack,
+    cos_sin=_cos_sin_stack,
+    dq_to_abc=_dq_to_abc_stack,
+)
+
+
+def _motor(env_id):
+    """Returns the motor abbreviation of an environment id like 'Cont-CC-PMSM-v0'."""
+    return env_id.split('-')[2]
+
+
+def registered_env_ids():
+    """Returns the ids of all registered gym-electric-motor environments.
+
+    Returns:
+        list(str): The sorted environment ids.
+    """
+    registry = gym.envs.registry
+    specs = registry.values() if isinstance(registry, dict) else registry.all()
+    return sorted(
+        spec.id for spec in specs
+        if isinstance(spec.entry_point, str) and spec.entry_point.startswith('gym_electric_motor')
+    )
+
+
+def benchmark_environment(env_id, ode_solver='euler', wrappers='none', steps=1000, resets=10, seed=0, repeats=5):
+    """Measures a single environment configuration.
+
+    The configuration is warmed up with an untimed construction, reset and steps first. Then, the construction time,
+    reset latency and steps per second are measured repeats times and the best values are returned.
+
+    Args:
+        env_id(str): Id of the environment.
+        ode_solver(str): Key of the ode solver of the physical system.
+        wrappers(str): Key of the physical system wrapper stack in WRAPPER_STACKS.
+        steps(int): Number of steps to measure the steps per second.
+        resets(int): Number of resets to measure the reset latency.
+        seed(int): Seed of the environment and the sampled actions.
+        repeats(int): Number of measurements of each time.
+
+    Returns:
+        dict or None: The results with the keys 'env_id', 'solver', 'wrappers' and the METRICS or an 'error' entry,
+        if the configuration failed. None, if the wrapper stack is not applicable to the environment.
+    """
+    assert repeats > 0, 'The number of repeats has to be positive.'
+    if WRAPPER_STACKS[wrappers](env_id) is None:
+        return None
+    result = dict(env_id=env_id, solver=ode_solver, wrappers=wrappers)
+
+    def make():
+        kwargs = dict(ode_solver=ode_solver, visualization=())
+        stack = WRAPPER_STACKS[wrappers](env_id)
+        # Not all environments accept physical system wrappers. Therefore, they are only passed if required.
+        if len(stack) > 0:
+            kwargs['physical_system_wrappers'] = stack
+        return gem.make(env_id, **kwargs)
+
+    def run_steps(env, actions):
+        step_time = 0.0
+        for action in actions:
+            start = time.perf_counter()
+            _, _, done, _ = env.step(action)
+            step_time += time.perf_counter() - start
+            if done:
+                env.reset()
+        return step_time
+
+    try:
+        # Untimed warm up of the imports, caches and compiled tables of the configuration
+        env = make()
+        env.seed(seed)
+        env.action_space.seed(seed)
+        env.reset()
+        actions = [env.action_space.sample() for _ in range(steps)]
+        run_steps(env, actions[:min(steps, 100)])
+        env.close()
+
+        # Like timeit, the garbage collection is disabled during the measurements, so that collections of the garbage
+        # of previous configurations do not disturb the times.
+        gc.collect()
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            construction_times = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                env = make()
+                construction_times.append(time.perf_counter() - start)
+                env.close()
+            result['construction_time'] = min(construction_times)
+
+            env = make()
+            env.seed(seed)
+            reset_times = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                for _ in range(resets):
+                    env.reset()
+                reset_times.append((time.perf_counter() - start) / resets)
+            result['reset_time'] = min(reset_times)
+
+            result['steps_per_second'] = max(steps / run_steps(env, actions) for _ in range(repeats))
+            env.close()
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+        # The memory is measured in a separate run, because tracemalloc slows down the execution.
+        tracemalloc.start()
+        try:
+            env = make()
+            env.seed(seed)
+            env.reset()
+            for action in actions[:min(steps, 100)]:
+                _, _, done, _ = env.step(action)
+                if done:
+                    env.reset()
+            result['peak_memory'] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        env.close()
+    except Exception as exception:
+        result['error'] = f'{type(exception).__name__}: {exception}'
+    return result
+
+
+def run_benchmark(env_ids=None, solvers=SOLVERS, wrappers=tuple(WRAPPER_STACKS.keys()), steps=1000, resets=10,
+                  seed=0, repeats=5, verbose=False):
+    """Sweeps all combinations of environment ids, ode solvers and wrapper stacks.
+
+    Args:
+        env_ids(iterable(str)): Ids of the environments. Default: All registered environments.
+        solvers(iterable(str)): Keys of the ode solvers.
+        wrappers(iterable(str)): Keys of the wrapper stacks in WRAPPER_STACKS.
+        steps(int): Number of steps to measure the steps per second.
+        resets(int): Number of resets to measure the reset latency.
+        seed(int): Seed of the environments and the sampled actions.
+        repeats(int): Number of measurements of each time per configuration.
+        verbose(bool): Flag, if each result shall be printed.
+
+    Returns:
+        dict: The benchmark with the keys 'metadata' (versions, platform and settings) and 'results' (list of the
+        results of benchmark_environment).
+    """
+    env_ids = registered_env_ids() if env_ids is None else list(env_ids)
+    results = []
+    for env_id in env_ids:
+        for solver in solvers:
+            for stack in wrappers:
+                result = benchmark_environment(env_id, solver, stack, steps, resets, seed, repeats)
+                if result is None:
+                    continue
+                results.append(result)
+                if verbose:
+                    print(_format_result(result), flush=True)
+    metadata = dict(
+        python=platform.python_version(),
+        numpy=np.__version__,
+        gym=gym.__version__,
+        platform=platform.platform(),
+        processor=platform.processor(),
+        steps=steps,
+        resets=resets,
+        seed=seed,
+        repeats=repeats,
+    )
+    return dict(metadata=metadata, results=results)
+
+
+def compare(results, baseline, tolerance=0.2):
+    """Compares benchmark results against a baseline.
+
+    A metric has regressed, if it is worse than the baseline value by more than the relative tolerance. Configurations
+    that fail now but succeeded in the baseline are regressions, too. Configurations that are missing in the baseline
+    are ignored.
+
+    Args:
+        results(dict): The benchmark of run_benchmark.
+        baseline(dict): The baseline benchmark of run_benchmark.
+        tolerance(float or dict(str, float)): Relative tolerance for all metrics or for each metric in METRICS.
+
+    Returns:
+        list(dict): The regressions with the keys 'env_id', 'solver', 'wrappers', 'metric', 'baseline', 'value' and
+        'change' (relative change of the value).
+    """
+    if not isinstance(tolerance, dict):
+        tolerance = {metric: tolerance for metric in METRICS}
+    baseline_results = {_key(result): result for result in baseline['results']}
+    regressions = []
+    for result in results['results']:
+        reference = baseline_results.get(_key(result))
+        if reference is None or 'error' in reference:
+            continue
+        configuration = dict(env_id=result['env_id'], solver=result['solver'], wrappers=result['wrappers'])
+        if 'error' in result:
+            regressions.append(dict(configuration, metric='error', baseline=None, value=result['error'], change=None))
+            continue
+        for metric, direction in METRICS.items():
+            if metric not in reference or metric not in result or reference[metric] == 0:
+                continue
+            change = (result[metric] - reference[metric]) / reference[metric]
+            if direction * change > tolerance.get(metric, np.inf):
+                regressions.append(
+                    dict(configuration, metric=metric, baseline=reference[metric], value=result[metric], change=change)
+                )
+    return regressions
+
+
+def save(benchmark, path):
+    """Writes the benchmark to a JSON file."""
+    with open(path, 'w') as file:
+        json.dump(benchmark, file, indent=1)
+
+
+def load(path):
+    """Reads a benchmark from a JSON file."""
+    with open(path, 'r') as file:
+        return json.load(file)
+
+
+def _key(result):
+    return result['env_id'], result['solver'], result['wrappers']
+
+
+def _format_result(result):
+    configuration = f'{result["env_id"]:22s} {result["solver"]:16s} {result["wrappers"]:10s}'
+    if 'error' in result:
+        return f'{configuration} ERROR {result["error"]}'
+    return (
+        f'{configuration} {result["steps_per_second"]:9.0f} steps/s {result["reset_time"] * 1e3:8.2f} ms/reset '
+        f'{result["construction_time"] * 1e3:8.2f} ms/make {result["peak_memory"] / 2 ** 20:7.2f} MiB'
+    )
+
+
+def main(args=None):
+    """Entry point of ``python -m gym_electric_motor.benchmark``.
+
+    Args:
+        args(list(str)): Command line arguments. Default: sys.argv
+
+    Returns:
+        int: Exit code. 1, if a regression against the baseline has been detected, else 0.
+    """
+    parser = argparse.ArgumentParser(
+        prog='python -m gym_electric_motor.benchmark',
+        description='Benchmark of all registered gym-electric-motor environments.',
+    )
+    parser.add_argument('--envs', nargs='+', default=None, help='Environment ids. Default: all registered ids')
+    parser.add_argument('--solvers', nargs='+', default=list(SOLVERS), help='Ode solvers')
+    parser.add_argument(
+        '--wrappers', nargs='+', default=list(WRAPPER_STACKS.keys()), choices=list(WRAPPER_STACKS.keys()),
+        help='Physical system wrapper stacks'
+    )
+    parser.add_argument('--steps', type=int, default=1000, help='Steps to measure the steps per second')
+    parser.add_argument('--resets', type=int, default=10, help='Resets to measure the reset latency')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeats', type=int, default=5, help='Measurements of each time. The best value is stored')
+    parser.add_argument('--output', default=None, help='Path of the JSON file to write the results to')
+    parser.add_argument('--baseline', default=None, help='Path of a JSON file with results to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='Relative tolerance of the comparison')
+    parser.add_argument('--quiet', action='store_true', help='Do not print each result')
+    args = parser.parse_args(args)
+
+    benchmark = run_benchmark(
+        args.envs, args.solvers, args.wrappers, args.steps, args.resets, args.seed, args.repeats,
+        verbose=not args.quiet
+    )
+    if args.output is not None:
+        save(benchmark, args.output)
+    errors = [result for result in benchmark['results'] if 'error' in result]
+    print(f'{len(benchmark["results"])} configurations measured, {len(errors)} failed.')
+    if args.baseline is None:
+        return 0
+    regressions = compare(benchmark, load(args.baseline), args.tolerance)
+    for regression in regressions:
+        change = '' if regression['change'] is None else f'{regression["change"]:+.1%}'
+        print(
+            f'REGRESSION {regression["env_id"]} {regression["solver"]} {regression["wrappers"]} '
+            f'{regression["metric"]}: {regression["baseline"]} -> {regression["value"]} {change}'
+        )
+    print(f'{len(regressions)} regressions against {args.baseline}.')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -20,6 +20,20 @@ class Constraint:
         """
         raise NotImplementedError
 
+    def check_batch(self, states):
+        """Function that is called to check the constraint for a batch of states.
+
+        Per default, the constraint is called for each state separately. Subclasses may overwrite this function with a
+        vectorized check.
+
+        Args:
+            states(numpy.ndarray(float)): The current states of a batch of physical systems. Shape: (N, states)
+
+        Returns:
+            numpy.ndarray(float): Degrees how much the constraint has been violated in each system. Shape: (N,)
+        """
+        return np.array([self(state) for state in states], dtype=float)
+
     def set_modules(self, ps):
         """Called by the environment that the Constraint can read information from the PhysicalSystem.
 
@@ -57,6 +71,11 @@ class LimitConstraint(Constraint):
         violation = any(abs(observed) > 1.0)
         return float(violation)
 
+    def check_batch(self, states):
+        # Docstring of superclass
+        observed = states[:, self._observed_states]
+        return np.any(abs(observed) > 1.0, axis=1).astype(float)
+
     def set_modules(self, ps):
         self._limits = ps.limits
         if 'all_states' in self._observed_state_names:
@@ -96,3 +115,8 @@ class SquaredConstraint(Constraint):
     def __call__(self, state):
         state_ = state[self._state_indices] if self._normalized else state[self._state_indices] / self._limits
         return float(np.sum(state_**2) > 1.0)
+
+    def check_batch(self, states):
+        # Docstring of superclass
+        states_ = states[:, self._state_indices] if self._normalized else states[:, self._state_indices] / self._limits
+        return (np.sum(states_**2, axis=1) > 1.0).astype(float)
@@ -23,7 +23,9 @@ from gym.spaces import Box
 
 from .utils import instantiate
 from .random_component import RandomComponent
+from .stateful_component import StatefulComponent
 from .constraints import Constraint, LimitConstraint
+from .profiling import StepProfiler
 import gym_electric_motor as gem
 
 
@@ -164,6 +166,16 @@ class ElectricMotorEnvironment(gym.core.Env):
         """Returns a list of all active motor visualizations."""
         return self._visualizations
 
+    @property
+    def profiler(self):
+        """Returns the attached StepProfiler or None, if the profiling is disabled."""
+        return self._profiler
+
+    @property
+    def observation_mode(self):
+        """Returns the observation mode ('tuple' or 'flat') of the environment. See set_observation_mode."""
+        return 'tuple' if self._observation_buffer is None else 'flat'
+
     def __init__(self, physical_system, reference_generator, reward_function, visualization=(), state_filter=None,
                  callbacks=(), constraints=(), physical_system_wrappers=(), **kwargs):
         """
@@ -226,30 +238,166 @@ class ElectricMotorEnvironment(gym.core.Env):
         self.action_space = self.physical_system.action_space
         self.reward_range = self._reward_function.reward_range
         self._done = True
+        self._profiler = None
+        self._observation_buffer = None
+        self._reuse_observation = False
+        self._state_selection = None
         self._callbacks = list(callbacks)
         self._callbacks += list(self._visualizations)
         self._call_callbacks('set_env', self)
+        self._callback_dispatcher = CallbackDispatcher(self._callbacks)
+
+    @property
+    def callback_dispatcher(self):
+        """Returns the CallbackDispatcher that calls the hooks of the callbacks and visualizations."""
+        return self._callback_dispatcher
 
     def _call_callbacks(self, func_name, *args):
-        """Calls each callback's func_name function with *args"""
+        """Calls each callback's func_name function with *args without the compiled dispatch."""
         for callback in self._callbacks:
             func = getattr(callback, func_name)
             func(*args)
             
+    def set_observation_mode(self, mode='flat', dtype=np.float64, reuse=False):
+        """
+        Selects the form of the observations that are returned by reset and step.
+
+        In the 'tuple' mode (default), the observation is a tuple of the observed states and the reference observation.
+        In the 'flat' mode, the observed states and the flattened reference observation are written one after another
+        into one contiguous array of the passed dtype and the observation space is a flat Box. Therefore, no wrapper is
+        required to concatenate the observation for the agent. If the state filter selects a contiguous range of
+        states, the states are copied without fancy indexing.
+
+        Args:
+            mode(str): 'tuple' or 'flat'
+            dtype(np.dtype): The dtype of the flat observations (e.g. np.float32). Default: np.float64
+            reuse(bool): Flag, if the same array is returned in each step of the 'flat' mode. It is overwritten by the
+                next call of reset or step. Therefore, it has to be copied, if it is stored (e.g. in a replay buffer).
+                Default: False (a new array per step)
+
+        Returns:
+            gym.spaces.Space: The new observation space of the environment.
+        """
+        assert mode in ('tuple', 'flat'), f'The observation mode {mode} is not supported. Use "tuple" or "flat".'
+        state_space = Box(
+            self._physical_system.state_space.low[self.state_filter],
+            self._physical_system.state_space.high[self.state_filter],
+            dtype=np.float64
+        )
+        reference_space = self._reference_generator.reference_space
+        if mode == 'tuple':
+            self._observation_buffer = None
+            self._state_selection = None
+            self._reuse_observation = False
+            self.observation_space = gym.spaces.Tuple((state_space, reference_space))
+            return self.observation_space
+        assert isinstance(reference_space, Box), 'The flat observation mode requires a Box reference space.'
+        state_filter = np.array(self.state_filter, dtype=int)
+        if len(state_filter) > 0 and np.all(np.diff(state_filter) == 1):
+            self._state_selection = slice(state_filter[0], state_filter[-1] + 1)
+        else:
+            self._state_selection = state_filter
+        self.observation_space = Box(
+            np.concatenate((state_space.low, reference_space.low.reshape(-1))).astype(dtype),
+            np.concatenate((state_space.high, reference_space.high.reshape(-1))).astype(dtype),
+            dtype=dtype
+        )
+        self._observation_buffer = np.zeros(self.observation_space.shape, dtype=dtype)
+        self._reuse_observation = reuse
+        return self.observation_space
+
+    def _observation(self, state, reference_observation):
+        """Returns the observation of the state and the reference observation in the selected observation mode."""
+        if self._observation_buffer is None:
+            return state[self.state_filter], reference_observation
+        observation = self._observation_buffer if self._reuse_observation else np.empty_like(self._observation_buffer)
+        states = len(self.state_filter)
+        observation[:states] = state[self._state_selection]
+        observation[states:] = np.reshape(reference_observation, -1)
+        return observation
+
+    def enable_profiling(self):
+        """
+        Attaches a StepProfiler that measures the wall time and the number of calls of all modules in the steps and
+        resets of the environment. The profiling is disabled by default and causes no overhead then.
+
+        Returns:
+            StepProfiler: The attached profiler. Its report() contains the measurements.
+        """
+        if self._profiler is None:
+            self._profiler = StepProfiler().attach(self)
+            # The timed hooks of the callbacks replace the compiled ones.
+            self._callback_dispatcher.compile(self._callbacks)
+        return self._profiler
+
+    def disable_profiling(self):
+        """
+        Detaches the StepProfiler and restores the original methods of all modules.
+
+        Returns:
+            dict(str, dict) or None: The final report of the profiler. None, if the profiling was not enabled.
+        """
+        if self._profiler is None:
+            return None
+        self._profiler.detach()
+        self._callback_dispatcher.compile(self._callbacks)
+        report = self._profiler.report()
+        self._profiler = None
+        return report
+
+    def get_state(self):
+        """
+        Captures a snapshot of the complete state of the environment.
+
+        The snapshot contains the states of the physical system (including all physical system wrappers, the converter,
+        the supply, the motor, the load and the ode solver), the reference generator, the reward function and the
+        constraint monitor as well as the states of all random generators. Only the values that change during an
+        episode are copied, so that the snapshot is small and can be taken and restored in every step, e.g. to branch
+        from the current state in model predictive control or tree search. The callbacks and visualizations are not
+        part of the snapshot.
+
+        Returns:
+            dict: The snapshot that can be passed to ``set_state``.
+        """
+        return dict(
+            done=self._done,
+            physical_system=self._physical_system.get_state(),
+            reference_generator=self._reference_generator.get_state(),
+            reward_function=self._reward_function.get_state(),
+            constraint_monitor=self._constraint_monitor.get_state(),
+        )
+
+    def set_state(self, state):
+        """
+        Restores the environment to a snapshot of ``get_state``.
+
+        The following steps of the environment are equal to the steps after the snapshot has been taken. The snapshot is
+        not modified and can be restored multiple times.
+
+        Args:
+            state(dict): The snapshot of this environment.
+        """
+        self._done = state['done']
+        self._physical_system.set_state(state['physical_system'])
+        self._reference_generator.set_state(state['reference_generator'])
+        self._reward_function.set_state(state['reward_function'])
+        self._constraint_monitor.set_state(state['constraint_monitor'])
+
     def reset(self, *_, **__):
         """
         Reset of the environment and all its modules to an initial state.
 
         Returns:
-             The initial observation consisting of the initial state and initial reference.
+             The initial observation consisting of the initial state and initial reference. A flat array in the 'flat'
+             observation mode (see set_observation_mode).
         """
-        self._call_callbacks('on_reset_begin')
+        self._callback_dispatcher.on_reset_begin()
         self._done = False
         state = self._physical_system.reset()
         reference, next_ref, trajectories = self.reference_generator.reset(state)
         self._reward_function.reset(state, reference)
-        self._call_callbacks('on_reset_end', state, reference)
-        return state[self.state_filter], next_ref
+        self._callback_dispatcher.on_reset_end(state, reference)
+        return self._observation(state, next_ref)
 
     def render(self, *_, **__):
         """
@@ -265,14 +413,15 @@ class ElectricMotorEnvironment(gym.core.Env):
             action: Action to play on the environment.
 
         Returns:
-            observation(Tuple(ndarray(float),ndarray(float)): Tuple of the new state and the next reference.
+            observation(Tuple(ndarray(float),ndarray(float)): Tuple of the new state and the next reference. A flat
+                array in the 'flat' observation mode (see set_observation_mode).
             reward(float): Amount of reward received for the last step.
             done(bool): Flag, indicating if a reset is required before new steps can be taken.
             {}: An empty dictionary for consistency with the OpenAi Gym interface.
         """
 
         assert not self._done, 'A reset is required before the environment can perform further steps'
-        self._call_callbacks('on_step_begin', self.physical_system.k, action)
+        self._callback_dispatcher.on_step_begin(self.physical_system.k, action)
         state = self._physical_system.simulate(action)
         reference = self.reference_generator.get_reference(state)
         violation_degree = self._constraint_monitor.check_constraints(state)
@@ -281,10 +430,8 @@ class ElectricMotorEnvironment(gym.core.Env):
         )
         self._done = violation_degree >= 1.0
         ref_next = self.reference_generator.get_reference_observation(state)
-        self._call_callbacks(
-            'on_step_end', self.physical_system.k, state, reference, reward, self._done
-        )
-        return (state[self.state_filter], ref_next), reward, self._done, {}
+        self._callback_dispatcher.on_step_end(self.physical_system.k, state, reference, reward, self._done)
+        return self._observation(state, ref_next), reward, self._done, {}
 
     def seed(self, seed=None):
         sg = np.random.SeedSequence(seed)
@@ -302,13 +449,13 @@ class ElectricMotorEnvironment(gym.core.Env):
 
     def close(self):
         """Called when the environment is deleted. Closes all its modules."""
-        self._call_callbacks('on_close')
+        self._callback_dispatcher.on_close()
         self._reward_function.close()
         self._physical_system.close()
         self._reference_generator.close()
 
 
-class ReferenceGenerator:
+class ReferenceGenerator(StatefulComponent):
     """The abstract base class for reference generators in gym electric motor environments.
 
     reference_space:
@@ -421,7 +568,7 @@ class ReferenceGenerator:
         pass
 
 
-class RewardFunction:
+class RewardFunction(StatefulComponent):
     """
     The abstract base class for reward functions in gym electric motor environments.
 
@@ -482,6 +629,34 @@ class RewardFunction:
 
         raise NotImplementedError
 
+    def reward_batch(self, states, references, k=None, actions=None, violation_degrees=None):
+        """
+        Reward calculation for a batch of environments as used by the VectorElectricMotorEnvironment.
+
+        Per default, the reward function is called for each batch entry separately. Subclasses may overwrite this
+        function with a vectorized calculation.
+
+        Args:
+            states(ndarray(float)): State arrays of all environments. Shape: (N, states)
+            references(ndarray(float)): Reference arrays of all environments. Shape: (N, states)
+            k(ndarray(int)): Momentary time-steps of all environments. Shape: (N,)
+            actions(Sequence): The previously taken actions of all environments.
+            violation_degrees(ndarray(float)): Degrees of violation of the constraints of all environments.
+                Shape: (N,)
+
+        Returns:
+            ndarray(float): Rewards of all environments. Shape: (N,)
+        """
+        n = len(states)
+        k = np.zeros(n, dtype=int) if k is None else k
+        actions = [None] * n if actions is None else actions
+        violation_degrees = np.zeros(n) if violation_degrees is None else violation_degrees
+        return np.array([
+            self.reward(state, reference, k_, action, violation_degree)
+            for state, reference, k_, action, violation_degree
+            in zip(states, references, k, actions, violation_degrees)
+        ], dtype=float)
+
     def reset(self, initial_state=None, initial_reference=None):
         """This function is called by the environment when reset.
 
@@ -498,10 +673,12 @@ class RewardFunction:
         pass
 
 
-class PhysicalSystem:
+class PhysicalSystem(StatefulComponent):
     """The Physical System module encapsulates the physical model of the system as well as the simulation from one step
     to the next."""
 
+    _state_attributes = ('_k',)
+
     @property
     def unwrapped(self):
         """Returns this instance of the physical system.
@@ -624,10 +801,28 @@ class Callback:
     Each of its functions gets called at one point in the :mod:`~gym_electric_motor.core.ElectricMotorEnvironment`.
     Attributes:
         _env: The GEM environment. Use it to have full control over the environment on runtime.
+
+    Only the functions that are overridden by a callback are called by the environment (see
+    :py:class:`CallbackDispatcher`). If the step_interval is n > 1, on_step_begin and on_step_end are only called in
+    every n-th step of the environment.
     """
 
-    def __init__(self):
+    _step_interval = 1
+
+    @property
+    def step_interval(self):
+        """Returns the number of steps of the environment between two calls of on_step_begin and on_step_end."""
+        return self._step_interval
+
+    def __init__(self, step_interval=1):
+        """
+        Args:
+            step_interval(int): Number of steps of the environment between two calls of on_step_begin and on_step_end.
+                They are called in the steps n, 2n, 3n,... counted over all episodes. Default: 1 (each step)
+        """
+        assert step_interval >= 1, 'The step interval has to be at least 1.'
         self._env = None
+        self._step_interval = int(step_interval)
 
     def set_env(self, env):
         """Sets the environment of the motor."""
@@ -654,6 +849,95 @@ class Callback:
         pass
 
 
+class CallbackDispatcher:
+    """Calls the functions of the callbacks of an ElectricMotorEnvironment.
+
+    The functions are resolved once in compile(). Only the functions that are overridden by a callback (or replaced on
+    the callback instance) are stored in flat lists of bound methods, so that the no-op functions of the Callback base
+    class are not called and no attributes are looked up in the steps. The step functions are stored with the step
+    intervals of their callbacks in the order of the callbacks. Step functions of callbacks with a step_interval n > 1
+    are only called in every n-th step of the environment.
+
+    The callbacks have to be compiled again, if their functions or step intervals are changed after the compilation.
+    """
+
+    #: Names of the functions of the callbacks that are called by the dispatcher
+    hooks = ('on_reset_begin', 'on_reset_end', 'on_step_begin', 'on_step_end', 'on_close')
+
+    @property
+    def num_steps(self):
+        """Returns the number of steps of the environment that have been dispatched over all episodes."""
+        return self._num_steps
+
+    def __init__(self, callbacks=()):
+        """
+        Args:
+            callbacks(iterable(Callback)): The callbacks in the order of their calls.
+        """
+        self._num_steps = 0
+        self.compile(callbacks)
+
+    def compile(self, callbacks):
+        """Resolves the overridden functions of the callbacks.
+
+        Args:
+            callbacks(iterable(Callback)): The callbacks in the order of their calls.
+        """
+        self._callbacks = list(callbacks)
+        self._on_reset_begin = [method for _, method in self._resolve('on_reset_begin')]
+        self._on_reset_end = [method for _, method in self._resolve('on_reset_end')]
+        self._on_close = [method for _, method in self._resolve('on_close')]
+        # Step functions as (interval, method) tuples in the order of the callbacks
+        self._on_step_begin = self._resolve('on_step_begin')
+        self._on_step_end = self._resolve('on_step_end')
+
+    def on_reset_begin(self):
+        """Calls on_reset_begin of the callbacks."""
+        for on_reset_begin in self._on_reset_begin:
+            on_reset_begin()
+
+    def on_reset_end(self, state, reference):
+        """Calls on_reset_end of the callbacks."""
+        for on_reset_end in self._on_reset_end:
+            on_reset_end(state, reference)
+
+    def on_step_begin(self, k, action):
+        """Counts the step and calls on_step_begin of the callbacks whose step interval is reached."""
+        self._num_steps += 1
+        for interval, on_step_begin in self._on_step_begin:
+            if interval == 1 or self._num_steps % interval == 0:
+                on_step_begin(k, action)
+
+    def on_step_end(self, k, state, reference, reward, done):
+        """Calls on_step_end of the callbacks whose step interval is reached."""
+        for interval, on_step_end in self._on_step_end:
+            if interval == 1 or self._num_steps % interval == 0:
+                on_step_end(k, state, reference, reward, done)
+
+    def on_close(self):
+        """Calls on_close of the callbacks."""
+        for on_close in self._on_close:
+            on_close()
+
+    def _resolve(self, hook):
+        """Returns (step interval, bound method) tuples of the callbacks that override the hook."""
+        base_function = getattr(Callback, hook)
+        methods = []
+        for callback in self._callbacks:
+            method = getattr(callback, hook)
+            if getattr(method, '__func__', None) is not base_function:
+                methods.append((getattr(callback, 'step_interval', 1), method))
+        return methods
+
+    def __getstate__(self):
+        # The bound methods are not copied. Copies resolve the functions of their copied callbacks again.
+        return dict(_callbacks=self._callbacks, _num_steps=self._num_steps)
+
+    def __setstate__(self, state):
+        self._num_steps = state['_num_steps']
+        self.compile(state['_callbacks'])
+
+
 class ElectricMotorVisualization(Callback):
     """Base class for all visualizations in GEM.
     The visualization is basically only a Callback that is extended by a render() function to update the figure.
@@ -667,7 +951,7 @@ class ElectricMotorVisualization(Callback):
         raise NotImplementedError
 
 
-class ConstraintMonitor:
+class ConstraintMonitor(StatefulComponent):
     """The ConstraintMonitor is used within the ElectricMotorEnvironment to monitor the states for illegal / undesired
     values (e.g. overcurrents).
 
@@ -724,14 +1008,20 @@ class ConstraintMonitor:
         if len(self._constraints) == 0:
             # Without any constraint, always return 0.0 as violation
             self._merge_violations = lambda *violation_degrees: 0.0
+            self._merge_violations_batch = lambda violation_degrees: np.zeros(violation_degrees.shape[1])
         elif merge_violations == 'max':
             self._merge_violations = max
+            self._merge_violations_batch = lambda violation_degrees: np.max(violation_degrees, axis=0)
         elif merge_violations == 'product':
             def product_merge(*violation_degrees):
                 return 1 - np.prod([(1 - violation) for violation in violation_degrees])
             self._merge_violations = product_merge
+            self._merge_violations_batch = lambda violation_degrees: 1 - np.prod(1 - violation_degrees, axis=0)
         elif callable(merge_violations):
             self._merge_violations = merge_violations
+            self._merge_violations_batch = lambda violation_degrees: np.array(
+                [merge_violations(list(violations)) for violations in violation_degrees.T], dtype=float
+            )
 
     def set_modules(self, ps: PhysicalSystem):
         """The PhysicalSystem of the environment is passed to save important parameters like the index of the states.
@@ -754,3 +1044,20 @@ class ConstraintMonitor:
         """
         violations = [constraint(state) for constraint in self._constraints]
         return self._merge_violations(violations)
+
+    def check_constraints_batch(self, states):
+        """Function to check and merge all constraints for a batch of states.
+
+        Args:
+            states(ndarray(float)): The current states of all environments. Shape: (N, states)
+
+        Returns:
+            ndarray(float): The total violation degrees in [0,1] of all environments. Shape: (N,)
+        """
+        violations = np.zeros((len(self._constraints), len(states)))
+        for violation, constraint in zip(violations, self._constraints):
+            if isinstance(constraint, Constraint):
+                violation[:] = constraint.check_batch(states)
+            else:
+                violation[:] = [constraint(state) for state in states]
+        return self._merge_violations_batch(violations)
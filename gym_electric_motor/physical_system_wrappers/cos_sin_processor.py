@@ -11,6 +11,8 @@ class CosSinProcessor(PhysicalSystemWrapper):
     Optionally, the CosSinProcessor can also remove the angle from the state vector.
     """
 
+    batch_support = True
+
     @property
     def angle(self):
         """Returns the name of the state whose cosine and sine are appended to the state vector."""
@@ -47,9 +49,9 @@ class CosSinProcessor(PhysicalSystemWrapper):
         self._state_positions = {key: index for index, key in enumerate(self._state_names)}
         return self
 
-    def reset(self):
+    def reset(self, **kwargs):
         # Docstring of super class
-        state = self._physical_system.reset()
+        state = self._physical_system.reset(**kwargs)
         return self._get_cos_sin(state)
 
     def simulate(self, action):
@@ -68,7 +70,7 @@ class CosSinProcessor(PhysicalSystemWrapper):
         Returns:
             numpy.ndarray[float]: The state vector removed by the angle.
                 """
-        return np.delete(state, self._remove_idx)
+        return np.delete(state, self._remove_idx, axis=-1)
 
     def _get_cos_sin(self, state):
         """Appends the cosine and sine of the specified state to the state vector.
@@ -79,4 +81,5 @@ class CosSinProcessor(PhysicalSystemWrapper):
         Returns:
             numpy.ndarray[float]: The state vector extended by cosine and sine.
         """
-        return np.concatenate((state, [np.cos(state[self._angle_index]), np.sin(state[self._angle_index])]))
+        angle = state[..., self._angle_index, np.newaxis]
+        return np.concatenate((state, np.cos(angle), np.sin(angle)), axis=-1)
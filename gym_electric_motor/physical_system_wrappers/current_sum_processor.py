@@ -7,6 +7,8 @@ from gym_electric_motor.physical_system_wrappers import PhysicalSystemWrapper
 class CurrentSumProcessor(PhysicalSystemWrapper):
     """Adds an ``i_sum`` state to the systems state vector that adds up currents."""
 
+    batch_support = True
+
     def __init__(self, currents, limit='max', physical_system=None):
         """
         Args:
@@ -43,23 +45,23 @@ class CurrentSumProcessor(PhysicalSystemWrapper):
         self._state_positions['i_sum'] = self._state_names.index('i_sum')
         return self
 
-    def reset(self):
+    def reset(self, **kwargs):
         # Docstring of superclass
-        state = self._physical_system.reset()
-        return np.concatenate((state, [self._get_current_sum(state)]))
+        state = self._physical_system.reset(**kwargs)
+        return np.concatenate((state, np.expand_dims(self._get_current_sum(state), -1)), axis=-1)
 
     def simulate(self, action):
         # Docstring of superclass
         state = self._physical_system.simulate(action)
-        return np.concatenate((state, [self._get_current_sum(state)]))
+        return np.concatenate((state, np.expand_dims(self._get_current_sum(state), -1)), axis=-1)
 
     def _get_current_sum(self, state):
         """Calculates the sum of the currents from the state
 
         Args:
-            state(numpy.ndarray[float]): The state of the inner system.
+            state(numpy.ndarray[float]): The state of the inner system. Shape: (states,) or (N, states)
 
         Returns:
-            float: The summation of the currents of the state.
+            float/numpy.ndarray[float]: The summation of the currents of the state.
         """
-        return np.sum(state[self._current_indices])
+        return np.sum(state[..., self._current_indices], axis=-1)
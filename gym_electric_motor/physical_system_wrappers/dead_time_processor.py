@@ -18,6 +18,8 @@ class DeadTimeProcessor(PhysicalSystemWrapper):
         ``Discrete, MultiDiscrete, Box``.
     """
 
+    _state_attributes = PhysicalSystemWrapper._state_attributes + ('_action_deque',)
+
     @property
     def dead_time(self):
         """int: The number of delayed steps."""
@@ -10,6 +10,8 @@ class DqToAbcActionProcessor(PhysicalSystemWrapper):
     system to which actions in the dq-coordinate system can be applied.
     """
 
+    _state_attributes = PhysicalSystemWrapper._state_attributes + ('_state',)
+
     @staticmethod
     def _transformation(action, angle):
         """Transforms the action in dq-space to an action in the abc-space for the use in the inner system.
@@ -21,7 +23,7 @@ class DqToAbcActionProcessor(PhysicalSystemWrapper):
         Returns:
             numpy.ndarray[float]: The action in the abc-space
         """
-        return ps.ThreePhaseMotor.t_32(ps.ThreePhaseMotor.q(action, angle))
+        return ps.ThreePhaseMotor.dq_to_abc(action, angle)
 
     _registry = {}
 
@@ -25,6 +25,8 @@ class FluxObserver(PhysicalSystemWrapper):
             \Psi_k = \sum_{i=0}^k (\Psi_{k-1} + \Delta\Psi_k) \\tau
     """
 
+    _state_attributes = PhysicalSystemWrapper._state_attributes + ('_integrated',)
+
     def __init__(self, current_names=('i_sa', 'i_sb', 'i_sc'), physical_system=None):
         """
         Args:
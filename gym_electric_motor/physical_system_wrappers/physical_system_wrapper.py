@@ -9,6 +9,12 @@ class PhysicalSystemWrapper(gem.core.PhysicalSystem, gem.core.RandomComponent):
     other components of the environment.
     """
 
+    #: Flag, if the wrapper is stateless and also processes the batched states of a BatchedSCMLSystem of shape
+    #: (N, states). Then, it can be used within the VectorElectricMotorEnvironment.
+    batch_support = False
+
+    _state_components = ('_physical_system',)
+
     @property
     def k(self):
         return self._physical_system.k
@@ -109,6 +115,9 @@ class PhysicalSystemWrapper(gem.core.PhysicalSystem, gem.core.RandomComponent):
             self._physical_system.seed(seed)
 
     def __getattr__(self, name):
+        # Avoid an infinite recursion, if the inner system is not set yet (e.g. during copying).
+        if name == '_physical_system':
+            raise AttributeError(name)
         return getattr(self._physical_system, name)
 
     def simulate(self, action):
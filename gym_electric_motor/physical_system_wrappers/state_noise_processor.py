@@ -20,6 +20,8 @@ class StateNoiseProcessor(PhysicalSystemWrapper):
 
     """
 
+    _state_attributes = PhysicalSystemWrapper._state_attributes + ('_random_pointer', '_noise')
+
     @property
     def random_kwargs(self):
         """Returns the random keyword arguments that are passed through to the random generator function."""
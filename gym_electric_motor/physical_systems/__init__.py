@@ -12,12 +12,17 @@ from .electric_motors import DcExternallyExcitedMotor, DcSeriesMotor, DcPermanen
 
 
 from .mechanical_loads import MechanicalLoad, PolynomialStaticLoad, ExternalSpeedLoad, ConstantSpeedLoad, \
-    OrnsteinUhlenbeckLoad
+    OrnsteinUhlenbeckLoad, StreamedSpeedLoad
 
-from .solvers import OdeSolver, EulerSolver, ScipyOdeIntSolver, ScipySolveIvpSolver, ScipyOdeSolver
+from .solvers import OdeSolver, EulerSolver, ScipyOdeIntSolver, ScipySolveIvpSolver, ScipyOdeSolver, \
+    ExplicitRungeKuttaSolver, HeunSolver, RungeKutta4Solver, RungeKutta45Solver, ZeroOrderHoldSolver
 
 from .voltage_supplies import VoltageSupply, IdealVoltageSupply, RCVoltageSupply, AC1PhaseSupply, AC3PhaseSupply
 
+from .batched_physical_systems import BatchedSCMLSystem, BatchedSynchronousMotorSystem, \
+    BatchedExternallyExcitedSynchronousMotorSystem, BatchedSquirrelCageInductionMotorSystem, \
+    BatchedDoublyFedInductionMotorSystem
+
 
 from ..utils import register_class, register_superclass
 from .. import PhysicalSystem
@@ -49,11 +54,16 @@ register_class(NoConverter, PowerElectronicConverter, 'NoConverter')
 register_class(PolynomialStaticLoad, MechanicalLoad, 'PolyStaticLoad')
 register_class(ConstantSpeedLoad, MechanicalLoad, 'ConstSpeedLoad')
 register_class(ExternalSpeedLoad, MechanicalLoad, 'ExtSpeedLoad')
+register_class(StreamedSpeedLoad, MechanicalLoad, 'StreamedSpeedLoad')
 
 register_class(EulerSolver, OdeSolver, 'euler')
 register_class(ScipyOdeSolver, OdeSolver, 'scipy.ode')
 register_class(ScipySolveIvpSolver, OdeSolver, 'scipy.solve_ivp')
 register_class(ScipyOdeIntSolver, OdeSolver, 'scipy.odeint')
+register_class(HeunSolver, OdeSolver, 'heun')
+register_class(RungeKutta4Solver, OdeSolver, 'rk4')
+register_class(RungeKutta45Solver, OdeSolver, 'rk45')
+register_class(ZeroOrderHoldSolver, OdeSolver, 'zoh')
 
 register_class(DcSeriesMotor, ElectricMotor, 'DcSeries')
 register_class(DcPermanentlyExcitedMotor, ElectricMotor, 'DcPermEx')
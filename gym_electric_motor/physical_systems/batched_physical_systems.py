@@ -0,0 +1,719 @@
+import copy
+import warnings
+
+import numpy as np
+
+import gym_electric_motor as gem
+from ..core import PhysicalSystem
+from ..random_component import RandomComponent
+from .electric_motors import ThreePhaseMotor
+from .physical_systems import DcMotorSystem, SynchronousMotorSystem, ExternallyExcitedSynchronousMotorSystem, \
+    SquirrelCageInductionMotorSystem, DoublyFedInductionMotorSystem
+
+
+def _stack_values(values):
+    """Stacks the values of all batch entries to an array or returns the first value, if all values are equal."""
+    arrays = [np.asarray(value, dtype=float) for value in values]
+    if all(np.array_equal(arrays[0], array) for array in arrays[1:]):
+        return values[0]
+    return np.stack(arrays)
+
+
+def _stack_component(components, attributes):
+    """Creates a shallow copy of the first component in which the passed attributes are stacked over all components.
+
+    The copy is used to evaluate the vectorized methods (e.g. ``electrical_ode_batch``) with individual parameters for
+    each batch entry. Attributes that are equal for all components are not stacked.
+
+    Args:
+        components(list): The components of the same type to stack.
+        attributes(Iterable(str)): Names of the attributes to stack.
+
+    Returns:
+        A copy of the first component with the stacked attributes.
+    """
+    stacked = copy.copy(components[0])
+    for attribute in attributes:
+        values = [getattr(component, attribute) for component in components]
+        if isinstance(values[0], dict):
+            stacked_value = {key: _stack_values([value[key] for value in values]) for key in values[0].keys()}
+        else:
+            stacked_value = _stack_values(values)
+        setattr(stacked, attribute, stacked_value)
+    return stacked
+
+
+def _q(quantities, epsilon):
+    """Vectorized transformation from dq- to alphabeta-coordinates for quantities of shape (N, 2)."""
+    cos = np.cos(epsilon)
+    sin = np.sin(epsilon)
+    return np.column_stack((
+        cos * quantities[:, 0] - sin * quantities[:, 1],
+        sin * quantities[:, 0] + cos * quantities[:, 1]
+    ))
+
+
+def _t_23(quantities):
+    """Vectorized transformation from abc- to alphabeta-coordinates for quantities of shape (N, 3)."""
+    return ThreePhaseMotor.t_23(quantities.T).T
+
+
+def _t_32(quantities):
+    """Vectorized transformation from alphabeta- to abc-coordinates for quantities of shape (N, 2)."""
+    return ThreePhaseMotor.t_32(quantities.T).T
+
+
+def _wrap_angle(epsilon):
+    """Maps the angles of shape (N,) to the interval [-pi, pi]."""
+    epsilon = epsilon % (2 * np.pi)
+    return np.where(epsilon > np.pi, epsilon - 2 * np.pi, epsilon)
+
+
+class BatchedSCMLSystem(PhysicalSystem, RandomComponent):
+    """Simulates N SCML-Systems of the same structure in lockstep.
+
+    The ODE-states of all drives are stored in one contiguous array of shape ``(N, ode_states)`` and integrated by a
+    single ode solver. Every evaluation of the systems differential equation is one vectorized call to the
+    ``electrical_ode_batch`` of the motor and to the ``mechanical_ode_batch`` of the load for the whole batch.
+
+    The drives may differ in their motor and load parameters (e.g. for domain randomization) and in their initializers.
+    Parameters that differ are stacked to arrays that are broadcast within the vectorized calculations.
+    The converters and voltage supplies remain individual instances, because they hold the switching state of each
+    drive. Switching instants of all drives within a step are merged. Each drive only updates its input voltages at its
+    own switching instants, so that every drive is simulated like a separate SCML-System. Note that fixed step solvers
+    (e.g. the EulerSolver) take additional steps at the switching instants of the other drives, which slightly changes
+    their discretization if the drives switch at different instants.
+
+    States, limits and nominal states are arrays of shape ``(N, states)``. The actions are passed as a sequence of N
+    actions of the action space of a single drive.
+
+    Usage Example:
+        >>> import gym_electric_motor as gem
+        >>> from gym_electric_motor.physical_systems import BatchedSCMLSystem
+        >>>
+        >>> # Three PMSM drives with different stator resistances
+        >>> systems = [
+        ...     gem.make('Cont-CC-PMSM-v0', motor=dict(motor_parameter=dict(r_s=r_s))).physical_system.unwrapped
+        ...     for r_s in (15e-3, 18e-3, 21e-3)
+        ... ]
+        >>> batched_system = BatchedSCMLSystem.make(systems)
+        >>> states = batched_system.reset()
+        >>> states = batched_system.simulate([batched_system.action_space.sample() for _ in range(3)])
+    """
+
+    _registry = {}
+
+    _state_attributes = PhysicalSystem._state_attributes + ('_t', '_t_start', '_state')
+    _state_components = ('_physical_systems', '_ode_solver')
+
+    @classmethod
+    def register_batched_system(cls, system_types):
+        """Registers a batched system class for the passed types of SCML-Systems.
+
+        Args:
+            system_types(Iterable(type)): SCML-System classes that can be simulated by the decorated class.
+        """
+        def wrapper(batched_system_class):
+            for system_type in system_types:
+                cls._registry[system_type] = batched_system_class
+            return batched_system_class
+        return wrapper
+
+    @classmethod
+    def make(cls, physical_systems, **kwargs):
+        """Creates the matching batched system for the passed SCML-Systems.
+
+        Args:
+            physical_systems(list(SCMLSystem)): The systems to simulate in lockstep.
+            kwargs: Further arguments passed to the batched system.
+
+        Returns:
+            BatchedSCMLSystem: The batched system simulating all passed systems.
+        """
+        for system_type in type(physical_systems[0]).__mro__:
+            if system_type in cls._registry.keys():
+                return cls._registry[system_type](physical_systems, **kwargs)
+        raise NotImplementedError(f'No batched system available for the {type(physical_systems[0]).__name__}.')
+
+    @classmethod
+    def supports(cls, physical_system):
+        """Checks, if a batched system is available for the passed SCML-System.
+
+        Args:
+            physical_system(PhysicalSystem): The (unwrapped) physical system to check.
+
+        Returns:
+            bool: True, if the physical system can be simulated by a batched system.
+        """
+        return any(system_type in cls._registry.keys() for system_type in type(physical_system).__mro__)
+
+    @property
+    def num_systems(self):
+        """int: Number of simulated drives N."""
+        return self._num_systems
+
+    @property
+    def physical_systems(self):
+        """list(SCMLSystem): The individual systems that hold the converters, supplies and initializers."""
+        return self._physical_systems
+
+    @property
+    def limits(self):
+        """ndarray(float): The limits of all drives. Shape: (N, states)"""
+        return self._limits
+
+    @property
+    def nominal_state(self):
+        """ndarray(float): The nominal states of all drives. Shape: (N, states)"""
+        return self._nominal_state
+
+    @property
+    def electrical_motor(self):
+        """The motor with the (stacked) parameters of all drives that is used for the vectorized calculations."""
+        return self._electrical_motor
+
+    @property
+    def mechanical_load(self):
+        """The load with the (stacked) parameters of all drives that is used for the vectorized calculations."""
+        return self._mechanical_load
+
+    def __init__(self, physical_systems, ode_solver=None, calc_jacobian=None):
+        """
+        Args:
+            physical_systems(list(SCMLSystem)): N systems of the same type with the same motor, load, converter and
+                supply types. Their converters, supplies and initializers are used for the simulation.
+            ode_solver(OdeSolver): Ode Solver to integrate the batch of ODE-states. Default: A new instance of the ode
+                solver type of the first system with its default parameters.
+            calc_jacobian(bool): If True, the block diagonal jacobian of all drives will be taken into account for the
+                ode-solvers. Default: The jacobians are used, if available
+        """
+        physical_systems = list(physical_systems)
+        assert len(physical_systems) > 0, 'At least one physical system has to be passed.'
+        ps = physical_systems[0]
+        for system in physical_systems[1:]:
+            assert type(system) is type(ps), 'All physical systems have to be of the same type.'
+            assert system.state_names == ps.state_names, 'All physical systems have to have the same states.'
+            assert system.tau == ps.tau, 'All physical systems have to have the same sampling time tau.'
+            assert type(system.electrical_motor) is type(ps.electrical_motor), \
+                'All physical systems have to contain the same motor type.'
+            assert type(system.mechanical_load) is type(ps.mechanical_load), \
+                'All physical systems have to contain the same load type.'
+        PhysicalSystem.__init__(self, ps.action_space, ps.state_space, ps.state_names, ps.tau)
+        RandomComponent.__init__(self)
+        self._physical_systems = physical_systems
+        self._num_systems = len(physical_systems)
+        self._converters = [system.converter for system in physical_systems]
+        self._supplies = [system.supply for system in physical_systems]
+        motors = [system.electrical_motor for system in physical_systems]
+        loads = [system.mechanical_load for system in physical_systems]
+        self._electrical_motor = _stack_component(motors, ('_model_constants', '_motor_parameter'))
+        self._mechanical_load = _stack_component(loads, type(ps.mechanical_load)._batch_parameters)
+        self._limits = np.stack([system.limits for system in physical_systems])
+        self._nominal_state = np.stack([system.nominal_state for system in physical_systems])
+
+        if ode_solver is None:
+            ode_solver = type(ps._ode_solver)()
+        self._ode_solver = gem.utils.instantiate(gem.physical_systems.OdeSolver, ode_solver)
+        has_jacobian = ps.electrical_motor.HAS_JACOBIAN and ps.mechanical_load.HAS_JACOBIAN
+        if calc_jacobian is None:
+            calc_jacobian = has_jacobian
+        if calc_jacobian and not has_jacobian:
+            warnings.warn('Jacobian Matrix is not provided for either the motor or the load Model')
+        jac = self._system_jacobian if calc_jacobian and has_jacobian else None
+        self._ode_solver.set_system_equation(self._system_equation, jac)
+
+        self._omega_ode_idx = ps._omega_ode_idx
+        self._load_ode_idx = list(ps._load_ode_idx)
+        self._motor_ode_idx = list(ps._motor_ode_idx)
+        self._ode_currents_idx = list(ps._ode_currents_idx)
+        self._ode_size = len(self._load_ode_idx) + len(self._motor_ode_idx)
+        self.TORQUE_IDX = ps.TORQUE_IDX
+        self.CURRENTS_IDX = list(ps.CURRENTS_IDX)
+        self.VOLTAGES_IDX = list(ps.VOLTAGES_IDX)
+        self.U_SUP_IDX = list(ps.U_SUP_IDX)
+
+        self._t = 0.0
+        self._t_start = np.zeros(self._num_systems)
+        self._k = np.zeros(self._num_systems, dtype=int)
+        self._state = np.zeros((self._num_systems, len(self._state_names)))
+
+    def seed(self, seed=None):
+        # Docstring of superclass
+        RandomComponent.seed(self, seed)
+        sub_seeds = self.seed_sequence.spawn(self._num_systems)
+        for system, sub_seed in zip(self._physical_systems, sub_seeds):
+            system.seed(sub_seed)
+
+    def reset(self, indices=None):
+        """Resets all or a subset of the drives to a new initial state.
+
+        The initial states are drawn by the individual physical systems with their own initializers.
+
+        Args:
+            indices(Iterable(int)): Indices of the drives to reset. Default: All drives are reset.
+
+        Returns:
+            ndarray(float): The normalized states of all drives. Shape: (N, states)
+        """
+        self.next_generator()
+        if indices is None:
+            indices = range(self._num_systems)
+            self._t = 0.0
+            ode_state = np.zeros((self._num_systems, self._ode_size))
+        else:
+            ode_state = self._ode_solver.y.reshape(self._num_systems, self._ode_size).copy()
+        for index in indices:
+            system = self._physical_systems[index]
+            self._state[index] = system.reset()
+            ode_state[index] = system._ode_solver.y
+            self._t_start[index] = self._t
+            self._k[index] = 0
+        self._ode_solver.set_initial_value(ode_state.ravel(), self._t)
+        return self._state.copy()
+
+    def set_system_state(self, state, indices=None):
+        """Restores all or a subset of the drives to a snapshot of a single SCML-System.
+
+        The snapshot has to be taken from an SCML-System of the same configuration with ``get_state()``. The drives
+        continue like the system from which the snapshot has been taken, e.g. to evaluate several action sequences
+        from the same state at once. Only the converters and supplies of the drives and the ODE-state are restored,
+        because the batched system simulates with the stacked motor and load and its own ode solver.
+
+        Args:
+            state(dict): Snapshot of an SCML-System.
+            indices(Iterable(int)): Indices of the drives to restore. Default: All drives are restored.
+        """
+        if indices is None:
+            indices = range(self._num_systems)
+            self._t = state['_t']
+            ode_state = np.zeros((self._num_systems, self._ode_size))
+        else:
+            ode_state = self._ode_solver.y.reshape(self._num_systems, self._ode_size).copy()
+        for index in indices:
+            self._converters[index].set_state(state['_converter'])
+            self._supplies[index].set_state(state['_supply'])
+            ode_state[index] = state['_ode_solver']['_y']
+            # The converters and supplies of each drive work on the local time of the restored system.
+            self._t_start[index] = self._t - state['_t']
+            self._k[index] = state['_k']
+        self._ode_solver.set_initial_value(ode_state.ravel(), self._t)
+
+    def simulate_switching_states(self, ode_state, t, u_sup):
+        """Simulates one step for every switching state of the finite converter from each of the passed ODE-states.
+
+        The output voltages of all switching states are taken from the ``switching_voltages`` of the converter of the
+        first drive. Interlocking times are neglected and the supply voltages are held constant during the step.
+        Drive ``p * actions + a`` is simulated from the ODE-state ``p`` with the action ``a``.
+        The converters, supplies and the internal state of the batched system are not used or changed.
+
+        Args:
+            ode_state(ndarray(float)): P ODE-states to start from. P times the number of actions has to be N.
+                Shape: (P, ode_states)
+            t(float): Time at the start of the step.
+            u_sup(ndarray(float)): The supply voltages during the step. Shape: (supply voltages,)
+
+        Returns:
+            Tuple(ndarray(float), ndarray(float)): The normalized states of shape (N, states) and the ODE-states of
+            shape (N, ode_states) at the end of the step.
+        """
+        u_out = self._converters[0].switching_voltages(self._converter_currents(ode_state))
+        assert u_out.shape[0] * u_out.shape[1] == self._num_systems, \
+            f'{self._num_systems} drives can not simulate {u_out.shape[1]} actions from {u_out.shape[0]} states.'
+        u_sup = np.asarray(u_sup, dtype=float)
+        u_in = (u_out[..., np.newaxis] * u_sup).reshape(self._num_systems, -1)
+        ode_state = np.repeat(ode_state, u_out.shape[1], axis=0)
+        u_motor = self._motor_voltages(u_in, ode_state)
+        self._ode_solver.set_initial_value(ode_state.ravel(), t)
+        self._ode_solver.set_f_params(u_motor)
+        next_ode_state = self._ode_solver.integrate(t + self._tau).reshape(self._num_systems, self._ode_size)
+        u_sup = np.broadcast_to(u_sup, (self._num_systems, len(u_sup)))
+        state = self._build_state(next_ode_state, ode_state, u_in, u_motor, u_sup) / self._limits
+        return state, next_ode_state
+
+    def simulate(self, action, *_, **__):
+        """Simulates all drives for one time step.
+
+        Args:
+            action(Sequence): One action of the action space for each drive.
+
+        Returns:
+            ndarray(float): The normalized states of all drives. Shape: (N, states)
+        """
+        ode_state = self._ode_solver.y.reshape(self._num_systems, self._ode_size)
+        local_t = self._t - self._t_start
+        actions = self._transform_actions(action, ode_state)
+        own_switching_times = [
+            set(t_ + t_start for t_ in converter.set_action(action_, t)[:-1] if t_ + t_start > self._t)
+            for converter, action_, t, t_start in zip(self._converters, actions, local_t, self._t_start)
+        ]
+        all_systems = range(self._num_systems)
+        u_in, u_sup = self._converter_voltages(self._converter_currents(ode_state), local_t, all_systems)
+        u_motor = self._motor_voltages(u_in, ode_state)
+        previous_ode_state = ode_state.copy()
+        for t in sorted(set().union(*own_switching_times)):
+            self._ode_solver.set_f_params(u_motor)
+            ode_state = self._ode_solver.integrate(t).reshape(self._num_systems, self._ode_size)
+            # Only the drives that switch at this instant update their voltages. All others keep the voltages of
+            # their own switching interval, as in the single system.
+            indices = [n for n in all_systems if t in own_switching_times[n]]
+            u_in_new, u_sup_new = self._converter_voltages(self._converter_currents(ode_state), local_t, indices)
+            u_in[indices] = u_in_new[indices]
+            u_sup[indices] = u_sup_new[indices]
+            u_motor[indices] = self._motor_voltages(u_in, ode_state)[indices]
+            previous_ode_state[indices] = ode_state[indices]
+        self._ode_solver.set_f_params(u_motor)
+        ode_state = self._ode_solver.integrate(self._t + self._tau).reshape(self._num_systems, self._ode_size)
+        self._t = self._ode_solver.t
+        self._k += 1
+        self._state = self._build_state(ode_state, previous_ode_state, u_in, u_motor, u_sup) / self._limits
+        return self._state.copy()
+
+    def _converter_voltages(self, i_in, local_t, indices):
+        """Determines the converter output voltages and supply voltages of the selected drives.
+
+        Args:
+            i_in(ndarray(float)): Converter output currents of all drives. Shape: (N, currents)
+            local_t(ndarray(float)): Time of the current step start of each drive. Shape: (N,)
+            indices(Iterable(int)): Indices of the drives whose voltages are determined.
+
+        Returns:
+            Tuple(ndarray(float), ndarray(float)): The converter voltages multiplied with the supply voltages of shape
+            (N, voltages) and the supply voltages of shape (N, supply voltages). Rows of not selected drives are zero.
+        """
+        indices = list(indices)
+        solver_t = self._ode_solver.t - self._t_start
+        u_in = []
+        u_sup = []
+        for n in indices:
+            converter = self._converters[n]
+            u_sup.append(self._supplies[n].get_voltage(local_t[n], converter.i_sup(i_in[n])))
+            u_in.append(converter.convert(i_in[n], solver_t[n]))
+        u_in = np.asarray(u_in, dtype=float)
+        u_sup = np.asarray(u_sup, dtype=float)
+        u_in_all = np.zeros((self._num_systems, u_in.shape[1] * u_sup.shape[1]))
+        u_sup_all = np.zeros((self._num_systems, u_sup.shape[1]))
+        u_in_all[indices] = (u_in[:, :, np.newaxis] * u_sup[:, np.newaxis, :]).reshape(len(indices), -1)
+        u_sup_all[indices] = u_sup
+        return u_in_all, u_sup_all
+
+    def _transform_actions(self, action, ode_state):
+        """Transforms the passed actions into actions for the converters.
+
+        Args:
+            action(Sequence): The passed actions of all drives.
+            ode_state(ndarray(float)): The ODE-states of all drives. Shape: (N, ode_states)
+
+        Returns:
+            Sequence: The actions for the converters of all drives.
+        """
+        return action
+
+    def _converter_currents(self, ode_state):
+        """Calculates the currents at the converter outputs of all drives.
+
+        Args:
+            ode_state(ndarray(float)): The ODE-states of all drives. Shape: (N, ode_states)
+
+        Returns:
+            ndarray(float): The converter output currents of all drives. Shape: (N, currents)
+        """
+        return self._electrical_motor.i_in_batch(ode_state[:, self._ode_currents_idx])
+
+    def _motor_voltages(self, u_in, ode_state):
+        """Transforms the converter output voltages into the input voltages of the motor ODE.
+
+        Args:
+            u_in(ndarray(float)): The converter output voltages of all drives. Shape: (N, voltages)
+            ode_state(ndarray(float)): The ODE-states of all drives. Shape: (N, ode_states)
+
+        Returns:
+            ndarray(float): The input voltages for the electrical_ode_batch of the motor.
+        """
+        return u_in
+
+    def _build_state(self, ode_state, previous_ode_state, u_in, u_motor, u_sup):
+        """Assembles the (not normalized) system states of all drives after a step.
+
+        Args:
+            ode_state(ndarray(float)): The ODE-states at the end of the step. Shape: (N, ode_states)
+            previous_ode_state(ndarray(float)): The ODE-states at the begin of the last integration interval.
+            u_in(ndarray(float)): The converter output voltages of all drives. Shape: (N, voltages)
+            u_motor(ndarray(float)): The input voltages of the motor ODE of the last integration interval.
+            u_sup(ndarray(float)): The supply voltages of all drives. Shape: (N, supply voltages)
+
+        Returns:
+            ndarray(float): The system states of all drives. Shape: (N, states)
+        """
+        motor_state = ode_state[:, self._motor_ode_idx]
+        state = np.empty((self._num_systems, len(self._state_names)))
+        state[:, self._load_ode_idx] = ode_state[:, self._load_ode_idx]
+        state[:, self.TORQUE_IDX] = self._electrical_motor.torque_batch(motor_state)
+        state[:, self.CURRENTS_IDX] = motor_state[:, self._electrical_motor.CURRENTS_IDX]
+        state[:, self.VOLTAGES_IDX] = u_in
+        state[:, self.U_SUP_IDX] = u_sup
+        return state
+
+    def _system_equation(self, t, state, u_in, **__):
+        """
+        Differential equation system of all drives.
+
+        Args:
+            t(float): Current systems time
+            state(ndarray(float)): Current ODE-States of all drives flattened to one dimension.
+            u_in(ndarray(float)): Input voltages of the motor ODEs
+
+        Returns:
+            ndarray(float): The flattened derivatives of the ODE-States.
+        """
+        state = state.reshape(self._num_systems, self._ode_size)
+        motor_state = state[:, self._motor_ode_idx]
+        torque = self._electrical_motor.torque_batch(motor_state)
+        derivative = np.empty_like(state)
+        derivative[:, self._load_ode_idx] = self._mechanical_load.mechanical_ode_batch(
+            t - self._t_start, state[:, self._load_ode_idx], torque
+        )
+        derivative[:, self._motor_ode_idx] = self._electrical_motor.electrical_ode_batch(
+            motor_state, u_in, state[:, self._omega_ode_idx]
+        )
+        return derivative.ravel()
+
+    def _system_jacobian(self, t, state, u_in, **__):
+        """
+        Jacobian of the differential equation system of all drives.
+
+        The drives are independent of each other. Therefore, the jacobian is a block diagonal matrix of the
+        jacobians of the single drives.
+
+        Args:
+            t(float): Current systems time
+            state(ndarray(float)): Current ODE-States of all drives flattened to one dimension.
+            u_in(ndarray(float)): Input voltages of the motor ODEs
+
+        Returns:
+            ndarray(float): The jacobian of the flattened ODE-States. Shape: (N * ode_states, N * ode_states)
+        """
+        blocks = self._system_jacobian_blocks(t, state.reshape(self._num_systems, self._ode_size), u_in)
+        system_jac = np.zeros((self._num_systems, self._ode_size, self._num_systems, self._ode_size))
+        batch_idx = np.arange(self._num_systems)
+        system_jac[batch_idx, :, batch_idx, :] = blocks
+        return system_jac.reshape(state.shape[0], state.shape[0])
+
+    def _system_jacobian_blocks(self, t, state, u_in):
+        """Calculates the jacobians of the ODE-systems of the single drives.
+
+        Args:
+            t(float): Current systems time
+            state(ndarray(float)): Current ODE-States of all drives. Shape: (N, ode_states)
+            u_in(ndarray(float)): Input voltages of the motor ODEs
+
+        Returns:
+            ndarray(float): The jacobian of each drive. Shape: (N, ode_states, ode_states)
+        """
+        motor_state = state[:, self._motor_ode_idx]
+        motor_jac, el_state_over_omega, torque_over_el_state = self._electrical_motor.electrical_jacobian_batch(
+            motor_state, u_in, state[:, self._omega_ode_idx]
+        )
+        torque = self._electrical_motor.torque_batch(motor_state)
+        load_jac, load_over_torque = self._mechanical_load.mechanical_jacobian_batch(
+            t - self._t_start, state[:, self._load_ode_idx], torque
+        )
+        load_size = load_jac.shape[1]
+        blocks = np.zeros((self._num_systems, self._ode_size, self._ode_size))
+        blocks[:, :load_size, :load_size] = load_jac
+        blocks[:, load_size:, load_size:] = motor_jac
+        blocks[:, load_size:, self._omega_ode_idx] = el_state_over_omega
+        blocks[:, :load_size, load_size:] = load_over_torque[:, :, np.newaxis] * torque_over_el_state[:, np.newaxis, :]
+        return blocks
+
+    def close(self):
+        # Docstring of superclass
+        for system in self._physical_systems:
+            system.close()
+
+
+BatchedSCMLSystem.register_batched_system([DcMotorSystem])(BatchedSCMLSystem)
+
+
+@BatchedSCMLSystem.register_batched_system([SynchronousMotorSystem])
+class BatchedSynchronousMotorSystem(BatchedSCMLSystem):
+    """Batched system for drives with the PMSM or SynRM."""
+
+    def __init__(self, physical_systems, **kwargs):
+        # Docstring of superclass
+        super().__init__(physical_systems, **kwargs)
+        ps = self._physical_systems[0]
+        self._control_space = ps.control_space
+        if self._control_space == 'dq':
+            self._action_space = ps.action_space
+        self._ode_epsilon_idx = ps._ode_epsilon_idx
+        self.EPSILON_IDX = ps.EPSILON_IDX
+
+    def _transform_actions(self, action, ode_state):
+        # Docstring of superclass
+        if self._control_space == 'dq':
+            return ThreePhaseMotor.dq_to_abc(np.asarray(action, dtype=float), ode_state[:, self._ode_epsilon_idx])
+        return action
+
+    def _converter_currents(self, ode_state):
+        # Docstring of superclass
+        i_dq = self._electrical_motor.i_in_batch(ode_state[:, self._ode_currents_idx])
+        return ThreePhaseMotor.dq_to_abc(i_dq, ode_state[:, self._ode_epsilon_idx])
+
+    def _motor_voltages(self, u_in, ode_state):
+        # Docstring of superclass
+        return ThreePhaseMotor.abc_to_dq(u_in, ode_state[:, self._ode_epsilon_idx])
+
+    def _build_state(self, ode_state, previous_ode_state, u_in, u_motor, u_sup):
+        # Docstring of superclass
+        i_dq = ode_state[:, self._ode_currents_idx]
+        i_abc = ThreePhaseMotor.dq_to_abc(i_dq, previous_ode_state[:, self._ode_epsilon_idx])
+        state = np.empty((self._num_systems, len(self._state_names)))
+        state[:, self._load_ode_idx] = ode_state[:, self._load_ode_idx]
+        state[:, self.TORQUE_IDX] = self._electrical_motor.torque_batch(ode_state[:, self._motor_ode_idx])
+        state[:, self.CURRENTS_IDX] = np.concatenate((i_abc, i_dq), axis=1)
+        state[:, self.VOLTAGES_IDX] = np.concatenate((u_in, u_motor), axis=1)
+        state[:, self.EPSILON_IDX] = _wrap_angle(ode_state[:, self._ode_epsilon_idx])
+        state[:, self.U_SUP_IDX] = u_sup
+        return state
+
+
+@BatchedSCMLSystem.register_batched_system([ExternallyExcitedSynchronousMotorSystem])
+class BatchedExternallyExcitedSynchronousMotorSystem(BatchedSynchronousMotorSystem):
+    """Batched system for drives with the EESM."""
+
+    def _converter_currents(self, ode_state):
+        # Docstring of superclass
+        i_dq_e = self._electrical_motor.i_in_batch(ode_state[:, self._ode_currents_idx])
+        i_abc = ThreePhaseMotor.dq_to_abc(i_dq_e[:, :2], ode_state[:, self._ode_epsilon_idx])
+        return np.concatenate((i_abc, i_dq_e[:, 2:]), axis=1)
+
+    def _motor_voltages(self, u_in, ode_state):
+        # Docstring of superclass
+        u_dq = ThreePhaseMotor.abc_to_dq(u_in[:, :3], ode_state[:, self._ode_epsilon_idx])
+        return np.concatenate((u_dq, u_in[:, 3:]), axis=1)
+
+    def _build_state(self, ode_state, previous_ode_state, u_in, u_motor, u_sup):
+        # Docstring of superclass
+        i_dq_e = ode_state[:, self._ode_currents_idx]
+        i_abc = ThreePhaseMotor.dq_to_abc(i_dq_e[:, :2], previous_ode_state[:, self._ode_epsilon_idx])
+        state = np.empty((self._num_systems, len(self._state_names)))
+        state[:, self._load_ode_idx] = ode_state[:, self._load_ode_idx]
+        state[:, self.TORQUE_IDX] = self._electrical_motor.torque_batch(ode_state[:, self._motor_ode_idx])
+        state[:, self.CURRENTS_IDX] = np.concatenate((i_abc, i_dq_e), axis=1)
+        state[:, self.VOLTAGES_IDX] = np.concatenate((u_in[:, :3], u_motor), axis=1)
+        state[:, self.EPSILON_IDX] = _wrap_angle(ode_state[:, self._ode_epsilon_idx])
+        state[:, self.U_SUP_IDX] = u_sup
+        return state
+
+
+@BatchedSCMLSystem.register_batched_system([SquirrelCageInductionMotorSystem])
+class BatchedSquirrelCageInductionMotorSystem(BatchedSCMLSystem):
+    """Batched system for drives with the SCIM."""
+
+    def __init__(self, physical_systems, **kwargs):
+        # Docstring of superclass
+        super().__init__(physical_systems, **kwargs)
+        ps = self._physical_systems[0]
+        self._control_space = ps.control_space
+        if self._control_space == 'dq':
+            self._action_space = ps.action_space
+        self._ode_epsilon_idx = ps._ode_epsilon_idx
+        self._ode_flux_idx = list(ps._ode_flux_idx)
+        self.EPSILON_IDX = ps.EPSILON_IDX
+
+    def _field_angle(self, ode_state):
+        """Calculates the field angles of all drives from the rotor fluxes."""
+        return np.arctan2(ode_state[:, self._ode_flux_idx[1]], ode_state[:, self._ode_flux_idx[0]])
+
+    def _transform_actions(self, action, ode_state):
+        # Docstring of superclass
+        if self._control_space == 'dq':
+            return ThreePhaseMotor.dq_to_abc(np.asarray(action, dtype=float), self._field_angle(ode_state))
+        return action
+
+    def _converter_currents(self, ode_state):
+        # Docstring of superclass
+        return _t_32(self._electrical_motor.i_in_batch(ode_state[:, self._ode_currents_idx]))
+
+    def _motor_voltages(self, u_in, ode_state):
+        # Docstring of superclass
+        return _t_23(u_in)
+
+    def _build_state(self, ode_state, previous_ode_state, u_in, u_motor, u_sup):
+        # Docstring of superclass
+        rotation, abc_to_dq, dq_to_abc = ThreePhaseMotor.transformation_matrices(self._field_angle(previous_ode_state))
+        i_dq = ThreePhaseMotor.apply_transformation(
+            np.swapaxes(rotation, 1, 2), ode_state[:, self._ode_currents_idx]
+        )
+        i_abc = ThreePhaseMotor.apply_transformation(dq_to_abc, i_dq)
+        u_dq = ThreePhaseMotor.apply_transformation(abc_to_dq, u_in)
+        state = np.empty((self._num_systems, len(self._state_names)))
+        state[:, self._load_ode_idx] = ode_state[:, self._load_ode_idx]
+        state[:, self.TORQUE_IDX] = self._electrical_motor.torque_batch(ode_state[:, self._motor_ode_idx])
+        state[:, self.CURRENTS_IDX] = np.concatenate((i_abc, i_dq), axis=1)
+        state[:, self.VOLTAGES_IDX] = np.concatenate((u_in, u_dq), axis=1)
+        state[:, self.EPSILON_IDX] = _wrap_angle(ode_state[:, self._ode_epsilon_idx])
+        state[:, self.U_SUP_IDX] = u_sup
+        return state
+
+
+@BatchedSCMLSystem.register_batched_system([DoublyFedInductionMotorSystem])
+class BatchedDoublyFedInductionMotorSystem(BatchedSquirrelCageInductionMotorSystem):
+    """Batched system for drives with the DFIM."""
+
+    def __init__(self, physical_systems, **kwargs):
+        # Docstring of superclass
+        BatchedSCMLSystem.__init__(self, physical_systems, **kwargs)
+        ps = self._physical_systems[0]
+        self._control_space = 'abc'
+        self._ode_epsilon_idx = ps._ode_epsilon_idx
+        self._ode_flux_idx = list(ps._ode_flux_idx)
+        self.EPSILON_IDX = ps.EPSILON_IDX
+        self._stator_voltages = slice(ps.stator_voltage_low_idx, ps.stator_voltage_high_idx)
+        self._rotor_voltages = slice(ps.rotor_voltage_low_idx, ps.rotor_voltage_high_idx)
+
+    def _rotor_currents(self, ode_state):
+        """Calculates the rotor currents in alphabeta-coordinates of all drives. Shape: (N, 2)"""
+        mp = self._electrical_motor.motor_parameter
+        l_r = np.asarray(mp['l_m'] + mp['l_sigr'])[..., np.newaxis]
+        l_m = np.asarray(mp['l_m'])[..., np.newaxis]
+        return 1 / l_r * ode_state[:, self._ode_flux_idx] - l_m / l_r * ode_state[:, self._ode_currents_idx]
+
+    def _converter_currents(self, ode_state):
+        # Docstring of superclass
+        i_sabc = _t_32(self._electrical_motor.i_in_batch(ode_state[:, self._ode_currents_idx]))
+        i_rdef = _t_32(self._rotor_currents(ode_state))
+        return np.concatenate((i_sabc, i_rdef), axis=1)
+
+    def _motor_voltages(self, u_in, ode_state):
+        # Docstring of superclass
+        eps_field = self._field_angle(ode_state)
+        eps_el = ode_state[:, self._ode_epsilon_idx]
+        u_rdq = ThreePhaseMotor.abc_to_dq(u_in[:, self._rotor_voltages], eps_field - eps_el)
+        u_salphabeta = _t_23(u_in[:, self._stator_voltages])
+        u_ralphabeta = _q(u_rdq, eps_field)
+        return np.stack((u_salphabeta, u_ralphabeta), axis=1)
+
+    def _build_state(self, ode_state, previous_ode_state, u_in, u_motor, u_sup):
+        # Docstring of superclass
+        eps_field = self._field_angle(previous_ode_state)
+        eps_el = previous_ode_state[:, self._ode_epsilon_idx]
+        u_sabc = u_in[:, self._stator_voltages]
+        u_rdef = u_in[:, self._rotor_voltages]
+        rotation, abc_to_dq, dq_to_abc = ThreePhaseMotor.transformation_matrices(eps_field)
+        _, abc_to_dq_rotor, dq_to_abc_rotor = ThreePhaseMotor.transformation_matrices(eps_field - eps_el)
+        rotation_inv = np.swapaxes(rotation, 1, 2)
+        u_sdq = ThreePhaseMotor.apply_transformation(abc_to_dq, u_sabc)
+        u_rdq = ThreePhaseMotor.apply_transformation(abc_to_dq_rotor, u_rdef)
+        i_sdq = ThreePhaseMotor.apply_transformation(rotation_inv, ode_state[:, self._ode_currents_idx])
+        i_sabc = ThreePhaseMotor.apply_transformation(dq_to_abc, i_sdq)
+        i_rdq = ThreePhaseMotor.apply_transformation(rotation_inv, self._rotor_currents(ode_state))
+        i_rdef = ThreePhaseMotor.apply_transformation(dq_to_abc_rotor, i_rdq)
+        state = np.empty((self._num_systems, len(self._state_names)))
+        state[:, self._load_ode_idx] = ode_state[:, self._load_ode_idx]
+        state[:, self.TORQUE_IDX] = self._electrical_motor.torque_batch(ode_state[:, self._motor_ode_idx])
+        state[:, self.CURRENTS_IDX] = np.concatenate((i_sabc, i_sdq, i_rdef, i_rdq), axis=1)
+        state[:, self.VOLTAGES_IDX] = np.concatenate((u_sabc, u_sdq, u_rdef, u_rdq), axis=1)
+        state[:, self.EPSILON_IDX] = _wrap_angle(ode_state[:, self._ode_epsilon_idx])
+        state[:, self.U_SUP_IDX] = u_sup
+        return state
@@ -2,9 +2,10 @@ import numpy as np
 from gym.spaces import Discrete, Box, MultiDiscrete
 
 from ..utils import instantiate
+from ..stateful_component import StatefulComponent
 
 
-class PowerElectronicConverter:
+class PowerElectronicConverter(StatefulComponent):
     """
     Base class for all converters in a SCMLSystem.
  
@@ -25,6 +26,8 @@ class PowerElectronicConverter:
     #: Default action that is taken after a reset.
     _reset_action = None
 
+    _state_attributes = ('_action_start_time', '_current_action')
+
     @property
     def tau(self):
         """Float: Time of one simulation step in seconds."""
@@ -144,7 +147,16 @@ class ContDynamicallyAveragedConverter(PowerElectronicConverter):
 
     def set_action(self, action, t):
         # Docstring in base class
-        return super().set_action(min(max(action, self.action_space.low), self.action_space.high), t)
+        # Equals min(max(action, low), high) without comparing the sequences element-wise in numpy
+        if np.ndim(action) == 0:
+            action = [float(action)]
+        low = self.action_space.low
+        high = self.action_space.high
+        if low[0] > action[0]:
+            action = low.copy()
+        elif high[0] < action[0]:
+            action = high.copy()
+        return super().set_action(action, t)
 
     def convert(self, i_out, t):
         # Docstring in base class
@@ -180,6 +192,16 @@ class ContDynamicallyAveragedConverter(PowerElectronicConverter):
 class FiniteConverter(PowerElectronicConverter):
     """
     Base class for all finite converters.
+
+    The behaviour of a finite converter is described by class-wide tables that are compiled at the first instantiation
+    of the converter class. Therefore, each step of the converter is a lookup in these tables:
+
+    | *_voltage_table[switching_state][sign_pattern]*: Output voltages.
+    | *_i_sup_table[switching_state][sign_pattern]*: Factors of the output currents in the supply current.
+    | *_switching_table[switching_state][action]*: Switching states during the next step. An interlocking state
+    | precedes the switching state of the action, if both transistors of a half bridge would switch.
+
+    The sign pattern encodes the directions of the currents that determine the conducting diodes (see _sign_pattern).
     """
 
     #: The switching states of the converter for the current action
@@ -188,10 +210,30 @@ class FiniteConverter(PowerElectronicConverter):
     _switching_state = 0
     #: The action that is the default after reset
     _reset_action = 0
+    #: Output voltages of each switching state (key) and sign pattern (index)
+    _voltage_table = None
+    #: Factors of the output currents in the supply current of each switching state (key) and sign pattern (index)
+    _i_sup_table = None
+    #: Switching states during the next step for each previous switching state (key) and action (index)
+    _switching_table = None
+
+    _state_attributes = PowerElectronicConverter._state_attributes + ('_switching_pattern', '_switching_state')
 
     def __init__(self, tau=1e-5, **kwargs):
         # Docstring in base class
         super().__init__(tau=tau, **kwargs)
+        if '_voltage_table' not in type(self).__dict__:
+            type(self)._compile_tables()
+        self._switching_pattern = [self._switching_state]
+
+    @classmethod
+    def _compile_tables(cls):
+        """
+        Compiles the voltage, supply current and switching tables of the converter class.
+
+        Converters without own tables (e.g. the FiniteMultiConverter) do not override this method.
+        """
+        pass
 
     def set_action(self, action, t):
         assert self.action_space.contains(action), \
@@ -200,12 +242,53 @@ class FiniteConverter(PowerElectronicConverter):
 
     def convert(self, i_out, t):
         # Docstring in base class
-        raise NotImplementedError
+        # Converter switches slightly (tau / 1000 seconds) before interlocking time due to inaccuracy of the solvers.
+        if t - self._tau / 1000 > self._action_start_time + self._interlocking_time:
+            self._switching_state = self._switching_pattern[-1]
+        else:
+            self._switching_state = self._switching_pattern[0]
+        return list(self._voltage_table[self._switching_state][self._sign_pattern(i_out)])
 
     def i_sup(self, i_out):
         # Docstring in base class
         raise NotImplementedError
 
+    def switching_voltages(self, i_out):
+        """
+        Determines the output voltages of all actions of the converter for the passed output currents.
+
+        The voltages are the ones after the interlocking time, which is neglected. The actions are ordered like the
+        flattened action space (e.g. by ``numpy.ndindex(*action_space.nvec)`` for MultiDiscrete action spaces).
+
+        Args:
+            i_out(ndarray(float)): Currents that flow out of the converter into the motor. Shape: (..., currents)
+
+        Returns:
+            ndarray(float): The normalized output voltages of each action. Shape: (..., actions, voltages)
+        """
+        raise NotImplementedError
+
+    def _sign_pattern(self, i_out):
+        """
+        Encodes the directions of the output currents that determine the conducting diodes.
+
+        Args:
+            i_out(list(float)): All currents flowing out of the converter and into the motor.
+
+        Returns:
+            int: Index of the sign pattern in the voltage and supply current tables.
+        """
+        raise NotImplementedError
+
+    def _set_switching_pattern(self, action):
+        # Docstring in base class
+        switching_pattern = self._switching_table[self._switching_state][action]
+        if len(switching_pattern) == 1 or self._interlocking_time == 0:
+            self._switching_pattern = [switching_pattern[-1]]
+            return [self._action_start_time + self._tau]
+        self._switching_pattern = list(switching_pattern)
+        return [self._action_start_time + self._interlocking_time, self._action_start_time + self._tau]
+
 
 class FiniteOneQuadrantConverter(FiniteConverter):
     """
@@ -228,13 +311,25 @@ class FiniteOneQuadrantConverter(FiniteConverter):
     currents = Box(0, 1, shape=(1,), dtype=np.float64)
     action_space = Discrete(2)
 
-    def convert(self, i_out, t):
-        # Docstring in base class
-        return [self._current_action if i_out[0] >= 0 else 1]
+    # Negative currents (sign pattern 1) flow through the diode to the supply.
+    _voltage_table = {0: ((0.0,), (1.0,)), 1: ((1.0,), (1.0,))}
+    _i_sup_table = {0: ((0.0,), (0.0,)), 1: ((1.0,), (1.0,))}
+    _switching_table = {0: ((0,), (1,)), 1: ((0,), (1,))}
 
     def i_sup(self, i_out):
         # Docstring in base class
-        return i_out[0] if self._current_action == 1 else 0
+        # The supply current depends on the action that has been set last.
+        return self._i_sup_table[self._current_action][self._sign_pattern(i_out)][0] * i_out[0]
+
+    def switching_voltages(self, i_out):
+        # Docstring in base class
+        i_out = np.asarray(i_out, dtype=float)
+        u_off = np.where(i_out[..., 0] >= 0, 0.0, 1.0)
+        return np.stack([u_off, np.ones_like(u_off)], axis=-1)[..., np.newaxis]
+
+    def _sign_pattern(self, i_out):
+        # Docstring of superclass
+        return 1 if i_out[0] < 0 else 0
 
 
 class FiniteTwoQuadrantConverter(FiniteConverter):
@@ -259,49 +354,75 @@ class FiniteTwoQuadrantConverter(FiniteConverter):
     currents = Box(-1, 1, shape=(1,), dtype=np.float64)
     action_space = Discrete(3)
 
-    def convert(self, i_out, t):
-        # Docstring in base class
-        # Converter switches slightly (tau / 1000 seconds) before interlocking time due to inaccuracy of the solvers.
-        if t - self._tau / 1000 > self._action_start_time + self._interlocking_time:
-            self._switching_state = self._switching_pattern[-1]
-        else:
-            self._switching_state = self._switching_pattern[0]
-        if self._switching_state == 0:
-            if i_out[0] < 0:
-                return [1]
-            elif i_out[0] >= 0:
-                return [0.0]
-        elif self._switching_state == 1:
-            return [1]
-        elif self._switching_state == 2:
-            return [0.0]
-        else:
-            raise Exception('Invalid switching state of the converter')
+    # If both transistors are off, negative currents (sign pattern 1) flow through the upper diode to the supply.
+    _voltage_table = {0: ((0.0,), (1.0,)), 1: ((1.0,), (1.0,)), 2: ((0.0,), (0.0,))}
+    _i_sup_table = {0: ((0.0,), (1.0,)), 1: ((1.0,), (1.0,)), 2: ((0.0,), (0.0,))}
+    # Both transistors are off during the interlocking time, if the converter switches directly between 1 and 2.
+    _switching_table = {0: ((0,), (1,), (2,)), 1: ((0,), (1,), (0, 2)), 2: ((0,), (0, 1), (2,))}
 
     def i_sup(self, i_out):
         # Docstring in base class
-        if self._switching_state == 0:
-            return i_out[0] if i_out[0] < 0 else 0
-        elif self._switching_state == 1:
-            return i_out[0]
-        elif self._switching_state == 2:
-            return 0
-        else:
-            raise Exception('Invalid switching state of the converter')
+        return self._i_sup_table[self._switching_state][self._sign_pattern(i_out)][0] * i_out[0]
 
-    def _set_switching_pattern(self, action):
+    def switching_voltages(self, i_out):
         # Docstring in base class
-        if (
-                action == 0
-                or self._switching_state == 0
-                or action == self._switching_state
-                or self._interlocking_time == 0
-        ):
-            self._switching_pattern = [action]
-            return [self._action_start_time + self._tau]
-        else:
-            self._switching_pattern = [0, action]
-            return [self._action_start_time + self._interlocking_time, self._action_start_time + self._tau]
+        i_out = np.asarray(i_out, dtype=float)
+        # If both transistors are off, negative currents flow through the upper diode.
+        u_off = np.where(i_out[..., 0] < 0, 1.0, 0.0)
+        return np.stack([u_off, np.ones_like(u_off), np.zeros_like(u_off)], axis=-1)[..., np.newaxis]
+
+    def _sign_pattern(self, i_out):
+        # Docstring of superclass
+        return 1 if i_out[0] < 0 else 0
+
+
+def _compile_half_bridge_tables(weights, offset, half_bridge_actions):
+    """
+    Compiles the tables of a finite converter that consists of half bridges, which behave like the Finite-2QC.
+
+    The switching state of the converter is sum(s_l * 3 ** l) of the switching states s_l of the half bridges.
+    The sign pattern is sum((i_l < 0) * 2 ** l) of the currents i_l = weights.T @ i_out of the half bridges.
+    The output voltages are weights @ u_l + offset with the output voltages u_l of the half bridges.
+
+    Args:
+        weights(list(list(float))): Factors of the half bridge voltages in the output voltages.
+            Shape: (voltages, half bridges)
+        offset(float): Offset of the output voltages.
+        half_bridge_actions(list(tuple(int))): Actions of the half bridges for each action of the converter.
+
+    Returns:
+        Tuple(dict, dict, dict): The voltage table, the supply current table and the switching table.
+    """
+    weights = np.array(weights, dtype=float)
+    half_bridges = weights.shape[1]
+    half_bridge = FiniteTwoQuadrantConverter
+    state_factors = 3 ** np.arange(half_bridges)
+    voltage_table = {}
+    i_sup_table = {}
+    switching_table = {}
+    for states in np.ndindex(*(3,) * half_bridges):
+        state = int(np.dot(states, state_factors))
+        voltages = []
+        i_sup_factors = []
+        for sign_pattern in range(2 ** half_bridges):
+            signs = [(sign_pattern >> l) & 1 for l in range(half_bridges)]
+            u = [half_bridge._voltage_table[s][sign][0] for s, sign in zip(states, signs)]
+            i_sup = [half_bridge._i_sup_table[s][sign][0] for s, sign in zip(states, signs)]
+            voltages.append(tuple(float(u_) for u_ in weights @ u + offset))
+            i_sup_factors.append(tuple(float(factor) for factor in weights @ i_sup))
+        voltage_table[state] = tuple(voltages)
+        i_sup_table[state] = tuple(i_sup_factors)
+        switching_patterns = []
+        for actions in half_bridge_actions:
+            patterns = [half_bridge._switching_table[s][action] for s, action in zip(states, actions)]
+            target_state = int(np.dot([pattern[-1] for pattern in patterns], state_factors))
+            if any(len(pattern) > 1 for pattern in patterns):
+                interlocking_state = int(np.dot([pattern[0] for pattern in patterns], state_factors))
+                switching_patterns.append((interlocking_state, target_state))
+            else:
+                switching_patterns.append((target_state,))
+        switching_table[state] = tuple(switching_patterns)
+    return voltage_table, i_sup_table, switching_table
 
 
 class FiniteFourQuadrantConverter(FiniteConverter):
@@ -326,35 +447,29 @@ class FiniteFourQuadrantConverter(FiniteConverter):
     currents = Box(-1, 1, shape=(1,), dtype=np.float64)
     action_space = Discrete(4)
 
-    def __init__(self, **kwargs):
-        # Docstring in base class
-        super().__init__(**kwargs)
-        self._subconverters = [FiniteTwoQuadrantConverter(**kwargs), FiniteTwoQuadrantConverter(**kwargs)]
+    @classmethod
+    def _compile_tables(cls):
+        # Docstring of superclass
+        # The output voltage is the difference of the voltages of two half bridges. The second one carries -i_out.
+        cls._voltage_table, cls._i_sup_table, cls._switching_table = _compile_half_bridge_tables(
+            weights=[[1.0, -1.0]], offset=0.0, half_bridge_actions=[(1, 1), (1, 2), (2, 1), (2, 2)]
+        )
 
-    def reset(self):
+    def i_sup(self, i_out):
         # Docstring in base class
-        self._subconverters[0].reset()
-        self._subconverters[1].reset()
-        return super().reset()
+        return self._i_sup_table[self._switching_state][self._sign_pattern(i_out)][0] * i_out[0]
 
-    def convert(self, i_out, t):
+    def switching_voltages(self, i_out):
         # Docstring in base class
-        return [self._subconverters[0].convert(i_out, t)[0] - self._subconverters[1].convert([-i_out[0]], t)[0]]
+        # One transistor of each half bridge is switched on in every action. Therefore, the voltages do not depend on
+        # the currents.
+        i_out = np.asarray(i_out, dtype=float)
+        return np.broadcast_to(np.array([[0.0], [1.0], [-1.0], [0.0]]), i_out.shape[:-1] + (4, 1))
 
-    def set_action(self, action, t):
-        # Docstring in base class
-        assert self.action_space.contains(action), \
-            f"The selected action {action} is not a valid element of the action space {self.action_space}."
-        times = []
-        action0 = [1, 1, 2, 2][action]
-        action1 = [1, 2, 1, 2][action]
-        times += self._subconverters[0].set_action(action0, t)
-        times += self._subconverters[1].set_action(action1, t)
-        return sorted(list(set(times)))
-
-    def i_sup(self, i_out):
-        # Docstring in base class
-        return self._subconverters[0].i_sup(i_out) + self._subconverters[1].i_sup([-i_out[0]])
+    def _sign_pattern(self, i_out):
+        # Docstring of superclass
+        # The currents of the half bridges are i_out and -i_out.
+        return 1 if i_out[0] < 0 else (2 if i_out[0] > 0 else 0)
 
 
 class ContOneQuadrantConverter(ContDynamicallyAveragedConverter):
@@ -446,6 +561,8 @@ class ContFourQuadrantConverter(ContDynamicallyAveragedConverter):
     currents = Box(-1, 1, shape=(1,), dtype=np.float64)
     action_space = Box(-1, 1, shape=(1,), dtype=np.float64)
 
+    _state_components = ('_subconverters',)
+
     def __init__(self, **kwargs):
         # Docstring in base class
         super().__init__(**kwargs)
@@ -468,6 +585,7 @@ class ContFourQuadrantConverter(ContDynamicallyAveragedConverter):
     def set_action(self, action, t):
         # Docstring in base class
         super().set_action(action, t)
+        action = self._current_action
         times = []
         times += self._subconverters[0].set_action([0.5 * (action[0] + 1)], t)
         times += self._subconverters[1].set_action([-0.5 * (action[0] - 1)], t)
@@ -510,6 +628,7 @@ class FiniteMultiConverter(FiniteConverter):
     def sub_converters(self):
         return self._sub_converters
 
+    _state_components = ('_sub_converters',)
 
     def __init__(self, subconverters, **kwargs):
         """
@@ -557,14 +676,18 @@ class FiniteMultiConverter(FiniteConverter):
         self.currents = Box(currents_low, currents_high, dtype=np.float64)
         self.voltages = Box(voltages_low, voltages_high, dtype=np.float64)
 
+        # Slices of the output currents of each subconverter
+        subsignal_idx_high = np.cumsum(self.subsignal_current_space_dims)
+        self._current_slices = [
+            slice(int(high - size), int(high))
+            for high, size in zip(subsignal_idx_high, self.subsignal_current_space_dims)
+        ]
+
     def convert(self, i_out, t):
         # Docstring in base class
         u_in = []
-        subsignal_idx_low = 0
-        for subconverter, subsignal_space_size in zip(self._sub_converters, self.subsignal_voltage_space_dims):
-            subsignal_idx_high = subsignal_idx_low + subsignal_space_size
-            u_in += subconverter.convert(i_out[subsignal_idx_low:subsignal_idx_high], t)
-            subsignal_idx_low = subsignal_idx_high
+        for subconverter, current_slice in zip(self._sub_converters, self._current_slices):
+            u_in += subconverter.convert(i_out[current_slice], t)
         return u_in
 
     def reset(self):
@@ -584,13 +707,25 @@ class FiniteMultiConverter(FiniteConverter):
     def i_sup(self, i_out):
         # Docstring in base class
         i_sup = 0
-        subsignal_idx_low = 0
-        for subconverter, subsignal_space_size in zip(self._sub_converters, self.subsignal_current_space_dims):
-            subsignal_idx_high = subsignal_idx_low + subsignal_space_size
-            i_sup += subconverter.i_sup(i_out[subsignal_idx_low:subsignal_idx_high])
-            subsignal_idx_low = subsignal_idx_high
+        for subconverter, current_slice in zip(self._sub_converters, self._current_slices):
+            i_sup += subconverter.i_sup(i_out[current_slice])
         return i_sup
 
+    def switching_voltages(self, i_out):
+        # Docstring in base class
+        i_out = np.asarray(i_out, dtype=float)
+        batch_shape = i_out.shape[:-1]
+        # Voltages of all combinations of the actions of the previous subconverters. Shape: (..., actions, voltages)
+        u_out = np.zeros(batch_shape + (1, 0))
+        for subconverter, current_slice in zip(self._sub_converters, self._current_slices):
+            u_sub = subconverter.switching_voltages(i_out[..., current_slice])
+            combinations = batch_shape + (u_out.shape[-2], u_sub.shape[-2])
+            u_out = np.concatenate((
+                np.broadcast_to(u_out[..., :, np.newaxis, :], combinations + u_out.shape[-1:]),
+                np.broadcast_to(u_sub[..., np.newaxis, :, :], combinations + u_sub.shape[-1:]),
+            ), axis=-1).reshape(batch_shape + (combinations[-2] * combinations[-1], -1))
+        return u_out
+
 
 class ContMultiConverter(ContDynamicallyAveragedConverter):
     """
@@ -622,6 +757,8 @@ class ContMultiConverter(ContDynamicallyAveragedConverter):
         for sub_converter in self._sub_converters:
             sub_converter.tau = value
 
+    _state_components = ('_sub_converters',)
+
     def __init__(self, subconverters, **kwargs):
         """
         Args:
@@ -719,7 +856,7 @@ class ContMultiConverter(ContDynamicallyAveragedConverter):
 
 class FiniteB6BridgeConverter(FiniteConverter):
     """
-    The finite B6 bridge converters (B6C) is simulated with three finite 2QC.
+    The finite B6 bridge converters (B6C) consists of three half bridges that behave like the finite 2QC.
 
     Key:
         'Finite-B6C'
@@ -773,46 +910,46 @@ class FiniteB6BridgeConverter(FiniteConverter):
         [1, 1, 1]
     ]
 
-    def __init__(self, tau=1e-5, **kwargs):
-        # Docstring in base class
-        super().__init__(tau=tau, **kwargs)
-        self._sub_converters = [
-            FiniteTwoQuadrantConverter(tau=tau, **kwargs),
-            FiniteTwoQuadrantConverter(tau=tau, **kwargs),
-            FiniteTwoQuadrantConverter(tau=tau, **kwargs),
-        ]
+    @classmethod
+    def _compile_tables(cls):
+        # Docstring of superclass
+        cls._voltage_table, cls._i_sup_table, cls._switching_table = _compile_half_bridge_tables(
+            weights=np.eye(3), offset=-0.5, half_bridge_actions=cls._subactions
+        )
 
     def reset(self):
         # Docstring in base class
-        return [
-            self._sub_converters[0].reset()[0] - 0.5,
-            self._sub_converters[1].reset()[0] - 0.5,
-            self._sub_converters[2].reset()[0] - 0.5,
-        ]
-
-    def convert(self, i_out, t):
-        # Docstring in base class
-        u_out = [
-            self._sub_converters[0].convert([i_out[0]], t)[0] - 0.5,
-            self._sub_converters[1].convert([i_out[1]], t)[0] - 0.5,
-            self._sub_converters[2].convert([i_out[2]], t)[0] - 0.5
-        ]
-        return u_out
+        super().reset()
+        return [-0.5, -0.5, -0.5]
 
-    def set_action(self, action, t):
+    def i_sup(self, i_out):
         # Docstring in base class
-        assert self.action_space.contains(action), \
-            f"The selected action {action} is not a valid element of the action space {self.action_space}."
-        subactions = self._subactions[action]
-        times = []
-        times += self._sub_converters[0].set_action(subactions[0], t)
-        times += self._sub_converters[1].set_action(subactions[1], t)
-        times += self._sub_converters[2].set_action(subactions[2], t)
-        return sorted(list(set(times)))
+        i_out = self._phase_currents(i_out)
+        factors = self._i_sup_table[self._switching_state][self._sign_pattern(i_out)]
+        return factors[0] * i_out[0] + factors[1] * i_out[1] + factors[2] * i_out[2]
 
-    def i_sup(self, i_out):
+    def switching_voltages(self, i_out):
         # Docstring in base class
-        return sum([subconverter.i_sup([i_out_]) for subconverter, i_out_ in zip(self._sub_converters, i_out)])
+        # The upper (1) or the lower (2) transistor of each phase is switched on. Therefore, the voltages do not depend
+        # on the currents.
+        i_out = np.asarray(i_out, dtype=float)
+        voltages = np.where(np.array(self._subactions) == 1, 0.5, -0.5)
+        return np.broadcast_to(voltages, i_out.shape[:-1] + voltages.shape)
+
+    def _sign_pattern(self, i_out):
+        # Docstring of superclass
+        i_out = self._phase_currents(i_out)
+        return (1 if i_out[0] < 0 else 0) + (2 if i_out[1] < 0 else 0) + (4 if i_out[2] < 0 else 0)
+
+    @staticmethod
+    def _phase_currents(i_out):
+        """Returns the three phase currents as a flat sequence.
+
+        The currents can also be passed per phase, e.g. [[i_a], [i_b], [i_c]].
+        """
+        if np.ndim(i_out[0]) == 0:
+            return i_out
+        return np.ravel(i_out)
 
 
 class ContB6BridgeConverter(ContDynamicallyAveragedConverter):
@@ -844,6 +981,8 @@ class ContB6BridgeConverter(ContDynamicallyAveragedConverter):
 
     _reset_action = [0, 0, 0]
 
+    _state_components = ('_subconverters',)
+
     def __init__(self, tau=1e-4, **kwargs):
         # Docstring in base class
         super().__init__(tau=tau, **kwargs)
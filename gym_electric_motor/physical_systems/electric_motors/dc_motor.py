@@ -116,6 +116,31 @@ class DcMotor(ElectricMotor):
             ])
         )
 
+    def electrical_ode_batch(self, states, u_in, omega):
+        # Docstring of superclass
+        return self._apply_model_constants(np.column_stack((
+            states[:, self.I_A_IDX],
+            states[:, self.I_E_IDX],
+            omega * states[:, self.I_E_IDX],
+            u_in[:, 0],
+            u_in[:, 1],
+        )))
+
+    def electrical_jacobian_batch(self, states, u_in, omega):
+        # Docstring of superclass
+        mp = self._motor_parameter
+        feature_jacobian = np.zeros((len(states), 5, 2))
+        feature_jacobian[:, 0, self.I_A_IDX] = 1
+        feature_jacobian[:, 1, self.I_E_IDX] = 1
+        feature_jacobian[:, 2, self.I_E_IDX] = omega
+        feature_omega_derivative = np.zeros((len(states), 5))
+        feature_omega_derivative[:, 2] = states[:, self.I_E_IDX]
+        torque_jacobian = np.column_stack((
+            mp['l_e_prime'] * states[:, self.I_E_IDX],
+            mp['l_e_prime'] * states[:, self.I_A_IDX],
+        ))
+        return (*self._apply_model_constants_jacobian(feature_jacobian, feature_omega_derivative), torque_jacobian)
+
     def get_state_space(self, input_currents, input_voltages):
         """
         Calculate the possible normalized state space for the motor as a tuple of dictionaries "low" and "high".
@@ -81,6 +81,20 @@ class DcPermanentlyExcitedMotor(DcMotor):
         self._ode_placeholder[:] = [omega] + np.atleast_1d(state[self.I_IDX]).tolist() + [u_in[0]]
         return np.matmul(self._model_constants, self._ode_placeholder)
 
+    def electrical_ode_batch(self, states, u_in, omega):
+        # Docstring of superclass
+        return self._apply_model_constants(np.column_stack((omega, states[:, self.I_IDX], u_in[:, 0])))
+
+    def electrical_jacobian_batch(self, states, u_in, omega):
+        # Docstring of superclass
+        feature_jacobian = np.zeros((len(states), 3, 1))
+        feature_jacobian[:, 1, self.I_IDX] = 1
+        feature_omega_derivative = np.zeros((len(states), 3))
+        feature_omega_derivative[:, 0] = 1
+        torque_jacobian = np.zeros((len(states), 1))
+        torque_jacobian[:, self.I_IDX] = self._motor_parameter['psi_e']
+        return (*self._apply_model_constants_jacobian(feature_jacobian, feature_omega_derivative), torque_jacobian)
+
     def electrical_jacobian(self, state, u_in, omega, *_):
         mp = self._motor_parameter
         return (
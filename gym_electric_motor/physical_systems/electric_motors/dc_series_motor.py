@@ -80,6 +80,25 @@ class DcSeriesMotor(DcMotor):
             ])
         )
 
+    def electrical_ode_batch(self, states, u_in, omega):
+        # Docstring of superclass
+        return self._apply_model_constants(np.column_stack((
+            states[:, self.I_IDX],
+            omega * states[:, self.I_IDX],
+            u_in[:, 0]
+        )))
+
+    def electrical_jacobian_batch(self, states, u_in, omega):
+        # Docstring of superclass
+        feature_jacobian = np.zeros((len(states), 3, 1))
+        feature_jacobian[:, 0, self.I_IDX] = 1
+        feature_jacobian[:, 1, self.I_IDX] = omega
+        feature_omega_derivative = np.zeros((len(states), 3))
+        feature_omega_derivative[:, 1] = states[:, self.I_IDX]
+        torque_jacobian = np.zeros((len(states), 1))
+        torque_jacobian[:, self.I_IDX] = 2 * self._motor_parameter['l_e_prime'] * states[:, self.I_IDX]
+        return (*self._apply_model_constants_jacobian(feature_jacobian, feature_omega_derivative), torque_jacobian)
+
     def i_in(self, state):
         # Docstring of superclass
         return state[self.CURRENTS_IDX]
@@ -67,6 +67,10 @@ class DcShuntMotor(DcMotor):
         # Docstring of superclass
         return super().electrical_ode(state, (u_in[0], u_in[0]), omega)
 
+    def electrical_ode_batch(self, states, u_in, omega):
+        # Docstring of superclass
+        return super().electrical_ode_batch(states, np.repeat(u_in[:, :1], 2, axis=1), omega)
+
     def electrical_jacobian(self, state, u_in, omega, *_):
         mp = self._motor_parameter
         return (
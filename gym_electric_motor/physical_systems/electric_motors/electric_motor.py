@@ -175,6 +175,94 @@ class ElectricMotor(RandomComponent):
         """
         pass
 
+    def electrical_ode_batch(self, states, u_in, omega):
+        """Vectorized calculation of the motors ODE-System for a batch of N independent motor states.
+
+        The model constants may either be shared by all states with shape ``(states x features)`` or be stacked per
+        batch entry with shape ``(N x states x features)`` to simulate motors with different parameters.
+
+        Args:
+            states(ndarray(float)): The motor states. Shape: (N, states)
+            u_in(ndarray(float)): The motors input voltages. Shape: (N, voltages)
+            omega(ndarray(float)): Angular velocities of the motors. Shape: (N,)
+
+        Returns:
+             ndarray(float): Derivatives of the motors ODE-system for each batch entry. Shape: (N, states)
+        """
+        raise NotImplementedError
+
+    def electrical_jacobian_batch(self, states, u_in, omega):
+        """Vectorized calculation of the jacobian of the motors ODE-System for a batch of N independent motor states.
+
+        The jacobians are derived from the (shared or stacked) model constants and the derivatives of the ODE features.
+        Therefore, they are consistent with the ``electrical_ode_batch`` of the motor.
+
+        Args:
+            states(ndarray(float)): The motor states. Shape: (N, states)
+            u_in(ndarray(float)): The motors input voltages. Shape: (N, voltages)
+            omega(ndarray(float)): Angular velocities of the motors. Shape: (N,)
+
+        Returns:
+             Tuple(ndarray, ndarray, ndarray):
+                [0]: Derivatives of all electrical motor states over all electrical motor states shape:(N, states, states)
+                [1]: Derivatives of all electrical motor states over omega shape:(N, states)
+                [2]: Derivative of Torque over all motor states shape:(N, states)
+        """
+        raise NotImplementedError
+
+    def torque_batch(self, states):
+        """Vectorized calculation of the torque for a batch of N motor states.
+
+        Args:
+            states(ndarray(float)): The motor states. Shape: (N, states)
+
+        Returns:
+            ndarray(float): The torque of each batch entry. Shape: (N,)
+        """
+        return np.asarray(self.torque(states.T), dtype=float)
+
+    def i_in_batch(self, states):
+        """Vectorized calculation of the input currents for a batch of N motor states.
+
+        Args:
+            states(ndarray(float)): ODE states of the motors. Shape: (N, states)
+
+        Returns:
+            ndarray(float): The currents flowing into each motor. Shape: (N, currents)
+        """
+        return np.asarray(self.i_in(states.T), dtype=float).T
+
+    def _apply_model_constants(self, features):
+        """Multiplies the feature matrix of a batch with the (shared or stacked) model constants.
+
+        Args:
+            features(ndarray(float)): The ODE features of each batch entry. Shape: (N, features)
+
+        Returns:
+            ndarray(float): The derivatives of the motor states. Shape: (N, states)
+        """
+        if self._model_constants.ndim == 2:
+            return np.matmul(features, self._model_constants.T)
+        return np.einsum('nij,nj->ni', self._model_constants, features)
+
+    def _apply_model_constants_jacobian(self, feature_jacobian, feature_omega_derivative):
+        """Multiplies the derivatives of the feature matrix of a batch with the (shared or stacked) model constants.
+
+        Args:
+            feature_jacobian(ndarray(float)): Derivatives of the ODE features over the motor states.
+                Shape: (N, features, states)
+            feature_omega_derivative(ndarray(float)): Derivatives of the ODE features over omega.
+                Shape: (N, features)
+
+        Returns:
+            Tuple(ndarray(float), ndarray(float)): The derivatives of the motor state derivatives over the motor states
+            of shape (N, states, states) and over omega of shape (N, states).
+        """
+        return (
+            np.matmul(self._model_constants, feature_jacobian),
+            np.matmul(self._model_constants, feature_omega_derivative[:, :, np.newaxis])[:, :, 0],
+        )
+
     def initialize(self, state_space, state_positions, **__):
         """
         Initializes given state values. Values can be given as a constant or
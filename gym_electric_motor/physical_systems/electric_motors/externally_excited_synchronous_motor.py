@@ -147,18 +147,61 @@ class ExternallyExcitedSynchronousMotor(SynchronousMotor):
         Returns:
             The derivatives of the state vector d/dt([i_sd, i_sq, epsilon])
         """
-        return np.matmul(self._model_constants, np.array([
+        i_sd = state[self.I_SD_IDX]
+        i_sq = state[self.I_SQ_IDX]
+        i_e = state[self.I_E_IDX]
+        return self._model_constants.dot((
             omega,
-            state[self.I_SD_IDX],
-            state[self.I_SQ_IDX],
-            state[self.I_E_IDX],
+            i_sd,
+            i_sq,
+            i_e,
             u_dq[0],
             u_dq[1],
             u_dq[2],
-            omega * state[self.I_SD_IDX],
-            omega * state[self.I_SQ_IDX],
-            omega * state[self.I_E_IDX]
-        ]))
+            omega * i_sd,
+            omega * i_sq,
+            omega * i_e
+        ))
+
+    def electrical_ode_batch(self, states, u_dq, omega):
+        # Docstring of superclass
+        return self._apply_model_constants(np.column_stack((
+            omega,
+            states[:, self.I_SD_IDX],
+            states[:, self.I_SQ_IDX],
+            states[:, self.I_E_IDX],
+            u_dq[:, 0],
+            u_dq[:, 1],
+            u_dq[:, 2],
+            omega * states[:, self.I_SD_IDX],
+            omega * states[:, self.I_SQ_IDX],
+            omega * states[:, self.I_E_IDX]
+        )))
+
+    def electrical_jacobian_batch(self, states, u_dq, omega):
+        # Docstring of superclass
+        feature_jacobian = np.zeros((len(states), 10, 4))
+        feature_omega_derivative = np.zeros((len(states), 10))
+        feature_omega_derivative[:, 0] = 1
+        for feature_idx, state_idx in enumerate((self.I_SD_IDX, self.I_SQ_IDX, self.I_E_IDX)):
+            feature_jacobian[:, 1 + feature_idx, state_idx] = 1
+            feature_jacobian[:, 7 + feature_idx, state_idx] = omega
+            feature_omega_derivative[:, 7 + feature_idx] = states[:, state_idx]
+        return (
+            *self._apply_model_constants_jacobian(feature_jacobian, feature_omega_derivative),
+            self._torque_jacobian_batch(states)
+        )
+
+    def _torque_jacobian_batch(self, states):
+        # Docstring of superclass
+        mp = self._motor_parameter
+        torque_jacobian = np.zeros_like(states, dtype=float)
+        torque_jacobian[:, self.I_SD_IDX] = 1.5 * mp['p'] * (mp['l_d'] - mp['l_q']) * states[:, self.I_SQ_IDX]
+        torque_jacobian[:, self.I_SQ_IDX] = 1.5 * mp['p'] * (
+            mp['l_m'] * states[:, self.I_E_IDX] + (mp['l_d'] - mp['l_q']) * states[:, self.I_SD_IDX]
+        )
+        torque_jacobian[:, self.I_E_IDX] = 1.5 * mp['p'] * mp['l_m'] * states[:, self.I_SQ_IDX]
+        return torque_jacobian
 
     def _torque_limit(self):
         # Docstring of superclass
@@ -186,21 +229,21 @@ class ExternallyExcitedSynchronousMotor(SynchronousMotor):
         sigma = 1 - mp['l_m'] ** 2 / (mp['l_d'] * mp['l_e'])
         return (
             np.array([ # dx'/dx
-                [                                 -mp['r_s'] / mp['l_d'],                          mp['l_q'] / (sigma * mp['l_d']) * omega * mp['p'], mp['l_m'] * mp['r_e'] / (sigma * mp['l_d'] * mp['l_e']), 0],
-                [               -mp['l_d'] / mp['l_q'] * omega * mp['p'],                                                     -mp['r_s'] / mp['l_q'],                -omega * mp['p'] * mp['l_e'] / mp['l_q'], 0],
-                [mp['l_m'] * mp['r_s'] / (sigma * mp['l_d'] * mp['l_e']), -omega * mp['p'] * mp['l_m'] * mp['l_q'] / (sigma * mp['l_d'] * mp['l_e']),                                  -mp['r_e'] / mp['l_e'], 0],
-                [                                                      0,                                                                          0,                                                       0, 0],
+                [                           -mp['r_s'] / (sigma * mp['l_d']),                          mp['l_q'] / (sigma * mp['l_d']) * omega * mp['p'], mp['l_m'] * mp['r_e'] / (sigma * mp['l_d'] * mp['l_e']), 0],
+                [                   -mp['l_d'] / mp['l_q'] * omega * mp['p'],                                                     -mp['r_s'] / mp['l_q'],                -omega * mp['p'] * mp['l_m'] / mp['l_q'], 0],
+                [mp['l_m'] * mp['r_s'] / (sigma * mp['l_d'] * mp['l_e']), -omega * mp['p'] * mp['l_m'] * mp['l_q'] / (sigma * mp['l_d'] * mp['l_e']),                         -mp['r_e'] / (sigma * mp['l_e']), 0],
+                [                                                          0,                                                                          0,                                                       0, 0],
             ]),
             np.array([ # dx'/dw
-                mp['p'] * mp['l_q'] / mp['l_d'] * state[self.I_SQ_IDX],
+                mp['p'] * mp['l_q'] / (sigma * mp['l_d']) * state[self.I_SQ_IDX],
                 -mp['p'] * mp['l_d'] / mp['l_q'] * state[self.I_SD_IDX] - mp['p'] * mp['l_m'] / mp['l_q'] * state[self.I_E_IDX],
-                -mp['p'],
+                -mp['p'] * mp['l_m'] * mp['l_q'] / (sigma * mp['l_d'] * mp['l_e']) * state[self.I_SQ_IDX],
                 mp['p'],
             ]),
             np.array([ # dT/dx
                 1.5 * mp['p'] * (mp['l_d'] - mp['l_q']) * state[self.I_SQ_IDX],
-                1.5 * mp['p'] * (mp['l_e'] * state[self.I_E_IDX] + (mp['l_d'] - mp['l_q']) * state[self.I_SD_IDX]),
-                1.5 * mp['p'] * mp['l_e'] * state[self.I_SQ_IDX],
+                1.5 * mp['p'] * (mp['l_m'] * state[self.I_E_IDX] + (mp['l_d'] - mp['l_q']) * state[self.I_SD_IDX]),
+                1.5 * mp['p'] * mp['l_m'] * state[self.I_SQ_IDX],
                 0,
             ])
         )
@@ -183,20 +183,87 @@ class InductionMotor(ThreePhaseMotor):
         Returns:
             The derivatives of the state vector d/dt( [i_salpha, i_sbeta, psi_ralpha, psi_rbeta, epsilon])
         """
-        return np.matmul(self._model_constants, np.array([
+        return self._electrical_ode(
+            state, omega,
+            u_sr_alphabeta[0, 0], u_sr_alphabeta[0, 1], u_sr_alphabeta[1, 0], u_sr_alphabeta[1, 1]
+        )
+
+    def _electrical_ode(self, state, omega, u_salpha, u_sbeta, u_ralpha, u_rbeta):
+        """
+        The differential equation of the Induction Motor with the input voltages passed as separate values.
+
+        Args:
+            state: The momentary state of the motor. [i_salpha, i_sbeta, psi_ralpha, psi_rbeta, epsilon]
+            omega: The mechanical load
+            u_salpha, u_sbeta, u_ralpha, u_rbeta: The input voltages
+
+        Returns:
+            The derivatives of the state vector d/dt( [i_salpha, i_sbeta, psi_ralpha, psi_rbeta, epsilon])
+        """
+        psi_ralpha = state[self.PSI_RALPHA_IDX]
+        psi_rbeta = state[self.PSI_RBETA_IDX]
+        return self._model_constants.dot((
             # omega, i_alpha, i_beta, psi_ralpha, psi_rbeta, omega * psi_ralpha, omega * psi_rbeta, u_salpha, u_sbeta, u_ralpha, u_rbeta,
             omega,
             state[self.I_SALPHA_IDX],
             state[self.I_SBETA_IDX],
-            state[self.PSI_RALPHA_IDX],
-            state[self.PSI_RBETA_IDX],
-            omega * state[self.PSI_RALPHA_IDX],
-            omega * state[self.PSI_RBETA_IDX],
-            u_sr_alphabeta[0, 0],
-            u_sr_alphabeta[0, 1],
-            u_sr_alphabeta[1, 0],
-            u_sr_alphabeta[1, 1],
-        ]))
+            psi_ralpha,
+            psi_rbeta,
+            omega * psi_ralpha,
+            omega * psi_rbeta,
+            u_salpha,
+            u_sbeta,
+            u_ralpha,
+            u_rbeta,
+        ))
+
+    def electrical_ode_batch(self, states, u_sr_alphabeta, omega):
+        """
+        The vectorized differential equation of the Induction Motor.
+
+        Args:
+            states: The momentary states of the motors. Shape: (N, 5)
+            omega: The mechanical velocities. Shape: (N,)
+            u_sr_alphabeta: The input voltages [[u_salpha, u_sbeta], [u_ralpha, u_rbeta]]. Shape: (N, 2, 2)
+
+        Returns:
+            The derivatives of the state vectors. Shape: (N, 5)
+        """
+        return self._apply_model_constants(np.column_stack((
+            omega,
+            states[:, self.I_SALPHA_IDX],
+            states[:, self.I_SBETA_IDX],
+            states[:, self.PSI_RALPHA_IDX],
+            states[:, self.PSI_RBETA_IDX],
+            omega * states[:, self.PSI_RALPHA_IDX],
+            omega * states[:, self.PSI_RBETA_IDX],
+            u_sr_alphabeta[:, 0, 0],
+            u_sr_alphabeta[:, 0, 1],
+            u_sr_alphabeta[:, 1, 0],
+            u_sr_alphabeta[:, 1, 1],
+        )))
+
+    def electrical_jacobian_batch(self, states, u_sr_alphabeta, omega):
+        # Docstring of superclass
+        mp = self._motor_parameter
+        feature_jacobian = np.zeros((len(states), 11, 5))
+        feature_jacobian[:, 1, self.I_SALPHA_IDX] = 1
+        feature_jacobian[:, 2, self.I_SBETA_IDX] = 1
+        feature_jacobian[:, 3, self.PSI_RALPHA_IDX] = 1
+        feature_jacobian[:, 4, self.PSI_RBETA_IDX] = 1
+        feature_jacobian[:, 5, self.PSI_RALPHA_IDX] = omega
+        feature_jacobian[:, 6, self.PSI_RBETA_IDX] = omega
+        feature_omega_derivative = np.zeros((len(states), 11))
+        feature_omega_derivative[:, 0] = 1
+        feature_omega_derivative[:, 5] = states[:, self.PSI_RALPHA_IDX]
+        feature_omega_derivative[:, 6] = states[:, self.PSI_RBETA_IDX]
+        torque_factor = 1.5 * mp['p'] * mp['l_m'] / (mp['l_m'] + mp['l_sigr'])
+        torque_jacobian = np.zeros_like(states, dtype=float)
+        torque_jacobian[:, self.I_SALPHA_IDX] = -torque_factor * states[:, self.PSI_RBETA_IDX]
+        torque_jacobian[:, self.I_SBETA_IDX] = torque_factor * states[:, self.PSI_RALPHA_IDX]
+        torque_jacobian[:, self.PSI_RALPHA_IDX] = torque_factor * states[:, self.I_SBETA_IDX]
+        torque_jacobian[:, self.PSI_RBETA_IDX] = -torque_factor * states[:, self.I_SALPHA_IDX]
+        return (*self._apply_model_constants_jacobian(feature_jacobian, feature_omega_derivative), torque_jacobian)
 
     def i_in(self, state):
         # Docstring of superclass
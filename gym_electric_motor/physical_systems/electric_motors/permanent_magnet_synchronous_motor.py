@@ -134,6 +134,15 @@ class PermanentMagnetSynchronousMotor(SynchronousMotor):
         mp = self._motor_parameter
         return 1.5 * mp['p'] * (mp['psi_p'] + (mp['l_d'] - mp['l_q']) * currents[self.I_SD_IDX]) * currents[self.I_SQ_IDX]
 
+    def _torque_jacobian_batch(self, states):
+        # Docstring of superclass
+        mp = self._motor_parameter
+        torque_jacobian = np.zeros_like(states, dtype=float)
+        torque_jacobian[:, self.I_SD_IDX] = 1.5 * mp['p'] * (mp['l_d'] - mp['l_q']) * states[:, self.I_SQ_IDX]
+        torque_jacobian[:, self.I_SQ_IDX] = \
+            1.5 * mp['p'] * (mp['psi_p'] + (mp['l_d'] - mp['l_q']) * states[:, self.I_SD_IDX])
+        return torque_jacobian
+
     def electrical_jacobian(self, state, u_in, omega, *args):
         mp = self._motor_parameter
         return (
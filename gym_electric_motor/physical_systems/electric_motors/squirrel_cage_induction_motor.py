@@ -115,10 +115,15 @@ class SquirrelCageInductionMotor(InductionMotor):
         The differential equation of the SCIM.
         Sets u_ralpha = u_rbeta = 0 before calling the respective super function.
         """
-        u_ralphabeta = np.zeros_like(u_salphabeta)
-        u_sr_aphabeta = np.array([u_salphabeta, u_ralphabeta])
+        return self._electrical_ode(state, omega, u_salphabeta[0], u_salphabeta[1], 0.0, 0.0)
 
-        return super().electrical_ode(state, u_sr_aphabeta, omega, *args)
+    def electrical_ode_batch(self, states, u_salphabeta, omega):
+        """
+        The vectorized differential equation of the SCIM.
+        Sets u_ralpha = u_rbeta = 0 before calling the respective super function.
+        """
+        u_sr_alphabeta = np.stack((u_salphabeta, np.zeros_like(u_salphabeta)), axis=1)
+        return super().electrical_ode_batch(states, u_sr_alphabeta, omega)
 
     def _update_limits(self, limit_values={}, nominal_values={}):
         # Docstring of superclass
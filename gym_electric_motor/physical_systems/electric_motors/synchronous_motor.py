@@ -147,15 +147,56 @@ class SynchronousMotor(ThreePhaseMotor):
         Returns:
             The derivatives of the state vector d/dt([i_sd, i_sq, epsilon])
         """
-        return np.matmul(self._model_constants, np.array([
+        i_sd = state[self.I_SD_IDX]
+        i_sq = state[self.I_SQ_IDX]
+        return self._model_constants.dot((
             omega,
-            state[self.I_SD_IDX],
-            state[self.I_SQ_IDX],
+            i_sd,
+            i_sq,
             u_dq[0],
             u_dq[1],
-            omega * state[self.I_SD_IDX],
-            omega * state[self.I_SQ_IDX],
-        ]))
+            omega * i_sd,
+            omega * i_sq,
+        ))
+
+    def electrical_ode_batch(self, states, u_dq, omega):
+        # Docstring of superclass
+        return self._apply_model_constants(np.column_stack((
+            omega,
+            states[:, self.I_SD_IDX],
+            states[:, self.I_SQ_IDX],
+            u_dq[:, 0],
+            u_dq[:, 1],
+            omega * states[:, self.I_SD_IDX],
+            omega * states[:, self.I_SQ_IDX],
+        )))
+
+    def electrical_jacobian_batch(self, states, u_dq, omega):
+        # Docstring of superclass
+        feature_jacobian = np.zeros((len(states), 7, 3))
+        feature_jacobian[:, 1, self.I_SD_IDX] = 1
+        feature_jacobian[:, 2, self.I_SQ_IDX] = 1
+        feature_jacobian[:, 5, self.I_SD_IDX] = omega
+        feature_jacobian[:, 6, self.I_SQ_IDX] = omega
+        feature_omega_derivative = np.zeros((len(states), 7))
+        feature_omega_derivative[:, 0] = 1
+        feature_omega_derivative[:, 5] = states[:, self.I_SD_IDX]
+        feature_omega_derivative[:, 6] = states[:, self.I_SQ_IDX]
+        return (
+            *self._apply_model_constants_jacobian(feature_jacobian, feature_omega_derivative),
+            self._torque_jacobian_batch(states)
+        )
+
+    def _torque_jacobian_batch(self, states):
+        """Vectorized calculation of the derivatives of the torque over the motor states.
+
+        Args:
+            states(ndarray(float)): The motor states. Shape: (N, states)
+
+        Returns:
+            ndarray(float): Derivatives of the torque over the motor states. Shape: (N, states)
+        """
+        raise NotImplementedError
 
     def i_in(self, state):
         # Docstring of superclass
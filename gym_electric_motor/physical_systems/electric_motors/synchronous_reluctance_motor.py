@@ -123,6 +123,14 @@ class SynchronousReluctanceMotor(SynchronousMotor):
                 (mp['l_d'] - mp['l_q']) * currents[self.I_SD_IDX]) * \
                currents[self.I_SQ_IDX]
 
+    def _torque_jacobian_batch(self, states):
+        # Docstring of superclass
+        mp = self._motor_parameter
+        torque_jacobian = np.zeros_like(states, dtype=float)
+        torque_jacobian[:, self.I_SD_IDX] = 1.5 * mp['p'] * (mp['l_d'] - mp['l_q']) * states[:, self.I_SQ_IDX]
+        torque_jacobian[:, self.I_SQ_IDX] = 1.5 * mp['p'] * (mp['l_d'] - mp['l_q']) * states[:, self.I_SD_IDX]
+        return torque_jacobian
+
     def electrical_jacobian(self, state, u_in, omega, *_):
         mp = self._motor_parameter
         return (
@@ -83,6 +83,93 @@ class ThreePhaseMotor(ElectricMotor):
         """
         return ThreePhaseMotor.q(quantities, -epsilon)
 
+    @staticmethod
+    def transformation_matrices(epsilon):
+        """
+        Computes the sine and cosine of the electrical angle once and returns all matrices of the dq-transformations.
+
+        Args:
+            epsilon(float or ndarray(float)): Electrical angle of the motor. Either a scalar or a batch of shape (N,).
+
+        Returns:
+            tuple(ndarray(float), ndarray(float), ndarray(float)): The rotation from dq to alpha-beta (2, 2), the
+            combined transformation from abc to dq (2, 3) and the combined transformation from dq to abc (3, 2).
+            For a batch of angles, each matrix has an additional leading dimension N.
+        """
+        if isinstance(epsilon, np.ndarray) and epsilon.ndim > 0:
+            cos = np.cos(epsilon)
+            sin = np.sin(epsilon)
+            rotation = np.empty(epsilon.shape + (2, 2))
+            rotation[..., 0, 0] = cos
+            rotation[..., 0, 1] = -sin
+            rotation[..., 1, 0] = sin
+            rotation[..., 1, 1] = cos
+            return (
+                rotation,
+                np.matmul(np.swapaxes(rotation, -1, -2), ThreePhaseMotor._t23),
+                np.matmul(ThreePhaseMotor._t32, rotation)
+            )
+        cos = math.cos(epsilon)
+        sin = math.sin(epsilon)
+        # Closed form of t_32 * Q(epsilon) to avoid the matrix products for a single angle
+        cos_a = 0.5 * cos
+        cos_b = 0.5 * math.sqrt(3) * cos
+        sin_a = 0.5 * sin
+        sin_b = 0.5 * math.sqrt(3) * sin
+        dq_to_abc = np.array((
+            (cos, -sin),
+            (sin_b - cos_a, sin_a + cos_b),
+            (-sin_b - cos_a, sin_a - cos_b),
+        ))
+        return np.array(((cos, -sin), (sin, cos))), 2 / 3 * dq_to_abc.T, dq_to_abc
+
+    @staticmethod
+    def apply_transformation(matrix, quantities):
+        """
+        Applies a transformation matrix of :meth:`transformation_matrices` to the quantities.
+
+        Args:
+            matrix(ndarray(float)): A single transformation matrix or a batch of matrices of shape (N, rows, columns).
+            quantities: A single quantity like ``[u_a, u_b, u_c]``, several quantities as columns of shape
+                (columns, K) for a single matrix, or a batch of shape (N, columns) for a batch of matrices.
+
+        Returns:
+            ndarray(float): The transformed quantities of shape (rows,), (rows, K) or (N, rows).
+        """
+        if matrix.ndim == 2:
+            return matrix.dot(quantities)
+        return np.einsum('nij,nj->ni', matrix, quantities)
+
+    @staticmethod
+    def abc_to_dq(quantities, epsilon):
+        """
+        Combined transformation from abc representation to dq representation.
+
+        Args:
+            quantities: The quantities in abc representation like ``[u_a, u_b, u_c]``. Several quantities can be
+                passed as columns of shape (3, K) or, together with a batch of angles, as rows of shape (N, 3).
+            epsilon(float or ndarray(float)): Electrical angle of the motor. Either a scalar or a batch of shape (N,).
+
+        Returns:
+            ndarray(float): The quantities in dq representation like ``[u_d, u_q]``.
+        """
+        return ThreePhaseMotor.apply_transformation(ThreePhaseMotor.transformation_matrices(epsilon)[1], quantities)
+
+    @staticmethod
+    def dq_to_abc(quantities, epsilon):
+        """
+        Combined transformation from dq representation to abc representation.
+
+        Args:
+            quantities: The quantities in dq representation like ``[u_d, u_q]``. Several quantities can be
+                passed as columns of shape (2, K) or, together with a batch of angles, as rows of shape (N, 2).
+            epsilon(float or ndarray(float)): Electrical angle of the motor. Either a scalar or a batch of shape (N,).
+
+        Returns:
+            ndarray(float): The quantities in abc representation like ``[u_a, u_b, u_c]``.
+        """
+        return ThreePhaseMotor.apply_transformation(ThreePhaseMotor.transformation_matrices(epsilon)[2], quantities)
+
     def q_me(self, quantities, epsilon):
         """
         Transformation of the dq-representation into alpha-beta using the mechanical angle
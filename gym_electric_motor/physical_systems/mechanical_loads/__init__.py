@@ -3,3 +3,4 @@ from .constant_speed_load import ConstantSpeedLoad
 from .ornstein_uhlenbeck_load import OrnsteinUhlenbeckLoad
 from .polynomial_static_load import PolynomialStaticLoad
 from .external_speed_load import ExternalSpeedLoad
+from .streamed_speed_load import StreamedSpeedLoad
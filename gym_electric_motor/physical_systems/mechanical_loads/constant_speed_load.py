@@ -41,6 +41,14 @@ class ConstantSpeedLoad(MechanicalLoad):
         # Docstring of superclass
         return self._ode_result
 
+    def mechanical_ode_batch(self, t, mechanical_states, torque):
+        # Docstring of superclass
+        return np.zeros_like(mechanical_states, dtype=float)
+
     def mechanical_jacobian(self, t, mechanical_state, torque):
         # Docstring of superclass
         return self._jacobian_result
+
+    def mechanical_jacobian_batch(self, t, mechanical_states, torque):
+        # Docstring of superclass
+        return np.zeros((len(mechanical_states), 1, 1)), np.zeros((len(mechanical_states), 1))
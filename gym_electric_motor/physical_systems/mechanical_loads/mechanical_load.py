@@ -76,6 +76,8 @@ class MechanicalLoad(RandomComponent):
 
     #: Parameter indicating if the class is implementing the optional jacobian function
     HAS_JACOBIAN = False
+    #: Attributes that are stacked to arrays when loads with different parameters are simulated in a batch.
+    _batch_parameters = ('_j_total',)
 
     #: _default_initial_state(dict): Default initial motor-state values
     _default_initializer = {}
@@ -208,6 +210,27 @@ class MechanicalLoad(RandomComponent):
         """
         raise NotImplementedError
 
+    def mechanical_ode_batch(self, t, mechanical_states, torque):
+        """
+        Calculation of the derivatives of the mechanical-ODE for a batch of N independent mechanical states.
+
+        The default implementation evaluates the mechanical_ode row by row. Subclasses override it with a
+        vectorized calculation.
+
+        Args:
+            t(float or ndarray(float)): Current time of each system. Shape: () or (N,)
+            mechanical_states(ndarray(float)): Current states of the mechanical systems. Shape: (N, states)
+            torque(ndarray(float)): Generated input torques by the electrical motors. Shape: (N,)
+
+        Returns:
+            ndarray(float): Derivatives of the mechanical states. Shape: (N, states)
+        """
+        t = np.broadcast_to(t, torque.shape)
+        return np.array([
+            np.ravel(self.mechanical_ode(t_, state, torque_))
+            for t_, state, torque_ in zip(t, mechanical_states, torque)
+        ], dtype=float).reshape(mechanical_states.shape)
+
     def mechanical_jacobian(self, t, mechanical_state, torque):
         """
         Calculation of the jacobians of the mechanical-ODE for each of the mechanical state.
@@ -227,6 +250,33 @@ class MechanicalLoad(RandomComponent):
         """
         pass
 
+    def mechanical_jacobian_batch(self, t, mechanical_states, torque):
+        """
+        Calculation of the jacobians of the mechanical-ODE for a batch of N independent mechanical states.
+
+        The default implementation evaluates the mechanical_jacobian row by row. Subclasses override it with a
+        vectorized calculation.
+
+        Args:
+            t(float or ndarray(float)): Current time of each system. Shape: () or (N,)
+            mechanical_states(ndarray(float)): Current states of the mechanical systems. Shape: (N, states)
+            torque(ndarray(float)): Generated input torques by the electrical motors. Shape: (N,)
+
+        Returns:
+            Tuple(ndarray, ndarray):
+                [0]: Derivatives of the mechanical_state-odes over the mechanical_states shape:(N, states, states)
+                [1]: Derivatives of the mechanical_state-odes over the torque shape:(N, states)
+        """
+        t = np.broadcast_to(t, torque.shape)
+        jacobians = [
+            self.mechanical_jacobian(t_, state, torque_)
+            for t_, state, torque_ in zip(t, mechanical_states, torque)
+        ]
+        return (
+            np.array([jacobian[0] for jacobian in jacobians], dtype=float),
+            np.array([jacobian[1] for jacobian in jacobians], dtype=float),
+        )
+
     def get_state_space(self, omega_range):
         """
         Args:
@@ -236,3 +286,7 @@ class MechanicalLoad(RandomComponent):
             Tuple(dict,dict): Lowest and highest possible values for all states normalized to (-1, 1)
         """
         return {'omega': omega_range[0]}, {'omega': omega_range[1]}
+
+    def close(self):
+        """Called, when the physical system is closed to close files, stop threads etc."""
+        pass
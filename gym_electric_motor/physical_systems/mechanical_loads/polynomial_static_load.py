@@ -50,6 +50,7 @@ class PolynomialStaticLoad(MechanicalLoad):
 
     #: Parameter indicating if the class is implementing the optional jacobian function
     HAS_JACOBIAN = True
+    _batch_parameters = ('_j_total', '_a', '_b', '_c', '_omega_lim', '_omega_linear_factor')
 
     @property
     def load_parameter(self):
@@ -101,6 +102,14 @@ class PolynomialStaticLoad(MechanicalLoad):
         total_torque = torque - static_torque
         return np.array([total_torque / self._j_total])
 
+    def mechanical_ode_batch(self, t, mechanical_states, torque):
+        # Docstring of superclass
+        omega = mechanical_states[:, self.OMEGA_IDX]
+        sign = np.sign(omega)
+        a = np.where(np.abs(omega) > self._omega_lim, sign * self._a, self._omega_linear_factor * omega)
+        static_torque = sign * self._c * omega**2 + self._b * omega + a
+        return ((torque - static_torque) / self._j_total)[:, np.newaxis]
+
     def mechanical_jacobian(self, t, mechanical_state, torque):
         # Docstring of superclass
         omega = mechanical_state[self.OMEGA_IDX]
@@ -109,3 +118,12 @@ class PolynomialStaticLoad(MechanicalLoad):
         a = 0 if abs(omega) > self._a * self.tau_decay / self._j_total else self._j_total / self.tau_decay
         return np.array([[(-self._b - 2 * sign * self._c * omega - a) / self._j_total]]), \
             np.array([1 / self._j_total])
+
+    def mechanical_jacobian_batch(self, t, mechanical_states, torque):
+        # Docstring of superclass
+        omega = mechanical_states[:, self.OMEGA_IDX]
+        # Linear region of the constant load term 'a' ?
+        a = np.where(np.abs(omega) > self._omega_lim, 0.0, self._omega_linear_factor)
+        load_jacobian = (-self._b - 2 * np.sign(omega) * self._c * omega - a) / self._j_total
+        torque_derivative = np.ones_like(omega) / self._j_total
+        return load_jacobian[:, np.newaxis, np.newaxis], torque_derivative[:, np.newaxis]
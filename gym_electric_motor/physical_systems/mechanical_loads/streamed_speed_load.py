@@ -0,0 +1,73 @@
+import numpy as np
+import warnings
+
+from .mechanical_load import MechanicalLoad
+from ...trajectory_stream import TrajectoryStream
+
+
+class StreamedSpeedLoad(MechanicalLoad):
+    """
+       Mechanical load that sets the speed to a measured speed profile (e.g. a drive cycle) that is streamed from
+       columnar files.
+
+       The speed profile is read chunk by chunk with a
+       :py:class:`~gym_electric_motor.trajectory_stream.TrajectoryStream` and resampled to tau, so that long profiles
+       are not loaded completely into the memory. Between the steps, the speed is interpolated linearly. After the end
+       of the profile, the last speed is held.
+    """
+
+    HAS_JACOBIAN = False
+
+    @property
+    def omega(self):
+        """
+        Returns:
+            float: The speed omega in rad/s at the start of the profile.
+        """
+        return self._omega_initial
+
+    def __init__(
+        self, source, sample_time, column='omega', tau=1e-4, start_time=0.0, chunk_size=65536, read_ahead=True,
+        load_initializer=None, **kwargs
+    ):
+        """
+        Args:
+            source(str or dict(str, array-like)): Directory with one .npy-file per column or mapping of the column
+                names to one-dimensional arrays. See :py:class:`~gym_electric_motor.trajectory_stream.TrajectoryStream`
+            sample_time(float): Time between two samples of the source in seconds.
+            column(str): Name of the column with the speed in rad/s.
+            tau(float): discrete time step of the system
+            start_time(float): Time of the source in seconds at which each episode starts.
+            chunk_size(int): Number of steps that are read at once.
+            read_ahead(bool): Flag, if the next chunk is read in a background thread.
+            kwargs(dict): Arguments to be passed to superclass :py:class:`.MechanicalLoad`
+        """
+        super().__init__(**kwargs)
+        if load_initializer is not None:
+            warnings.warn(
+                'Given initializer will be overwritten with starting value from the speed profile, to avoid '
+                'complications at the load reset.',
+                UserWarning)
+        self._tau = tau
+        self._stream = TrajectoryStream(source, sample_time, [column], start_time, chunk_size, read_ahead)
+        self._stream.set_output(tau)
+        self._omega_initial = float(self._stream.window(0)[0, 0])
+
+    def mechanical_ode(self, t, mechanical_state, torque=None):
+        # Docstring of superclass
+        # The derivative leads the speed to the next speed of the profile with the euler-forward method
+        omega_next = self._stream.value_at(t + self._tau)[0]
+        return np.array([(1 / self._tau) * (omega_next - mechanical_state[self.OMEGA_IDX])])
+
+    def mechanical_jacobian(self, t, mechanical_state, torque):
+        # Docstring of superclass
+        # jacobian here not necessary, since omega is externally given
+        return None
+
+    def reset(self, **kwargs):
+        # Docstring of superclass
+        return np.array([self._omega_initial])
+
+    def close(self):
+        # Docstring of superclass
+        self._stream.close()
@@ -1,11 +1,12 @@
 import numpy as np
-from gym.spaces import Box
+from gym.spaces import Box, Discrete
 import warnings
 
 import gym_electric_motor as gem
 from ..random_component import RandomComponent
 from ..core import PhysicalSystem
 from ..utils import set_state_array
+from .converters import FiniteConverter
 
 
 class SCMLSystem(PhysicalSystem, RandomComponent):
@@ -20,6 +21,9 @@ class SCMLSystem(PhysicalSystem, RandomComponent):
     VOLTAGES_IDX = []
     U_SUP_IDX = -1
 
+    _state_attributes = PhysicalSystem._state_attributes + ('_t',)
+    _state_components = ('_converter', '_electrical_motor', '_mechanical_load', '_supply', '_ode_solver')
+
     @property
     def limits(self):
         return self._limits
@@ -48,6 +52,11 @@ class SCMLSystem(PhysicalSystem, RandomComponent):
         """The mechanical load instance in the system"""
         return self._mechanical_load
 
+    @property
+    def ode_solver(self):
+        """The ode solver instance of the system"""
+        return self._ode_solver
+
     def __init__(self, converter, motor, load, supply, ode_solver, tau=1e-4, calc_jacobian=None):
         """
         Args:
@@ -80,6 +89,7 @@ class SCMLSystem(PhysicalSystem, RandomComponent):
         self._mechanical_load.set_j_rotor(self._electrical_motor.motor_parameter['j_rotor'])
         self._t = 0
         self._set_indices()
+        self._set_slices()
         state_space = self._build_state_space(state_names)
         super().__init__(self._converter.action_space, state_space, state_names, tau)
         self._limits = np.zeros_like(state_names, dtype=float)
@@ -88,8 +98,8 @@ class SCMLSystem(PhysicalSystem, RandomComponent):
         self._set_nominal_state()
         self.system_state = np.zeros_like(state_names, dtype=float)
         self._system_eq_placeholder = None
-        self._motor_deriv_size = None
-        self._load_deriv_size = None
+        # Batched systems that predict the states of all actions. Key: Number of simulated drives.
+        self._predictors = {}
         self._components = [
             self._supply, self._converter, self._electrical_motor, self._mechanical_load, self._ode_solver
         ]
@@ -151,6 +161,33 @@ class SCMLSystem(PhysicalSystem, RandomComponent):
         self.VOLTAGES_IDX = list(range(voltages_lower, voltages_upper))
         self.U_SUP_IDX = list(range(voltages_upper, voltages_upper + self._supply.voltage_len))
 
+    def _set_slices(self):
+        """
+        Setting of slices for the contiguous index ranges to access the arrays as views during the simulation.
+        """
+        self._load_ode_slice = self._index_slice(self._load_ode_idx)
+        self._motor_ode_slice = self._index_slice(self._motor_ode_idx)
+        self._ode_currents_slice = self._index_slice(self._ode_currents_idx)
+        self._currents_slice = self._index_slice(self.CURRENTS_IDX)
+        self._voltages_slice = self._index_slice(self.VOLTAGES_IDX)
+        self._u_sup_slice = self._index_slice(self.U_SUP_IDX)
+
+    @staticmethod
+    def _index_slice(indices):
+        """
+        Returns a slice for contiguous ascending indices. Otherwise, the indices are returned as index array.
+
+        Args:
+            indices(list(int)): Indices of the states in an array.
+
+        Returns:
+            slice or ndarray(int): The index of the states.
+        """
+        indices = np.array(indices, dtype=int)
+        if len(indices) > 0 and np.all(np.diff(indices) == 1):
+            return slice(int(indices[0]), int(indices[-1]) + 1)
+        return indices
+
     def seed(self, seed=None):
         RandomComponent.seed(self, seed)
         sub_seeds = self.seed_sequence.spawn(len(self._components))
@@ -161,37 +198,91 @@ class SCMLSystem(PhysicalSystem, RandomComponent):
     def simulate(self, action, *_, **__):
         # Docstring of superclass
         ode_state = self._ode_solver.y
-        i_in = self._electrical_motor.i_in(ode_state[self._ode_currents_idx])
+        i_in = self._electrical_motor.i_in(ode_state[self._ode_currents_slice])
         switching_times = self._converter.set_action(action, self._t)
 
         for t in switching_times[:-1]:
-            i_sup = self._converter.i_sup(i_in)
-            u_sup = self._supply.get_voltage(self._t, i_sup)
-            u_in = self._converter.convert(i_in, self._ode_solver.t)
-            u_in = [u * u_s for u in u_in for u_s in u_sup]
+            u_in, u_sup = self._input_voltages(i_in)
             self._ode_solver.set_f_params(u_in)
             ode_state = self._ode_solver.integrate(t)
-            i_in = self._electrical_motor.i_in(ode_state[self._ode_currents_idx])
-        
-        i_sup = self._converter.i_sup(i_in)
-        u_sup = self._supply.get_voltage(self._t, i_sup)
-        u_in = self._converter.convert(i_in, self._ode_solver.t)
-        u_in = [u * u_s for u in u_in for u_s in u_sup]
+            i_in = self._electrical_motor.i_in(ode_state[self._ode_currents_slice])
+
+        u_in, u_sup = self._input_voltages(i_in)
         self._ode_solver.set_f_params(u_in)
         ode_state = self._ode_solver.integrate(self._t + self._tau)
         self._t = self._ode_solver.t
         self._k += 1
-        torque = self._electrical_motor.torque(ode_state[self._motor_ode_idx])
-
-        n_mech_states = len(self.mechanical_load.state_names)
-        motor_state = ode_state[n_mech_states:]
-        self.system_state[:n_mech_states] = ode_state[:n_mech_states]
-        self.system_state[self.TORQUE_IDX] = torque
-        self.system_state[self.CURRENTS_IDX] = \
-            motor_state[self._electrical_motor.CURRENTS_IDX]
-        self.system_state[self.VOLTAGES_IDX] = u_in
-        self.system_state[self.U_SUP_IDX] = u_sup
-        return self.system_state / self._limits
+        motor_state = ode_state[self._motor_ode_slice]
+
+        system_state = self.system_state
+        system_state[self._load_ode_slice] = ode_state[self._load_ode_slice]
+        system_state[self.TORQUE_IDX] = self._electrical_motor.torque(motor_state)
+        system_state[self._currents_slice] = motor_state[self._electrical_motor.CURRENTS_IDX]
+        system_state[self._voltages_slice] = u_in
+        system_state[self._u_sup_slice] = u_sup
+        return system_state / self._limits
+
+    def simulate_all_actions(self, horizon=1):
+        """
+        Predicts the states of the next steps for all action sequences of a finite converter.
+
+        The output voltages of every switching state are taken from the ``switching_voltages`` of the converter and
+        all branches of a step are integrated at once by a BatchedSCMLSystem. Therefore, the prediction of all actions
+        (e.g. 8 for a B6 bridge) costs roughly as much as a single step. Interlocking times are neglected and the
+        supply voltage is evaluated once per step with the present switching state of the converter.
+        The state of the physical system is not changed.
+
+        The batched systems are created at the first call and reused afterwards. Therefore, changes of the motor or
+        load parameters are not considered by later predictions.
+
+        Args:
+            horizon(int): Number of steps to predict.
+
+        Returns:
+            ndarray(float): The normalized states after each step of each action sequence. The sequences are in the
+            order of ``gym_electric_motor.rollout.all_action_sequences``. Shape: (actions ** horizon, horizon, states)
+        """
+        assert isinstance(self._converter, FiniteConverter), \
+            'All actions can only be simulated for finite converters.'
+        assert horizon >= 1, 'At least one step has to be predicted.'
+        space = self._converter.action_space
+        num_actions = space.n if isinstance(space, Discrete) else int(np.prod(space.nvec))
+        ode_state = self._ode_solver.y.reshape(1, -1)
+        i_sup = self._converter.i_sup(self._predictor(num_actions)._converter_currents(ode_state)[0])
+        supply_state = self._supply.get_state()
+        states = np.empty((num_actions ** horizon, horizon, len(self._state_names)))
+        t = self._t
+        for step in range(horizon):
+            u_sup = self._supply.get_voltage(t, i_sup)
+            state, ode_state = self._predictor(num_actions ** (step + 1)).simulate_switching_states(ode_state, t, u_sup)
+            states[:, step] = np.repeat(state, num_actions ** (horizon - step - 1), axis=0)
+            t += self._tau
+        self._supply.set_state(supply_state)
+        return states
+
+    def _predictor(self, num_systems):
+        """Returns the cached batched system that simulates num_systems copies of this system."""
+        if num_systems not in self._predictors:
+            self._predictors[num_systems] = gem.physical_systems.BatchedSCMLSystem.make([self] * num_systems)
+        return self._predictors[num_systems]
+
+    def _input_voltages(self, i_in):
+        """
+        Calculates the supply voltage and the input voltages of the motor for the current switching state of the
+        converter.
+
+        Args:
+            i_in(list(float)): Input currents of the motor
+
+        Returns:
+            Tuple(list(float), list(float)): The input voltages of the motor and the supply voltage.
+        """
+        u_sup = self._supply.get_voltage(self._t, self._converter.i_sup(i_in))
+        u_in = self._converter.convert(i_in, self._ode_solver.t)
+        if len(u_sup) == 1:
+            u_s = u_sup[0]
+            return [u * u_s for u in u_in], u_sup
+        return [u * u_s for u in u_in for u_s in u_sup], u_sup
 
     def _system_equation(self, t, state, u_in, **__):
         """
@@ -208,30 +299,14 @@ class SCMLSystem(PhysicalSystem, RandomComponent):
             ndarray(float): The derivatives of the ODE-State. Based on this, the Ode Solver calculates the next state.
         """
         if self._system_eq_placeholder is None:
-            motor_state = state[self._motor_ode_idx]
-            motor_derivative = self._electrical_motor.electrical_ode(
-                motor_state, u_in, state[self._omega_ode_idx]
-            )
-            torque = self._electrical_motor.torque(motor_state)
-            load_derivative = self._mechanical_load.mechanical_ode(
-                t, state[self._load_ode_idx], torque
-            )
-            self._system_eq_placeholder = np.concatenate((load_derivative,
-                                                          motor_derivative))
-            self._motor_deriv_size = motor_derivative.size
-            self._load_deriv_size = load_derivative.size
-        else:
-            motor_state = state[self._motor_ode_idx]
-            self._system_eq_placeholder[:self._load_deriv_size] = \
-                self._mechanical_load.mechanical_ode(
-                    t, state[self._load_ode_idx],
-                    self._electrical_motor.torque(motor_state)
-                ).ravel()
-            self._system_eq_placeholder[self._load_deriv_size:] = \
-                self._electrical_motor.electrical_ode(
-                    motor_state, u_in, state[self._omega_ode_idx]
-                ).ravel()
-
+            self._system_eq_placeholder = np.zeros(len(state))
+        motor_state = state[self._motor_ode_slice]
+        self._system_eq_placeholder[self._load_ode_slice] = self._mechanical_load.mechanical_ode(
+            t, state[self._load_ode_slice], self._electrical_motor.torque(motor_state)
+        )
+        self._system_eq_placeholder[self._motor_ode_slice] = self._electrical_motor.electrical_ode(
+            motor_state, u_in, state[self._omega_ode_idx]
+        )
         return self._system_eq_placeholder
 
     def _system_jacobian(self, t, state, u_in, **__):
@@ -284,6 +359,10 @@ class SCMLSystem(PhysicalSystem, RandomComponent):
         ))
         return system_state / self._limits
 
+    def close(self):
+        # Docstring of superclass
+        self._mechanical_load.close()
+
 
 class DcMotorSystem(SCMLSystem):
     """
@@ -319,7 +398,34 @@ class DcMotorSystem(SCMLSystem):
 class ThreePhaseMotorSystem(SCMLSystem):
     """
     SCML-System that implements the basic transformations needed for three phase drives.
+
+    The transformations between the abc-, alphabeta- and dq-space compute the sine and cosine of the angle only once.
+    The transformation matrices of the last angle are cached, because the same angle is used for several quantities
+    within a simulation step. Every transformation into or out of the dq-space also accepts a batch of angles of shape
+    (N,) together with quantities of shape (N, 3) or (N, 2).
     """
+
+    _cached_epsilon = None
+    _cached_matrices = None
+
+    def _transformation_matrices(self, epsilon_el):
+        """
+        Returns the matrices of the dq-transformations of the electrical angle.
+
+        Args:
+            epsilon_el(float or ndarray(float)): Electrical angle of the motor. Either a scalar or a batch of shape (N,).
+
+        Returns:
+            tuple(ndarray(float), ndarray(float), ndarray(float)): The matrices of
+            :meth:`ThreePhaseMotor.transformation_matrices`.
+        """
+        if isinstance(epsilon_el, np.ndarray) and epsilon_el.ndim > 0:
+            return self._electrical_motor.transformation_matrices(epsilon_el)
+        if epsilon_el != self._cached_epsilon:
+            self._cached_matrices = self._electrical_motor.transformation_matrices(epsilon_el)
+            self._cached_epsilon = epsilon_el
+        return self._cached_matrices
+
     def abc_to_alphabeta_space(self, abc_quantities):
         """
         Transformation from abc to alphabeta space
@@ -358,9 +464,10 @@ class ThreePhaseMotorSystem(SCMLSystem):
             (quantity_d, quantity_q): The quantities in the dq-space
         """
         if normed_epsilon:
-            epsilon_el *= np.pi
-        dq_quantity = self._electrical_motor.q_inv(self._electrical_motor.t_23(abc_quantities), epsilon_el)
-        return dq_quantity
+            epsilon_el = epsilon_el * np.pi
+        return self._electrical_motor.apply_transformation(
+            self._transformation_matrices(epsilon_el)[1], abc_quantities
+        )
 
     def dq_to_abc_space(self, dq_quantities, epsilon_el, normed_epsilon=False):
         """
@@ -375,8 +482,10 @@ class ThreePhaseMotorSystem(SCMLSystem):
             (quantity_a, quantity_b, quantity_c): The quantities in the abc-space
         """
         if normed_epsilon:
-            epsilon_el *= np.pi
-        return self._electrical_motor.t_32(self._electrical_motor.q(dq_quantities, epsilon_el))
+            epsilon_el = epsilon_el * np.pi
+        return self._electrical_motor.apply_transformation(
+            self._transformation_matrices(epsilon_el)[2], dq_quantities
+        )
 
     def alphabeta_to_dq_space(self, alphabeta_quantities, epsilon_el, normed_epsilon=False):
         """
@@ -391,9 +500,10 @@ class ThreePhaseMotorSystem(SCMLSystem):
             (quantity_d, quantity_q): The quantities in the dq-space
         """
         if normed_epsilon:
-            epsilon_el *= np.pi
-        dq_quantity = self._electrical_motor.q_inv(alphabeta_quantities, epsilon_el)
-        return dq_quantity
+            epsilon_el = epsilon_el * np.pi
+        return self._electrical_motor.apply_transformation(
+            np.swapaxes(self._transformation_matrices(epsilon_el)[0], -1, -2), alphabeta_quantities
+        )
 
     def dq_to_alphabeta_space(self, dq_quantities, epsilon_el, normed_epsilon=False):
         """
@@ -408,8 +518,10 @@ class ThreePhaseMotorSystem(SCMLSystem):
             (quantity_alpha, quantity_beta): The quantities in the alphabeta-space
         """
         if normed_epsilon:
-            epsilon_el *= np.pi
-        return self._electrical_motor.q(dq_quantities, epsilon_el)
+            epsilon_el = epsilon_el * np.pi
+        return self._electrical_motor.apply_transformation(
+            self._transformation_matrices(epsilon_el)[0], dq_quantities
+        )
 
 
 class SynchronousMotorSystem(ThreePhaseMotorSystem):
@@ -475,47 +587,39 @@ class SynchronousMotorSystem(ThreePhaseMotorSystem):
         eps = ode_state[self._ode_epsilon_idx]
         if self.control_space == 'dq':
             action = self.dq_to_abc_space(action, eps)
-        i_in = self.dq_to_abc_space(self._electrical_motor.i_in(ode_state[self._ode_currents_idx]), eps)
+        i_in = self.dq_to_abc_space(self._electrical_motor.i_in(ode_state[self._ode_currents_slice]), eps)
         switching_times = self._converter.set_action(action, self._t)
 
         for t in switching_times[:-1]:
-            i_sup = self._converter.i_sup(i_in)
-            u_sup = self._supply.get_voltage(self._t, i_sup)
-            u_in = self._converter.convert(i_in, self._ode_solver.t)
-            u_in = [u * u_s for u in u_in for u_s in u_sup]
+            u_in, u_sup = self._input_voltages(i_in)
             u_dq = self.abc_to_dq_space(u_in, eps)
             self._ode_solver.set_f_params(u_dq)
             ode_state = self._ode_solver.integrate(t)
             eps = ode_state[self._ode_epsilon_idx]
-            i_in = self.dq_to_abc_space(self._electrical_motor.i_in(ode_state[self._ode_currents_idx]), eps)
+            i_in = self.dq_to_abc_space(self._electrical_motor.i_in(ode_state[self._ode_currents_slice]), eps)
 
-        i_sup = self._converter.i_sup(i_in)
-        u_sup = self._supply.get_voltage(self._t, i_sup)
-        u_in = self._converter.convert(i_in, self._ode_solver.t)
-        u_in = [u * u_s for u in u_in for u_s in u_sup]
+        u_in, u_sup = self._input_voltages(i_in)
         u_dq = self.abc_to_dq_space(u_in, eps)
         self._ode_solver.set_f_params(u_dq)
         ode_state = self._ode_solver.integrate(self._t + self._tau)
         self._t = self._ode_solver.t
         self._k += 1
-        torque = self._electrical_motor.torque(ode_state[self._motor_ode_idx])
-        mechanical_state = ode_state[self._load_ode_idx]
-        i_dq = ode_state[self._ode_currents_idx]
-        i_abc = list(
-            self.dq_to_abc_space(i_dq, eps)
-        )
-        eps = ode_state[self._ode_epsilon_idx] % (2 * np.pi)
-        if eps > np.pi:
-            eps -= 2 * np.pi
-
-        system_state = np.concatenate((
-            mechanical_state,
-            [torque],
-            i_abc, i_dq,
-            u_in, u_dq,
-            [eps],
-            u_sup
-        ))
+        i_dq = ode_state[self._ode_currents_slice]
+        eps_new = ode_state[self._ode_epsilon_idx] % (2 * np.pi)
+        if eps_new > np.pi:
+            eps_new -= 2 * np.pi
+
+        currents = self.CURRENTS_IDX[0]
+        voltages = self.VOLTAGES_IDX[0]
+        system_state = self.system_state
+        system_state[self._load_ode_slice] = ode_state[self._load_ode_slice]
+        system_state[self.TORQUE_IDX] = self._electrical_motor.torque(ode_state[self._motor_ode_slice])
+        system_state[currents:currents + 3] = self.dq_to_abc_space(i_dq, eps)
+        system_state[currents + 3:currents + 5] = i_dq
+        system_state[voltages:voltages + 3] = u_in
+        system_state[voltages + 3:voltages + 5] = u_dq
+        system_state[self.EPSILON_IDX] = eps_new
+        system_state[self._u_sup_slice] = u_sup
         return system_state / self._limits
 
     def reset(self, *_):
@@ -598,51 +702,55 @@ class ExternallyExcitedSynchronousMotorSystem(SynchronousMotorSystem):
         # Docstring of superclass
         ode_state = self._ode_solver.y
         eps = ode_state[self._ode_epsilon_idx]
-        i_in_dq_e = self._electrical_motor.i_in(ode_state[self._ode_currents_idx])
-        i_in_abc_e = list(self.dq_to_abc_space(i_in_dq_e[:2], eps)) + list(i_in_dq_e[2:])
+        i_in_abc_e = self._abc_e_currents(ode_state, eps)
         switching_times = self._converter.set_action(action, self._t)
 
         for t in switching_times[:-1]:
-            i_sup = self._converter.i_sup(i_in_abc_e)
-            u_sup = self._supply.get_voltage(self._t, i_sup)
-            u_in = self._converter.convert(i_in_abc_e, self._ode_solver.t)
-            u_in = [u * u_s for u in u_in for u_s in u_sup]
-            u_dq_e = list(self.abc_to_dq_space(u_in[:2], eps)) + u_in[2:]
+            u_in, u_sup = self._input_voltages(i_in_abc_e)
+            u_dq_e = np.concatenate((self.abc_to_dq_space(u_in[:3], eps), u_in[3:]))
             self._ode_solver.set_f_params(u_dq_e)
             ode_state = self._ode_solver.integrate(t)
             eps = ode_state[self._ode_epsilon_idx]
-            i_in_dq_e = self._electrical_motor.i_in(ode_state[self._ode_currents_idx])
-            i_in_abc_e = list(self.dq_to_abc_space(i_in_dq_e[:2], eps)) + i_in_dq_e[2:]
- 
-        i_sup = self._converter.i_sup(i_in_abc_e)
-        u_sup = self._supply.get_voltage(self._t, i_sup)
-        u_in = self._converter.convert(i_in_abc_e, self._ode_solver.t)
-        u_in = [u * u_s for u in u_in for u_s in u_sup]
+            i_in_abc_e = self._abc_e_currents(ode_state, eps)
+
+        u_in, u_sup = self._input_voltages(i_in_abc_e)
         u_dq_e = np.concatenate((self.abc_to_dq_space(u_in[:3], eps), u_in[3:]))
         self._ode_solver.set_f_params(u_dq_e)
         ode_state = self._ode_solver.integrate(self._t + self._tau)
         self._t = self._ode_solver.t
         self._k += 1
-        torque = self._electrical_motor.torque(ode_state[self._motor_ode_idx])
-        mechanical_state = ode_state[self._load_ode_idx]
-        i_dq_e = ode_state[self._ode_currents_idx]
-        i_abc = list(
-            self.dq_to_abc_space(i_dq_e[:2], eps)
-        )
-        eps = ode_state[self._ode_epsilon_idx] % (2 * np.pi)
-        if eps > np.pi:
-            eps -= 2 * np.pi
-
-        system_state = np.concatenate((
-            mechanical_state,
-            [torque],
-            i_abc, i_dq_e,
-            u_in[:3], u_dq_e,
-            [eps],
-            u_sup
-        ))
+        i_dq_e = ode_state[self._ode_currents_slice]
+        eps_new = ode_state[self._ode_epsilon_idx] % (2 * np.pi)
+        if eps_new > np.pi:
+            eps_new -= 2 * np.pi
+
+        currents = self.CURRENTS_IDX[0]
+        voltages = self.VOLTAGES_IDX[0]
+        system_state = self.system_state
+        system_state[self._load_ode_slice] = ode_state[self._load_ode_slice]
+        system_state[self.TORQUE_IDX] = self._electrical_motor.torque(ode_state[self._motor_ode_slice])
+        system_state[currents:currents + 3] = self.dq_to_abc_space(i_dq_e[:2], eps)
+        system_state[currents + 3:currents + 6] = i_dq_e
+        system_state[voltages:voltages + 3] = u_in[:3]
+        system_state[voltages + 3:voltages + 6] = u_dq_e
+        system_state[self.EPSILON_IDX] = eps_new
+        system_state[self._u_sup_slice] = u_sup
         return system_state / self._limits
 
+    def _abc_e_currents(self, ode_state, eps):
+        """
+        Calculates the input currents of the converter.
+
+        Args:
+            ode_state(ndarray(float)): The current ODE-State of the system
+            eps(float): Electrical angle of the motor
+
+        Returns:
+            list(float): The currents [i_a, i_b, i_c, i_e]
+        """
+        i_in_dq_e = self._electrical_motor.i_in(ode_state[self._ode_currents_slice])
+        return [*self.dq_to_abc_space(i_in_dq_e[:2], eps), *i_in_dq_e[2:]]
+
     def reset(self, *_):
         # Docstring of superclass
         motor_state = self._electrical_motor.reset(
@@ -744,46 +852,40 @@ class SquirrelCageInductionMotorSystem(ThreePhaseMotorSystem):
         if self.control_space == 'dq':
             action = self.dq_to_abc_space(action, eps_fs)
 
-        i_in = self.alphabeta_to_abc_space(self._electrical_motor.i_in(ode_state[self._ode_currents_idx]))
+        i_in = self.alphabeta_to_abc_space(self._electrical_motor.i_in(ode_state[self._ode_currents_slice]))
         switching_times = self._converter.set_action(action, self._t)
 
         for t in switching_times[:-1]:
-            i_sup = self._converter.i_sup(i_in)
-            u_sup = self._supply.get_voltage(self._t, i_sup)
-            u_in = self._converter.convert(i_in, self._ode_solver.t)
-            u_in = [u * u_s for u in u_in for u_s in u_sup]
+            u_in, u_sup = self._input_voltages(i_in)
             u_alphabeta = self.abc_to_alphabeta_space(u_in)
             self._ode_solver.set_f_params(u_alphabeta)
             ode_state = self._ode_solver.integrate(t)
             eps_fs = self.calculate_field_angle(ode_state)
-            i_in = self.alphabeta_to_abc_space(self._electrical_motor.i_in(ode_state[self._ode_currents_idx]))
+            i_in = self.alphabeta_to_abc_space(self._electrical_motor.i_in(ode_state[self._ode_currents_slice]))
 
-        i_sup = self._converter.i_sup(i_in)
-        u_sup = self._supply.get_voltage(self._t, i_sup)
-        u_in = self._converter.convert(i_in, self._ode_solver.t)
-        u_in = [u * u_s for u in u_in for u_s in u_sup]
+        u_in, u_sup = self._input_voltages(i_in)
         u_dq = self.abc_to_dq_space(u_in, eps_fs)
         u_alphabeta = self.abc_to_alphabeta_space(u_in)
         self._ode_solver.set_f_params(u_alphabeta)
         ode_state = self._ode_solver.integrate(self._t + self._tau)
         self._t = self._ode_solver.t
         self._k += 1
-        torque = self._electrical_motor.torque(ode_state[self._motor_ode_idx])
-        mechanical_state = ode_state[self._load_ode_idx]
-        i_dq = self.alphabeta_to_dq_space(ode_state[self._ode_currents_idx], eps_fs)
-        i_abc = list(self.dq_to_abc_space(i_dq, eps_fs))
-
+        i_dq = self.alphabeta_to_dq_space(ode_state[self._ode_currents_slice], eps_fs)
         eps = ode_state[self._ode_epsilon_idx] % (2 * np.pi)
         if eps > np.pi:
             eps -= 2 * np.pi
 
-        system_state = np.concatenate((
-            mechanical_state, [torque],
-            i_abc, i_dq,
-            u_in, u_dq,
-            [eps],
-            u_sup
-        ))
+        currents = self.CURRENTS_IDX[0]
+        voltages = self.VOLTAGES_IDX[0]
+        system_state = self.system_state
+        system_state[self._load_ode_slice] = ode_state[self._load_ode_slice]
+        system_state[self.TORQUE_IDX] = self._electrical_motor.torque(ode_state[self._motor_ode_slice])
+        system_state[currents:currents + 3] = self.dq_to_abc_space(i_dq, eps_fs)
+        system_state[currents + 3:currents + 5] = i_dq
+        system_state[voltages:voltages + 3] = u_in
+        system_state[voltages + 3:voltages + 5] = u_dq
+        system_state[self.EPSILON_IDX] = eps
+        system_state[self._u_sup_slice] = u_sup
         return system_state / self._limits
 
     def reset(self, *_):
@@ -936,15 +1038,12 @@ class DoublyFedInductionMotorSystem(ThreePhaseMotorSystem):
         eps_field = self.calculate_field_angle(ode_state)
         eps_el = ode_state[self._ode_epsilon_idx]
 
-        i_sabc = self.alphabeta_to_abc_space(self._electrical_motor.i_in(ode_state[self._ode_currents_idx]))
+        i_sabc = self.alphabeta_to_abc_space(self._electrical_motor.i_in(ode_state[self._ode_currents_slice]))
         i_rdef = self.alphabeta_to_abc_space(self.calculate_rotor_current(ode_state))
         switching_times = self._converter.set_action(action, self._t)
 
         for t in switching_times[:-1]:
-            i_sup = self._converter.i_sup(np.concatenate((i_sabc, i_rdef)))
-            u_sup = self._supply.get_voltage(self._t, i_sup)
-            u_in = self._converter.convert(np.concatenate([i_sabc, i_rdef]).tolist(), self._ode_solver.t)
-            u_in = [u * u_s for u in u_in for u_s in u_sup]
+            u_in, u_sup = self._input_voltages([*i_sabc, *i_rdef])
             u_sabc = u_in[self.stator_voltage_low_idx:self.stator_voltage_high_idx]
             u_rdef = u_in[self.rotor_voltage_low_idx:self.rotor_voltage_high_idx]
             u_rdq = self.abc_to_dq_space(u_rdef, eps_field-eps_el)
@@ -957,13 +1056,10 @@ class DoublyFedInductionMotorSystem(ThreePhaseMotorSystem):
 
             eps_field = self.calculate_field_angle(ode_state)
             eps_el = ode_state[self._ode_epsilon_idx]
-            i_sabc = self.alphabeta_to_abc_space(self._electrical_motor.i_in(ode_state[self._ode_currents_idx]))
+            i_sabc = self.alphabeta_to_abc_space(self._electrical_motor.i_in(ode_state[self._ode_currents_slice]))
             i_rdef = self.alphabeta_to_abc_space(self.calculate_rotor_current(ode_state))
-            
-        i_sup = self._converter.i_sup(np.concatenate((i_sabc, i_rdef)))
-        u_sup = self._supply.get_voltage(self._t, i_sup)
-        u_in = self._converter.convert(np.concatenate([i_sabc, i_rdef]).tolist(), self._ode_solver.t)
-        u_in = [u * u_s for u in u_in for u_s in u_sup]
+
+        u_in, u_sup = self._input_voltages([*i_sabc, *i_rdef])
         u_sabc = u_in[self.stator_voltage_low_idx:self.stator_voltage_high_idx]
         u_rdef = u_in[self.rotor_voltage_low_idx:self.rotor_voltage_high_idx]
         u_sdq = self.abc_to_dq_space(u_sabc, eps_field)
@@ -976,29 +1072,29 @@ class DoublyFedInductionMotorSystem(ThreePhaseMotorSystem):
         ode_state = self._ode_solver.integrate(self._t + self._tau)
         self._t = self._ode_solver.t
         self._k += 1
-        torque = self._electrical_motor.torque(ode_state[self._motor_ode_idx])
-        mechanical_state = ode_state[self._load_ode_idx]
-
-        i_sdq = self.alphabeta_to_dq_space(ode_state[self._ode_currents_idx], eps_field)
-        i_sabc = list(self.dq_to_abc_space(i_sdq, eps_field))
 
+        i_sdq = self.alphabeta_to_dq_space(ode_state[self._ode_currents_slice], eps_field)
         i_rdq = self.alphabeta_to_dq_space(self.calculate_rotor_current(ode_state), eps_field)
-        i_rdef = list(self.dq_to_abc_space(i_rdq, eps_field-eps_el))
+
+        currents = self.CURRENTS_IDX[0]
+        voltages = self.VOLTAGES_IDX[0]
+        system_state = self.system_state
+        system_state[self._load_ode_slice] = ode_state[self._load_ode_slice]
+        system_state[self.TORQUE_IDX] = self._electrical_motor.torque(ode_state[self._motor_ode_slice])
+        system_state[currents:currents + 3] = self.dq_to_abc_space(i_sdq, eps_field)
+        system_state[currents + 3:currents + 5] = i_sdq
+        system_state[currents + 5:currents + 8] = self.dq_to_abc_space(i_rdq, eps_field-eps_el)
+        system_state[currents + 8:currents + 10] = i_rdq
+        system_state[voltages:voltages + 3] = u_sabc
+        system_state[voltages + 3:voltages + 5] = u_sdq
+        system_state[voltages + 5:voltages + 8] = u_rdef
+        system_state[voltages + 8:voltages + 10] = u_rdq
 
         eps_el = ode_state[self._ode_epsilon_idx] % (2 * np.pi)
         if eps_el > np.pi:
             eps_el -= 2 * np.pi
-
-        system_state = np.concatenate((
-            mechanical_state,
-            [torque],
-            i_sabc, i_sdq,
-            i_rdef, i_rdq,
-            u_sabc, u_sdq,
-            u_rdef, u_rdq,
-            [eps_el],
-            u_sup,
-        ))
+        system_state[self.EPSILON_IDX] = eps_el
+        system_state[self._u_sup_slice] = u_sup
         return system_state / self._limits
 
     def reset(self, *_):
@@ -1,11 +1,19 @@
-from scipy.integrate import ode, solve_ivp, odeint
+from collections import OrderedDict
 
+import numpy as np
+from scipy.integrate import ode, solve_ivp, odeint, RK23, RK45, DOP853, Radau, BDF, LSODA
+from scipy.linalg import expm
 
-class OdeSolver:
+from ..stateful_component import StatefulComponent
+
+
+class OdeSolver(StatefulComponent):
     """
     Interface and base class for all used OdeSolvers in gym-electric-motor.
     """
 
+    _state_attributes = ('_t', '_y', '_f_params', '_nfev')
+
     #: Current system time t
     _t = 0
     #: Current system state y
@@ -16,6 +24,8 @@ class OdeSolver:
     _system_equation = None
     #: System jacobian in the form _system_jacobian(t,y, *f_params)
     _system_jacobian = None
+    #: Number of evaluations of the system equation. None, if the solver does not count them.
+    _nfev = None
 
     @property
     def t(self):
@@ -33,6 +43,15 @@ class OdeSolver:
         """
         return self._y
 
+    @property
+    def nfev(self):
+        """
+        Returns:
+            int or None: Number of evaluations of the system equation since the creation of the solver.
+            None, if the solver does not expose the number of evaluations.
+        """
+        return self._nfev
+
     def set_initial_value(self, initial_value, t=0):
         """
         Set the new initial system state after reset.
@@ -94,10 +113,12 @@ class EulerSolver(OdeSolver):
                 but take also longer to compute.
         """
         self._nsteps = nsteps
+        self._nfev = 0
         self._integrate = self._integrate_one_step if nsteps == 1 else self._integrate_nsteps
 
     def integrate(self, t):
         # Docstring of superclass
+        self._nfev += self._nsteps
         return self._integrate(t)
 
     def _integrate_nsteps(self, t):
@@ -136,6 +157,227 @@ class EulerSolver(OdeSolver):
         return self._y
 
 
+class ExplicitRungeKuttaSolver(OdeSolver):
+    """
+    Base class for explicit Runge-Kutta solvers with a fixed step size.
+
+    The solvers are defined by their Butcher tableau with the coefficients a, b and c. Each call of integrate performs
+    nsteps Runge-Kutta steps of equal size h:
+
+        .. math:
+            k_i = f(t + c_i h, x(t) + h \\sum_{j<i} a_{ij} k_j)
+
+        .. math:
+            x(t + h) = x(t) + h \\sum_i b_i k_i
+
+    The stage and state arrays are allocated in set_initial_value and reused in every integration step, so that the
+    solver itself does not allocate any arrays during the integration. Therefore, the state returned by integrate is
+    only valid until the next but one call of integrate and has to be copied, if it shall be stored.
+    """
+
+    #: Coefficients of the stages in the Butcher tableau (stages x stages)
+    _a = np.zeros((1, 1))
+    #: Weights of the stages to calculate the next state (stages,)
+    _b = np.ones(1)
+    #: Fractions of the step size at which the stages are evaluated (stages,)
+    _c = np.zeros(1)
+
+    def __init__(self, nsteps=1):
+        """
+        Args:
+            nsteps(int): Number of Runge-Kutta steps to calculate for each iteration. Higher steps make the system more
+                accurate, but take also longer to compute.
+        """
+        assert nsteps >= 1, 'At least one step has to be calculated in each iteration.'
+        self._nsteps = nsteps
+        self._a_h = np.zeros_like(self._a)
+        self._b_h = np.zeros_like(self._b)
+        self._stages = None
+        self._stage_state = None
+        self._states = None
+        self._state_idx = 0
+        self._nfev = 0
+
+    def set_initial_value(self, initial_value, t=0):
+        # Docstring of superclass
+        initial_value = np.asarray(initial_value, dtype=float)
+        if self._states is None or self._states.shape[1:] != initial_value.shape:
+            self._stages = np.zeros((len(self._c),) + initial_value.shape)
+            self._stage_state = np.zeros(initial_value.shape)
+            self._states = np.zeros((2,) + initial_value.shape)
+        self._state_idx = 0
+        self._states[0] = initial_value
+        self._y = self._states[0]
+        self._t = t
+
+    def integrate(self, t):
+        # Docstring of superclass
+        h = (t - self._t) / self._nsteps
+        np.multiply(self._a, h, out=self._a_h)
+        np.multiply(self._b, h, out=self._b_h)
+        stages = self._stages
+        stage_state = self._stage_state
+        # The new state is calculated in the other state array, so that the previously returned state remains valid.
+        self._state_idx = 1 - self._state_idx
+        y = self._states[self._state_idx]
+        np.copyto(y, self._y)
+        current_t = self._t
+        for _ in range(self._nsteps):
+            stages[0] = self._system_equation(current_t, y, *self._f_params)
+            for i in range(1, len(self._c)):
+                np.dot(self._a_h[i, :i], stages[:i], out=stage_state)
+                stage_state += y
+                stages[i] = self._system_equation(current_t + self._c[i] * h, stage_state, *self._f_params)
+            np.dot(self._b_h, stages, out=stage_state)
+            y += stage_state
+            current_t += h
+        self._nfev += self._nsteps * len(self._c)
+        self._y = y
+        self._t = t
+        return self._y
+
+
+class HeunSolver(ExplicitRungeKuttaSolver):
+    """
+    Solves a system of differential equations of first order with the second order method of Heun (explicit
+    trapezoidal rule) with a fixed step size.
+    """
+
+    _a = np.array([
+        [0.0, 0.0],
+        [1.0, 0.0],
+    ])
+    _b = np.array([0.5, 0.5])
+    _c = np.array([0.0, 1.0])
+
+
+class RungeKutta4Solver(ExplicitRungeKuttaSolver):
+    """
+    Solves a system of differential equations of first order with the classic fourth order Runge-Kutta method with a
+    fixed step size.
+    """
+
+    _a = np.array([
+        [0.0, 0.0, 0.0, 0.0],
+        [0.5, 0.0, 0.0, 0.0],
+        [0.0, 0.5, 0.0, 0.0],
+        [0.0, 0.0, 1.0, 0.0],
+    ])
+    _b = np.array([1 / 6, 1 / 3, 1 / 3, 1 / 6])
+    _c = np.array([0.0, 0.5, 0.5, 1.0])
+
+
+class RungeKutta45Solver(ExplicitRungeKuttaSolver):
+    """
+    Solves a system of differential equations of first order with the fifth order Runge-Kutta method of
+    Dormand-Prince (the method of the scipy 'dopri5' and 'RK45' integrators) with a fixed step size.
+
+    In contrast to the scipy integrators, no error estimation and step size control is performed.
+    """
+
+    _a = np.array([
+        [0.0, 0.0, 0.0, 0.0, 0.0, 0.0],
+        [1 / 5, 0.0, 0.0, 0.0, 0.0, 0.0],
+        [3 / 40, 9 / 40, 0.0, 0.0, 0.0, 0.0],
+        [44 / 45, -56 / 15, 32 / 9, 0.0, 0.0, 0.0],
+        [19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729, 0.0, 0.0],
+        [9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656, 0.0],
+    ])
+    _b = np.array([35 / 384, 0.0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84])
+    _c = np.array([0.0, 1 / 5, 3 / 10, 4 / 5, 8 / 9, 1.0])
+
+
+class ZeroOrderHoldSolver(OdeSolver):
+    """
+    Solves a system of differential equations with the zero-order hold discretization of the linearized system.
+
+    With the jacobian A of the system at the current state x(t), the state after the time step h is calculated as:
+
+        .. math:
+            x(t + h) = x(t) + \\int_0^h e^{A s} \\mathrm{d}s \\cdot f(x(t))
+
+    The integral is the upper right block of the matrix exponential of the augmented system matrix [[A, I], [0, 0]] h.
+    The discretization is exact, if the system equation is affine in the states for a given speed and the inputs are
+    constant within the step. This holds for all motor models at a constant speed (e.g. with the ConstantSpeedLoad),
+    because their electrical ODEs are linear in the currents for a given omega. For varying speeds, the solver is an
+    exponential integrator of first order.
+
+    The discrete matrices are cached for each step size and speed. The speeds are quantized to buckets of the width
+    omega_resolution and the least recently used matrices are evicted, if the cache is full. Therefore, the matrix
+    exponential is calculated only once for each step size within a constant speed environment.
+    The solver requires the jacobian of the system. The cached matrices are not part of the state of the solver.
+    Therefore, the steps after restoring a snapshot may differ within the linearization error of the speed buckets.
+    """
+
+    def __init__(self, omega_idx=0, omega_resolution=1e-3, cache_size=128):
+        """
+        Args:
+            omega_idx(int or list(int)): Indices of the speeds in the ode state. Default: 0 (the speed of the SCMLSystem)
+            omega_resolution(float): Width of the speed buckets in which the discrete matrices are cached.
+            cache_size(int): Maximal number of cached discrete matrices.
+        """
+        assert omega_resolution > 0, 'The omega_resolution has to be positive.'
+        assert cache_size >= 1, 'At least one discrete matrix has to be cached.'
+        self._omega_idx = omega_idx
+        self._omega_resolution = omega_resolution
+        self._cache_size = cache_size
+        self._cache = OrderedDict()
+        self._nfev = 0
+
+    @property
+    def cache_size(self):
+        """
+        Returns:
+            int: Number of currently cached discrete matrices.
+        """
+        return len(self._cache)
+
+    def clear_cache(self):
+        """Removes all cached discrete matrices. Has to be called, if the parameters of the system have changed."""
+        self._cache.clear()
+
+    def set_system_equation(self, system_equation, jac=None):
+        # Docstring of superclass
+        assert jac is not None, 'The ZeroOrderHoldSolver requires the jacobian of the system.'
+        super().set_system_equation(system_equation, jac)
+        self.clear_cache()
+
+    def integrate(self, t):
+        # Docstring of superclass
+        h = t - self._t
+        omega_bucket = np.round(np.asarray(self._y)[self._omega_idx] / self._omega_resolution)
+        key = (round(h, 12), omega_bucket.tobytes())
+        integral = self._cache.get(key)
+        if integral is None:
+            integral = self._discretize(h)
+            self._cache[key] = integral
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(key)
+        self._y = self._y + np.matmul(integral, self._system_equation(self._t, self._y, *self._f_params))
+        self._nfev += 1
+        self._t = t
+        return self._y
+
+    def _discretize(self, h):
+        """
+        Calculates the integral of the matrix exponential of the system jacobian over the time step.
+
+        Args:
+            h(float): The time step.
+
+        Returns:
+            ndarray(float): The integral of the matrix exponential from 0 to h. Shape: (states x states)
+        """
+        system_matrix = np.asarray(self._system_jacobian(self._t, self._y, *self._f_params), dtype=float)
+        size = system_matrix.shape[0]
+        augmented_matrix = np.zeros((2 * size, 2 * size))
+        augmented_matrix[:size, :size] = system_matrix
+        augmented_matrix[:size, size:] = np.eye(size)
+        return expm(augmented_matrix * h)[:size, size:]
+
+
 class ScipyOdeSolver(OdeSolver):
     """
     Wrapper class for all ode-solvers in the scipy.integrate.ode package.
@@ -145,6 +387,9 @@ class ScipyOdeSolver(OdeSolver):
 
     #: Integrator object
     _ode = None
+    #: Index of the number of function evaluations in the integer work array of the integrators and flag, if it is
+    #: accumulated over the integrations (instead of being counted per integration) until the next initial value is set
+    _nfev_counters = dict(dopri5=(16, False), vode=(11, True), lsoda=(11, True))
 
     @property
     def t(self):
@@ -163,6 +408,9 @@ class ScipyOdeSolver(OdeSolver):
         self._solver = None
         self._solver_args = kwargs
         self._integrator = integrator
+        self._nfev_counter = self._nfev_counters.get(integrator, None)
+        self._nfev = 0 if self._nfev_counter is not None else None
+        self._accumulated_nfev = 0
 
     def set_system_equation(self, system_equation, jac=None):
         # Docstring of superclass
@@ -172,6 +420,7 @@ class ScipyOdeSolver(OdeSolver):
     def set_initial_value(self, initial_value, t=0):
         # Docstring of superclass
         self._ode.set_initial_value(initial_value, t)
+        self._accumulated_nfev = 0
 
     def set_f_params(self, *args):
         # Docstring of superclass
@@ -179,9 +428,39 @@ class ScipyOdeSolver(OdeSolver):
         self._ode.set_f_params(*args)
         self._ode.set_jac_params(*args)
 
+    def get_state(self):
+        # Docstring of superclass
+        state = super().get_state()
+        state.update(_t=self._ode.t, _y=np.array(self._ode.y))
+        return state
+
+    def set_state(self, state):
+        """Restores the state of the solver.
+
+        The integrator is restarted at the restored state. The integrators vode and lsoda keep the history of their
+        last steps in fortran common blocks. This history is not part of the state, so that their next integration
+        step might differ within the tolerances from the integration step without the restore.
+
+        Args:
+            state(dict): The snapshot of this solver from get_state().
+        """
+        super().set_state(state)
+        self._ode.set_initial_value(self._y, self._t)
+        if self._f_params is not None:
+            self._ode.set_f_params(*self._f_params)
+            self._ode.set_jac_params(*self._f_params)
+        self._accumulated_nfev = 0
+
     def integrate(self, t):
         # Docstring of superclass
-        return self._ode.integrate(t)
+        y = self._ode.integrate(t)
+        if self._nfev_counter is not None:
+            index, accumulated = self._nfev_counter
+            nfev = int(self._ode._integrator.iwork[index])
+            if accumulated:
+                nfev, self._accumulated_nfev = nfev - self._accumulated_nfev, nfev
+            self._nfev += nfev
+        return y
 
 
 class ScipySolveIvpSolver(OdeSolver):
@@ -189,30 +468,248 @@ class ScipySolveIvpSolver(OdeSolver):
     Wrapper class for all ode-solvers in the scipy.integrate.solve_ivp function
 
     https://docs.scipy.org/doc/scipy/reference/generated/scipy.integrate.solve_ivp.html
+
+    By default, solve_ivp is called from scratch in each integration. In the persistent mode, the stepper object of the
+    selected method (e.g. scipy.integrate.RK45) is kept alive between the integrations instead. Thereby, the input
+    validation, the selection of the first step size and the result allocation of solve_ivp are omitted, and the last
+    accepted step size as well as the jacobian (and LU factorizations) of the implicit methods are carried over to the
+    next integration. The stepper is only rebuilt after set_initial_value. If the function parameters (e.g. the input
+    voltages) change, the stepper is restarted at the current state with its last step size and jacobian.
+
+    The restart and the continuation of LSODA steppers write private attributes of the scipy steppers. If a stepper
+    does not have these attributes (e.g. in another scipy version), it is rebuilt with its last step size instead.
     """
 
-    def __init__(self, **kwargs):
-        # Docstring of superclass
+    #: Stepper classes of the methods of solve_ivp
+    _methods = dict(RK23=RK23, RK45=RK45, DOP853=DOP853, Radau=Radau, BDF=BDF, LSODA=LSODA)
+
+    #: Private attributes of the stepper classes that are reset to restart a stepper at the current state
+    _restart_attributes = {
+        RK23: ('f',),
+        RK45: ('f',),
+        DOP853: ('f',),
+        Radau: ('f', 'sol', 'h_abs_old', 'error_norm_old'),
+        BDF: ('D', 'order', 'n_equal_steps', 'LU', 'h_abs', 'atol', 'rtol'),
+    }
+
+    #: Private attributes of the stepper classes that are set to continue a stepper until a new time
+    _continue_attributes = {
+        LSODA: ('_lsoda_solver._integrator.rwork',),
+    }
+
+    _state_attributes = OdeSolver._state_attributes + ('_previous_f_params', '_restart_step_size')
+
+    def __init__(self, persistent=False, **kwargs):
+        """
+        Args:
+            persistent(bool): Flag, if the stepper object shall be kept alive between the integrations.
+            kwargs(dict): Arguments to pass to the solver. See the scipy description for further information.
+        """
+        self._persistent = persistent
         self._solver_kwargs = kwargs
+        self._stepper = None
+        self._restartable = False
+        self._continuable = False
+        self._nfev = 0
+        self._previous_f_params = None
+        self._restart_step_size = None
 
     def set_system_equation(self, system_equation, jac=None):
         # Docstring of superclass
         method = self._solver_kwargs.get('method', None)
         super().set_system_equation(system_equation, jac)
+        self._discard_stepper()
 
         # Only Radau BDF and LSODA support the jacobian.
         if method in ['Radau', 'BDF', 'LSODA']:
             self._solver_kwargs['jac'] = self._system_jacobian
 
+    def set_initial_value(self, initial_value, t=0):
+        # Docstring of superclass
+        super().set_initial_value(initial_value, t)
+        self._discard_stepper()
+        self._restart_step_size = None
+
+    @property
+    def nfev(self):
+        # Docstring of superclass
+        if self._stepper is None:
+            return self._nfev
+        return self._nfev + self._stepper.nfev
+
+    def get_state(self):
+        """Captures the state of the solver.
+
+        In the persistent mode, the stepper object is not copied. Instead, its last step size is stored and the stepper
+        is rebuilt with this step size at the restored state.
+
+        Returns:
+            dict: Snapshot of the solver.
+        """
+        state = super().get_state()
+        state['_nfev'] = self.nfev
+        if self._stepper is not None and self._stepper.step_size:
+            state['_restart_step_size'] = self._stepper.step_size
+        return state
+
+    def set_state(self, state):
+        # Docstring of superclass
+        self._stepper = None
+        super().set_state(state)
+
+    def set_f_params(self, *args):
+        # Docstring of superclass
+        super().set_f_params(*args)
+        if not self._persistent:
+            return
+        if self._stepper is not None and not self._equal_f_params(args):
+            self._restart_stepper()
+        self._previous_f_params = [np.array(arg, copy=True) for arg in args]
+
     def integrate(self, t):
         # Docstring of superclass
+        if self._persistent:
+            return self._integrate_persistent(t)
         result = solve_ivp(
             self._system_equation, [self._t, t], self._y, t_eval=[t], args=self._f_params, **self._solver_kwargs
         )
+        self._nfev += result.nfev
         self._t = t
         self._y = result.y.T[-1]
         return self._y
 
+    def _integrate_persistent(self, t):
+        """
+        Integration method of the persistent mode.
+
+        Args:
+            t(float): Time until the system shall be calculated
+
+        Returns:
+            ndarray(float):The new state of the system.
+        """
+        if t == self._t:
+            return self._y
+        if self._stepper is not None and not self._continuable:
+            self._restart_step_size = self._stepper.step_size
+            self._discard_stepper()
+        if self._stepper is None:
+            self._stepper = self._build_stepper(t)
+        stepper = self._stepper
+        stepper.t_bound = t
+        if isinstance(stepper, LSODA) and self._continuable:
+            # LSODA does not step beyond the critical time that is stored in the work array of the fortran solver.
+            stepper._lsoda_solver._integrator.rwork[0] = t
+        stepper.status = 'running'
+        while stepper.status == 'running':
+            message = stepper.step()
+        assert stepper.status == 'finished', f'The integration failed: {message}'
+        self._t = t
+        self._y = np.array(stepper.y)
+        return self._y
+
+    def _build_stepper(self, t_bound):
+        """
+        Creates a new stepper object of the selected method at the current state.
+
+        Args:
+            t_bound(float): Time until the system shall be calculated.
+
+        Returns:
+            scipy.integrate.OdeSolver: The stepper of the selected method.
+        """
+        kwargs = dict(self._solver_kwargs)
+        method = kwargs.pop('method', 'RK45')
+        method = self._methods.get(method, method)
+        if callable(kwargs.get('jac', None)):
+            kwargs['jac'] = self._stepper_jacobian
+        if self._restart_step_size and 'first_step' not in kwargs:
+            kwargs['first_step'] = min(self._restart_step_size, t_bound - self._t)
+        stepper = method(self._stepper_equation, self._t, np.asarray(self._y, dtype=float), t_bound, **kwargs)
+        restart_attributes = self._restart_attributes.get(type(stepper), None)
+        self._restartable = restart_attributes is not None and self._has_attributes(stepper, restart_attributes)
+        self._continuable = self._has_attributes(stepper, self._continue_attributes.get(type(stepper), ()))
+        return stepper
+
+    def _restart_stepper(self):
+        """
+        Restarts the stepper at the current state after a discontinuous change of the function parameters.
+
+        The last step size and the jacobian of the stepper are kept. Only the data of the last steps that depends on the
+        system equation (e.g. the derivative at the current state and the dense output for the predictions) is reset.
+        BDF steppers keep their order, their difference history and their LU factorization, if the change of the
+        derivative is below the tolerances within a step. Otherwise, they restart with the first order and only
+        factorize again, if the order has been higher before.
+        LSODA steppers and steppers without the expected private attributes can not be restarted and are rebuilt with
+        their last step size.
+        """
+        stepper = self._stepper
+        if not self._restartable:
+            self._restart_step_size = stepper.step_size
+            self._discard_stepper()
+        elif isinstance(stepper, (RK23, RK45, DOP853)):
+            stepper.f = stepper.fun(stepper.t, stepper.y)
+        elif isinstance(stepper, Radau):
+            stepper.f = stepper.fun(stepper.t, stepper.y)
+            stepper.sol = None
+            stepper.h_abs_old = None
+            stepper.error_norm_old = None
+        elif isinstance(stepper, BDF):
+            derivative = stepper.fun(stepper.t, stepper.y)
+            if self._is_discontinuity(stepper, derivative):
+                stepper.D[0] = stepper.y
+                stepper.D[1] = derivative * stepper.h_abs * stepper.direction
+                stepper.D[2:] = 0.0
+                stepper.n_equal_steps = 0
+                if stepper.order != 1:
+                    # The LU factorization depends on the order, but not on the system equation.
+                    stepper.order = 1
+                    stepper.LU = None
+
+    def _is_discontinuity(self, stepper, derivative):
+        """Returns True, if the change of the derivative by the new function parameters exceeds the tolerances.
+
+        Args:
+            stepper(scipy.integrate.OdeSolver): The stepper at the current state.
+            derivative(ndarray(float)): The derivative at the current state with the new function parameters.
+        """
+        self._nfev += 1
+        previous_derivative = np.array(self._system_equation(stepper.t, stepper.y, *self._previous_f_params))
+        scale = stepper.atol + stepper.rtol * np.abs(stepper.y)
+        change = stepper.h_abs * (derivative - previous_derivative) / scale
+        return np.sqrt(np.mean(change ** 2)) > 1.0
+
+    @staticmethod
+    def _has_attributes(stepper, attributes):
+        """Returns True, if the stepper has all (dotted) attributes."""
+        for attribute in attributes:
+            obj = stepper
+            for name in attribute.split('.'):
+                if not hasattr(obj, name):
+                    return False
+                obj = getattr(obj, name)
+        return True
+
+    def _discard_stepper(self):
+        """Removes the stepper object and keeps its number of function evaluations."""
+        if self._stepper is not None:
+            self._nfev += self._stepper.nfev
+            self._stepper = None
+
+    def _equal_f_params(self, args):
+        """Returns True, if the passed function parameters equal the ones of the last set_f_params call."""
+        return self._previous_f_params is not None and len(args) == len(self._previous_f_params) and all(
+            np.array_equal(arg, previous_arg) for arg, previous_arg in zip(args, self._previous_f_params)
+        )
+
+    def _stepper_equation(self, t, y):
+        """System equation with the current function parameters in the form of the scipy steppers."""
+        return np.array(self._system_equation(t, y, *self._f_params))
+
+    def _stepper_jacobian(self, t, y):
+        """System jacobian with the current function parameters in the form of the scipy steppers."""
+        return self._system_jacobian(t, y, *self._f_params)
+
 
 class ScipyOdeIntSolver(OdeSolver):
     """
@@ -1,9 +1,10 @@
 from gym_electric_motor.physical_systems.solvers import EulerSolver
+from gym_electric_motor.stateful_component import StatefulComponent
 import warnings
 import numpy as np
 
 
-class VoltageSupply:
+class VoltageSupply(StatefulComponent):
     """Base class for all VoltageSupplies to be used in a SCMLSystem.
 
     Parameter:
@@ -72,6 +73,9 @@ class IdealVoltageSupply(VoltageSupply):
 
 class RCVoltageSupply(VoltageSupply):
     """DC voltage supply modeled as RC element"""
+
+    _state_attributes = VoltageSupply._state_attributes + ('_u_sup',)
+    _state_components = ('_solver',)
     
     def __init__(self, u_nominal=600.0, supply_parameter=None):
         """This Voltage Supply is a model of a non ideal voltage supply.
@@ -124,6 +128,8 @@ class RCVoltageSupply(VoltageSupply):
 class AC1PhaseSupply(VoltageSupply):
     """AC one phase voltage supply"""
 
+    _state_attributes = VoltageSupply._state_attributes + ('_phi',)
+
     def __init__(self, u_nominal=230, supply_parameter=None):
         """
         Args:
@@ -165,6 +171,7 @@ class AC1PhaseSupply(VoltageSupply):
 class AC3PhaseSupply(VoltageSupply):
     """AC three phase voltage supply"""
     voltage_len = 3
+    _state_attributes = VoltageSupply._state_attributes + ('_phi',)
 
     def __init__(self, u_nominal=400, supply_parameter=None):
         """
@@ -0,0 +1,196 @@
+"""This module introduces the StepProfiler that measures where the time of the steps of a GEM environment is spent."""
+import time
+
+
+class StepProfiler:
+    """Measures the wall time and the number of calls of all modules of an ElectricMotorEnvironment.
+
+    While the profiler is attached, the methods of the modules that are called in the step and reset of the environment
+    are replaced by timed versions on the module instances. Detaching restores the original methods. Therefore, the
+    environment runs without any overhead, if no profiler is attached.
+
+    The following methods are measured:
+
+    - ``step`` and ``reset`` of the ``environment``
+    - ``simulate`` and ``reset`` of each PhysicalSystemWrapper (``physical_system_wrappers[i]`` with the index of the
+      wrapper in the physical_system_wrappers of the environment) and of the innermost ``physical_system``
+    - ``integrate`` of the ``ode_solver`` of the physical system including the number of function evaluations (nfev),
+      if the solver exposes them
+    - ``reset``, ``get_reference`` and ``get_reference_observation`` of the ``reference_generator``
+    - ``check_constraints`` of the ``constraint_monitor``
+    - ``reset`` and ``reward`` of the ``reward_function``
+    - ``on_reset_begin``, ``on_reset_end``, ``on_step_begin`` and ``on_step_end`` of each callback (``callbacks[j]``)
+      including the visualizations
+
+    Example:
+        >>> import gym_electric_motor as gem
+        >>> import pandas as pd
+        >>> env = gem.make('Cont-CC-PMSM-v0')
+        >>> profiler = env.enable_profiling()
+        >>> env.reset()
+        >>> for _ in range(1000):
+        ...     (state, reference), reward, done, _ = env.step(env.action_space.sample())
+        >>> pd.DataFrame.from_dict(profiler.report(), orient='index')
+    """
+
+    #: Names of the measured methods of the modules of the environment
+    _module_methods = dict(
+        reference_generator=('reset', 'get_reference', 'get_reference_observation'),
+        constraint_monitor=('check_constraints',),
+        reward_function=('reset', 'reward'),
+    )
+    _callback_methods = ('on_reset_begin', 'on_reset_end', 'on_step_begin', 'on_step_end')
+
+    @property
+    def attached(self):
+        """Flag, if the profiler is currently attached to an environment."""
+        return len(self._patches) > 0
+
+    def __init__(self):
+        # Measurement of each method: [calls, time, nfev]
+        self._records = {}
+        # Class names of the measured modules
+        self._classes = {}
+        # Names of the nested simulate methods from the outermost wrapper to the innermost physical system
+        self._chain = []
+        # Patched methods: (instance, method name, previous instance attribute or None)
+        self._patches = []
+
+    def attach(self, env):
+        """Replaces the methods of the modules of the environment by timed versions.
+
+        Args:
+            env(ElectricMotorEnvironment): The environment to profile.
+
+        Returns:
+            StepProfiler: This profiler.
+        """
+        assert not self.attached, 'The profiler is already attached to an environment.'
+        self._chain = []
+        self._instrument('environment', env, 'step')
+        self._instrument('environment', env, 'reset')
+        physical_system = env.physical_system
+        wrappers = []
+        while physical_system is not physical_system.unwrapped:
+            wrappers.append(physical_system)
+            physical_system = physical_system.physical_system
+        # The first wrapper in the physical_system_wrappers of the environment is the innermost one.
+        for wrapper_idx, wrapper in zip(range(len(wrappers) - 1, -1, -1), wrappers):
+            name = f'physical_system_wrappers[{wrapper_idx}]'
+            self._instrument(name, wrapper, 'simulate')
+            self._instrument(name, wrapper, 'reset')
+            self._chain.append(name)
+        self._instrument('physical_system', physical_system, 'simulate')
+        self._instrument('physical_system', physical_system, 'reset')
+        self._chain.append('physical_system')
+        ode_solver = getattr(physical_system, 'ode_solver', None)
+        if ode_solver is not None:
+            self._instrument_solver(ode_solver)
+        for module_name, methods in self._module_methods.items():
+            module = getattr(env, module_name)
+            for method in methods:
+                self._instrument(module_name, module, method)
+        for callback_idx, callback in enumerate(env._callbacks):
+            for method in self._callback_methods:
+                self._instrument(f'callbacks[{callback_idx}]', callback, method)
+        return self
+
+    def detach(self):
+        """Restores the original methods of the modules. The measurements are kept."""
+        for instance, method_name, previous in reversed(self._patches):
+            if previous is None:
+                delattr(instance, method_name)
+            else:
+                setattr(instance, method_name, previous)
+        self._patches = []
+
+    def reset(self):
+        """Sets all measurements to zero."""
+        for record in self._records.values():
+            record[0] = 0
+            record[1] = 0.0
+            if record[2] is not None:
+                record[2] = 0
+
+    def report(self):
+        """Returns the measurements of all methods.
+
+        The times of the physical system wrappers include the time of the inner systems and the time of the physical
+        system includes the time of the ode solver. Therefore, their entries additionally contain the 'self_time'
+        without the inner system (or the ode solver).
+
+        Returns:
+            dict(str, dict): For each method (e.g. 'reward_function.reward') a dictionary with the keys 'class',
+            'calls', 'time', 'mean_time' and 'nfev' (number of function evaluations of the ode solver or None).
+            The report can be converted to a pandas DataFrame with ``pandas.DataFrame.from_dict(report, orient='index')``.
+        """
+        report = {}
+        for name, (calls, total_time, nfev) in self._records.items():
+            report[name] = {
+                'class': self._classes[name],
+                'calls': calls,
+                'time': total_time,
+                'mean_time': total_time / calls if calls > 0 else 0.0,
+                'nfev': nfev,
+            }
+        for method in ('simulate', 'reset'):
+            names = [f'{component}.{method}' for component in self._chain]
+            for name, inner_name in zip(names, names[1:]):
+                report[name]['self_time'] = report[name]['time'] - report[inner_name]['time']
+        solver_time = report['ode_solver.integrate']['time'] if 'ode_solver.integrate' in report else 0.0
+        if 'physical_system.simulate' in report:
+            report['physical_system.simulate']['self_time'] = report['physical_system.simulate']['time'] - solver_time
+            report['physical_system.reset']['self_time'] = report['physical_system.reset']['time']
+        return report
+
+    def _instrument(self, component, instance, method_name):
+        """Replaces the method of the instance by a version that measures its calls and wall time.
+
+        Args:
+            component(str): Name of the component in the report.
+            instance(object): The instance whose method is measured.
+            method_name(str): Name of the method.
+        """
+        method = getattr(instance, method_name)
+        record = self._record(f'{component}.{method_name}', instance, with_nfev=False)
+        perf_counter = time.perf_counter
+
+        def timed_method(*args, **kwargs):
+            start = perf_counter()
+            result = method(*args, **kwargs)
+            record[1] += perf_counter() - start
+            record[0] += 1
+            return result
+
+        self._patch(instance, method_name, timed_method)
+
+    def _instrument_solver(self, solver):
+        """Replaces the integrate method of the ode solver by a version that additionally counts the function
+        evaluations, if the solver exposes them."""
+        integrate = solver.integrate
+        record = self._record('ode_solver.integrate', solver, with_nfev=solver.nfev is not None)
+        perf_counter = time.perf_counter
+
+        def timed_integrate(t):
+            nfev = solver.nfev
+            start = perf_counter()
+            result = integrate(t)
+            record[1] += perf_counter() - start
+            record[0] += 1
+            if nfev is not None:
+                record[2] += solver.nfev - nfev
+            return result
+
+        self._patch(solver, 'integrate', timed_integrate)
+
+    def _record(self, name, instance, with_nfev):
+        """Returns the (new or existing) measurement list [calls, time, nfev] of a method."""
+        self._classes[name] = type(instance).__name__
+        if name not in self._records:
+            self._records[name] = [0, 0.0, 0 if with_nfev else None]
+        return self._records[name]
+
+    def _patch(self, instance, method_name, function):
+        """Sets the function as instance attribute and stores the previous instance attribute to restore it."""
+        self._patches.append((instance, method_name, vars(instance).get(method_name, None)))
+        setattr(instance, method_name, function)
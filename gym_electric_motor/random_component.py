@@ -1,7 +1,9 @@
 import numpy as np
 
+from .stateful_component import StatefulComponent
 
-class RandomComponent:
+
+class RandomComponent(StatefulComponent):
     """Base class for all random components in the environment.
 
     Every component (e.g. ReferenceGenerator or ElectricMotor) that has any kind of random behavior has to derive from
@@ -85,3 +87,33 @@ class RandomComponent:
     def next_generator(self):
         """Sets a new reference generator for a new episode."""
         self._random_generator = np.random.default_rng(self._seed_sequence.spawn(1)[0])
+
+    def get_state(self):
+        """Captures the internal state of the component including the state of its random generator and the number of
+        seeds that have already been spawned from its seed sequence.
+
+        Returns:
+            dict: Snapshot of the component.
+        """
+        state = super().get_state()
+        state['_random_state'] = (
+            self._random_generator.bit_generator.state, self._seed_sequence.n_children_spawned
+        )
+        return state
+
+    def set_state(self, state):
+        """Restores the internal state of the component including the state of its random generator.
+
+        Args:
+            state(dict): The snapshot of this component from ``get_state()``.
+        """
+        super().set_state(state)
+        bit_generator_state, n_children_spawned = state['_random_state']
+        self._random_generator.bit_generator.state = bit_generator_state
+        seed_sequence = self._seed_sequence
+        if seed_sequence.n_children_spawned != n_children_spawned:
+            # The counter of the spawned seeds is read-only. Therefore, an equal seed sequence is created.
+            self._seed_sequence = np.random.SeedSequence(
+                seed_sequence.entropy, spawn_key=seed_sequence.spawn_key, pool_size=seed_sequence.pool_size,
+                n_children_spawned=n_children_spawned
+            )
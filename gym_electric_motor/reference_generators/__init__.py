@@ -9,6 +9,8 @@ from .const_reference_generator import ConstReferenceGenerator
 from .multiple_reference_generator import MultipleReferenceGenerator
 from .subepisoded_reference_generator import SubepisodedReferenceGenerator
 from .laplace_process_reference_generator import LaplaceProcessReferenceGenerator
+from .reference_bank import ReferenceBankGenerator, create_reference_bank
+from .streamed_reference_generator import StreamedReferenceGenerator
 from ..utils import register_class
 from ..core import ReferenceGenerator
 
@@ -21,3 +23,5 @@ register_class(SawtoothReferenceGenerator, ReferenceGenerator, 'SawtoothReferenc
 register_class(ConstReferenceGenerator, ReferenceGenerator, 'ConstReference')
 register_class(MultipleReferenceGenerator, ReferenceGenerator, 'MultipleReference')
 register_class(SubepisodedReferenceGenerator, ReferenceGenerator, 'SubepisodedReference')
+register_class(ReferenceBankGenerator, ReferenceGenerator, 'ReferenceBank')
+register_class(StreamedReferenceGenerator, ReferenceGenerator, 'StreamedReference')
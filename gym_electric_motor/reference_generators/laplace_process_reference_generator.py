@@ -1,7 +1,7 @@
 import numpy as np
 
 from ..random_component import RandomComponent
-from .subepisoded_reference_generator import SubepisodedReferenceGenerator
+from .subepisoded_reference_generator import SubepisodedReferenceGenerator, clipped_cumsum
 
 
 class LaplaceProcessReferenceGenerator(SubepisodedReferenceGenerator):
@@ -24,13 +24,5 @@ class LaplaceProcessReferenceGenerator(SubepisodedReferenceGenerator):
     def _reset_reference(self):
         self._current_sigma = 10 ** self._get_current_value(np.log10(self._sigma_range))
         random_values = self.random_generator.laplace(0, self._current_sigma, self._current_episode_length)
-        self._reference = np.zeros_like(random_values)
-        reference_value = self._reference_value
-        for i in range(self._current_episode_length):
-            reference_value += random_values[i]
-            if reference_value > self._limit_margin[1]:
-                reference_value = self._limit_margin[1]
-            if reference_value < self._limit_margin[0]:
-                reference_value = self._limit_margin[0]
-            self._reference[i] = reference_value
+        self._reference = clipped_cumsum(random_values, self._reference_value, *self._limit_margin)
 
@@ -11,12 +11,17 @@ class MultipleReferenceGenerator(ReferenceGenerator, gem.RandomComponent):
     different state variables.
     """
 
-    def __init__(self, sub_generators, sub_args=None, **kwargs):
+    _state_components = ('_sub_generators',)
+
+    def __init__(self, sub_generators, sub_args=None, preview=None, **kwargs):
         """
         Args:
             sub_generators(list(str/class/object)): List of keys, classes or objects to instantiate the sub_generators
             sub_args(dict/list(dict)/None): (Optional) Arguments to pass to the sub_converters. If not passed all kwargs
                 will be passed to each sub_generator.
+            preview(int/None): (Optional) Number of steps in the reference observations of the sub_generators that are
+                instantiated from keys or classes. The observation contains the previews of all sub_generators one
+                after another.
             kwargs: All kwargs of the environment. Passed to the sub_generators, if no sub_args are passed.
         """
         ReferenceGenerator.__init__(self, **kwargs)
@@ -29,6 +34,8 @@ class MultipleReferenceGenerator(ReferenceGenerator, gem.RandomComponent):
             sub_arguments = sub_args
         else:
             sub_arguments = [kwargs] * len(sub_generators)
+        if preview is not None:
+            sub_arguments = [dict(sub_arg, preview=preview) for sub_arg in sub_arguments]
         self._sub_generators = [instantiate(ReferenceGenerator, sub_generator, **sub_arg)
                                 for sub_generator, sub_arg in zip(sub_generators, sub_arguments)]
         self._reference_names = []
@@ -0,0 +1,214 @@
+import json
+import os
+
+import numpy as np
+from gym.spaces import Box
+
+from ..core import ReferenceGenerator
+from ..random_component import RandomComponent
+
+#: Name of the file with the description of a reference bank
+INDEX_FILE = 'index.json'
+#: Name of the file with the reference arrays of all episodes. Shape: (episodes, episode_length + 1, referenced states)
+REFERENCES_FILE = 'references.npy'
+#: Name of the file with the reference observations of all episodes. Shape: (episodes, episode_length + 1, observation)
+OBSERVATIONS_FILE = 'observations.npy'
+
+
+def create_reference_bank(path, env, num_episodes, episode_length, seed=None):
+    """Pre-generates the references of several episodes with the reference generator of an environment and stores them
+    in a reference bank.
+
+    The reference bank is a directory with an index file and two .npy-files with the references and the reference
+    observations of all episodes. The episode with id i contains the references of the i-th reset of the reference
+    generator after the seeding. The :py:class:`ReferenceBankGenerator` plays the episodes from the memory-mapped files.
+
+    Args:
+        path(str): Directory of the reference bank. It is created, if it does not exist.
+        env(ElectricMotorEnvironment): The environment whose reference generator generates the references. Its
+            physical system and reference generator are reset during the generation.
+        num_episodes(int): Number of episodes to generate.
+        episode_length(int): Number of steps of each episode.
+        seed(int): Seed of the reference generator. Default: None (random seed)
+
+    Returns:
+        dict: The index of the reference bank.
+    """
+    physical_system = env.physical_system
+    reference_generator = env.reference_generator
+    if isinstance(reference_generator, RandomComponent):
+        reference_generator.seed(np.random.SeedSequence(seed))
+    referenced_states = np.asarray(reference_generator.referenced_states, dtype=bool)
+    observation_shape = reference_generator.reference_space.shape
+    os.makedirs(path, exist_ok=True)
+    references = np.lib.format.open_memmap(
+        os.path.join(path, REFERENCES_FILE), mode='w+', dtype=np.float64,
+        shape=(num_episodes, episode_length + 1, int(referenced_states.sum()))
+    )
+    observations = np.lib.format.open_memmap(
+        os.path.join(path, OBSERVATIONS_FILE), mode='w+', dtype=np.float64,
+        shape=(num_episodes, episode_length + 1) + observation_shape
+    )
+    for episode in range(num_episodes):
+        state = physical_system.reset()
+        reference, observation, _ = reference_generator.reset(state)
+        references[episode, 0] = reference[referenced_states]
+        observations[episode, 0] = observation
+        for k in range(1, episode_length + 1):
+            references[episode, k] = reference_generator.get_reference(state)[referenced_states]
+            observations[episode, k] = reference_generator.get_reference_observation(state)
+    references.flush()
+    observations.flush()
+    del references, observations
+    state_names = list(physical_system.state_names)
+    reference_names = reference_generator.reference_names
+    index = dict(
+        num_episodes=num_episodes,
+        episode_length=episode_length,
+        seed=seed,
+        tau=physical_system.tau,
+        state_names=state_names,
+        referenced_states=[name for name, referenced in zip(state_names, referenced_states) if referenced],
+        reference_names=[reference_names] if isinstance(reference_names, str) else list(reference_names),
+        reference_space_low=reference_generator.reference_space.low.tolist(),
+        reference_space_high=reference_generator.reference_space.high.tolist(),
+        reference_generator=type(reference_generator).__name__,
+    )
+    with open(os.path.join(path, INDEX_FILE), 'w') as file:
+        json.dump(index, file, indent=1)
+    return index
+
+
+class ReferenceBankGenerator(ReferenceGenerator):
+    """Reference generator that plays the pre-generated episodes of a reference bank.
+
+    The references are read from memory-mapped files. Therefore, the episodes are not held in the memory of each
+    process, but all processes that use the same reference bank share the pages of the files via the page cache of the
+    operating system. The reference observations are read-only views into the files and are not copied.
+
+    Each reset starts the next episode of the passed episode ids. If an episode of the environment is longer than the
+    episodes in the bank, the last references are held.
+
+    Example:
+
+        >>> import gym_electric_motor as gem
+        >>> from gym_electric_motor.reference_generators import create_reference_bank, ReferenceBankGenerator
+        >>>
+        >>> # Pre-generate the references once
+        >>> create_reference_bank('pmsm_bank', gem.make('Cont-CC-PMSM-v0'), num_episodes=64, episode_length=10000,
+        >>>                       seed=0)
+        >>>
+        >>> # In each of the 8 worker processes
+        >>> worker = 3
+        >>> reference_generator = ReferenceBankGenerator('pmsm_bank', episodes=range(worker, 64, 8))
+        >>> env = gem.make('Cont-CC-PMSM-v0', reference_generator=reference_generator)
+    """
+
+    _state_attributes = ReferenceGenerator._state_attributes + ('_episode_id', '_next_episode', '_k')
+
+    @property
+    def index(self):
+        """
+        Returns:
+            dict: The index of the reference bank with the number and length of the episodes, the state names, the
+            names of the referenced states and the reference space.
+        """
+        return self._index
+
+    @property
+    def episode_id(self):
+        """
+        Returns:
+            int: Id of the current episode in the reference bank. None, before the first reset.
+        """
+        return self._episode_id
+
+    def __init__(self, path, episodes=None, **kwargs):
+        """
+        Args:
+            path(str): Directory of the reference bank that has been created with :py:func:`create_reference_bank`.
+            episodes(iterable(int)): Ids of the episodes that are played one after another at each reset. After the
+                last id, the first id is played again. Default: All episodes in ascending order.
+            kwargs(dict): Arguments passed to the superclass ReferenceGenerator.
+        """
+        super().__init__(**kwargs)
+        self._path = path
+        with open(os.path.join(path, INDEX_FILE), 'r') as file:
+            self._index = json.load(file)
+        num_episodes = self._index['num_episodes']
+        self._episodes = list(range(num_episodes)) if episodes is None else [int(episode) for episode in episodes]
+        assert len(self._episodes) > 0, 'At least one episode has to be played.'
+        assert all(0 <= episode < num_episodes for episode in self._episodes), \
+            f'The episode ids have to be in the range [0, {num_episodes}).'
+        self._episode_length = self._index['episode_length']
+        self.reference_space = Box(
+            np.array(self._index['reference_space_low']), np.array(self._index['reference_space_high']),
+            dtype=np.float64
+        )
+        self._reference_names = self._index['reference_names']
+        self._references = None
+        self._observations = None
+        self._open()
+        self._episode_id = None
+        self._next_episode = 0
+        self._k = 0
+
+    def set_modules(self, physical_system):
+        # Docstring of superclass
+        super().set_modules(physical_system)
+        state_names = list(physical_system.state_names)
+        assert state_names == self._index['state_names'], \
+            f'The states {state_names} of the physical system differ from the states {self._index["state_names"]} ' \
+            f'of the reference bank.'
+        assert np.isclose(physical_system.tau, self._index['tau']), \
+            f'The sampling time {physical_system.tau} differs from the sampling time {self._index["tau"]} of the ' \
+            f'reference bank.'
+        self._referenced_states = np.isin(state_names, self._index['referenced_states'])
+
+    def reset(self, initial_state=None, initial_reference=None):
+        """
+        Starts the next episode of the reference bank. An initial reference cannot be set, because the references are
+        pre-generated.
+
+        Args:
+            initial_state(ndarray(float)): The initial state of the physical system.
+            initial_reference(ndarray(float)): Ignored.
+
+        Returns:
+             initial_reference(ndarray(float)): initial reference array.
+             initial_reference_observation(element of reference_space): An initial observation of the next reference.
+             trajectory(None): No initial trajectory is passed.
+        """
+        self._episode_id = self._episodes[self._next_episode]
+        self._next_episode = (self._next_episode + 1) % len(self._episodes)
+        self._k = 0
+        return super().reset(initial_state)
+
+    def get_reference(self, *_, **__):
+        # Docstring of superclass
+        reference = np.zeros_like(self._referenced_states, dtype=float)
+        reference[self._referenced_states] = self._references[self._episode_id, min(self._k, self._episode_length)]
+        return reference
+
+    def get_reference_observation(self, *_, **__):
+        # Docstring of superclass
+        observation = self._observations[self._episode_id, min(self._k, self._episode_length)]
+        self._k += 1
+        return observation
+
+    def _open(self):
+        """Opens the memory-mapped files of the reference bank."""
+        # The views as plain arrays keep the memory maps alive without returning np.memmap instances to the user.
+        self._references = np.load(os.path.join(self._path, REFERENCES_FILE), mmap_mode='r').view(np.ndarray)
+        self._observations = np.load(os.path.join(self._path, OBSERVATIONS_FILE), mmap_mode='r').view(np.ndarray)
+
+    def __getstate__(self):
+        # The memory maps are not pickled or deep copied. Copies and other processes open the files again.
+        state = self.__dict__.copy()
+        state['_references'] = None
+        state['_observations'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._open()
@@ -0,0 +1,122 @@
+import numpy as np
+from gym.spaces import Box
+
+from ..core import ReferenceGenerator
+from ..trajectory_stream import TrajectoryStream
+
+
+class StreamedReferenceGenerator(ReferenceGenerator):
+    """Reference generator that streams measured reference trajectories (e.g. drive cycles) from columnar files.
+
+    The trajectories are read chunk by chunk with a :py:class:`~gym_electric_motor.trajectory_stream.TrajectoryStream`
+    and resampled to the sampling time tau of the environment. Only the current chunk and the chunk that is read ahead
+    are held in memory. Each episode starts at the start time of the trajectory. After its end, the last references
+    are held.
+
+    The reference observation contains the references of the next ``preview`` steps. It is a view into the buffer of
+    the stream. Shape: (preview * referenced states,) with the references of each step one after another.
+
+    Example:
+
+        >>> import gym_electric_motor as gem
+        >>> from gym_electric_motor.trajectory_stream import write_columns
+        >>> from gym_electric_motor.reference_generators import StreamedReferenceGenerator
+        >>>
+        >>> # Measured drive cycle at 10 kHz in rad/s
+        >>> write_columns('drive_cycle', dict(omega=measured_speed))
+        >>> reference_generator = StreamedReferenceGenerator(
+        >>>     'drive_cycle', sample_time=1e-4, reference_states=['omega'], preview=10
+        >>> )
+        >>> env = gem.make('Cont-SC-PMSM-v0', reference_generator=reference_generator)
+    """
+
+    _state_attributes = ReferenceGenerator._state_attributes + ('_k',)
+
+    @property
+    def stream(self):
+        """
+        Returns:
+            TrajectoryStream: The stream of the reference trajectories.
+        """
+        return self._stream
+
+    def __init__(
+        self, source, sample_time, reference_states=('omega',), columns=None, normalized=False, preview=1,
+        start_time=0.0, chunk_size=65536, read_ahead=True, **kwargs
+    ):
+        """
+        Args:
+            source(str or dict(str, array-like)): Directory with one .npy-file per column or mapping of the column
+                names to one-dimensional arrays. See :py:class:`~gym_electric_motor.trajectory_stream.TrajectoryStream`
+            sample_time(float): Time between two samples of the source in seconds.
+            reference_states(iterable(str)): Names of the referenced states.
+            columns(iterable(str)): Names of the columns with the references of each referenced state.
+                Default: The names of the referenced states.
+            normalized(bool): Flag, if the references in the source are normalized to the limits of the environment.
+                Otherwise, they are in physical units and normalized by the limits.
+            preview(int): Number of future steps in the reference observation.
+            start_time(float): Time of the source in seconds at which each episode starts.
+            chunk_size(int): Number of steps that are read at once.
+            read_ahead(bool): Flag, if the next chunk is read in a background thread.
+            kwargs(dict): Arguments passed to the superclass ReferenceGenerator.
+        """
+        super().__init__(**kwargs)
+        self._reference_states = [state.lower() for state in reference_states]
+        columns = self._reference_states if columns is None else list(columns)
+        assert len(columns) == len(self._reference_states), 'A column is required for each referenced state.'
+        assert preview >= 1, 'The preview has to contain at least one step.'
+        self._stream = TrajectoryStream(source, sample_time, columns, start_time, chunk_size, read_ahead)
+        self._normalized = normalized
+        self._preview = int(preview)
+        self._reference_names = list(self._reference_states)
+        self._state_indices = None
+        self._k = 0
+
+    def set_modules(self, physical_system):
+        # Docstring of superclass
+        super().set_modules(physical_system)
+        state_names = list(physical_system.state_names)
+        for state in self._reference_states:
+            assert state in state_names, f'The referenced state {state} is not a state of the physical system.'
+        self._state_indices = [state_names.index(state) for state in self._reference_states]
+        self._referenced_states = np.zeros(len(state_names), dtype=bool)
+        self._referenced_states[self._state_indices] = True
+        scale = 1.0 if self._normalized else 1 / physical_system.limits[self._state_indices]
+        self._stream.set_output(physical_system.tau, scale)
+        self.reference_space = Box(
+            np.tile(physical_system.state_space.low[self._state_indices], self._preview),
+            np.tile(physical_system.state_space.high[self._state_indices], self._preview),
+            dtype=np.float64
+        )
+
+    def reset(self, initial_state=None, initial_reference=None):
+        """
+        Restarts the references at the start time of the trajectory. An initial reference cannot be set, because the
+        references are given by the trajectory.
+
+        Args:
+            initial_state(ndarray(float)): The initial state of the physical system.
+            initial_reference(ndarray(float)): Ignored.
+
+        Returns:
+             initial_reference(ndarray(float)): initial reference array.
+             initial_reference_observation(element of reference_space): An initial observation of the next references.
+             trajectory(None): No initial trajectory is passed.
+        """
+        self._k = 0
+        return super().reset(initial_state)
+
+    def get_reference(self, *_, **__):
+        # Docstring of superclass
+        reference = np.zeros_like(self._referenced_states, dtype=float)
+        reference[self._state_indices] = self._stream.window(self._k)[0]
+        return reference
+
+    def get_reference_observation(self, *_, **__):
+        # Docstring of superclass
+        self._k += 1
+        return self._stream.window(self._k, self._preview).reshape(-1)
+
+    def close(self):
+        # Docstring of superclass
+        self._stream.close()
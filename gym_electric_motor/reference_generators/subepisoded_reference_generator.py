@@ -1,3 +1,5 @@
+from collections import deque
+
 import numpy as np
 from gym.spaces import Box
 
@@ -11,7 +13,12 @@ class SubepisodedReferenceGenerator(ReferenceGenerator, RandomComponent):
     time steps and can pre-calculate their references in these "sub episodes".
     """
 
-    def __init__(self, reference_state='omega', episode_lengths=(500, 2000), limit_margin=None, **kwargs):
+    _state_attributes = ReferenceGenerator._state_attributes + (
+        '_reference', '_reference_value', '_current_episode_length', '_k', '_pending_references', '_preview_buffer',
+        '_preview_offset', '_buffered_subepisodes'
+    )
+
+    def __init__(self, reference_state='omega', episode_lengths=(500, 2000), limit_margin=None, preview=1, **kwargs):
         """
         Args:
             reference_state(str): Name of the state that this reference generator is referencing.
@@ -22,6 +29,9 @@ class SubepisodedReferenceGenerator(ReferenceGenerator, RandomComponent):
                 If a float is passed, both margins are equal.
                 If None(default), the limit margin equals (nominal values/limits).
                 In general, the limit margin should not exceed (-1, 1)
+            preview(int): Number of steps in the reference observation. If it is greater than one, the observation
+                contains the current and the next references. It is a read-only view into the pre-calculated
+                references. At the end of a sub episode, the next sub episode is generated in advance.
             kwargs(dict): Keyword arguments to be passed to the base class ReferenceGenerator
         """
         ReferenceGenerator.__init__(self, **kwargs)
@@ -35,6 +45,15 @@ class SubepisodedReferenceGenerator(ReferenceGenerator, RandomComponent):
         self._current_episode_length = int(self._get_current_value(episode_lengths))
         self._k = 0
         self._reference_names = [self._reference_state]
+        # Pre-generated sub episodes as tuples (reference, state of the random generator before its generation)
+        self._pending_references = deque()
+        assert preview >= 1, 'The preview has to contain at least one step.'
+        self._preview = int(preview)
+        # References of the current and the following sub episodes from which the previews are taken
+        self._preview_buffer = None
+        self._preview_offset = 0
+        # Number of pre-generated sub episodes at the end of the preview buffer
+        self._buffered_subepisodes = 0
 
     def set_modules(self, physical_system):
         super().set_modules(physical_system)
@@ -57,7 +76,7 @@ class SubepisodedReferenceGenerator(ReferenceGenerator, RandomComponent):
             self._limit_margin = lower_margin[0], upper_margin[0]
         else:
             raise Exception('Unknown type for the limit margin.')
-        self.reference_space = Box(lower_margin[0], upper_margin[0], shape=(1,), dtype=np.float64)
+        self.reference_space = Box(lower_margin[0], upper_margin[0], shape=(self._preview,), dtype=np.float64)
 
     def reset(self, initial_state=None, initial_reference=None):
         """
@@ -73,6 +92,7 @@ class SubepisodedReferenceGenerator(ReferenceGenerator, RandomComponent):
              initial_reference_observation(element of reference_space): An initial observation of the next reference.
              trajectory(None): No initial trajectory is passed.
         """
+        self._discard_pending_references()
         if initial_reference is not None:
             self._reference_value = initial_reference[self._referenced_states][0]
         else:
@@ -81,6 +101,11 @@ class SubepisodedReferenceGenerator(ReferenceGenerator, RandomComponent):
         self._current_episode_length = -1
         return super().reset(initial_state)
 
+    def seed(self, seed=None):
+        # Docstring of superclass
+        self._pending_references.clear()
+        return super().seed(seed)
+
     def get_reference(self, *_, **__):
         reference = np.zeros_like(self._referenced_states, dtype=float)
         reference[self._referenced_states] = self._reference_value
@@ -89,11 +114,81 @@ class SubepisodedReferenceGenerator(ReferenceGenerator, RandomComponent):
     def get_reference_observation(self, *_, **__):
         if self._k >= self._current_episode_length:
             self._k = 0
-            self._current_episode_length = int(self._get_current_value(self._episode_len_range))
-            self._reset_reference()
+            if self._pending_references:
+                self._reference = self._pending_references.popleft()[0]
+                self._current_episode_length = len(self._reference)
+            else:
+                self._current_episode_length = int(self._get_current_value(self._episode_len_range))
+                self._reset_reference()
+            if self._preview > 1:
+                self._start_preview()
         self._reference_value = self._reference[self._k]
         self._k += 1
-        return np.array([self._reference_value])
+        if self._preview == 1:
+            return np.array([self._reference_value])
+        return self._preview_window()
+
+    def generate_subepisodes(self, num_subepisodes):
+        """
+        Pre-generates the references of the next sub episodes at once.
+
+        The pre-generated sub episodes are used before any new sub episode is generated during the episode. This moves
+        the generation time out of the steps, e.g. in front of a time critical control loop. For a given seed, the
+        references are identical to the ones that are generated sub episode by sub episode. Unused sub episodes are
+        discarded at the next reset and the random generator is set back as if they had never been generated.
+
+        Args:
+            num_subepisodes(int): Number of sub episodes to pre-generate.
+        """
+        if self._pending_references:
+            reference_value = self._pending_references[-1][0][-1]
+        elif self._k < self._current_episode_length:
+            reference_value = self._reference[-1]
+        else:
+            reference_value = self._reference_value
+        current_sub_episode = self._reference, self._reference_value, self._current_episode_length
+        for _ in range(num_subepisodes):
+            random_state = self._random_generator.bit_generator.state
+            self._current_episode_length = int(self._get_current_value(self._episode_len_range))
+            self._reference_value = reference_value
+            self._reset_reference()
+            self._pending_references.append((self._reference, random_state))
+            reference_value = self._reference[-1]
+        self._reference, self._reference_value, self._current_episode_length = current_sub_episode
+
+    def _discard_pending_references(self):
+        """Discards the pre-generated sub episodes and sets the random generator back to the state before them."""
+        if self._pending_references:
+            self._random_generator.bit_generator.state = self._pending_references[0][1]
+            self._pending_references.clear()
+        self._buffered_subepisodes = 0
+
+    def _start_preview(self):
+        """Starts the previews of a new sub episode."""
+        if self._buffered_subepisodes > 0:
+            # The sub episode is already in the preview buffer directly after the previous one.
+            self._buffered_subepisodes -= 1
+        else:
+            self._preview_buffer = self._reference.view()
+            self._preview_buffer.flags.writeable = False
+            self._preview_offset = -1
+
+    def _preview_window(self):
+        """Returns the view of the next preview steps, beginning with the current reference."""
+        self._preview_offset += 1
+        end = self._preview_offset + self._preview
+        while end > len(self._preview_buffer):
+            # The preview reaches into the next sub episode. Its references are appended once, so that the following
+            # previews are views again.
+            if len(self._pending_references) <= self._buffered_subepisodes:
+                self.generate_subepisodes(1)
+            next_reference = self._pending_references[self._buffered_subepisodes][0]
+            self._preview_buffer = np.concatenate((self._preview_buffer[self._preview_offset:], next_reference))
+            self._preview_buffer.flags.writeable = False
+            end -= self._preview_offset
+            self._preview_offset = 0
+            self._buffered_subepisodes += 1
+        return self._preview_buffer[self._preview_offset:end]
 
     def _reset_reference(self):
         """
@@ -113,3 +208,66 @@ class SubepisodedReferenceGenerator(ReferenceGenerator, RandomComponent):
             return value_range
         elif type(value_range) in [list, tuple, np.ndarray]:
             return (value_range[1] - value_range[0]) * self._random_generator.uniform() + value_range[0]
+
+
+def clipped_cumsum(increments, initial_value, low, high, free_steps=64):
+    """
+    Accumulates the increments to a random walk that is clipped to the bounds after each step.
+
+    The result is bit-identical to adding the increments one after another and clipping the sum after each addition.
+    Between two clippings, the walk is an ordinary cumulative sum that restarts at the clipped bound. Therefore, the
+    increments are accumulated with cumulative sums in windows up to the first clipping. Near a bound, the walk is
+    clipped every few steps and the steps are accumulated one by one until the walk has stayed within the bounds for
+    free_steps steps.
+
+    Args:
+        increments(ndarray(float)): The increments of each step.
+        initial_value(float): The value of the walk before the first step.
+        low(float): Lower bound of the walk.
+        high(float): Upper bound of the walk.
+        free_steps(int): Number of steps without clipping, after which the cumulative sums are used again.
+
+    Returns:
+        ndarray(float): The values of the walk after each step.
+    """
+    walk = np.array(increments, dtype=float)
+    length = len(walk)
+    value = float(initial_value)
+    low, high = float(low), float(high)
+    start = 0
+    window = free_steps
+    while start < length:
+        stop = min(start + window, length)
+        segment = walk[start:stop]
+        segment[0] += value
+        np.cumsum(segment, out=segment)
+        clipped = (segment > high) | (segment < low)
+        first = int(clipped.argmax())
+        if not clipped[first]:
+            value = float(segment[-1])
+            start = stop
+            window *= 2
+            continue
+        # Undo the accumulation from the first clipping on and continue step by step
+        if first > 0:
+            value = float(segment[first - 1])
+        start += first
+        walk[start:stop] = increments[start:stop]
+        values = []
+        unclipped_steps = 0
+        for increment in walk[start:].tolist():
+            value += increment
+            unclipped_steps += 1
+            if value > high:
+                value = high
+                unclipped_steps = 0
+            if value < low:
+                value = low
+                unclipped_steps = 0
+            values.append(value)
+            if unclipped_steps == free_steps:
+                break
+        walk[start:start + len(values)] = values
+        start += len(values)
+        window = free_steps
+    return walk
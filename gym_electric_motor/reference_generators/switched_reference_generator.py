@@ -8,8 +8,17 @@ from ..utils import instantiate
 
 class SwitchedReferenceGenerator(ReferenceGenerator, RandomComponent):
     """Reference Generator that switches randomly between multiple sub generators with a certain probability p for each.
+
+    If the sub generators have a preview of the next references (e.g. the ``preview`` of the
+    :py:class:`.SubepisodedReferenceGenerator`), all of them need the same preview. The previews contain the references
+    of the active sub generator.
     """
 
+    _state_attributes = ReferenceGenerator._state_attributes + (
+        '_reference', '_current_episode_length', '_k'
+    )
+    _state_components = ('_sub_generators',)
+
     def __init__(self, sub_generators, p=None, super_episode_length=(100, 10000)):
         """
         Args:
@@ -80,6 +89,19 @@ class SwitchedReferenceGenerator(ReferenceGenerator, RandomComponent):
         self._k = 0
         self._current_ref_generator = self.random_generator.choice(self._sub_generators, p=self._probabilities)
 
+    def get_state(self):
+        # Docstring of superclass
+        state = super().get_state()
+        # The active sub generator is stored by its index, so that the snapshot can also be restored in a copy of
+        # this generator (e.g. in another process).
+        state['_current_ref_generator'] = self._sub_generators.index(self._current_ref_generator)
+        return state
+
+    def set_state(self, state):
+        # Docstring of superclass
+        super().set_state(state)
+        self._current_ref_generator = self._sub_generators[state['_current_ref_generator']]
+
     def seed(self, seed=None):
         super().seed(seed)
         for sub_generator in self._sub_generators:
@@ -1,6 +1,6 @@
 import numpy as np
 
-from .subepisoded_reference_generator import SubepisodedReferenceGenerator
+from .subepisoded_reference_generator import SubepisodedReferenceGenerator, clipped_cumsum
 
 
 class WienerProcessReferenceGenerator(SubepisodedReferenceGenerator):
@@ -30,17 +30,12 @@ class WienerProcessReferenceGenerator(SubepisodedReferenceGenerator):
     def _reset_reference(self):
         self._current_sigma = 10 ** self._get_current_value(np.log10(self._sigma_range))
         random_values = self._random_generator.normal(0, self._current_sigma, self._current_episode_length)
-        self._reference = np.zeros_like(random_values)
-        reference_value = self._reference_value
-        for i in range(self._current_episode_length):
-            reference_value += random_values[i]
-            if reference_value > self._limit_margin[1]:
-                reference_value = self._limit_margin[1]
-            if reference_value < self._limit_margin[0]:
-                reference_value = self._limit_margin[0]
-            self._reference[i] = reference_value
+        self._reference = clipped_cumsum(random_values, self._reference_value, *self._limit_margin)
 
     def reset(self, initial_state=None, initial_reference=None):
+        # The initial reference is drawn from the generator of the last episode after the unused sub episodes are
+        # discarded.
+        self._discard_pending_references()
         if initial_reference is None:
             initial_reference = np.zeros_like(self._referenced_states, dtype=float)
             initial_reference[self._referenced_states] =\
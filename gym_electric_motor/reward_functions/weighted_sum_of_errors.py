@@ -120,3 +120,11 @@ class WeightedSumOfErrors(RewardFunction):
 
     def _wse_reward(self, state, reference):
         return -np.sum(self._reward_weights * (abs(state - reference) / self._state_length) ** self._n) + self._bias
+
+    def reward_batch(self, states, references, k=None, actions=None, violation_degrees=None):
+        # Docstring of superclass
+        violation_degrees = np.zeros(len(states)) if violation_degrees is None else violation_degrees
+        wse_rewards = -np.sum(
+            self._reward_weights * (abs(states - references) / self._state_length) ** self._n, axis=1
+        ) + self._bias
+        return (1.0 - violation_degrees) * wse_rewards + violation_degrees * self._violation_reward
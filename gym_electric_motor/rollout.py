@@ -0,0 +1,377 @@
+"""This module introduces the BranchRollout that evaluates several action sequences from one state of an environment."""
+import copy
+import itertools
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import gym
+import numpy as np
+
+from .core import ElectricMotorEnvironment, Callback
+from .physical_systems import BatchedSCMLSystem
+from .vector_env import VectorElectricMotorEnvironment
+
+#: Modes of the BranchRollout
+MODES = ('auto', 'vectorized', 'processes', 'sequential')
+
+
+class BranchRollout:
+    """Evaluates K candidate action sequences of a horizon H from one state of an ElectricMotorEnvironment.
+
+    All branches start from the same snapshot of the environment (see ``ElectricMotorEnvironment.get_state()``). For
+    each branch, the observed states, the reference observations, the rewards of the reward function of the environment
+    and the (discounted) cumulative rewards are returned. This is the inner loop of model predictive controllers and of
+    finite control set MPC with the FiniteB6BridgeConverter, where the action sequences can be created with
+    ``all_action_sequences``.
+
+    The branches are evaluated in one of the following modes:
+
+    * vectorized
+        - All branches are simulated at once by a VectorElectricMotorEnvironment on copies of the environment. The
+          physical systems are integrated by a single BatchedSCMLSystem and the reward function and the constraint
+          monitor are evaluated once per step for all branches. This mode requires, that the physical system and all
+          physical system wrappers support batches and that the reward function and the constraint monitor do not hold
+          an internal state. The copies are created once for each number of branches.
+    * processes
+        - The branches are split over a pool of processes. Each process holds its own copy of the environment and
+          evaluates its branches sequentially. The copies are created with the ``env_factory`` or, if no factory is
+          passed, are inherited from the parent process (only on platforms with the 'fork' start method).
+    * sequential
+        - The branches are evaluated one after another in the environment itself. Afterwards, the environment is
+          restored to its previous state.
+
+    In the 'auto' mode, the vectorized mode is selected, if it is supported. Otherwise, the process pool is used, if
+    more than one process is available and the rollout contains at least ``process_threshold`` steps in total. All
+    other rollouts are evaluated sequentially.
+
+    Callbacks and visualizations of the environment are not called during the rollouts. If a branch violates the
+    constraints, it is terminated: Its last observation is repeated for the remaining steps, which do not contribute
+    any reward.
+
+    Note that fixed step ode solvers in the vectorized mode take additional steps at the switching instants of the
+    converters of the other branches, which slightly changes their discretization (see ``BatchedSCMLSystem``).
+
+    Example:
+        >>> import numpy as np
+        >>> import gym_electric_motor as gem
+        >>> from gym_electric_motor.rollout import BranchRollout, all_action_sequences
+        >>>
+        >>> env = gem.make('Finite-CC-PMSM-v0')
+        >>> rollout = BranchRollout(env)
+        >>> env.reset()
+        >>> # All 8 ** 2 switching state sequences of the FiniteB6BridgeConverter for a horizon of two steps
+        >>> action_sequences = all_action_sequences(env.action_space, horizon=2)
+        >>> result = rollout.rollout(action_sequences)
+        >>> best_action = action_sequences[np.argmax(result['returns']), 0]
+        >>> (state, reference), reward, done, _ = env.step(best_action)
+        >>> rollout.close()
+    """
+
+    #: Minimal number of steps (branches times horizon) of a rollout for which the 'auto' mode uses the process pool.
+    process_threshold = 512
+
+    @property
+    def env(self):
+        """ElectricMotorEnvironment: The environment whose states are rolled out."""
+        return self._env
+
+    @property
+    def vectorizable(self):
+        """bool: Flag, if the environment supports the vectorized mode."""
+        return self._vectorizable
+
+    def __init__(self, env, mode='auto', processes=None, env_factory=None, gamma=1.0):
+        """
+        Args:
+            env(ElectricMotorEnvironment): The environment whose states are rolled out.
+            mode(str): One of 'auto', 'vectorized', 'processes' or 'sequential'. See above.
+            processes(int): Number of processes of the process pool. Default: The number of CPUs.
+            env_factory(callable): Picklable function without arguments that creates an environment of the same
+                configuration in the processes of the pool (e.g. ``functools.partial(gem.make, env_id, visualization=())``).
+                Default: The processes inherit a copy of the environment.
+            gamma(float): Discount factor of the cumulative rewards.
+        """
+        assert mode in MODES, f'The mode has to be one of {MODES}.'
+        assert 0.0 < gamma <= 1.0, 'The discount factor gamma has to be in (0, 1].'
+        self._env = env
+        self._mode = mode
+        self._processes = (os.cpu_count() or 1) if processes is None else processes
+        self._env_factory = env_factory
+        self._gamma = gamma
+        self._vectorizable = _supports_vectorization(env)
+        self._pool_available = env_factory is not None or 'fork' in multiprocessing.get_all_start_methods()
+        assert mode != 'vectorized' or self._vectorizable, \
+            'The physical system, the physical system wrappers, the reward function or the constraint monitor do not ' \
+            'support the vectorized mode.'
+        assert mode != 'processes' or self._pool_available, \
+            'An env_factory is required for the process pool on platforms without the fork start method.'
+        self._vector_env = None
+        self._pool = None
+
+    def rollout(self, action_sequences, state=None):
+        """Evaluates the action sequences from the passed state.
+
+        Args:
+            action_sequences(array-like): K action sequences of the horizon H. Shape: (K, H, action shape)
+            state(dict): Snapshot of the environment to start from. Default: The current state of the environment.
+
+        Returns:
+            dict: The results with the following entries:
+
+            - 'states': The observed states of each branch and step. Shape: (K, H, observed states)
+            - 'references': The reference observations of each branch and step. Shape: (K, H, references)
+            - 'rewards': The rewards of each branch and step. Shape: (K, H)
+            - 'dones': Flags, if the branch has violated the constraints in or before each step. Shape: (K, H)
+            - 'returns': The cumulative rewards discounted by gamma. Shape: (K,)
+            - 'mode': The mode in which the branches have been evaluated.
+        """
+        action_sequences = np.asarray(action_sequences)
+        assert action_sequences.ndim >= 2, 'The action sequences have to be of shape (branches, horizon, ...).'
+        current_state = self._env.get_state()
+        state = current_state if state is None else state
+        assert not state['done'], 'The environment has to be reset before rollouts can be taken from its state.'
+        mode = self._select_mode(*action_sequences.shape[:2])
+        if mode == 'vectorized':
+            result = self._rollout_vectorized(state, action_sequences)
+        elif mode == 'processes':
+            result = self._rollout_processes(state, action_sequences)
+        else:
+            result = _rollout_sequential(self._env, state, action_sequences, self._gamma)
+            self._env.set_state(current_state)
+        result['mode'] = mode
+        return result
+
+    def close(self):
+        """Shuts down the process pool and closes the copies of the environment."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        if self._vector_env is not None:
+            self._vector_env.close()
+            self._vector_env = None
+
+    def _select_mode(self, branches, horizon):
+        """Returns the mode for a rollout of the passed size."""
+        if self._mode != 'auto':
+            return self._mode
+        if self._vectorizable and branches > 1:
+            return 'vectorized'
+        if self._pool_available and self._processes > 1 and branches > 1 \
+                and branches * horizon >= self.process_threshold:
+            return 'processes'
+        return 'sequential'
+
+    def _rollout_vectorized(self, state, action_sequences):
+        """Simulates all branches at once in a VectorElectricMotorEnvironment."""
+        branches, horizon = action_sequences.shape[:2]
+        if self._vector_env is None or self._vector_env.num_envs != branches:
+            if self._vector_env is not None:
+                self._vector_env.close()
+            envs = [_copy_environment(self._env) for _ in range(branches + 1)]
+            # The ode solver of an additional copy integrates all branches with the settings of the environment.
+            ode_solver = envs.pop().physical_system.unwrapped.ode_solver
+            self._vector_env = VectorElectricMotorEnvironment(envs, ode_solver=ode_solver)
+        vector_env = self._vector_env
+        physical_system = vector_env.physical_system
+        reference_generators = vector_env.reference_generators
+        reward_function = vector_env.reward_function
+        constraint_monitor = vector_env.constraint_monitor
+        physical_system.unwrapped.set_system_state(_unwrapped_state(state['physical_system']))
+        for reference_generator in reference_generators:
+            reference_generator.set_state(state['reference_generator'])
+        reward_function.set_state(state['reward_function'])
+        constraint_monitor.set_state(state['constraint_monitor'])
+
+        result = _allocate_result(self._env, branches, horizon)
+        terminal_steps = np.full(branches, horizon)
+        active = np.ones(branches, dtype=bool)
+        for step in range(horizon):
+            actions = action_sequences[:, step]
+            states = physical_system.simulate(actions)
+            references = np.stack([
+                reference_generator.get_reference(state_)
+                for reference_generator, state_ in zip(reference_generators, states)
+            ])
+            violation_degrees = constraint_monitor.check_constraints_batch(states)
+            result['rewards'][:, step] = reward_function.reward_batch(
+                states, references, physical_system.k, actions, violation_degrees
+            )
+            result['references'][:, step] = np.stack([
+                reference_generator.get_reference_observation(state_)
+                for reference_generator, state_ in zip(reference_generators, states)
+            ])
+            result['states'][:, step] = states[:, vector_env.state_filter]
+            terminated = active & (violation_degrees >= 1.0)
+            terminal_steps[terminated] = step
+            active &= ~terminated
+            if not np.any(active):
+                break
+        _complete_result(result, terminal_steps, self._gamma)
+        return result
+
+    def _rollout_processes(self, state, action_sequences):
+        """Splits the branches over the processes of the pool."""
+        if self._pool is None:
+            if self._env_factory is not None:
+                source, context = self._env_factory, None
+            else:
+                source, context = _copy_environment(self._env), multiprocessing.get_context('fork')
+            self._pool = ProcessPoolExecutor(
+                self._processes, mp_context=context, initializer=_initialize_worker, initargs=(source,)
+            )
+        chunks = np.array_split(action_sequences, min(self._processes, len(action_sequences)))
+        futures = [self._pool.submit(_rollout_in_worker, state, chunk, self._gamma) for chunk in chunks]
+        results = [future.result() for future in futures]
+        return {key: np.concatenate([result[key] for result in results]) for key in results[0].keys()}
+
+
+def all_action_sequences(action_space, horizon=1):
+    """Returns all action sequences of a finite action space, e.g. for finite control set MPC.
+
+    Args:
+        action_space(gym.spaces.Discrete/gym.spaces.MultiDiscrete): The action space of the environment.
+        horizon(int): Length H of the sequences.
+
+    Returns:
+        ndarray(int): All n ** H action sequences of the n actions of the space. Shape: (n ** H, H) for Discrete and
+        (n ** H, H, sub actions) for MultiDiscrete action spaces.
+    """
+    if isinstance(action_space, gym.spaces.Discrete):
+        actions = range(action_space.n)
+    elif isinstance(action_space, gym.spaces.MultiDiscrete):
+        actions = list(itertools.product(*(range(n) for n in action_space.nvec)))
+    else:
+        raise AssertionError('Only Discrete and MultiDiscrete action spaces have a finite number of actions.')
+    return np.array(list(itertools.product(actions, repeat=horizon)))
+
+
+def _supports_vectorization(env):
+    """Checks, if all modules of the environment support the simulation of all branches at once."""
+    physical_system = env.physical_system
+    while physical_system is not physical_system.unwrapped:
+        if not physical_system.batch_support:
+            return False
+        physical_system = physical_system.physical_system
+    # The reward function and the constraint monitor are evaluated once for all branches. Therefore, they must not hold
+    # any state of a single branch.
+    stateless = all(
+        len(module._state_attributes) == 0 and len(module._state_components) == 0
+        for module in (env.reward_function, env.constraint_monitor)
+    )
+    return stateless and BatchedSCMLSystem.supports(physical_system)
+
+
+def _copy_environment(env):
+    """Returns a deep copy of the environment in which the callbacks and visualizations are replaced by no-ops."""
+    assert env.profiler is None, 'The profiling has to be disabled to copy the environment.'
+    memo = {id(callback): Callback() for callback in env._callbacks}
+    # The spaces are shared by all copies, because the random generators of the spaces cannot be copied in all gym
+    # versions.
+    for space in _find_spaces(env, set(memo.keys())):
+        memo[id(space)] = space
+    return copy.deepcopy(env, memo)
+
+
+def _find_spaces(obj, visited):
+    """Returns all gym spaces that are referenced by the object and its attributes."""
+    if id(obj) in visited or isinstance(obj, (np.ndarray, str, int, float)):
+        return []
+    visited.add(id(obj))
+    if isinstance(obj, gym.spaces.Space):
+        return [obj]
+    if isinstance(obj, dict):
+        members = obj.values()
+    elif isinstance(obj, (list, tuple, set)):
+        members = obj
+    else:
+        members = getattr(obj, '__dict__', {}).values()
+    return [space for member in members for space in _find_spaces(member, visited)]
+
+
+def _unwrapped_state(state):
+    """Returns the snapshot of the innermost physical system from the snapshot of the (wrapped) physical system."""
+    while '_physical_system' in state.keys():
+        state = state['_physical_system']
+    return state
+
+
+def _allocate_result(env, branches, horizon):
+    return dict(
+        states=np.zeros((branches, horizon, len(env.state_filter))),
+        references=np.zeros((branches, horizon) + env.reference_generator.reference_space.shape),
+        rewards=np.zeros((branches, horizon)),
+        dones=np.zeros((branches, horizon), dtype=bool),
+    )
+
+
+def _complete_result(result, terminal_steps, gamma):
+    """Repeats the terminal observations of the terminated branches and calculates the cumulative rewards.
+
+    Args:
+        result(dict): The result of the rollout.
+        terminal_steps(ndarray(int)): Step in which each branch has violated the constraints or the horizon, if not.
+        gamma(float): Discount factor of the cumulative rewards.
+    """
+    horizon = result['rewards'].shape[1]
+    for branch in np.flatnonzero(terminal_steps < horizon):
+        step = terminal_steps[branch]
+        result['states'][branch, step + 1:] = result['states'][branch, step]
+        result['references'][branch, step + 1:] = result['references'][branch, step]
+        result['rewards'][branch, step + 1:] = 0.0
+        result['dones'][branch, step:] = True
+    result['returns'] = result['rewards'] @ gamma ** np.arange(horizon)
+
+
+def _rollout_sequential(env, state, action_sequences, gamma):
+    """Evaluates the branches one after another in the passed environment.
+
+    The environment is not restored afterwards.
+
+    Args:
+        env(ElectricMotorEnvironment): The environment to simulate the branches in.
+        state(dict): The snapshot to start each branch from.
+        action_sequences(ndarray): The action sequences of all branches. Shape: (K, H, action shape)
+        gamma(float): Discount factor of the cumulative rewards.
+
+    Returns:
+        dict: The result of the rollout. See ``BranchRollout.rollout``.
+    """
+    branches, horizon = action_sequences.shape[:2]
+    physical_system = env.physical_system
+    reference_generator = env.reference_generator
+    reward_function = env.reward_function
+    constraint_monitor = env.constraint_monitor
+    result = _allocate_result(env, branches, horizon)
+    terminal_steps = np.full(branches, horizon)
+    for branch, actions in enumerate(action_sequences):
+        env.set_state(state)
+        for step, action in enumerate(actions):
+            # Equal to the step of the environment, but without calling the callbacks and visualizations.
+            state_ = physical_system.simulate(action)
+            reference = reference_generator.get_reference(state_)
+            violation_degree = constraint_monitor.check_constraints(state_)
+            result['rewards'][branch, step] = reward_function.reward(
+                state_, reference, physical_system.k, action, violation_degree
+            )
+            result['references'][branch, step] = reference_generator.get_reference_observation(state_)
+            result['states'][branch, step] = state_[env.state_filter]
+            if violation_degree >= 1.0:
+                terminal_steps[branch] = step
+                break
+    _complete_result(result, terminal_steps, gamma)
+    return result
+
+
+# The copy of the environment in a process of the pool
+_worker_env = None
+
+
+def _initialize_worker(source):
+    """Sets up the environment of a process of the pool from a copy of the environment or an env_factory."""
+    global _worker_env
+    _worker_env = source if isinstance(source, ElectricMotorEnvironment) else source()
+
+
+def _rollout_in_worker(state, action_sequences, gamma):
+    return _rollout_sequential(_worker_env, state, action_sequences, gamma)
@@ -0,0 +1,83 @@
+import copy
+from collections import deque
+
+import numpy as np
+
+
+class StatefulComponent:
+    """Base class for all components whose internal state changes during an episode.
+
+    The state of a component can be captured with ``get_state()`` and restored with ``set_state(state)``. This allows
+    to branch from the current state of an environment (e.g. for model predictive control or tree search) without
+    copying the whole environment. The snapshot contains only the values that change during an episode. Therefore,
+    capturing and restoring takes time in the order of the state size.
+
+    Each subclass lists the names of its attributes that change during an episode in ``_state_attributes``. Arrays,
+    lists, dictionaries and deques are copied during capturing and restoring, so that a snapshot can be restored
+    multiple times. All other values (e.g. floats or references to other objects) are stored directly.
+    The names of attributes that hold further StatefulComponents (or lists of them) are listed in
+    ``_state_components``. Their states are captured and restored recursively.
+
+    Example:
+
+        >>> import gym_electric_motor as gem
+        >>> from collections import deque
+        >>>
+        >>>
+        >>> class MyRewardFunction(gem.RewardFunction):
+        >>>
+        >>>     _state_attributes = gem.RewardFunction._state_attributes + ('_last_rewards',)
+        >>>
+        >>>     def __init__(self):
+        >>>         super().__init__()
+        >>>         self._last_rewards = deque(maxlen=10)
+        >>>
+        >>>     def reward(self, state, reference, k=None, action=None, violation_degree=0.0):
+        >>>         self._last_rewards.append(-abs(state[0] - reference[0]))
+        >>>         return sum(self._last_rewards)
+    """
+
+    #: Names of the attributes that change during an episode.
+    _state_attributes = ()
+    #: Names of the attributes that hold further StatefulComponents or lists of StatefulComponents.
+    _state_components = ()
+
+    def get_state(self):
+        """Captures the internal state of the component.
+
+        Returns:
+            dict: Snapshot with the copied values of the state attributes and the states of the sub components.
+        """
+        state = {name: _copy_value(getattr(self, name)) for name in self._state_attributes}
+        for name in self._state_components:
+            component = getattr(self, name)
+            if isinstance(component, (list, tuple)):
+                state[name] = [sub_component.get_state() for sub_component in component]
+            elif component is not None:
+                state[name] = component.get_state()
+        return state
+
+    def set_state(self, state):
+        """Restores the internal state of the component from a snapshot of ``get_state()``.
+
+        Args:
+            state(dict): The snapshot of this component. It is not modified and can be restored multiple times.
+        """
+        for name in self._state_attributes:
+            setattr(self, name, _copy_value(state[name]))
+        for name in self._state_components:
+            component = getattr(self, name)
+            if isinstance(component, (list, tuple)):
+                for sub_component, sub_state in zip(component, state[name]):
+                    sub_component.set_state(sub_state)
+            elif component is not None:
+                component.set_state(state[name])
+
+
+def _copy_value(value):
+    """Returns a copy of mutable containers. Other values are returned directly."""
+    if isinstance(value, np.ndarray):
+        return value.copy()
+    if isinstance(value, (list, dict, deque)):
+        return copy.copy(value)
+    return value
@@ -0,0 +1,205 @@
+"""Lazy reading of long measured trajectories (e.g. drive cycles) for reference generators and mechanical loads.
+
+A trajectory is stored column by column. The columns are read in chunks and only the current chunk and the chunk that
+is read ahead are held in memory. Therefore, trajectories with tens of millions of samples per column can be used
+without loading them completely.
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+
+def write_columns(path, columns):
+    """Writes the columns of a trajectory into a directory that can be streamed by a TrajectoryStream.
+
+    Each column is stored as a one-dimensional .npy-file. These files are memory-mapped during the streaming.
+
+    Args:
+        path(str): The directory to write the columns to. It is created, if it does not exist.
+        columns(dict(str, array-like)): Mapping of the column names to the samples of the columns.
+    """
+    os.makedirs(path, exist_ok=True)
+    for name, values in columns.items():
+        np.save(os.path.join(path, f'{name}.npy'), np.asarray(values, dtype=np.float64).reshape(-1))
+
+
+class TrajectoryStream:
+    """Streams the columns of a long trajectory in chunks and resamples them to the sampling time of an environment.
+
+    The source is either a directory with one .npy-file per column (see :py:func:`write_columns`) that are
+    memory-mapped, or a mapping of the column names to arbitrary sliceable one-dimensional arrays (e.g. np.memmap, h5py
+    or zarr datasets), which are read chunk by chunk. The samples at the times ``start_time + k * tau`` are
+    interpolated linearly between the samples of the source. After the end of the source, the last samples are held.
+
+    The resampled samples are kept in a buffer of ``chunk_size`` steps. If ``read_ahead`` is set, the next chunk is read
+    in a background thread while the current chunk is used. The windows of the buffer are returned without copying.
+    """
+
+    @property
+    def columns(self):
+        """
+        Returns:
+            list(str): The names of the streamed columns.
+        """
+        return self._columns
+
+    @property
+    def num_samples(self):
+        """
+        Returns:
+            int: Number of samples of the source.
+        """
+        return self._num_samples
+
+    @property
+    def duration(self):
+        """
+        Returns:
+            float: Duration of the trajectory in seconds after the start time.
+        """
+        return (self._num_samples - 1) * self._sample_time - self._start_time
+
+    def __init__(self, source, sample_time, columns, start_time=0.0, chunk_size=65536, read_ahead=True):
+        """
+        Args:
+            source(str or dict(str, array-like)): Directory with one .npy-file per column or mapping of the column
+                names to the one-dimensional arrays.
+            sample_time(float): Time between two samples of the source in seconds.
+            columns(list(str)): Names of the columns to stream.
+            start_time(float): Time of the source in seconds that is streamed at step 0.
+            chunk_size(int): Number of resampled steps that are read at once.
+            read_ahead(bool): Flag, if the next chunk is read in a background thread.
+        """
+        assert sample_time > 0, 'The sample time has to be positive.'
+        assert chunk_size > 0, 'The chunk size has to be positive.'
+        self._source = source
+        self._sample_time = sample_time
+        self._columns = list(columns)
+        self._start_time = start_time
+        self._chunk_size = int(chunk_size)
+        self._read_ahead = read_ahead
+        self._tau = sample_time
+        self._scale = np.ones(len(self._columns))
+        self._data = None
+        self._open()
+        self._num_samples = len(self._data[0])
+        assert all(len(data) == self._num_samples for data in self._data), 'All columns need the same length.'
+        assert self._num_samples > 0, 'The columns are empty.'
+        self._executor = None
+        self._clear()
+
+    def set_output(self, tau, scale=1.0):
+        """Sets the sampling time and the scaling of the streamed samples.
+
+        Args:
+            tau(float): Time between two streamed steps in seconds.
+            scale(float or array-like(float)): Factor for all columns or for each column, e.g. to normalize the
+                samples by the limits of the environment.
+        """
+        assert tau > 0, 'The sampling time has to be positive.'
+        self._tau = tau
+        self._scale = np.broadcast_to(np.asarray(scale, dtype=float), (len(self._columns),)).copy()
+        self._clear()
+
+    def window(self, k, length=1):
+        """Returns the samples of the steps k to k + length - 1.
+
+        Args:
+            k(int): The first step.
+            length(int): Number of steps.
+
+        Returns:
+            ndarray(float): Read-only view of the samples. Shape: (length, columns)
+        """
+        offset = k - self._buffer_start
+        if offset < 0 or offset + length > len(self._buffer):
+            self._load(k, length)
+            offset = 0
+        return self._buffer[offset:offset + length]
+
+    def value_at(self, t):
+        """Returns the samples at the time t that are interpolated linearly between the streamed steps.
+
+        Args:
+            t(float): Time in seconds after the start time.
+
+        Returns:
+            ndarray(float): The samples of each column. Shape: (columns,)
+        """
+        position = t / self._tau
+        k = round(position)
+        if abs(position - k) < 1e-9:
+            return self.window(k)[0]
+        k = int(np.floor(position))
+        first, second = self.window(k, 2)
+        return first + (position - k) * (second - first)
+
+    def close(self):
+        """Stops the read ahead thread and releases the buffers."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self._clear()
+
+    def _clear(self):
+        self._buffer = np.zeros((0, len(self._columns)))
+        self._buffer_start = 0
+        self._overlap = 0
+        self._pending = None
+
+    def _open(self):
+        if isinstance(self._source, str):
+            self._data = [
+                np.load(os.path.join(self._source, f'{column}.npy'), mmap_mode='r') for column in self._columns
+            ]
+        else:
+            self._data = [self._source[column] for column in self._columns]
+
+    def _load(self, k, length):
+        """Fills the buffer with the steps from k on and starts reading the following chunk."""
+        # The buffer overlaps with the next chunk, so that all windows that start within a chunk fit into the buffer.
+        if length - 1 > self._overlap:
+            self._overlap = length - 1
+            self._pending = None
+        size = self._chunk_size + self._overlap
+        if self._pending is not None and self._pending[0] == k:
+            buffer = self._pending[1].result()
+        else:
+            buffer = self._read(k, size)
+        self._pending = None
+        buffer.flags.writeable = False
+        self._buffer = buffer
+        self._buffer_start = k
+        if self._read_ahead:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1)
+            next_k = k + self._chunk_size
+            self._pending = next_k, self._executor.submit(self._read, next_k, size)
+
+    def _read(self, k, size):
+        """Reads and resamples the steps k to k + size - 1 from the source."""
+        positions = (k + np.arange(size)) * (self._tau / self._sample_time) + self._start_time / self._sample_time
+        first = min(max(int(np.floor(positions[0])), 0), self._num_samples - 1)
+        last = max(min(int(np.ceil(positions[-1])) + 1, self._num_samples), first + 1)
+        sample_positions = np.arange(first, last)
+        buffer = np.empty((size, len(self._columns)))
+        for i, (data, scale) in enumerate(zip(self._data, self._scale)):
+            buffer[:, i] = np.interp(positions, sample_positions, np.asarray(data[first:last], dtype=float)) * scale
+        return buffer
+
+    def __getstate__(self):
+        # The buffers, the read ahead thread and memory maps are not copied. Copies read the source again.
+        state = self.__dict__.copy()
+        state['_executor'] = None
+        state['_pending'] = None
+        state['_buffer'] = np.zeros((0, len(self._columns)))
+        state['_buffer_start'] = 0
+        if isinstance(self._source, str):
+            state['_data'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self._data is None:
+            self._open()
@@ -1,3 +1,5 @@
+from copy import deepcopy
+
 import numpy as np
 import gym
 
@@ -160,3 +162,28 @@ def update_parameter_dict(source_dict, update_dict, copy=True):
 
 #: Short notation for the gym.make call to avoid the necessary import of gym when making environments.
 make = gym.make
+
+
+def make_vec(environment_id, num_envs, ode_solver=None, **kwargs):
+    """
+    Short notation to create a VectorElectricMotorEnvironment of a registered environment.
+
+    Each sub-environment is created with its own copy of the passed keyword arguments, so that the sub-environments do
+    not share any module instances. Per default, the visualizations of the sub-environments are deactivated.
+
+    Args:
+        environment_id(str): Id of the registered environment. (e.g. ``'Cont-CC-PMSM-v0'``)
+        num_envs(int): Number of sub-environments.
+        ode_solver(OdeSolver/str/dict): The ode solver to integrate the batched physical system. It is also passed to
+            the sub-environments. Default: The default ode solver of the environment.
+        kwargs: Further arguments that are passed to each sub-environment.
+
+    Returns:
+        VectorElectricMotorEnvironment: The vectorized environment.
+    """
+    from .vector_env import VectorElectricMotorEnvironment
+    kwargs.setdefault('visualization', ())
+    if ode_solver is not None:
+        kwargs['ode_solver'] = ode_solver
+    envs = [make(environment_id, **deepcopy(kwargs)) for _ in range(num_envs)]
+    return VectorElectricMotorEnvironment(envs, ode_solver=deepcopy(ode_solver))
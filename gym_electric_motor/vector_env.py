@@ -0,0 +1,270 @@
+import copy
+
+import gym
+import numpy as np
+
+from .core import ElectricMotorEnvironment
+from .physical_systems import BatchedSCMLSystem
+
+
+class VectorElectricMotorEnvironment(gym.vector.VectorEnv):
+    """A vectorized environment that simulates N ElectricMotorEnvironments of the same type at once.
+
+    In contrast to wrapping several environments into a ``gym.vector.SyncVectorEnv``, the modules are evaluated on
+    batched arrays:
+
+    * PhysicalSystem
+        - All physical systems are simulated by one BatchedSCMLSystem.
+    * ConstraintMonitor and RewardFunction
+        - The ConstraintMonitor and the RewardFunction of the first environment are evaluated once per step on the
+          states of all environments with their ``check_constraints_batch`` and ``reward_batch`` functions.
+    * ReferenceGenerator
+        - The reference generators hold an individual episode state (e.g. random trajectories) for each environment.
+          They are called for each environment and their outputs are stacked to arrays.
+
+    If a sub-environment is done, its terminal observation is stored in the info dict under the key
+    ``'terminal_observation'`` and the sub-environment is reset automatically.
+    Physical system wrappers are put around the batched physical system, if they support batches (see
+    ``PhysicalSystemWrapper.batch_support``). Visualizations and callbacks of the sub-environments are not called.
+
+    Usage Example:
+        >>> import gym_electric_motor as gem
+        >>>
+        >>> env = gem.make_vec('Cont-CC-PMSM-v0', num_envs=64)
+        >>> states, references = env.reset(seed=0)
+        >>> (states, references), rewards, dones, infos = env.step(env.action_space.sample())
+    """
+
+    @property
+    def envs(self):
+        """Returns(list(ElectricMotorEnvironment)): The sub-environments that define the modules of each entry."""
+        return self._envs
+
+    @property
+    def physical_system(self):
+        """Returns(PhysicalSystem): The batched physical system of all sub-environments with its wrappers."""
+        return self._physical_system
+
+    @property
+    def reference_generators(self):
+        """Returns(list(ReferenceGenerator)): The reference generators of all sub-environments."""
+        return self._reference_generators
+
+    @property
+    def reward_function(self):
+        """Returns(RewardFunction): The RewardFunction that is evaluated for all sub-environments."""
+        return self._reward_function
+
+    @property
+    def constraint_monitor(self):
+        """Returns(ConstraintMonitor): The ConstraintMonitor that is evaluated for all sub-environments."""
+        return self._constraint_monitor
+
+    @property
+    def limits(self):
+        """Returns the limits of all states in the observation of all sub-environments. Shape: (N, states)"""
+        return self._limits[:, self.state_filter]
+
+    @property
+    def state_names(self):
+        """Returns a list of state names of all states in the observation in the same order."""
+        return self._envs[0].state_names
+
+    @property
+    def reference_names(self):
+        """Returns a list of the names of all referenced states."""
+        return self._envs[0].reference_names
+
+    @property
+    def nominal_state(self):
+        """Returns the nominal values of all states in the observation of all sub-environments. Shape: (N, states)"""
+        return self._nominal_state[:, self.state_filter]
+
+    def __init__(self, envs, ode_solver=None):
+        """
+        Args:
+            envs(Iterable(ElectricMotorEnvironment)): Environments of the same type and configuration. Their modules
+                are taken over into the vectorized environment. The environments must not share any module instances.
+            ode_solver(OdeSolver/str/dict): The ode solver to integrate the batched physical system. Default: A new
+                instance of the ode solver type of the first environment.
+        """
+        envs = list(envs)
+        assert len(envs) > 0, 'At least one environment has to be passed.'
+        env = envs[0]
+        for env_ in envs:
+            assert isinstance(env_, ElectricMotorEnvironment), 'Only ElectricMotorEnvironments can be vectorized.'
+            assert env_.state_names == env.state_names, 'All environments have to have the same states.'
+            assert env_.state_filter == env.state_filter, 'All environments have to have the same state filter.'
+            assert env_.observation_mode == 'tuple', 'Only environments in the tuple observation mode can be vectorized.'
+        assert len(set(id(env_.physical_system.unwrapped) for env_ in envs)) == len(envs), \
+            'The environments must not share their physical systems.'
+        self._envs = envs
+        self._physical_system = self._wrap(
+            BatchedSCMLSystem.make([env_.physical_system.unwrapped for env_ in envs], ode_solver=ode_solver),
+            env.physical_system
+        )
+        super().__init__(len(envs), env.observation_space, env.action_space)
+        self._limits = np.stack([env_.physical_system.limits for env_ in envs])
+        self._nominal_state = np.stack([env_.physical_system.nominal_state for env_ in envs])
+        self._reference_generators = [env_.reference_generator for env_ in envs]
+        self._reward_function = env.reward_function
+        self._constraint_monitor = env.constraint_monitor
+        self.state_filter = list(env.state_filter)
+        self.reward_range = env.reward_range
+        self._actions = None
+        self._dones = np.ones(self.num_envs, dtype=bool)
+
+    @staticmethod
+    def _wrap(batched_system, physical_system):
+        """Puts copies of the physical system wrappers of a sub-environment around the batched physical system.
+
+        Args:
+            batched_system(BatchedSCMLSystem): The batched physical system.
+            physical_system(PhysicalSystem): The (wrapped) physical system of the first sub-environment.
+
+        Returns:
+            PhysicalSystem: The wrapped batched physical system.
+        """
+        wrappers = []
+        while physical_system is not physical_system.unwrapped:
+            assert physical_system.batch_support, \
+                f'The {type(physical_system).__name__} does not support the VectorElectricMotorEnvironment.'
+            wrappers.append(physical_system)
+            physical_system = physical_system.physical_system
+        for wrapper in reversed(wrappers):
+            # The wrapper copy keeps the spaces, names and indices that have been set up with the single system.
+            wrapper = copy.copy(wrapper)
+            wrapper._physical_system = batched_system
+            batched_system = wrapper
+        return batched_system
+
+    def seed(self, seed=None):
+        """Sets the random seed in all sub-environments.
+
+        Args:
+            seed(None/int/list(int)): The seed for each sub-environment. If an integer is passed, the sub-environment
+                n is seeded with ``seed + n``. Default: None (Random seeds for all sub-environments)
+
+        Returns:
+            List(int): The entropies of the seed sequences of all sub-environments.
+        """
+        if seed is None:
+            seed = [None] * self.num_envs
+        elif isinstance(seed, int):
+            seed = [seed + n for n in range(self.num_envs)]
+        assert len(seed) == self.num_envs, 'A seed has to be passed for each sub-environment.'
+        return [entropy for env, seed_ in zip(self._envs, seed) for entropy in env.seed(seed_)]
+
+    def reset_wait(self, seed=None, return_info=False, options=None):
+        """Resets all sub-environments.
+
+        Args:
+            seed(None/int/list(int)): Seeds all sub-environments before the reset, if passed. See ``seed()``.
+            return_info(bool): Flag, if the info dicts shall be returned additionally.
+            options: Unused. Only for compatibility with the gym interface.
+
+        Returns:
+            The initial observation consisting of the initial states and initial references of all sub-environments.
+        """
+        if seed is not None:
+            self.seed(seed)
+        self._dones[:] = False
+        states = self._physical_system.reset()
+        references = self._reset_references(states, range(self.num_envs))
+        observation = states[:, self.state_filter], references
+        if return_info:
+            return observation, [{} for _ in range(self.num_envs)]
+        return observation
+
+    def step_async(self, actions):
+        # Docstring of superclass
+        self._actions = actions
+
+    def step_wait(self, **kwargs):
+        """Performs one simulation step of all sub-environments with the previously passed actions.
+
+        Returns:
+            observation(Tuple(ndarray(float),ndarray(float)): Tuple of the new states and the next references.
+            rewards(ndarray(float)): Rewards of all sub-environments for the last step.
+            dones(ndarray(bool)): Flags, indicating which sub-environments have been reset.
+            infos(list(dict)): Info dicts of the sub-environments with the terminal observations of reset ones.
+        """
+        assert not np.any(self._dones), 'A reset is required before the environment can perform further steps'
+        actions = self._actions
+        states = self._physical_system.simulate(actions)
+        references = np.stack([
+            reference_generator.get_reference(state)
+            for reference_generator, state in zip(self._reference_generators, states)
+        ])
+        violation_degrees = self._constraint_monitor.check_constraints_batch(states)
+        rewards = self._reward_function.reward_batch(
+            states, references, self._physical_system.k, actions, violation_degrees
+        )
+        dones = violation_degrees >= 1.0
+        next_references = np.stack([
+            reference_generator.get_reference_observation(state)
+            for reference_generator, state in zip(self._reference_generators, states)
+        ])
+        observed_states = states[:, self.state_filter]
+        infos = [{} for _ in range(self.num_envs)]
+        if np.any(dones):
+            indices = np.flatnonzero(dones)
+            for index in indices:
+                infos[index]['terminal_observation'] = observed_states[index].copy(), next_references[index].copy()
+            states = self._physical_system.reset(indices=indices)
+            next_references[indices] = self._reset_references(states, indices)
+            observed_states[indices] = states[indices][:, self.state_filter]
+        return (observed_states, next_references), rewards, dones, infos
+
+    def _reset_references(self, states, indices):
+        """Resets the reference generators and the reward function for the passed sub-environments.
+
+        Args:
+            states(ndarray(float)): The initial states of all sub-environments. Shape: (N, states)
+            indices(Iterable(int)): Indices of the sub-environments to reset.
+
+        Returns:
+            ndarray(float): The initial reference observations of the reset sub-environments.
+        """
+        next_references = []
+        for index in indices:
+            reference, next_reference, _ = self._reference_generators[index].reset(states[index])
+            self._reward_function.reset(states[index], reference)
+            next_references.append(next_reference)
+        return np.stack(next_references)
+
+    def call(self, name, *args, **kwargs):
+        """Calls a method or gets a property of each sub-environment.
+
+        Args:
+            name(str): Name of the method or property.
+            *args: Arguments of the method call.
+            **kwargs: Keyword arguments of the method call.
+
+        Returns:
+            tuple: The results of all sub-environments.
+        """
+        results = []
+        for env in self._envs:
+            function = getattr(env, name)
+            results.append(function(*args, **kwargs) if callable(function) else function)
+        return tuple(results)
+
+    def set_attr(self, name, values):
+        """Sets a property in each sub-environment.
+
+        Args:
+            name(str): Name of the property.
+            values(list/tuple/object): One value for each sub-environment or a single value for all.
+        """
+        if not isinstance(values, (list, tuple)):
+            values = [values] * self.num_envs
+        assert len(values) == self.num_envs, 'A value has to be passed for each sub-environment.'
+        for env, value in zip(self._envs, values):
+            setattr(env, name, value)
+
+    def close_extras(self, **kwargs):
+        # Docstring of superclass
+        self._physical_system.close()
+        for env in self._envs:
+            env.close()
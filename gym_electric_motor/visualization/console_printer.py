@@ -1,15 +1,38 @@
-from ..core import ElectricMotorVisualization
+import json
+import os
+import sys
+import time
+
 import numpy as np
 
+from ..core import ElectricMotorVisualization
+
+
+def _format_array(array):
+    """Formats an array for the console without changing the global print options of numpy."""
+    return np.array2string(np.asarray(array), formatter={'float': '{:9.3f}'.format})
+
 
 class ConsolePrinter(ElectricMotorVisualization):
     """Prints current training values of the environment on the console.
 
     These include environment state and reference values as well as the number of training steps, the rewards
     and the cumulative reward. It also shows why an episode has terminated (external, constraint violation)
+
+    In the buffered mode (``flush_interval`` is set), nothing is printed during the steps. Instead, the statistics of the
+    steps (minimum, mean and maximum of the states and rewards) and the terminated episodes are aggregated in arrays and
+    written at most once per flush interval (and when the environment is closed) with a single write. The log can be
+    written as text or as JSON lines (one JSON object per flush) to the console, to a file or to any other stream, so
+    that the logs of many parallel environments can be parsed cheaply.
+
+    Example:
+        >>> import gym_electric_motor as gem
+        >>> from gym_electric_motor.visualization import ConsolePrinter
+        >>> printer = ConsolePrinter(verbose=2, flush_interval=5.0, output='env_0.jsonl', log_format='json', tag=0)
+        >>> env = gem.make('Cont-CC-PMSM-v0', visualization=printer)
     """
 
-    def __init__(self, verbose=0, update_freq=1):
+    def __init__(self, verbose=0, update_freq=1, flush_interval=None, output=None, log_format='text', tag=None):
         """
         Args:
             verbose(Int):
@@ -21,8 +44,20 @@ class ConsolePrinter(ElectricMotorVisualization):
             update_freq(Int):
                 Unsigned Integer setting the update frequency if verbose is 2.
                 It's value n means that each nth step the corresponding output will be printed
+            flush_interval(float): Minimal wall-clock time in seconds between two writes of the buffered mode.
+                With verbose 1, the terminated episodes are written. With verbose 2, the step statistics are written
+                additionally. Default: None (no buffering, printing at the render calls)
+            output(str/file-like): Name of the file to append the buffered log to or a writable text stream.
+                Default: None (sys.stdout)
+            log_format(str): Format of the buffered log. 'text' for a human readable log or 'json' for JSON lines.
+            tag(any JSON-serializable): Identifier of the environment in the buffered log, e.g. the index of the
+                environment. The process id is logged, too.
         """
         super().__init__()
+        assert log_format in ('text', 'json'), f'Log format {log_format} is not supported.'
+        assert flush_interval is not None or (output is None and log_format == 'text'), \
+            'The output and log format can only be selected for the buffered mode.'
+        assert flush_interval is None or flush_interval >= 0, 'The flush interval must not be negative.'
         self._limits = None
         self._state = np.nan
         self._reference = np.nan
@@ -35,12 +70,36 @@ class ConsolePrinter(ElectricMotorVisualization):
         self._cum_reward = 0
         self._done = False
         self._episode = 0
-        np.set_printoptions(formatter={'float': '{:9.3f}'.format})
         self._reset = False
 
+        # Buffered mode
+        self._flush_interval = flush_interval
+        self._output = output
+        self._stream = None
+        self._log_format = log_format
+        self._tag = tag
+        self._state_names = []
+        self._next_flush = 0.0
+        self._last_flush = None
+        self._interval_steps = 0
+        self._state_sum = self._state_min = self._state_max = None
+        self._reward_sum = 0.0
+        self._reward_min = np.inf
+        self._reward_max = -np.inf
+        # (episode, steps, cumulative reward, constraint violation) of each terminated episode since the last write
+        self._episodes = []
+
     def on_reset_begin(self):
         """Gets called on environment reset. Handles internal value reset and External reset printing"""
-        self._reset = True
+        if self._flush_interval is not None:
+            if self._k > 0:
+                self._episodes.append((self._episode, int(self._k), float(self._cum_reward), bool(self._done)))
+                self._episode += 1
+            self._cum_reward = 0
+            self._k = 0
+            self._done = False
+        else:
+            self._reset = True
 
     def on_reset_end(self, state, reference):
         self._reference = reference
@@ -49,6 +108,11 @@ class ConsolePrinter(ElectricMotorVisualization):
     def set_env(self, env):
         """Gets the limits of the current physical system for accurate printing"""
         self._limits = env.physical_system.limits
+        self._state_names = list(env.physical_system.state_names)
+        if self._flush_interval is not None:
+            self._state_sum = np.zeros(len(self._state_names))
+            self._state_min = np.full(len(self._state_names), np.inf)
+            self._state_max = np.full(len(self._state_names), -np.inf)
 
     def on_step_begin(self, k, action):
         self._k = k
@@ -63,8 +127,21 @@ class ConsolePrinter(ElectricMotorVisualization):
         self._reward = reward
         self._cum_reward += reward
         self._done = done
+        self._num_steps += 1
+        if self._flush_interval is not None and self._print_freq == 2:
+            self._interval_steps += 1
+            self._state_sum += state
+            np.minimum(self._state_min, state, out=self._state_min)
+            np.maximum(self._state_max, state, out=self._state_max)
+            self._reward_sum += reward
+            self._reward_min = min(self._reward_min, reward)
+            self._reward_max = max(self._reward_max, reward)
 
     def render(self):
+        if self._flush_interval is not None:
+            if self._print_freq > 0 and time.monotonic() >= self._next_flush:
+                self.flush()
+            return
         if self._print_freq > 0:
             if self._reset:
                 print(
@@ -79,9 +156,107 @@ class ConsolePrinter(ElectricMotorVisualization):
             if self._print_freq == 2 and (self._k % self._update_freq) == 0:
                 print(f'Episode {self._episode} '
                       f'Step {self._k: 8d} '
-                      f'State {self._state * self._limits} '
-                      f'Reference {self._reference * self._limits} '
+                      f'State {_format_array(self._state * self._limits)} '
+                      f'Reference {_format_array(self._reference * self._limits)} '
                       f'Reward {self._reward:7.3f} '
                       f'Cumulative Reward {self._cum_reward:7.3f}',
                       end='\r'
                       )
+
+    def flush(self):
+        """Writes the aggregated statistics and terminated episodes of the buffered mode and resets the statistics."""
+        if self._flush_interval is None:
+            return
+        now = time.monotonic()
+        elapsed = None if self._last_flush is None else now - self._last_flush
+        self._last_flush = now
+        self._next_flush = now + self._flush_interval
+        if self._print_freq == 0 or (len(self._episodes) == 0 and self._interval_steps == 0):
+            return
+        if self._log_format == 'json':
+            text = json.dumps(self._log_entry(elapsed)) + '\n'
+        else:
+            text = self._log_text(elapsed)
+        stream = self._open_stream()
+        stream.write(text)
+        stream.flush()
+        self._episodes = []
+        self._interval_steps = 0
+        self._state_sum[:] = 0.0
+        self._state_min[:] = np.inf
+        self._state_max[:] = -np.inf
+        self._reward_sum = 0.0
+        self._reward_min = np.inf
+        self._reward_max = -np.inf
+
+    def _open_stream(self):
+        """Returns the stream of the buffered log and opens the file at the first write."""
+        if self._stream is None:
+            if self._output is None:
+                return sys.stdout
+            self._stream = open(self._output, 'a') if isinstance(self._output, str) else self._output
+        return self._stream
+
+    def _log_entry(self, elapsed):
+        """Returns the JSON-serializable entry of the buffered log."""
+        entry = dict(
+            time=time.time(), pid=os.getpid(), tag=self._tag, steps=self._num_steps, episode=self._episode,
+            episodes=[
+                dict(episode=episode, steps=steps, cumulative_reward=cumulative_reward, violation=violation)
+                for episode, steps, cumulative_reward, violation in self._episodes
+            ]
+        )
+        if self._interval_steps > 0:
+            mean, minimum, maximum = self._state_statistics()
+            entry.update(
+                interval_steps=self._interval_steps,
+                steps_per_second=None if not elapsed else self._interval_steps / elapsed,
+                reward=dict(
+                    mean=float(self._reward_sum / self._interval_steps), min=float(self._reward_min),
+                    max=float(self._reward_max)
+                ),
+                states={
+                    name: dict(mean=mean[i], min=minimum[i], max=maximum[i])
+                    for i, name in enumerate(self._state_names)
+                },
+            )
+        return entry
+
+    def _log_text(self, elapsed):
+        """Returns the lines of the buffered log in the text format."""
+        prefix = '' if self._tag is None else f'[{self._tag}] '
+        lines = [
+            f'{prefix}Episode {episode} '
+            f'{"Constraint Violation! " if violation else "External Reset. "}'
+            f'Number of steps: {steps: 8d} '
+            f'Cumulative Reward: {cumulative_reward:7.3f}'
+            for episode, steps, cumulative_reward, violation in self._episodes
+        ]
+        if self._interval_steps > 0:
+            mean, minimum, maximum = self._state_statistics()
+            steps_per_second = '' if not elapsed else f' ({self._interval_steps / elapsed:.0f} steps/s)'
+            lines.append(
+                f'{prefix}Episode {self._episode} Steps {self._num_steps: 8d}{steps_per_second} '
+                f'Reward mean {self._reward_sum / self._interval_steps:7.3f} '
+                f'min {self._reward_min:7.3f} max {self._reward_max:7.3f}'
+            )
+            lines += [
+                f'{prefix}    {name:>10} mean {mean[i]:9.3f} min {minimum[i]:9.3f} max {maximum[i]:9.3f}'
+                for i, name in enumerate(self._state_names)
+            ]
+        return '\n'.join(lines) + '\n'
+
+    def _state_statistics(self):
+        """Returns the mean, minimum and maximum of the states in physical units since the last write."""
+        return (
+            (self._state_sum / self._interval_steps * self._limits).tolist(),
+            (self._state_min * self._limits).tolist(),
+            (self._state_max * self._limits).tolist(),
+        )
+
+    def on_close(self):
+        # Docstring of superclass
+        self.flush()
+        if self._stream is not None and isinstance(self._output, str):
+            self._stream.close()
+        self._stream = None
@@ -24,6 +24,13 @@ class MotorDashboard(ElectricMotorVisualization):
 
     Furthermore, completely custom plots can be defined. They have to derive from the TimePlot, EpisodePlot or
     StepPlot base classes.
+
+    For long training runs, the rendering can be accelerated with ``blit=True`` and ``decimation=True``. With
+    blitting, the backgrounds of the figures (axes, ticks, labels, legends) are cached and only the lines are drawn
+    again at the updates. The background is only redrawn, if the limits of an axis or its static artists have changed.
+    Therefore, the axis limits are moved in pages: The time axis is moved by half of its width, when the time exceeds
+    its upper limit, and the episode and step axes double their range. With decimation, the lines of the time plots are
+    reduced to the minimum and maximum value per pixel of the axis before they are drawn.
     """
 
     @property
@@ -33,7 +40,7 @@ class MotorDashboard(ElectricMotorVisualization):
 
     def __init__(
         self, state_plots=(), action_plots=(), reward_plot=False, additional_plots=(),
-        update_interval=1000, time_plot_width=10000, style=None
+        update_interval=1000, time_plot_width=10000, style=None, blit=False, decimation=False
     ):
         """
         Args:
@@ -51,6 +58,10 @@ class MotorDashboard(ElectricMotorVisualization):
                 (1 second for continuously controlled environments / 0.1 second for discretely controlled environments)
             style(string): Select one of the matplotlib-styles. e.g. "dark-background".
                 Default: None (the already selected style)
+            blit(bool): Flag, if only the lines are drawn onto the cached backgrounds of the figures at the updates.
+                If the canvas does not support blitting, the figures are drawn completely. Default: False
+            decimation(bool): Flag, if the lines of the time plots are decimated to the minimum and maximum value per
+                pixel before they are drawn. Default: False
         """
         # Basic assertions
         assert type(reward_plot) is bool
@@ -89,6 +100,13 @@ class MotorDashboard(ElectricMotorVisualization):
         self._plots = []
         self._k = 0
         self._update_render = False
+        self._blit = blit
+        self._decimation = decimation
+        # Cached backgrounds and animated artists of each figure for the blitting
+        self._backgrounds = {}
+        self._animated_artists = {}
+        # Limits and number of artists of each axis at the last drawing of the backgrounds
+        self._axis_states = {}
 
     def on_reset_begin(self):
         """Called before the environment is reset. All subplots are reset."""
@@ -141,6 +159,36 @@ class MotorDashboard(ElectricMotorVisualization):
             self._update()
             self._update_render = False
 
+    def save_figures(self, file_name, **savefig_kwargs):
+        """Updates all plots and saves the figures into files, e.g. to export the figures of a recorded run.
+
+        Args:
+            file_name(str): Name of the files with the placeholder ``{figure}``, which is replaced by 'time',
+                'episode' or 'step' for the respective figure (e.g. 'frames/{figure}_000001.png').
+            savefig_kwargs(dict): Further arguments passed to matplotlib's savefig (e.g. dpi).
+
+        Returns:
+            list(str): The names of the saved files.
+        """
+        if not (self._time_plot_figure or self._episodic_plot_figure or self._step_plot_figure) \
+           and len(self._plots) > 0:
+            self.initialize()
+        for plot in self._plots:
+            plot.render()
+        file_names = []
+        saved_figures = []
+        figures = (
+            ('time', self._time_plot_figure), ('episode', self._episodic_plot_figure), ('step', self._step_plot_figure)
+        )
+        for name, fig in figures:
+            # In notebooks, all plots are in the same figure.
+            if fig is None or fig in saved_figures:
+                continue
+            file_names.append(file_name.format(figure=name))
+            fig.savefig(file_names[-1], **savefig_kwargs)
+            saved_figures.append(fig)
+        return file_names
+
     def set_env(self, env):
         """Called during initialization of the environment to interconnect all modules. State names, references,...
         might be saved here for later processing
@@ -181,8 +229,10 @@ class MotorDashboard(ElectricMotorVisualization):
 
         for time_plot in self._time_plots:
             time_plot.set_width(self._time_plot_width)
+            time_plot.set_decimation(self._decimation)
 
         for plot in self._plots:
+            plot.set_paging(self._blit)
             plot.set_env(env)
 
     def reset_figures(self):
@@ -195,19 +245,53 @@ class MotorDashboard(ElectricMotorVisualization):
             plot.reset_data()
         self._episodic_plot_figure = self._time_plot_figure = self._step_plot_figure = None
         self._figures = []
+        self._backgrounds = {}
+        self._animated_artists = {}
+        self._axis_states = {}
 
     def initialize(self):
         """Called with first render() call to setup the figures and plots."""
         plt.close()
         self._figures = []
+        self._backgrounds = {}
+        self._animated_artists = {}
+        self._axis_states = {}
 
         if plt.get_backend() in ['nbAgg', 'module://ipympl.backend_nbagg']:
             self._initialize_figures_notebook()
         else:
             self._initialize_figures_window()
 
+        if self._blit:
+            self._initialize_blitting()
+
         plt.pause(0.1)
 
+    def _initialize_blitting(self):
+        """Excludes the lines of the plots from the normal drawing and caches the backgrounds at each drawing."""
+        for fig in self._figures:
+            self._animated_artists[fig] = []
+            fig.canvas.mpl_connect('draw_event', self._on_draw)
+        for plot in self._plots:
+            for artist in plot.get_animated_artists():
+                artist.set_animated(True)
+                self._animated_artists[artist.figure].append(artist)
+
+    def _on_draw(self, event):
+        """Caches the background of a completely drawn figure and draws the lines onto it."""
+        fig = event.canvas.figure
+        if fig not in self._animated_artists:
+            return
+        if event.canvas.supports_blit:
+            self._backgrounds[fig] = event.canvas.copy_from_bbox(fig.bbox)
+        for artist in self._animated_artists[fig]:
+            fig.draw_artist(artist)
+
+    @staticmethod
+    def _axis_state(axis):
+        """Returns the limits and the number of artists of an axis that define the background of the axis."""
+        return axis.get_xlim(), axis.get_ylim(), len(axis.get_children())
+
     def _initialize_figures_notebook(self):
         # Create all plots below each other: First Time then Episode then Step Plots
         no_of_plots = len(self._episodic_plots) + len(self._step_plots) + len(self._time_plots)
@@ -275,6 +359,22 @@ class MotorDashboard(ElectricMotorVisualization):
         for plot in self._plots:
             plot.render()
         for fig in self._figures:
-            fig.canvas.draw()
+            if self._blit:
+                self._blit_figure(fig)
+            else:
+                fig.canvas.draw()
             fig.canvas.flush_events()
 
+    def _blit_figure(self, fig):
+        """Draws only the lines onto the cached background or the complete figure, if its background has changed."""
+        axis_states = [self._axis_state(axis) for axis in fig.axes]
+        background = self._backgrounds.get(fig)
+        if background is None or axis_states != self._axis_states.get(fig):
+            self._axis_states[fig] = axis_states
+            fig.canvas.draw()
+        else:
+            fig.canvas.restore_region(background)
+            for artist in self._animated_artists[fig]:
+                fig.draw_artist(artist)
+            fig.canvas.blit(fig.bbox)
+
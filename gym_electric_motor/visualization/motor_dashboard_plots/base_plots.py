@@ -3,6 +3,221 @@ import numpy as np
 from gym_electric_motor.core import Callback
 
 
+def decimate_min_max(x, y, x_min, x_max, bins):
+    """Reduces the data of a line to the minimum and maximum value in each of bins equally wide intervals of the x-axis.
+
+    If a bin is one pixel wide, the decimated line looks the same as the complete line in the plot. The x-data does
+    not have to be sorted. NaN-values and the data outside of [x_min, x_max] are ignored.
+
+    Args:
+        x(ndarray(float)): The x-data of the line.
+        y(ndarray(float)): The y-data of the line.
+        x_min(float): The lower limit of the x-axis.
+        x_max(float): The upper limit of the x-axis.
+        bins(int): Number of intervals (e.g. the width of the axis in pixels).
+
+    Returns:
+        x(ndarray(float)): The centers of the bins, each repeated twice. Shape: (2 * bins,)
+        y(ndarray(float)): The minimum and maximum of each bin one after another. NaN, if a bin is empty.
+            Shape: (2 * bins,)
+    """
+    in_range = (x >= x_min) & (x <= x_max)
+    # The data at x_max belongs to the last bin.
+    bin_idx = np.minimum((x[in_range] - x_min) * (bins / (x_max - x_min)), bins - 1).astype(np.intp)
+    y = y[in_range]
+    y_decimated = np.full((bins, 2), np.nan)
+    np.fmin.at(y_decimated[:, 0], bin_idx, y)
+    np.fmax.at(y_decimated[:, 1], bin_idx, y)
+    x_decimated = np.repeat(x_min + (np.arange(bins) + 0.5) * ((x_max - x_min) / bins), 2)
+    return x_decimated, y_decimated.reshape(-1)
+
+
+class RingBuffer:
+    """Numpy buffer of floats with a fixed capacity. When it is full, the oldest values are overwritten.
+
+    Appending a value is O(1) and the memory does not grow during the run.
+    """
+
+    @property
+    def capacity(self):
+        """Returns the maximal number of values in the buffer."""
+        return len(self._data)
+
+    def __init__(self, capacity):
+        """
+        Args:
+            capacity(int): Maximal number of values in the buffer.
+        """
+        assert capacity > 0, 'The capacity has to be positive.'
+        self._data = np.empty(capacity)
+        self._count = 0
+
+    def __len__(self):
+        return min(self._count, len(self._data))
+
+    def append(self, value):
+        """Appends a value and overwrites the oldest value, if the buffer is full.
+
+        Args:
+            value(float): The value to append.
+        """
+        self._data[self._count % len(self._data)] = value
+        self._count += 1
+
+    def values(self):
+        """Returns the values in the appended order.
+
+        Returns:
+            ndarray(float): The values from the oldest to the newest one. Shape: (len(self),)
+        """
+        if self._count <= len(self._data):
+            return self._data[:self._count]
+        split = self._count % len(self._data)
+        return np.concatenate((self._data[split:], self._data[:split]))
+
+    def clear(self):
+        """Removes all values."""
+        self._count = 0
+
+
+class DownsampledSeries:
+    """Series of (x, y)-points with a fixed number of buckets for the plots over the complete runtime.
+
+    Each bucket aggregates the minimum, the mean and the maximum of consecutive points. Until the capacity is reached,
+    each bucket holds a single point. Then, neighbouring buckets are merged pairwise and each bucket holds twice as many
+    points as before. Therefore, the series always covers the complete run with a constant memory, and appending a
+    point is O(1) amortized.
+
+    The line of the series goes from the minimum at the first x-value to the maximum at the last x-value of each
+    bucket. It shows the range of the y-values in each bucket and the original points, as long as the buckets hold a
+    single point.
+    """
+
+    @property
+    def capacity(self):
+        """Returns the maximal number of buckets."""
+        return len(self._count)
+
+    @property
+    def bucket_size(self):
+        """Returns the number of points that are aggregated in each full bucket."""
+        return self._bucket_size
+
+    @property
+    def last_x(self):
+        """Returns the x-value of the last appended point. None, if the series is empty."""
+        return self._x[self._size - 1, 1] if self._size > 0 else None
+
+    @property
+    def minimum(self):
+        """Returns the minimal y-value of all points."""
+        return self._minimum
+
+    @property
+    def maximum(self):
+        """Returns the maximal y-value of all points."""
+        return self._maximum
+
+    @property
+    def version(self):
+        """Returns the number of appended points to detect changes of the series."""
+        return self._version
+
+    @property
+    def x(self):
+        """Returns the x-value of the first point of each bucket."""
+        return self._x[:self._size, 0]
+
+    @property
+    def y_min(self):
+        """Returns the minimum y-value in each bucket."""
+        return self._y[:self._size, 0]
+
+    @property
+    def y_mean(self):
+        """Returns the mean y-value in each bucket."""
+        return self._sum[:self._size] / self._count[:self._size]
+
+    @property
+    def y_max(self):
+        """Returns the maximum y-value in each bucket."""
+        return self._y[:self._size, 1]
+
+    def __init__(self, capacity=4096):
+        """
+        Args:
+            capacity(int): Maximal number of buckets. It has to be even.
+        """
+        assert capacity >= 2 and capacity % 2 == 0, 'The capacity has to be a positive even number.'
+        # First and last x-value of each bucket
+        self._x = np.empty((capacity, 2))
+        # Minimum and maximum y-value of each bucket
+        self._y = np.empty((capacity, 2))
+        self._sum = np.empty(capacity)
+        self._count = np.zeros(capacity, dtype=np.int64)
+        self._size = 0
+        self._bucket_size = 1
+        self._minimum = np.inf
+        self._maximum = -np.inf
+        self._version = 0
+
+    def __len__(self):
+        return self._size
+
+    def append(self, x, y):
+        """Appends a point to the last bucket or to a new bucket, if the last one is full.
+
+        Args:
+            x(float): The x-value of the point. The x-values have to be appended in ascending order.
+            y(float): The y-value of the point.
+        """
+        idx = self._size - 1
+        if idx >= 0 and self._count[idx] < self._bucket_size:
+            self._x[idx, 1] = x
+            self._y[idx, 0] = min(self._y[idx, 0], y)
+            self._y[idx, 1] = max(self._y[idx, 1], y)
+            self._sum[idx] += y
+            self._count[idx] += 1
+        else:
+            if self._size == len(self._count):
+                self._merge()
+            idx = self._size
+            self._size += 1
+            self._x[idx] = x
+            self._y[idx] = y
+            self._sum[idx] = y
+            self._count[idx] = 1
+        self._minimum = min(self._minimum, y)
+        self._maximum = max(self._maximum, y)
+        self._version += 1
+
+    def line_data(self):
+        """Returns the data of the line through the minimum and maximum of each bucket.
+
+        Returns:
+            x(ndarray(float)): The first and last x-value of each bucket. Shape: (2 * len(self),)
+            y(ndarray(float)): The minimum and maximum y-value of each bucket. Shape: (2 * len(self),)
+        """
+        return self._x[:self._size].reshape(-1), self._y[:self._size].reshape(-1)
+
+    def clear(self):
+        """Removes all points."""
+        self.__init__(len(self._count))
+
+    def _merge(self):
+        """Merges the buckets pairwise."""
+        half = len(self._count) // 2
+        self._x[:half] = np.stack((self._x[0::2, 0], self._x[1::2, 1]), axis=1)
+        self._y[:half] = np.stack(
+            (np.minimum(self._y[0::2, 0], self._y[1::2, 0]), np.maximum(self._y[0::2, 1], self._y[1::2, 1])), axis=1
+        )
+        self._sum[:half] = self._sum[0::2] + self._sum[1::2]
+        self._count[:half] = self._count[0::2] + self._count[1::2]
+        self._count[half:] = 0
+        self._size = half
+        self._bucket_size *= 2
+
+
 class MotorDashboardPlot(Callback):
     """Base Plot class that all plots in the MotorDashboard have to derive from.
 
@@ -41,6 +256,20 @@ class MotorDashboardPlot(Callback):
         # All colors of the current matplotlib style. It is recommended to select one of these for plotting the lines.
         self._colors = [cycle['color'] for cycle in plt.rcParams['axes.prop_cycle']]
 
+        # Flag, if the limits of the axes are moved in large pages instead of small steps. Set by the dashboard.
+        self._paging = False
+
+    def set_paging(self, paging):
+        """Selects, if the dynamically scaled axis limits are moved in large pages instead of small steps.
+
+        The dashboard enables the paging for blitting, because the background of a figure only has to be drawn again,
+        if the axis limits have changed.
+
+        Args:
+            paging(bool): Flag, if the axis limits are paged.
+        """
+        self._paging = paging
+
     def initialize(self, axis):
         """Initialization of the plot.
 
@@ -59,6 +288,14 @@ class MotorDashboardPlot(Callback):
         if self._y_lim is not None:
             self._axis.set_ylim(self._y_lim)
 
+    def get_animated_artists(self):
+        """Returns the artists that are drawn onto the cached background at each update, if the dashboard blits.
+
+        Returns:
+            list(matplotlib.artist.Artist): The lines of the plot.
+        """
+        return list(self._lines)
+
     def render(self):
         """Update of the plots axis.
 
@@ -94,7 +331,8 @@ class TimePlot(MotorDashboardPlot):
 
     These use fixed-size numpy-arrays as x and y data. The plot is moved along the time axis and old data is cut out.
     Furthermore, if the environment is reset manually or a limit violation occurs, a blue or red vertical line is
-    plotted to indicate these cases in the timeline.
+    plotted to indicate these cases in the timeline. The times of these are stored in RingBuffers with the width of
+    the plot, because at most one of them can occur in each step.
 
     Attributes:
         _t(float): The cumulative simulation time.
@@ -138,8 +376,13 @@ class TimePlot(MotorDashboardPlot):
         self._done = None
         self._x_width = 10000
         self._k = 0
-        self._reset_memory = []
-        self._violation_memory = []
+        self._decimation = False
+        # The resets and violations are drawn as vertical segments of one line each instead of separate vertical
+        # lines, so that the number of artists does not grow and the background of the axis does not change.
+        self._reset_times = None
+        self._violation_times = None
+        self._reset_line = None
+        self._violation_line = None
 
     def set_width(self, width):
         """Sets the width of the plot in data points.
@@ -154,12 +397,27 @@ class TimePlot(MotorDashboardPlot):
         self._tau = env.physical_system.tau
         self.reset_data()
 
+    def initialize(self, axis):
+        # Docstring of superclass
+        super().initialize(axis)
+        self._reset_line, = self._axis.plot([], [], transform=self._axis.get_xaxis_transform(), **self._reset_line_cfg)
+        self._violation_line, = self._axis.plot(
+            [], [], transform=self._axis.get_xaxis_transform(), **self._violation_line_cfg
+        )
+
+    def get_animated_artists(self):
+        # Docstring of superclass
+        artists = super().get_animated_artists()
+        if self._paging:
+            artists += [self._reset_line, self._violation_line]
+        return artists
+
     def reset_data(self):
         super().reset_data()
         self._k = 0
         self._t = 0
-        self._reset_memory = []
-        self._violation_memory = []
+        self._reset_times = RingBuffer(self._x_width)
+        self._violation_times = RingBuffer(self._x_width)
         self._x_data = np.linspace(0, self._x_width * self._tau, self._x_width, endpoint=False)
         self._x_lim = (0, self._x_data[-1])
 
@@ -167,9 +425,9 @@ class TimePlot(MotorDashboardPlot):
         # self._done is None at initial reset.
         if self._done is not None:
             if self._done:
-                self._violation_memory.append(self._t)
+                self._violation_times.append(self._t)
             else:
-                self._reset_memory.append(self._t)
+                self._reset_times.append(self._t)
         self._done = False
 
     def on_step_end(self, k, state, reference, reward, done):
@@ -178,26 +436,133 @@ class TimePlot(MotorDashboardPlot):
         self._done = done
 
     def render(self):
-        super().render()
-
-        for violation in self._violation_memory:
-            self._axis.axvline(violation, **self._violation_line_cfg)
-        self._violation_memory = []
+        if self._decimation:
+            self._render_decimated()
+        else:
+            super().render()
+
+        lower_lim = self._axis.get_xlim()[0]
+        self._violation_line.set_data(*self._vertical_segments(self._violation_times.values(), lower_lim))
+        self._reset_line.set_data(*self._vertical_segments(self._reset_times.values(), lower_lim))
+
+    @staticmethod
+    def _vertical_segments(times, lower_lim):
+        """Returns the data of vertical segments over the complete height of the axis at the times after lower_lim."""
+        times = times[times >= lower_lim]
+        x = np.repeat(times, 3)
+        x[2::3] = np.nan
+        y = np.tile([0.0, 1.0, np.nan], len(times))
+        return x, y
+
+    def set_decimation(self, decimation):
+        """Selects, if the lines are decimated to the minimum and maximum value per pixel of the axis before plotting.
 
-        for reset in self._reset_memory:
-            self._axis.axvline(reset, **self._reset_line_cfg)
-        self._reset_memory = []
+        Args:
+            decimation(bool): Flag, if the lines are decimated.
+        """
+        self._decimation = decimation
 
     def _scale_x_axis(self):
-        """The x-axis is modeled as a sliding window in this plot."""
+        """The x-axis is modeled as a sliding window in this plot.
+
+        With paging, the window is moved by half of its width, when the time exceeds the upper limit.
+        """
         x_lim = self._axis.get_xlim()
-        upper_lim = max(self._t, x_lim[1])
+        if self._paging:
+            if self._t <= x_lim[1]:
+                return
+            upper_lim = self._t + 0.5 * self._x_width * self._tau
+        else:
+            upper_lim = max(self._t, x_lim[1])
         lower_lim = upper_lim - self._x_width * self._tau
         self._axis.set_xlim(lower_lim, upper_lim)
 
+    def _render_decimated(self):
+        """Sets the data of the lines decimated to the pixel width of the axis."""
+        self._scale_x_axis()
+        self._scale_y_axis()
+        x_min, x_max = self._axis.get_xlim()
+        bins = max(int(self._axis.get_window_extent().width), 1)
+        for line, data in zip(self._lines, self._y_data):
+            line.set_data(*decimate_min_max(self._x_data, data, x_min, x_max, bins))
 
-class EpisodePlot(MotorDashboardPlot):
-    """Base Plot class that all episode based plots ."""
+
+class _DownsampledDataPlot(MotorDashboardPlot):
+    """Base class of the plots whose data grows during the complete run.
+
+    The data of each line is stored in a DownsampledSeries of a fixed capacity. Subclasses append the points with
+    _append(). The lines are only updated, if new points have been appended.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._capacity = 4096
+        self._series = []
+        self._rendered_versions = None
+
+    def set_capacity(self, capacity):
+        """Sets the number of buckets of the series of each line.
+
+        Args:
+            capacity(int): Even number of buckets. Until the capacity is reached, each point is plotted. Afterwards,
+                the minimum and maximum of the aggregated points in each bucket are plotted.
+        """
+        self._capacity = capacity
+        self.reset_data()
+
+    def _append(self, x, *y):
+        """Appends a point to the series of each line.
+
+        Args:
+            x(float): The common x-value.
+            y(float): The y-value of each line.
+        """
+        while len(self._series) < len(y):
+            self._series.append(DownsampledSeries(self._capacity))
+        for series, y_ in zip(self._series, y):
+            series.append(x, y_)
+
+    def render(self):
+        # Docstring of superclass
+        versions = [series.version for series in self._series]
+        if versions != self._rendered_versions:
+            self._rendered_versions = versions
+            for line, series in zip(self._lines, self._series):
+                line.set_data(*series.line_data())
+        self._scale_x_axis()
+        self._scale_y_axis()
+
+    def initialize(self, axis):
+        # Docstring of superclass
+        super().initialize(axis)
+        self._rendered_versions = None
+
+    def reset_data(self):
+        # Docstring of superclass
+        super().reset_data()
+        self._series = []
+        self._rendered_versions = None
+
+    def _scale_x_axis(self):
+        """The upper x-limit is set to the last x-value. With paging, it is doubled when the last x-value exceeds it."""
+        if len(self._series) == 0 or len(self._series[0]) == 0:
+            return
+        x_lim = self._axis.get_xlim()
+        upper_lim = self._series[0].last_x
+        if self._paging:
+            if upper_lim <= x_lim[1]:
+                return
+            upper_lim = max(2 * upper_lim, 10)
+        if x_lim != (-1, upper_lim):
+            self._axis.set_xlim(-1, upper_lim)
+
+
+class EpisodePlot(_DownsampledDataPlot):
+    """Base Plot class that all episode based plots .
+
+    Subclasses append the values of each finished episode in _set_y_data() with
+    ``self._append(self._episode_no, *values)``.
+    """
 
     def __init__(self):
         super().__init__()
@@ -205,7 +570,6 @@ class EpisodePlot(MotorDashboardPlot):
 
     def on_reset_begin(self):
         if self._episode_no > -1:
-            self._x_data.append(self._episode_no)
             self._set_y_data()
         self._episode_no += 1
 
@@ -214,15 +578,10 @@ class EpisodePlot(MotorDashboardPlot):
 
     def reset_data(self):
         super().reset_data()
-        self._y_data = []
         self._episode_no = -1
 
-    def _scale_x_axis(self):
-        if len(self._x_data) > 0 and self._axis.get_xlim() != (-1, self._x_data[-1]):
-            self._axis.set_xlim(-1, self._x_data[-1])
-
 
-class StepPlot(MotorDashboardPlot):
+class StepPlot(_DownsampledDataPlot):
 
     def __init__(self):
         super().__init__()
@@ -233,14 +592,11 @@ class StepPlot(MotorDashboardPlot):
 
     def reset_data(self):
         super().reset_data()
-        self._y_data = []
         self._k = 0
 
-    def _scale_x_axis(self):
-        if self._axis.get_xlim() != (-1, self._x_data[-1]):
-            self._axis.set_xlim(-1, self._x_data[-1])
-
     def _scale_y_axis(self):
-        min_, max_ = min(self._y_data[0]), max(self._y_data[0])
+        if len(self._series) == 0 or len(self._series[0]) == 0:
+            return
+        min_, max_ = self._series[0].minimum, self._series[0].maximum
         if self._axis.get_ylim() != (min_, max_):
             self._axis.set_ylim(min_, max_)
@@ -6,8 +6,6 @@ class EpisodeLengthPlot(EpisodePlot):
 
     def __init__(self):
         super().__init__()
-        # data container for episode lengths
-        self._episode_lengths = []
         self._episode_length = 0
         self._label = 'Episode Length'
         self._axis = None
@@ -15,7 +13,6 @@ class EpisodeLengthPlot(EpisodePlot):
         self._reset = False
         self._ymax = 1.0
         self._update_lim = False
-        self._y_data.append(self._episode_lengths)
 
     def initialize(self, axis):
         super().initialize(axis)
@@ -26,13 +23,11 @@ class EpisodeLengthPlot(EpisodePlot):
 
     def reset_data(self):
         super().reset_data()
-        self._episode_lengths = []
         self._ymax = 1
         self._update_lim = True
-        self._y_data.append(self._episode_lengths)
 
     def _set_y_data(self):
-        self._episode_lengths.append(self._episode_length)
+        self._append(self._episode_no, self._episode_length)
         if self._ymax < self._episode_length:
             self._ymax = self._episode_length
             self._update_lim = True
@@ -41,3 +36,4 @@ class EpisodeLengthPlot(EpisodePlot):
     def _scale_y_axis(self):
         if self._update_lim:
             self._axis.set_ylim(-0.1 * self._ymax, 1.1 * self._ymax)
+            self._update_lim = False
@@ -0,0 +1,229 @@
+"""Offline visualization of recorded runs.
+
+The :py:class:`DashboardRecorder` writes the states, references, actions and rewards of the steps of an environment
+into a file. The in-loop visualization can be switched off completely (``visualization=()``). After the run,
+:py:func:`export_dashboard` replays the recording on a
+:py:class:`~gym_electric_motor.visualization.motor_dashboard.MotorDashboard` and saves its figures as PNG-frames or
+videos. The frames are rendered in parallel in a pool of processes with a non-interactive backend, so no display is
+required.
+
+Example:
+    During the run:
+
+    >>> import gym_electric_motor as gem
+    >>> from gym_electric_motor.visualization.recording import DashboardRecorder, export_dashboard
+    >>> env = gem.make('Cont-CC-PMSM-v0', visualization=(), callbacks=[DashboardRecorder('pmsm_run')])
+    >>> ...
+    >>> env.close()
+
+    After the run:
+
+    >>> export_dashboard(
+    >>>     'pmsm_run', 'pmsm_run.mp4', frame_interval=1000, processes=8,
+    >>>     state_plots=('i_sd', 'i_sq'), reward_plot=True
+    >>> )
+"""
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .step_records import RecordingCallback, RecordReplay
+
+_METADATA_FILE = 'metadata.json'
+_RECORDS_FILE = 'records.bin'
+
+
+class DashboardRecorder(RecordingCallback):
+    """Writes the states, references, actions and rewards of every decimation-th step into a recording directory.
+
+    The recording consists of the metadata of the environment (metadata.json) and the records of the steps as raw
+    float64 values (records.bin). The records are collected in a chunk of ``chunk_size`` records and appended to the
+    file, when the chunk is full and when the environment is closed. Therefore, the memory does not grow during the run.
+
+    Recordings can be loaded with :py:func:`load_recording` and rendered with :py:func:`export_dashboard`.
+    """
+
+    @property
+    def path(self):
+        """Returns the directory of the recording."""
+        return self._path
+
+    def __init__(self, path, decimation=1, chunk_size=4096):
+        """
+        Args:
+            path(str): Directory of the recording. It is created, if it does not exist. An existing recording in the
+                directory is overwritten.
+            decimation(int): Only every decimation-th step is recorded. With a decimation of 1, the exported figures are
+                the same as the figures of a MotorDashboard that renders during the run.
+            chunk_size(int): Number of records that are written to the file at once.
+        """
+        super().__init__(decimation)
+        assert chunk_size > 0, 'The chunk size has to be positive.'
+        self._path = path
+        self._chunk_size = chunk_size
+        self._chunk = None
+        self._chunk_idx = 0
+        self._file = None
+
+    def _open(self, metadata, record_width):
+        # Docstring of superclass
+        self.on_close()
+        os.makedirs(self._path, exist_ok=True)
+        with open(os.path.join(self._path, _METADATA_FILE), 'w') as file:
+            json.dump(dict(metadata, record_width=record_width), file)
+        self._file = open(os.path.join(self._path, _RECORDS_FILE), 'wb')
+        self._chunk = np.zeros((self._chunk_size, record_width))
+        self._chunk_idx = 0
+
+    def _next_record(self):
+        # Docstring of superclass
+        return self._chunk[self._chunk_idx]
+
+    def _publish(self):
+        # Docstring of superclass
+        self._chunk_idx += 1
+        if self._chunk_idx == self._chunk_size:
+            self.flush()
+
+    def flush(self):
+        """Writes the collected records to the file."""
+        if self._file is None:
+            return
+        self._chunk[:self._chunk_idx].tofile(self._file)
+        self._file.flush()
+        self._chunk_idx = 0
+
+    def on_close(self):
+        # Docstring of superclass
+        if self._file is not None:
+            self.flush()
+            self._file.close()
+            self._file = None
+
+
+def load_recording(path):
+    """Loads a recording of a DashboardRecorder.
+
+    Args:
+        path(str): Directory of the recording.
+
+    Returns:
+        metadata(dict): The description of the environment.
+        records(ndarray(float)): Memory-mapped records of the steps. Shape: (records, record_width)
+    """
+    with open(os.path.join(path, _METADATA_FILE)) as file:
+        metadata = json.load(file)
+    records_file = os.path.join(path, _RECORDS_FILE)
+    if os.path.getsize(records_file) == 0:
+        return metadata, np.zeros((0, metadata['record_width']))
+    return metadata, np.memmap(records_file, dtype=np.float64, mode='r').reshape(-1, metadata['record_width'])
+
+
+def export_dashboard(
+    path, output, frame_interval=1000, processes=None, fps=25, dpi=None, **dashboard_kwargs
+):
+    """Renders the figures of a MotorDashboard for a recording of a DashboardRecorder.
+
+    A frame is rendered after every frame_interval-th recorded step (like a dashboard with an update_interval of
+    frame_interval during the run) and after the last step. The frames are split into consecutive blocks that are
+    rendered in parallel in a pool of processes with the non-interactive Agg-backend of matplotlib.
+
+    Args:
+        path(str): Directory of the recording.
+        output(str): Directory for the PNG-frames or name of a video file (.gif or a video format of ffmpeg, e.g. .mp4).
+            The frames are saved as ``<output>/<figure>_<frame>.png`` with figure in ('time', 'episode', 'step').
+            The name of a video file can contain the placeholder ``{figure}``. Otherwise, ``_<figure>`` is appended to
+            the name of each video.
+        frame_interval(int): Number of recorded steps between two frames.
+        processes(int): Number of rendering processes. Default: Number of CPUs
+        fps(float): Frames per second of the videos.
+        dpi(float): Resolution of the frames. Default: None (the resolution of the matplotlib settings)
+        dashboard_kwargs(dict): Arguments of the MotorDashboard (e.g. state_plots, reward_plot, additional_plots).
+
+    Returns:
+        list(str): The names of the saved frames or videos.
+    """
+    assert frame_interval > 0, 'The frame interval has to be positive.'
+    metadata, records = load_recording(path)
+    frame_steps = list(range(frame_interval, len(records) + 1, frame_interval))
+    if len(records) > 0 and (len(frame_steps) == 0 or frame_steps[-1] != len(records)):
+        frame_steps.append(len(records))
+    video = os.path.splitext(output)[1] != ''
+    frame_directory = tempfile.mkdtemp() if video else output
+    os.makedirs(frame_directory, exist_ok=True)
+    frame_name = os.path.join(frame_directory, '{figure}_{frame:06d}.png')
+    dashboard_kwargs = dict(dashboard_kwargs, update_interval=frame_interval)
+    processes = min(processes or os.cpu_count(), max(len(frame_steps), 1))
+    blocks = [block for block in np.array_split(np.arange(len(frame_steps)), processes) if len(block) > 0]
+    try:
+        with ProcessPoolExecutor(processes) as pool:
+            futures = [
+                pool.submit(
+                    _render_frames, path, frame_name, int(block[0]), frame_steps[block[0]:block[-1] + 1],
+                    dashboard_kwargs, dict(dpi=dpi)
+                ) for block in blocks
+            ]
+            frames = [file_name for future in futures for file_name in future.result()]
+        if not video:
+            return frames
+        return [
+            _write_video(frame_name.replace('{frame:06d}', '%06d').format(figure=figure), len(frame_steps),
+                         _video_name(output, figure), fps)
+            for figure in dict.fromkeys(os.path.basename(frame).rsplit('_', 1)[0] for frame in frames)
+        ]
+    finally:
+        if video:
+            shutil.rmtree(frame_directory, ignore_errors=True)
+
+
+def _render_frames(path, frame_name, first_frame, frame_steps, dashboard_kwargs, savefig_kwargs):
+    """Replays a recording on a new dashboard and saves its figures at the frame steps.
+
+    All steps before the first frame are replayed as well, because the episode and step plots show the complete run.
+    """
+    import matplotlib
+    matplotlib.use('Agg', force=True)
+    from .motor_dashboard import MotorDashboard
+
+    metadata, records = load_recording(path)
+    replay = RecordReplay(metadata)
+    dashboard = MotorDashboard(**dashboard_kwargs)
+    dashboard.set_env(replay.environment)
+    file_names = []
+    step = 0
+    for frame, frame_step in enumerate(frame_steps, start=first_frame):
+        replay.replay(dashboard, records[step:frame_step])
+        step = frame_step
+        file_names += dashboard.save_figures(frame_name.replace('{frame:06d}', f'{frame:06d}'), **savefig_kwargs)
+    return file_names
+
+
+def _video_name(output, figure):
+    """Returns the name of the video of a figure."""
+    if '{figure}' in output:
+        return output.format(figure=figure)
+    root, extension = os.path.splitext(output)
+    return f'{root}_{figure}{extension}'
+
+
+def _write_video(frame_pattern, num_frames, output, fps):
+    """Combines the PNG-frames of a figure to a GIF with pillow or to another video format with ffmpeg."""
+    if output.lower().endswith('.gif'):
+        from PIL import Image
+        frames = [Image.open(frame_pattern % frame) for frame in range(num_frames)]
+        frames[0].save(output, save_all=True, append_images=frames[1:], duration=1000 / fps, loop=0)
+        return output
+    import matplotlib
+    ffmpeg = shutil.which(matplotlib.rcParams['animation.ffmpeg_path'])
+    assert ffmpeg is not None, 'ffmpeg is required to write videos other than GIFs.'
+    subprocess.run([
+        ffmpeg, '-y', '-loglevel', 'error', '-framerate', str(fps), '-i', frame_pattern,
+        # Most video codecs require even frame sizes
+        '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2', '-pix_fmt', 'yuv420p', output
+    ], check=True)
+    return output
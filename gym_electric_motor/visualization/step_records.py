@@ -0,0 +1,186 @@
+"""Records of the steps of an environment that can be replayed on a MotorDashboard without the environment.
+
+The records are written by the :py:class:`~gym_electric_motor.visualization.telemetry.TelemetryCallback` into shared
+memory and by the :py:class:`~gym_electric_motor.visualization.recording.DashboardRecorder` into files. Each record
+is a float array with the episode step, a reset flag, the done flag, the reward, the states, the references and the
+action of a step.
+"""
+import numpy as np
+from gym.spaces import Box, Discrete, MultiDiscrete
+
+from ..core import Callback
+
+# Fields at the beginning of each record, followed by the states, references and actions
+_K, _FLAGS, _DONE, _REWARD = range(4)
+_NUM_FIELDS = 4
+# Bits of the flags field
+RESET_FLAG = 1
+
+
+def space_description(space):
+    """Returns a JSON-serializable description of a Box, Discrete or MultiDiscrete action space."""
+    if isinstance(space, Discrete):
+        return dict(type='Discrete', n=int(space.n))
+    if isinstance(space, MultiDiscrete):
+        return dict(type='MultiDiscrete', nvec=space.nvec.tolist())
+    assert isinstance(space, Box), f'Action space of type {type(space)} not supported for the recording.'
+    return dict(type='Box', low=space.low.tolist(), high=space.high.tolist())
+
+
+def space_from_description(description):
+    """Returns the action space of a description of space_description."""
+    if description['type'] == 'Discrete':
+        return Discrete(description['n'])
+    if description['type'] == 'MultiDiscrete':
+        return MultiDiscrete(description['nvec'])
+    return Box(np.array(description['low']), np.array(description['high']), dtype=np.float64)
+
+
+def record_slices(num_states):
+    """Returns the slices of the states, references and actions in a record."""
+    return (
+        slice(_NUM_FIELDS, _NUM_FIELDS + num_states),
+        slice(_NUM_FIELDS + num_states, _NUM_FIELDS + 2 * num_states),
+        slice(_NUM_FIELDS + 2 * num_states, None),
+    )
+
+
+class RecordingCallback(Callback):
+    """Base class of the callbacks that write the steps of an environment as records.
+
+    Each record contains the episode step, a reset flag, the done flag, the reward, the states, the references and
+    the action of a step. The descriptions of the states, the action space and the reward range are passed as metadata
+    to _open(), so that the records can be replayed on a MotorDashboard without the environment. Subclasses provide the
+    storage of the records.
+    """
+
+    def __init__(self, decimation=1):
+        """
+        Args:
+            decimation(int): Only every decimation-th step is recorded.
+        """
+        super().__init__(step_interval=decimation)
+        self._reset = False
+
+    def set_env(self, env):
+        # Docstring of superclass
+        super().set_env(env)
+        ps = env.physical_system
+        action_space = ps.action_space
+        action_width = 1 if isinstance(action_space, Discrete) else action_space.shape[0]
+        num_states = len(ps.state_names)
+        metadata = dict(
+            state_names=list(ps.state_names),
+            limits=np.asarray(ps.limits, dtype=float).tolist(),
+            state_space_low=ps.state_space.low.tolist(),
+            state_space_high=ps.state_space.high.tolist(),
+            referenced_states=np.asarray(env.reference_generator.referenced_states, dtype=bool).tolist(),
+            tau=ps.tau * self.step_interval,
+            reward_range=[float(limit) for limit in env.reward_range],
+            action_space=space_description(action_space),
+            decimation=self.step_interval,
+        )
+        self._states, self._references, self._actions = record_slices(num_states)
+        self._open(metadata, _NUM_FIELDS + 2 * num_states + action_width)
+
+    def _open(self, metadata, record_width):
+        """Opens the storage of the records.
+
+        Args:
+            metadata(dict): JSON-serializable description of the environment.
+            record_width(int): Number of floats per record.
+        """
+        raise NotImplementedError
+
+    def _next_record(self):
+        """Returns the writable slot of the next record."""
+        raise NotImplementedError
+
+    def _publish(self):
+        """Completes the record that has been written into the slot of _next_record()."""
+        raise NotImplementedError
+
+    def on_reset_begin(self):
+        # Docstring of superclass
+        self._reset = True
+
+    def on_step_begin(self, k, action):
+        # Docstring of superclass
+        record = self._next_record()
+        record[self._actions] = action
+
+    def on_step_end(self, k, state, reference, reward, done):
+        # Docstring of superclass
+        record = self._next_record()
+        record[_K] = k
+        record[_FLAGS] = RESET_FLAG if self._reset else 0
+        record[_DONE] = done
+        record[_REWARD] = reward
+        record[self._states] = state
+        record[self._references] = reference
+        self._publish()
+        self._reset = False
+
+
+class RecordedPhysicalSystem:
+    """Provides the attributes of the physical system that are required by the plots from the metadata of the recording."""
+
+    def __init__(self, metadata):
+        self.state_names = metadata['state_names']
+        self.state_positions = {state: idx for idx, state in enumerate(self.state_names)}
+        self.limits = np.array(metadata['limits'])
+        self.state_space = Box(
+            np.array(metadata['state_space_low']), np.array(metadata['state_space_high']), dtype=np.float64
+        )
+        self.tau = metadata['tau']
+        self.action_space = space_from_description(metadata['action_space'])
+
+
+class RecordedReferenceGenerator:
+    """Provides the referenced states from the metadata of the recording."""
+
+    def __init__(self, metadata):
+        self.referenced_states = np.array(metadata['referenced_states'], dtype=bool)
+
+
+class RecordedEnvironment:
+    """Provides the attributes of the environment that are required by the plots from the metadata of the recording."""
+
+    def __init__(self, metadata):
+        self.physical_system = RecordedPhysicalSystem(metadata)
+        self.reference_generator = RecordedReferenceGenerator(metadata)
+        self.action_space = self.physical_system.action_space
+        self.reward_range = tuple(metadata['reward_range'])
+
+
+class RecordReplay:
+    """Replays records on a MotorDashboard that has been set up with the environment of the metadata."""
+
+    def __init__(self, metadata):
+        """
+        Args:
+            metadata(dict): The metadata of the recording callback.
+        """
+        self.environment = RecordedEnvironment(metadata)
+        self._states, self._references, self._actions = record_slices(len(metadata['state_names']))
+        self._discrete = metadata['action_space']['type'] != 'Box'
+
+    def replay(self, dashboard, records):
+        """Passes the steps of the records to the dashboard.
+
+        Args:
+            dashboard(MotorDashboard): The dashboard.
+            records(ndarray(float)): The records. Shape: (records, record_width)
+        """
+        for record in records:
+            if int(record[_FLAGS]) & RESET_FLAG:
+                dashboard.on_reset_begin()
+            action = record[self._actions]
+            if self._discrete:
+                action = action.astype(int)
+                action = action[0] if len(action) == 1 else action
+            k = int(record[_K])
+            dashboard.on_step_begin(k - 1, action)
+            dashboard.on_step_end(
+                k, record[self._states], record[self._references], record[_REWARD], bool(record[_DONE])
+            )
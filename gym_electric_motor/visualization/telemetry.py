@@ -0,0 +1,371 @@
+"""Out-of-process visualization of an environment.
+
+The :py:class:`TelemetryCallback` writes samples of the states, references, actions and rewards of an environment into
+a bounded ring buffer in shared memory. The :py:class:`TelemetryViewer` reads the samples in another process and renders
+them with the plots of the :py:class:`~gym_electric_motor.visualization.motor_dashboard.MotorDashboard`. Therefore, the
+drawing does not block the training process. The ring buffer is removed, when the environment is closed.
+
+The environment never waits for the viewer. If the viewer falls behind, the oldest samples in the ring buffer are
+overwritten and the viewer skips them.
+
+Example:
+    In the training process:
+
+    >>> import gym_electric_motor as gem
+    >>> from gym_electric_motor.visualization.telemetry import TelemetryCallback
+    >>> telemetry = TelemetryCallback('pmsm_telemetry', decimation=10)
+    >>> env = gem.make('Cont-CC-PMSM-v0', visualization=(), callbacks=[telemetry])
+    >>> telemetry.launch_viewer(state_plots=('i_sd', 'i_sq'), action_plots='all', reward_plot=True)
+
+    Or in a separate shell:
+
+    .. code-block:: bash
+
+        python -m gym_electric_motor.visualization.telemetry pmsm_telemetry --state-plots i_sd i_sq --reward-plot
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+import numpy as np
+
+from .step_records import RecordingCallback, RecordReplay
+
+#: Version of the layout of the ring buffer
+_LAYOUT_VERSION = 1
+# Indices in the header of the ring buffer
+_VERSION, _SLOTS, _WIDTH, _WRITE_COUNT, _CLOSED, _METADATA_SIZE = range(6)
+_HEADER_SIZE = 8
+# Names of the shared memory blocks that have been created in this process
+_created_blocks = set()
+
+
+class TelemetryRingBuffer:
+    """Bounded ring buffer of float records in shared memory with one writer and one reader.
+
+    The writer never blocks. It overwrites the oldest records, if the ring buffer is full. The reader copies all records
+    that have been written since its last read and counts the records that have been overwritten before they were read.
+    A JSON-serializable metadata dictionary is stored in front of the records.
+
+    The shared memory requires Python 3.8 or newer.
+    """
+
+    @property
+    def name(self):
+        """Returns the name of the shared memory block."""
+        return self._shared_memory.name
+
+    @property
+    def metadata(self):
+        """Returns the metadata dictionary that has been stored by the writer."""
+        return self._metadata
+
+    @property
+    def capacity(self):
+        """Returns the maximal number of records in the ring buffer."""
+        return int(self._header[_SLOTS]) - 1
+
+    @property
+    def write_count(self):
+        """Returns the number of records that have been written."""
+        return int(self._header[_WRITE_COUNT])
+
+    @property
+    def closed(self):
+        """Returns the flag, if the writer has closed the ring buffer."""
+        return bool(self._header[_CLOSED])
+
+    @property
+    def dropped(self):
+        """Returns the number of records that have been overwritten before this reader could read them."""
+        return self._dropped
+
+    def __init__(self, name=None, record_width=None, capacity=65536, metadata=None):
+        """
+        Args:
+            name(str): Name of the shared memory block. A writer creates a new block with this name (a random name, if
+                None). A reader attaches to the existing block with this name.
+            record_width(int): Number of floats per record. Only required for the writer.
+                Default: None (attach to an existing ring buffer as reader)
+            capacity(int): Maximal number of records in the ring buffer of the writer.
+            metadata(dict): JSON-serializable metadata that is stored by the writer.
+        """
+        # The shared memory is available from Python 3.8 on.
+        from multiprocessing import shared_memory
+        self._is_writer = record_width is not None
+        self._dropped = 0
+        self._read_count = 0
+        if self._is_writer:
+            assert capacity > 0, 'The capacity has to be positive.'
+            metadata_bytes = json.dumps(metadata or {}).encode()
+            metadata_size = -(-len(metadata_bytes) // 8) * 8
+            # One additional slot is written by the writer while the others can be read.
+            slots = capacity + 1
+            self._shared_memory = shared_memory.SharedMemory(
+                name=name, create=True, size=8 * (_HEADER_SIZE + slots * record_width) + metadata_size
+            )
+            _created_blocks.add(self._shared_memory.name)
+            self._header = np.ndarray((_HEADER_SIZE,), dtype=np.int64, buffer=self._shared_memory.buf)
+            self._header[:] = 0
+            self._header[_VERSION] = _LAYOUT_VERSION
+            self._header[_SLOTS] = slots
+            self._header[_WIDTH] = record_width
+            self._header[_METADATA_SIZE] = len(metadata_bytes)
+            self._shared_memory.buf[8 * _HEADER_SIZE:8 * _HEADER_SIZE + len(metadata_bytes)] = metadata_bytes
+        else:
+            self._shared_memory = self._attach(name)
+            self._header = np.ndarray((_HEADER_SIZE,), dtype=np.int64, buffer=self._shared_memory.buf)
+            assert self._header[_VERSION] == _LAYOUT_VERSION, 'The ring buffer has an unsupported layout.'
+            metadata_size = -(-int(self._header[_METADATA_SIZE]) // 8) * 8
+        metadata_start = 8 * _HEADER_SIZE
+        self._metadata = json.loads(
+            bytes(self._shared_memory.buf[metadata_start:metadata_start + int(self._header[_METADATA_SIZE])])
+        )
+        self._records = np.ndarray(
+            (int(self._header[_SLOTS]), int(self._header[_WIDTH])), dtype=np.float64,
+            buffer=self._shared_memory.buf, offset=metadata_start + metadata_size
+        )
+
+    @staticmethod
+    def _attach(name):
+        """Attaches to an existing shared memory block without taking over its ownership."""
+        from multiprocessing import shared_memory, resource_tracker
+        try:
+            return shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            # Before Python 3.13, the resource tracker of the reader would unlink the block at the exit of the reader.
+            memory = shared_memory.SharedMemory(name=name)
+            if memory.name not in _created_blocks:
+                resource_tracker.unregister(memory._name, 'shared_memory')
+            return memory
+
+    def next_record(self):
+        """Returns the slot of the next record to be filled by the writer. It is published with publish().
+
+        Returns:
+            ndarray(float): The writable slot. Shape: (record_width,)
+        """
+        return self._records[self._header[_WRITE_COUNT] % self._records.shape[0]]
+
+    def publish(self):
+        """Publishes the record that has been written into the slot of next_record()."""
+        self._header[_WRITE_COUNT] += 1
+
+    def write(self, record):
+        """Writes one record into the ring buffer.
+
+        Args:
+            record(array-like(float)): The record. Shape: (record_width,)
+        """
+        self.next_record()[:] = record
+        self.publish()
+
+    def read(self):
+        """Returns all records that have been written since the last read and not been overwritten.
+
+        Returns:
+            ndarray(float): The new records in the written order. Shape: (records, record_width)
+        """
+        slots = self._records.shape[0]
+        end = int(self._header[_WRITE_COUNT])
+        start = max(self._read_count, end - slots + 1)
+        records = self._records[np.arange(start, end) % slots]
+        # Records that the writer has started to overwrite during the copying are dropped.
+        valid_start = max(start, int(self._header[_WRITE_COUNT]) - slots + 1)
+        self._dropped += valid_start - self._read_count
+        self._read_count = end
+        return records[valid_start - start:]
+
+    def close(self):
+        """Closes the ring buffer. The writer marks it as closed and removes the shared memory block."""
+        if self._shared_memory is None:
+            return
+        if self._is_writer:
+            self._header[_CLOSED] = 1
+        self._header = self._records = None
+        self._shared_memory.close()
+        if self._is_writer:
+            self._shared_memory.unlink()
+            _created_blocks.discard(self._shared_memory.name)
+        self._shared_memory = None
+
+
+class TelemetryCallback(RecordingCallback):
+    """Writes the states, references, actions and rewards of every decimation-th step into a TelemetryRingBuffer.
+
+    Each record contains the episode step, a reset flag, the done flag, the reward, the states, the references and
+    the action of a step. The descriptions of the states, the action space and the reward range are stored as metadata,
+    so that a :py:class:`TelemetryViewer` can set up the plots without the environment.
+
+    Due to the decimation, the step functions are only called by the environment in every decimation-th step. Then, a
+    constraint violation is only shown by the viewer, if it occurs in a recorded step.
+    """
+
+    @property
+    def name(self):
+        """Returns the name of the shared memory block of the ring buffer. None, before the environment is set."""
+        return None if self._buffer is None else self._buffer.name
+
+    @property
+    def buffer(self):
+        """Returns the TelemetryRingBuffer of the callback."""
+        return self._buffer
+
+    def __init__(self, name=None, capacity=65536, decimation=1):
+        """
+        Args:
+            name(str): Name of the shared memory block. Default: None (a random name)
+            capacity(int): Maximal number of records in the ring buffer.
+            decimation(int): Only every decimation-th step is recorded.
+        """
+        super().__init__(decimation)
+        self._name = name
+        self._capacity = capacity
+        self._buffer = None
+        self._viewer = None
+
+    def _open(self, metadata, record_width):
+        # Docstring of superclass
+        if self._buffer is not None:
+            self._buffer.close()
+        self._buffer = TelemetryRingBuffer(self._name, record_width, self._capacity, metadata)
+
+    def _next_record(self):
+        # Docstring of superclass
+        return self._buffer.next_record()
+
+    def _publish(self):
+        # Docstring of superclass
+        self._buffer.publish()
+
+    def launch_viewer(self, **viewer_kwargs):
+        """Starts a TelemetryViewer for this callback in a new process.
+
+        Args:
+            viewer_kwargs(dict): state_plots, action_plots, reward_plot, time_plot_width and poll_interval of the
+                viewer. See the command line arguments of ``python -m gym_electric_motor.visualization.telemetry -h``
+
+        Returns:
+            subprocess.Popen: The viewer process.
+        """
+        assert self._buffer is not None, 'The callback has to be passed to an environment before.'
+        self._viewer = subprocess.Popen([
+            sys.executable, '-m', 'gym_electric_motor.visualization.telemetry', self.name, *_arguments(**viewer_kwargs)
+        ])
+        return self._viewer
+
+    def on_close(self):
+        # Docstring of superclass
+        if self._buffer is not None:
+            self._buffer.close()
+            self._buffer = None
+
+
+class TelemetryViewer:
+    """Renders the records of a TelemetryRingBuffer with the time plots of a MotorDashboard.
+
+    The viewer replays the recorded steps on a
+    :py:class:`~gym_electric_motor.visualization.motor_dashboard.MotorDashboard` and updates its figures after each
+    poll of the ring buffer. It is usually run in a separate process with
+    ``python -m gym_electric_motor.visualization.telemetry <name>``.
+    """
+
+    @property
+    def dashboard(self):
+        """Returns the MotorDashboard that renders the records."""
+        return self._dashboard
+
+    @property
+    def dropped(self):
+        """Returns the number of records that have been overwritten before the viewer could read them."""
+        return self._buffer.dropped
+
+    def __init__(self, name, state_plots='all', action_plots='all', reward_plot=False, time_plot_width=10000,
+                 poll_interval=0.05):
+        """
+        Args:
+            name(str): Name of the shared memory block of the TelemetryCallback.
+            state_plots('all'/iterable(str)): Names of the states to plot.
+            action_plots('all'/iterable(int)): Indices of the actions to plot.
+            reward_plot(bool): Flag, if the rewards are plotted.
+            time_plot_width(int): Width of the time plots in records.
+            poll_interval(float): Time in seconds between two reads of the ring buffer.
+        """
+        # The MotorDashboard imports pyplot. It is imported here, so that the training process does not require it.
+        from .motor_dashboard import MotorDashboard
+        self._buffer = TelemetryRingBuffer(name)
+        self._poll_interval = poll_interval
+        self._replay = RecordReplay(self._buffer.metadata)
+        self._dashboard = MotorDashboard(
+            state_plots=state_plots, action_plots=action_plots, reward_plot=reward_plot, update_interval=1,
+            time_plot_width=time_plot_width, blit=True, decimation=True
+        )
+        self._dashboard.set_env(self._replay.environment)
+
+    def poll(self):
+        """Replays the new records on the dashboard.
+
+        Returns:
+            int: Number of replayed records.
+        """
+        records = self._buffer.read()
+        self._replay.replay(self._dashboard, records)
+        return len(records)
+
+    def run(self):
+        """Polls the ring buffer and updates the figures until the writer closes the ring buffer."""
+        import matplotlib.pyplot as plt
+        try:
+            while True:
+                closed = self._buffer.closed
+                if self.poll() > 0:
+                    self._dashboard.render()
+                elif closed:
+                    break
+                plt.pause(self._poll_interval)
+        finally:
+            self._buffer.close()
+
+
+def _arguments(state_plots='all', action_plots='all', reward_plot=False, time_plot_width=10000, poll_interval=0.05):
+    """Returns the command line arguments of the viewer for the keyword arguments of the TelemetryViewer."""
+    arguments = []
+    if state_plots != 'all':
+        arguments += ['--state-plots', *state_plots] if len(state_plots) > 0 else ['--no-state-plots']
+    if action_plots != 'all':
+        arguments += ['--action-plots', *map(str, action_plots)] if len(action_plots) > 0 else ['--no-action-plots']
+    if reward_plot:
+        arguments.append('--reward-plot')
+    return arguments + ['--time-plot-width', str(time_plot_width), '--poll-interval', str(poll_interval)]
+
+
+def _parse_arguments(argv=None):
+    """Returns the name and the keyword arguments of the TelemetryViewer for the command line arguments."""
+    parser = argparse.ArgumentParser(description='Renders the telemetry of a GEM environment.')
+    parser.add_argument('name', help='Name of the shared memory block of the TelemetryCallback.')
+    parser.add_argument('--state-plots', nargs='+', help='Names of the plotted states. Default: all')
+    parser.add_argument('--no-state-plots', action='store_true', help='Plot no states.')
+    parser.add_argument('--action-plots', nargs='+', type=int, help='Indices of the plotted actions. Default: all')
+    parser.add_argument('--no-action-plots', action='store_true', help='Plot no actions.')
+    parser.add_argument('--reward-plot', action='store_true', help='Plot the rewards.')
+    parser.add_argument('--time-plot-width', type=int, default=10000, help='Width of the time plots in records.')
+    parser.add_argument('--poll-interval', type=float, default=0.05, help='Seconds between two reads.')
+    args = parser.parse_args(argv)
+    return args.name, dict(
+        state_plots=() if args.no_state_plots else args.state_plots or 'all',
+        action_plots=() if args.no_action_plots else args.action_plots or 'all',
+        reward_plot=args.reward_plot,
+        time_plot_width=args.time_plot_width,
+        poll_interval=args.poll_interval,
+    )
+
+
+def main(argv=None):
+    """Runs a TelemetryViewer with the command line arguments."""
+    name, viewer_kwargs = _parse_arguments(argv)
+    TelemetryViewer(name, **viewer_kwargs).run()
+
+
+if __name__ == '__main__':
+    main()
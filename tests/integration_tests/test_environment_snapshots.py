@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+
+import gym_electric_motor as gem
+from gym_electric_motor.physical_system_wrappers import DeadTimeProcessor, FluxObserver, StateNoiseProcessor
+
+motors = ['SeriesDc', 'PermExDc', 'ExtExDc', 'ShuntDc', 'PMSM', 'EESM', 'SynRM', 'DFIM', 'SCIM']
+
+
+def execute(env, actions):
+    """Executes the actions in the environment and resets it, if an episode has ended."""
+    observations = []
+    for action in actions:
+        (state, reference), reward, done, _ = env.step(action)
+        observations.append(np.concatenate((state, reference, [reward, done])))
+        if done:
+            env.reset()
+    return np.array(observations)
+
+
+def assert_equal_branches(env, no_of_steps=300, rtol=0.0):
+    """Steps the environment, takes a snapshot and asserts that the following steps are equal after each restore.
+
+    If the solver is restarted at the restored state, the steps after the restores only equal the steps after taking
+    the snapshot within the relative tolerance rtol. The restored branches are still equal to each other.
+    """
+    env.seed(123)
+    env.action_space.seed(123)
+    actions = [env.action_space.sample() for _ in range(2 * no_of_steps)]
+    env.reset()
+    execute(env, actions[:no_of_steps])
+    state = env.get_state()
+    expected = execute(env, actions[no_of_steps:])
+    env.set_state(state)
+    branch = execute(env, actions[no_of_steps:])
+    assert np.allclose(branch, expected, rtol=rtol, atol=0.0)
+    env.set_state(state)
+    assert np.all(execute(env, actions[no_of_steps:]) == branch)
+
+
+@pytest.mark.parametrize('motor', motors)
+@pytest.mark.parametrize('action_type', ['Cont', 'Finite'])
+@pytest.mark.parametrize('control_task', ['CC', 'SC'])
+def test_snapshot_environments(motor, action_type, control_task):
+    """Test, that the episodes after restoring a snapshot equal the episode after taking the snapshot. The constraints
+    are violated within the random steps, so that the snapshot also covers the following resets."""
+    env = gem.make(f'{action_type}-{control_task}-{motor}-v0', visualization=())
+    assert_equal_branches(env)
+
+
+@pytest.mark.parametrize('ode_solver', ['euler', 'rk4', 'scipy.ode', 'scipy.solve_ivp', 'scipy.odeint'])
+def test_snapshot_ode_solvers(ode_solver):
+    env = gem.make('Finite-CC-PMSM-v0', ode_solver=ode_solver, visualization=())
+    assert_equal_branches(env, 100)
+
+
+def test_snapshot_persistent_solve_ivp():
+    env = gem.make(
+        'Cont-CC-PMSM-v0', ode_solver=gem.physical_systems.ScipySolveIvpSolver(persistent=True, method='Radau'),
+        visualization=()
+    )
+    assert_equal_branches(env, 100, rtol=1e-6)
+
+
+def test_snapshot_physical_system_wrappers():
+    env = gem.make(
+        'Cont-CC-SCIM-v0', visualization=(),
+        physical_system_wrappers=(
+            FluxObserver(), StateNoiseProcessor(states=['i_sd'], random_length=50), DeadTimeProcessor(steps=2)
+        ),
+    )
+    assert_equal_branches(env)
+    dead_time_processor = env.physical_system
+    flux_observer = dead_time_processor.physical_system.physical_system
+    state = env.get_state()
+    integrated_flux = flux_observer._integrated
+    actions = list(dead_time_processor._action_deque)
+    env.step(env.action_space.sample())
+    env.set_state(state)
+    assert flux_observer._integrated == integrated_flux
+    assert all(np.all(action == expected) for action, expected in zip(dead_time_processor._action_deque, actions))
+
+
+def test_snapshot_done():
+    env = gem.make('Finite-CC-PMSM-v0', visualization=())
+    env.reset()
+    state = env.get_state()
+    done = False
+    while not done:
+        _, _, done, _ = env.step(env.action_space.sample())
+    with pytest.raises(AssertionError):
+        env.step(env.action_space.sample())
+    env.set_state(state)
+    env.step(env.action_space.sample())
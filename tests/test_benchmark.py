@@ -0,0 +1,114 @@
+import copy
+import json
+
+import pytest
+
+from gym_electric_motor import benchmark
+
+
+@pytest.fixture(scope='module')
+def results():
+    return benchmark.run_benchmark(
+        ['Cont-CC-PMSM-v0', 'Finite-SC-SeriesDc-v0'], solvers=('euler', 'scipy.solve_ivp'),
+        wrappers=('none', 'cos_sin', 'dq_to_abc'), steps=20, resets=2
+    )
+
+
+def test_registered_env_ids():
+    env_ids = benchmark.registered_env_ids()
+    assert 'Cont-CC-PMSM-v0' in env_ids and 'Finite-SC-SeriesDc-v0' in env_ids
+    assert env_ids == sorted(env_ids)
+    assert all(env_id.split('-')[0] in ('Cont', 'Finite') for env_id in env_ids)
+
+
+def test_run_benchmark(results):
+    configurations = [(result['env_id'], result['solver'], result['wrappers']) for result in results['results']]
+    # The cos_sin and dq_to_abc stacks are not applicable to the DC motor
+    assert configurations == [
+        ('Cont-CC-PMSM-v0', 'euler', 'none'), ('Cont-CC-PMSM-v0', 'euler', 'cos_sin'),
+        ('Cont-CC-PMSM-v0', 'euler', 'dq_to_abc'), ('Cont-CC-PMSM-v0', 'scipy.solve_ivp', 'none'),
+        ('Cont-CC-PMSM-v0', 'scipy.solve_ivp', 'cos_sin'), ('Cont-CC-PMSM-v0', 'scipy.solve_ivp', 'dq_to_abc'),
+        ('Finite-SC-SeriesDc-v0', 'euler', 'none'), ('Finite-SC-SeriesDc-v0', 'scipy.solve_ivp', 'none'),
+    ]
+    for result in results['results']:
+        assert 'error' not in result
+        assert all(result[metric] > 0 for metric in benchmark.METRICS)
+    assert results['metadata']['steps'] == 20
+
+
+def test_repeats(monkeypatch):
+    constructions = []
+    make = benchmark.gem.make
+
+    def counting_make(*args, **kwargs):
+        constructions.append(args)
+        return make(*args, **kwargs)
+
+    monkeypatch.setattr(benchmark.gem, 'make', counting_make)
+    result = benchmark.benchmark_environment('Cont-SC-PermExDc-v0', steps=5, resets=1, repeats=3)
+    # One untimed warm up, three timed constructions, one environment for the reset and step times and one for memory
+    assert len(constructions) == 6
+    assert all(result[metric] > 0 for metric in benchmark.METRICS)
+    with pytest.raises(AssertionError):
+        benchmark.benchmark_environment('Cont-SC-PermExDc-v0', repeats=0)
+
+
+def test_failing_configuration():
+    result = benchmark.benchmark_environment('Cont-CC-PMSM-v0', ode_solver='no_solver', steps=5, resets=1)
+    assert result['error'].startswith('KeyError')
+    assert not any(metric in result for metric in ('steps_per_second', 'peak_memory'))
+
+
+def test_save_and_load(results, tmp_path):
+    path = tmp_path / 'results.json'
+    benchmark.save(results, path)
+    assert benchmark.load(path) == json.loads(json.dumps(results))
+
+
+def test_compare(results):
+    assert benchmark.compare(results, results) == []
+    current = copy.deepcopy(results)
+    current['results'][0]['steps_per_second'] = 0.5 * results['results'][0]['steps_per_second']
+    current['results'][1]['peak_memory'] = 1.1 * results['results'][1]['peak_memory']
+    current['results'][2]['reset_time'] = 2.0 * results['results'][2]['reset_time']
+    current['results'][3] = dict(current['results'][3], error='ValueError: failed')
+    # Improvements are no regressions
+    current['results'][4]['steps_per_second'] = 2.0 * results['results'][4]['steps_per_second']
+    regressions = benchmark.compare(current, results, tolerance=0.2)
+    assert [(regression['wrappers'], regression['solver'], regression['metric']) for regression in regressions] == [
+        ('none', 'euler', 'steps_per_second'), ('dq_to_abc', 'euler', 'reset_time'),
+        ('none', 'scipy.solve_ivp', 'error'),
+    ]
+    assert regressions[0]['change'] == pytest.approx(-0.5)
+    regressions = benchmark.compare(current, results, tolerance=dict(peak_memory=0.05))
+    assert [regression['metric'] for regression in regressions] == ['peak_memory', 'error']
+
+
+def test_compare_ignores_new_configurations(results):
+    baseline = dict(metadata=results['metadata'], results=results['results'][:1])
+    current = copy.deepcopy(results)
+    for result in current['results']:
+        result['steps_per_second'] *= 0.1
+    assert len(benchmark.compare(current, baseline)) == 1
+
+
+def test_main(tmp_path, capsys):
+    output = tmp_path / 'results.json'
+    args = ['--envs', 'Cont-SC-PermExDc-v0', '--solvers', 'euler', '--steps', '10', '--resets', '1', '--quiet']
+    assert benchmark.main(args + ['--output', str(output)]) == 0
+    baseline = benchmark.load(output)
+    assert [result['wrappers'] for result in baseline['results']] == ['none', 'dead_time']
+    assert benchmark.main(args + ['--baseline', str(output), '--tolerance', '1e6']) == 0
+    # Only the steps per second regress against the fabricated baseline. The other metrics improve.
+    for result in baseline['results']:
+        result['steps_per_second'] *= 1e9
+        result['construction_time'] *= 1e9
+        result['reset_time'] *= 1e9
+        result['peak_memory'] *= 1e9
+    benchmark.save(baseline, output)
+    capsys.readouterr()
+    assert benchmark.main(args + ['--baseline', str(output)]) == 1
+    lines = capsys.readouterr().out.splitlines()
+    assert [line.split()[3] for line in lines if line.startswith('REGRESSION')] == ['none', 'dead_time']
+    assert all('steps_per_second' in line for line in lines if line.startswith('REGRESSION'))
+    assert '2 regressions' in lines[-1]
@@ -0,0 +1,82 @@
+import io
+import json
+
+import numpy as np
+import pytest
+
+import gym_electric_motor as gem
+from gym_electric_motor.visualization import ConsolePrinter
+
+
+def run(env, steps):
+    """Steps the environment with random actions, resets it regularly and renders it after each step."""
+    env.action_space.seed(0)
+    env.reset()
+    lengths = []
+    for k in range(steps):
+        _, _, done, _ = env.step(env.action_space.sample())
+        env.render()
+        if done or k % 100 == 99:
+            lengths.append(env.physical_system.k)
+            env.reset()
+    return lengths
+
+
+def test_print_options_are_not_changed():
+    print_options = np.get_printoptions()
+    ConsolePrinter(verbose=2)
+    assert np.get_printoptions() == print_options
+
+
+def test_unbuffered_printing(capsys):
+    env = gem.make('Cont-CC-PMSM-v0', visualization=ConsolePrinter(verbose=1))
+    lengths = run(env, 250)
+    printed = capsys.readouterr().out
+    # The initial reset is printed, too.
+    assert printed.count('Number of steps') == len(lengths) + 1
+
+
+def test_json_lines():
+    output = io.StringIO()
+    printer = ConsolePrinter(verbose=2, flush_interval=0.0, output=output, log_format='json', tag='env-0')
+    env = gem.make('Cont-CC-PMSM-v0', visualization=printer)
+    lengths = run(env, 250)
+    env.close()
+    entries = [json.loads(line) for line in output.getvalue().splitlines()]
+    # Each render writes the statistics of a single step.
+    assert len(entries) == 250
+    assert all(entry['tag'] == 'env-0' and entry['interval_steps'] == 1 for entry in entries)
+    assert [episode['steps'] for entry in entries for episode in entry['episodes']] == lengths
+    omega = entries[-1]['states']['omega']
+    assert omega['min'] == omega['mean'] == omega['max']
+    assert entries[-1]['steps'] == 250
+
+
+def test_buffered_text():
+    output = io.StringIO()
+    printer = ConsolePrinter(verbose=2, flush_interval=3600.0, output=output)
+    env = gem.make('Cont-CC-PMSM-v0', visualization=printer)
+    states = []
+    env.action_space.seed(0)
+    env.reset()
+    env.render()
+    # The first render writes nothing, because no step has been taken.
+    assert output.getvalue() == ''
+    for _ in range(50):
+        (state, _), *_ = env.step(env.action_space.sample())
+        states.append(state * env.physical_system.limits)
+        env.render()
+    assert output.getvalue() == ''
+    env.close()
+    lines = output.getvalue().splitlines()
+    assert lines[0].startswith('Episode 0 Steps       50')
+    omega = env.physical_system.state_positions['omega']
+    mean, minimum, maximum = (float(value) for value in lines[1 + omega].split()[2::2])
+    assert mean == pytest.approx(np.mean(states, axis=0)[omega], abs=1e-3)
+    assert minimum == pytest.approx(np.min(states, axis=0)[omega], abs=1e-3)
+    assert maximum == pytest.approx(np.max(states, axis=0)[omega], abs=1e-3)
+
+
+def test_json_requires_buffered_mode():
+    with pytest.raises(AssertionError):
+        ConsolePrinter(verbose=2, log_format='json')
@@ -34,3 +34,13 @@ class TestLimitConstraint:
         lc.set_modules(ps)
         violation = lc(state)
         assert violation == expected_violation
+
+    @pytest.mark.parametrize(['ps', 'observed_state_names'], [
+        [DummyPhysicalSystem(2), ['all_states']],
+        [DummyPhysicalSystem(3), ['dummy_state_0', 'dummy_state_2']],
+    ])
+    def test_check_batch(self, ps, observed_state_names):
+        lc = LimitConstraint(observed_state_names)
+        lc.set_modules(ps)
+        states = np.random.default_rng(0).uniform(-1.2, 1.2, size=(20, len(ps.state_names)))
+        assert np.all(lc.check_batch(states) == [lc(state) for state in states])
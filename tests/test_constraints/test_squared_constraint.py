@@ -34,3 +34,13 @@ class TestSquaredConstraint:
         sc.set_modules(ps)
         violation = sc(state)
         assert violation == expected_violation
+
+    @pytest.mark.parametrize(['ps', 'observed_state_names'], [
+        [DummyPhysicalSystem(2), ['dummy_state_0', 'dummy_state_1']],
+        [DummyPhysicalSystem(3), ['dummy_state_0', 'dummy_state_2']],
+    ])
+    def test_check_batch(self, ps, observed_state_names):
+        sc = SquaredConstraint(observed_state_names)
+        sc.set_modules(ps)
+        states = np.random.default_rng(0).uniform(-1.0, 1.0, size=(20, len(ps.state_names)))
+        assert np.all(sc.check_batch(states) == [sc(state) for state in states])
@@ -5,7 +5,7 @@ from tests.testing_utils import DummyPhysicalSystem, DummyReferenceGenerator, Du
 from gym.spaces import Tuple, Box
 import gym_electric_motor
 from gym_electric_motor.core import ElectricMotorEnvironment, RewardFunction, \
-    ReferenceGenerator, PhysicalSystem, ConstraintMonitor, Constraint
+    ReferenceGenerator, PhysicalSystem, ConstraintMonitor, Constraint, Callback, CallbackDispatcher
 from gym_electric_motor.constraints import LimitConstraint
 import gym
 import gym_electric_motor as gem
@@ -216,6 +216,133 @@ class TestElectricMotorEnvironment:
         )
         assert all(env.limits == expected_result)
 
+    @pytest.mark.parametrize('state_filter', [None, ['i_sd', 'i_sq', 'u_sd'], ['omega', 'i_sd', 'epsilon']])
+    @pytest.mark.parametrize('dtype', [np.float64, np.float32])
+    @pytest.mark.parametrize('reuse', [False, True])
+    def test_flat_observation_mode(self, state_filter, dtype, reuse):
+        tuple_env = gem.make('Cont-CC-PMSM-v0', visualization=(), state_filter=state_filter)
+        flat_env = gem.make('Cont-CC-PMSM-v0', visualization=(), state_filter=state_filter)
+        assert flat_env.observation_mode == 'tuple'
+        space = flat_env.set_observation_mode('flat', dtype=dtype, reuse=reuse)
+        assert flat_env.observation_mode == 'flat' and flat_env.observation_space is space
+        states = len(tuple_env.state_filter)
+        assert space.shape == (states + tuple_env.observation_space[1].shape[0],) and space.dtype == dtype
+        assert np.all(space.low[:states] == tuple_env.observation_space[0].low.astype(dtype))
+        assert np.all(space.high[states:] == tuple_env.observation_space[1].high.astype(dtype))
+        tuple_env.seed(3)
+        flat_env.seed(3)
+        observations = [flat_env.reset()]
+        expected = [np.concatenate(tuple_env.reset())]
+        action_space = tuple_env.action_space
+        action_space.seed(0)
+        for _ in range(20):
+            action = action_space.sample()
+            observation, reward, done, _ = flat_env.step(action)
+            (state, reference), expected_reward, _, _ = tuple_env.step(action)
+            assert observation.dtype == dtype and observation.flags.c_contiguous
+            assert reward == expected_reward
+            observations.append(observation)
+            expected.append(np.concatenate((state, reference)))
+            assert np.all(observation == expected[-1].astype(dtype))
+        # Only the reused buffer is overwritten by the following steps
+        assert all(observation is observations[-1] for observation in observations) == reuse
+        flat_env.set_observation_mode('tuple')
+        state, reference = flat_env.reset()
+        assert flat_env.observation_space == tuple_env.observation_space
+        assert (state, reference) in flat_env.observation_space
+
+
+class StepEndCallback(Callback):
+    """Callback that only overrides on_step_end and records the steps of its calls."""
+
+    def __init__(self, step_interval=1):
+        super().__init__(step_interval)
+        self.steps = []
+
+    def on_step_end(self, k, state, reference, reward, done):
+        self.steps.append(k)
+
+
+class TestCallbackDispatcher:
+
+    def test_resolves_overridden_hooks(self):
+        callback = StepEndCallback()
+        dispatcher = CallbackDispatcher([Callback(), callback, DummyCallback()])
+        assert dispatcher._on_step_begin == [(1, dispatcher._callbacks[2].on_step_begin)]
+        assert dispatcher._on_step_end == [(1, callback.on_step_end), (1, dispatcher._callbacks[2].on_step_end)]
+        assert len(dispatcher._on_reset_begin) == len(dispatcher._on_reset_end) == len(dispatcher._on_close) == 1
+
+    @pytest.mark.parametrize('step_interval', [1, 3, 1000])
+    def test_step_interval(self, step_interval):
+        strided = DummyCallback()
+        strided._step_interval = step_interval
+        each_step = StepEndCallback()
+        dispatcher = CallbackDispatcher([strided, each_step])
+        for k in range(2500):
+            dispatcher.on_step_begin(k, 0)
+            dispatcher.on_step_end(k, 0, 0, 0, False)
+        assert each_step.steps == list(range(2500))
+        assert strided.step_begin == strided.step_end == 2500 // step_interval
+        assert dispatcher.num_steps == 2500
+
+    def test_step_interval_call_order(self):
+        calls = []
+
+        class OrderCallback(Callback):
+
+            def __init__(self, name, step_interval=1):
+                super().__init__(step_interval)
+                self.name = name
+
+            def on_step_begin(self, k, action):
+                calls.append(('begin', self.name, k))
+
+            def on_step_end(self, k, state, reference, reward, done):
+                calls.append(('end', self.name, k))
+
+        dispatcher = CallbackDispatcher([OrderCallback('A', step_interval=2), OrderCallback('B')])
+        for k in range(4):
+            dispatcher.on_step_begin(k, 0)
+            dispatcher.on_step_end(k, 0, 0, 0, False)
+        # The strided callbacks are called in the order of the callbacks in the steps in which they are called
+        assert calls == [
+            ('begin', 'B', 0), ('end', 'B', 0),
+            ('begin', 'A', 1), ('begin', 'B', 1), ('end', 'A', 1), ('end', 'B', 1),
+            ('begin', 'B', 2), ('end', 'B', 2),
+            ('begin', 'A', 3), ('begin', 'B', 3), ('end', 'A', 3), ('end', 'B', 3),
+        ]
+
+    def test_step_interval_in_environment(self):
+        callback = StepEndCallback(step_interval=4)
+        env = ElectricMotorEnvironment(
+            DummyPhysicalSystem(), DummyReferenceGenerator(), DummyRewardFunction(), callbacks=[callback]
+        )
+        assert callback.step_interval == 4
+        env.reset()
+        for _ in range(10):
+            env.step(0)
+        env.reset()
+        for _ in range(6):
+            env.step(0)
+        # The steps are counted over all episodes
+        assert len(callback.steps) == 4
+
+    def test_compile_instance_hooks(self):
+        callback = Callback()
+        dispatcher = CallbackDispatcher([callback])
+        assert dispatcher._on_step_end == []
+        calls = []
+        callback.on_step_end = lambda *args: calls.append(args)
+        dispatcher.on_step_end(0, 0, 0, 0, False)
+        assert calls == []
+        dispatcher.compile([callback])
+        dispatcher.on_step_end(0, 0, 0, 0, False)
+        assert calls == [(0, 0, 0, 0, False)]
+
+    def test_invalid_step_interval(self):
+        with pytest.raises(AssertionError):
+            Callback(step_interval=0)
+
 
 class TestReferenceGenerator:
     test_object = None
@@ -363,3 +490,20 @@ class TestConstraintMonitor:
         degree = cm.check_constraints(state)
         assert degree == expected_violation_degree
         assert all(passed == expected for passed, expected in zip(passed_violations[0][0], violations))
+
+    @pytest.mark.parametrize(['merge_violations', 'merge'], [
+        ['max', max],
+        ['product', lambda violations: 1 - np.prod([1 - violation for violation in violations])],
+        [lambda violations: min(violations), min],
+    ])
+    @pytest.mark.parametrize('ps', [DummyPhysicalSystem(2)])
+    def test_check_constraints_batch(self, ps, merge_violations, merge):
+        constraints = [
+            DummyConstraint(0.3), LimitConstraint(['dummy_state_0']), lambda state: float(state[1] > 0.5)
+        ]
+        cm = ConstraintMonitor(additional_constraints=constraints, merge_violations=merge_violations)
+        cm.set_modules(ps)
+        states = np.random.default_rng(0).uniform(-1.2, 1.2, size=(20, 2))
+        degrees = cm.check_constraints_batch(states)
+        assert degrees.shape == (20,)
+        assert np.allclose(degrees, [merge([constraint(state) for constraint in cm.constraints]) for state in states])
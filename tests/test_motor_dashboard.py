@@ -0,0 +1,158 @@
+import matplotlib
+import numpy as np
+import pytest
+
+import gym_electric_motor as gem
+from gym_electric_motor.visualization import MotorDashboard
+from gym_electric_motor.visualization.motor_dashboard_plots import MeanEpisodeRewardPlot, EpisodeLengthPlot, \
+    CumulativeConstraintViolationPlot
+from gym_electric_motor.visualization.motor_dashboard_plots.base_plots import decimate_min_max, RingBuffer, \
+    DownsampledSeries
+
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def close_figures():
+    yield
+    plt.close('all')
+
+
+def run(env, steps, render=True):
+    """Steps the environment with random actions, resets it regularly and renders it after each step."""
+    env.action_space.seed(0)
+    env.reset()
+    for k in range(steps):
+        _, _, done, _ = env.step(env.action_space.sample())
+        if done or k % 700 == 699:
+            env.reset()
+        if render:
+            env.render()
+
+
+def test_decimate_min_max():
+    rng = np.random.default_rng(0)
+    x = rng.uniform(-1.0, 11.0, 5000)
+    y = rng.normal(size=5000)
+    y[::17] = np.nan
+    x_decimated, y_decimated = decimate_min_max(x, y, 0.0, 10.0, 40)
+    assert x_decimated.shape == y_decimated.shape == (80,)
+    assert np.allclose(x_decimated, np.repeat(np.arange(40) * 0.25 + 0.125, 2))
+    for bin_ in range(40):
+        in_bin = (x >= bin_ * 0.25) & (x < (bin_ + 1) * 0.25) & ~np.isnan(y)
+        assert y_decimated[2 * bin_] == y[in_bin].min()
+        assert y_decimated[2 * bin_ + 1] == y[in_bin].max()
+    # Empty bins are NaN
+    _, y_decimated = decimate_min_max(np.array([0.1, 0.2]), np.array([1.0, 2.0]), 0.0, 1.0, 4)
+    assert np.array_equal(y_decimated, [1.0, 2.0] + [np.nan] * 6, equal_nan=True)
+
+
+def test_ring_buffer():
+    buffer = RingBuffer(4)
+    assert len(buffer) == 0 and buffer.values().shape == (0,)
+    for value in range(3):
+        buffer.append(value)
+    assert np.array_equal(buffer.values(), [0, 1, 2])
+    for value in range(3, 7):
+        buffer.append(value)
+    assert len(buffer) == buffer.capacity == 4
+    assert np.array_equal(buffer.values(), [3, 4, 5, 6])
+    buffer.clear()
+    assert len(buffer) == 0
+
+
+def test_downsampled_series():
+    rng = np.random.default_rng(0)
+    y = rng.normal(size=1000)
+    series = DownsampledSeries(8)
+    for x_, y_ in enumerate(y[:8]):
+        series.append(x_, y_)
+    # Up to the capacity, the series holds the original points.
+    assert series.bucket_size == 1
+    assert np.array_equal(series.line_data()[0], np.repeat(np.arange(8), 2))
+    assert np.array_equal(series.line_data()[1], np.repeat(y[:8], 2))
+    for x_, y_ in enumerate(y[8:], start=8):
+        series.append(x_, y_)
+    # 1000 points are aggregated in buckets of 128 points.
+    assert series.bucket_size == 128 and len(series) == 8
+    assert series.last_x == 999
+    assert np.array_equal(series.x, np.arange(0, 1000, 128))
+    for bucket in range(8):
+        data = y[bucket * 128:(bucket + 1) * 128]
+        assert series.y_min[bucket] == data.min()
+        assert series.y_max[bucket] == data.max()
+        assert np.isclose(series.y_mean[bucket], data.mean())
+    assert series.minimum == y.min() and series.maximum == y.max()
+
+
+def test_episode_plots_render_downsampled_data():
+    plots = [MeanEpisodeRewardPlot(), EpisodeLengthPlot(), CumulativeConstraintViolationPlot()]
+    for plot in plots:
+        plot.set_capacity(8)
+    dashboard = MotorDashboard(additional_plots=plots, update_interval=100)
+    env = gem.make('Cont-CC-PMSM-v0', visualization=dashboard)
+    run(env, 5000)
+    episode_lengths = plots[1]._series[0]
+    assert episode_lengths.bucket_size > 1
+    assert np.sum(episode_lengths.y_mean * episode_lengths._count[:len(episode_lengths)]) <= 5000
+    for plot in plots:
+        for line, series in zip(plot._lines, plot._series):
+            assert len(series) <= 8
+            assert np.array_equal(line.get_xdata(), series.line_data()[0])
+            assert np.array_equal(line.get_ydata(), series.line_data()[1])
+
+
+def test_time_plot_markers_are_bounded():
+    dashboard = MotorDashboard(state_plots=['omega'], update_interval=100, time_plot_width=300)
+    env = gem.make('Cont-CC-PMSM-v0', visualization=dashboard)
+    env.action_space.seed(0)
+    env.reset()
+    env.render()
+    plot = dashboard._time_plots[0]
+    num_lines = len(plot._axis.lines)
+    for k in range(3000):
+        env.step(env.action_space.sample())
+        if k % 10 == 9:
+            env.reset()
+        env.render()
+    assert len(plot._reset_times) == 300
+    # Only the resets within the visible time window are drawn, and no artists are added to the axis.
+    reset_times = plot._reset_line.get_xdata()[::3]
+    assert reset_times.min() >= plot._axis.get_xlim()[0] and len(reset_times) <= 31
+    assert len(plot._axis.lines) == num_lines
+
+
+@pytest.mark.parametrize('decimation', [False, True])
+def test_blitting(decimation):
+    dashboard = MotorDashboard(
+        state_plots='all', action_plots='all', reward_plot=True, update_interval=100, time_plot_width=2000, blit=True,
+        decimation=decimation,
+        additional_plots=[MeanEpisodeRewardPlot(), EpisodeLengthPlot(), CumulativeConstraintViolationPlot()]
+    )
+    env = gem.make('Cont-CC-PMSM-v0', visualization=dashboard)
+    env.render()
+    draws = []
+    for fig in dashboard._figures:
+        fig.canvas.mpl_connect('draw_event', draws.append)
+    run(env, 3000)
+    # Only a part of the updates draws the complete figures.
+    assert 0 < len(draws) < 0.5 * 30 * len(dashboard._figures)
+    # The blitted figures look exactly like completely drawn ones.
+    for fig in dashboard._figures:
+        blitted = np.asarray(fig.canvas.buffer_rgba()).copy()
+        fig.canvas.draw()
+        assert np.array_equal(blitted, np.asarray(fig.canvas.buffer_rgba()))
+
+
+def test_decimated_time_plots():
+    dashboard = MotorDashboard(state_plots=['omega', 'i_sd'], update_interval=500, decimation=True)
+    env = gem.make('Cont-CC-PMSM-v0', visualization=dashboard)
+    run(env, 3000)
+    env.render()
+    for plot in dashboard._time_plots:
+        width = int(plot._axis.get_window_extent().width)
+        for line, data in zip(plot._lines, plot._y_data):
+            y_data = line.get_ydata()
+            assert len(y_data) == 2 * width
+            assert np.nanmin(y_data) == np.nanmin(data) and np.nanmax(y_data) == np.nanmax(data)
@@ -0,0 +1,307 @@
+import numpy as np
+import pytest
+
+import gym_electric_motor as gem
+from gym_electric_motor.physical_systems import BatchedSCMLSystem, BatchedSynchronousMotorSystem, \
+    BatchedSquirrelCageInductionMotorSystem, BatchedDoublyFedInductionMotorSystem, \
+    BatchedExternallyExcitedSynchronousMotorSystem
+from gym_electric_motor.physical_systems import electric_motors as em, mechanical_loads as ml, solvers as sv
+
+
+def make_systems(env_id, num_systems, **kwargs):
+    kwargs.setdefault('ode_solver', 'euler')
+    return [gem.make(env_id, **kwargs).physical_system.unwrapped for _ in range(num_systems)]
+
+
+def align_single_systems(batched_system, single_systems):
+    """Sets the initial ode states of the single systems to the ones of the batched system."""
+    ode_states = batched_system._ode_solver.y.reshape(batched_system.num_systems, -1)
+    for system, ode_state in zip(single_systems, ode_states):
+        system._ode_solver.set_initial_value(ode_state.copy(), 0.0)
+
+
+@pytest.mark.parametrize('env_id, batched_type', [
+    ('Cont-CC-ExtExDc-v0', BatchedSCMLSystem),
+    ('Finite-SC-PermExDc-v0', BatchedSCMLSystem),
+    ('Cont-TC-SeriesDc-v0', BatchedSCMLSystem),
+    ('Finite-CC-PMSM-v0', BatchedSynchronousMotorSystem),
+    ('Cont-SC-SynRM-v0', BatchedSynchronousMotorSystem),
+    ('Cont-CC-EESM-v0', BatchedExternallyExcitedSynchronousMotorSystem),
+    ('Finite-TC-SCIM-v0', BatchedSquirrelCageInductionMotorSystem),
+    ('Cont-CC-DFIM-v0', BatchedDoublyFedInductionMotorSystem),
+])
+def test_batched_system_equals_single_systems(env_id, batched_type):
+    num_systems = 3
+    systems = make_systems(env_id, num_systems)
+    single_systems = make_systems(env_id, num_systems)
+    batched_system = BatchedSCMLSystem.make(systems)
+    assert type(batched_system) is batched_type
+    assert batched_system.num_systems == num_systems
+    batched_system.seed(np.random.SeedSequence(123))
+    states = batched_system.reset()
+    align_single_systems(batched_system, single_systems)
+    assert states.shape == (num_systems, len(batched_system.state_names))
+    assert np.all(batched_system.limits == np.array([system.limits for system in systems]))
+    action_space = systems[0].action_space
+    action_space.seed(0)
+    for _ in range(20):
+        actions = [action_space.sample() for _ in range(num_systems)]
+        states = batched_system.simulate(actions)
+        single_states = np.array([system.simulate(action) for system, action in zip(single_systems, actions)])
+        assert np.allclose(states, single_states, rtol=1e-10, atol=1e-10)
+    assert batched_system._t == pytest.approx(20 * batched_system.tau)
+    assert np.all(batched_system.k == 20)
+
+
+def test_different_switching_instants():
+    num_systems = 3
+    solver = dict(rtol=1e-11, atol=1e-11)
+    systems, single_systems = [[
+        gem.make(
+            'Finite-CC-PMSM-v0', ode_solver=sv.ScipySolveIvpSolver(**solver),
+            converter=dict(interlocking_time=1e-6 * n)
+        ).physical_system.unwrapped
+        for n in range(num_systems)
+    ] for _ in range(2)]
+    batched_system = BatchedSCMLSystem.make(systems, ode_solver=sv.ScipySolveIvpSolver(**solver))
+    batched_system.reset()
+    align_single_systems(batched_system, single_systems)
+    for k in range(10):
+        actions = [(k + n) % 8 for n in range(num_systems)]
+        states = batched_system.simulate(actions)
+        single_states = np.array([system.simulate(action) for system, action in zip(single_systems, actions)])
+        assert np.allclose(states, single_states, atol=1e-7)
+
+
+def test_different_parameters():
+    r_a = (16e-3, 20e-3, 24e-3)
+    j_load = (1e-3, 2e-3, 3e-3)
+    systems, single_systems = [[
+        gem.make(
+            'Cont-SC-ExtExDc-v0', ode_solver='euler', motor=dict(motor_parameter=dict(r_a=r_a_)),
+            load=dict(load_parameter=dict(j_load=j_load_))
+        ).physical_system.unwrapped
+        for r_a_, j_load_ in zip(r_a, j_load)
+    ] for _ in range(2)]
+    batched_system = BatchedSCMLSystem.make(systems)
+    assert batched_system.electrical_motor._model_constants.shape == (3, 2, 5)
+    assert np.all(batched_system.electrical_motor.motor_parameter['r_a'] == r_a)
+    assert batched_system.mechanical_load.j_total.shape == (3,)
+    batched_system.reset()
+    align_single_systems(batched_system, single_systems)
+    for _ in range(20):
+        actions = [np.array([0.8, 0.5])] * 3
+        states = batched_system.simulate(actions)
+        single_states = np.array([system.simulate(action) for system, action in zip(single_systems, actions)])
+        assert np.allclose(states, single_states, rtol=1e-10, atol=1e-12)
+
+
+def test_partial_reset():
+    systems = make_systems('Cont-CC-PMSM-v0', 3)
+    batched_system = BatchedSCMLSystem.make(systems)
+    batched_system.reset()
+    for _ in range(5):
+        states = batched_system.simulate([np.array([1.0, 0.5, -0.5])] * 3)
+    reset_states = batched_system.reset([1])
+    assert np.all(reset_states[[0, 2]] == states[[0, 2]])
+    assert np.all(batched_system.k == [5, 0, 5])
+    assert np.all(batched_system._t_start == [0.0, batched_system._t, 0.0])
+
+
+@pytest.mark.parametrize('env_id', ['Finite-CC-PMSM-v0', 'Cont-CC-SCIM-v0', 'Cont-SC-SeriesDc-v0'])
+def test_set_system_state(env_id):
+    system = make_systems(env_id, 1)[0]
+    system.reset()
+    for _ in range(10):
+        system.simulate(system.action_space.sample())
+    state = system.get_state()
+    batched_system = BatchedSCMLSystem.make(make_systems(env_id, 3))
+    batched_system.reset()
+    batched_system.simulate([batched_system.action_space.sample() for _ in range(3)])
+    batched_system.set_system_state(state, indices=[1])
+    assert np.all(batched_system.k == [1, 10, 1])
+    batched_system.set_system_state(state)
+    assert np.all(batched_system.k == 10)
+    actions = [system.action_space.sample() for _ in range(5)]
+    for action in actions:
+        batched_states = batched_system.simulate([action] * 3)
+        single_state = system.simulate(action)
+        assert np.allclose(batched_states, single_state, atol=1e-12)
+
+
+def test_mismatching_systems():
+    systems = make_systems('Cont-CC-PMSM-v0', 1) + make_systems('Cont-CC-SynRM-v0', 1)
+    with pytest.raises(AssertionError):
+        BatchedSCMLSystem.make(systems)
+
+
+@pytest.mark.parametrize('motor, u_size', [
+    (em.DcExternallyExcitedMotor(), 2),
+    (em.DcPermanentlyExcitedMotor(), 1),
+    (em.DcSeriesMotor(), 1),
+    (em.DcShuntMotor(), 1),
+    (em.PermanentMagnetSynchronousMotor(), 2),
+    (em.SynchronousReluctanceMotor(), 2),
+    (em.ExternallyExcitedSynchronousMotor(), 3),
+])
+def test_electrical_ode_batch(motor, u_size):
+    rng = np.random.default_rng(1)
+    num_states = motor._model_constants.shape[0]
+    states = rng.normal(size=(4, num_states))
+    u_in = rng.normal(size=(4, u_size))
+    omega = rng.normal(size=4)
+    batch = motor.electrical_ode_batch(states, u_in, omega)
+    single = np.array([motor.electrical_ode(s, u, w) for s, u, w in zip(states, u_in, omega)])
+    assert np.allclose(batch, single)
+
+
+@pytest.mark.parametrize('motor', [em.SquirrelCageInductionMotor(), em.DoublyFedInductionMotor()])
+def test_electrical_ode_batch_induction_motors(motor):
+    rng = np.random.default_rng(1)
+    states = rng.normal(size=(4, 5))
+    u_in = rng.normal(size=(4, 2, 2))
+    omega = rng.normal(size=4)
+    if isinstance(motor, em.SquirrelCageInductionMotor):
+        u_in = u_in[:, 0]
+    batch = motor.electrical_ode_batch(states, u_in, omega)
+    single = np.array([motor.electrical_ode(s, u, w) for s, u, w in zip(states, u_in, omega)])
+    assert np.allclose(batch, single)
+
+
+@pytest.mark.parametrize('load', [
+    ml.PolynomialStaticLoad(load_parameter=dict(a=0.01, b=0.05, c=0.1)),
+    ml.ConstantSpeedLoad(omega_fixed=100.0),
+])
+def test_mechanical_ode_batch(load):
+    rng = np.random.default_rng(1)
+    omega = rng.normal(scale=10.0, size=(5, 1))
+    omega[0] = 0.0
+    torque = rng.normal(size=5)
+    batch = load.mechanical_ode_batch(0.0, omega, torque)
+    single = np.array([load.mechanical_ode(0.0, w, t) for w, t in zip(omega, torque)])
+    assert np.allclose(batch, single)
+
+
+def finite_differences(function, x, h=1e-6):
+    """Central differences of a batched function over the last axis of x. Shape: (N, outputs, inputs)"""
+    return np.stack([
+        (function(x + h * unit_vector) - function(x - h * unit_vector)) / (2 * h)
+        for unit_vector in np.eye(x.shape[-1])
+    ], axis=-1)
+
+
+@pytest.mark.parametrize('motor, u_shape', [
+    (em.DcExternallyExcitedMotor(), (2,)),
+    (em.DcPermanentlyExcitedMotor(), (1,)),
+    (em.DcSeriesMotor(), (1,)),
+    (em.DcShuntMotor(), (1,)),
+    (em.PermanentMagnetSynchronousMotor(), (2,)),
+    (em.SynchronousReluctanceMotor(), (2,)),
+    (em.ExternallyExcitedSynchronousMotor(), (3,)),
+    (em.SquirrelCageInductionMotor(), (2,)),
+    (em.DoublyFedInductionMotor(), (2, 2)),
+])
+def test_electrical_jacobian_batch(motor, u_shape):
+    rng = np.random.default_rng(1)
+    num_states = motor._model_constants.shape[0]
+    states = rng.normal(scale=10.0, size=(4, num_states))
+    u_in = rng.normal(size=(4, *u_shape))
+    omega = rng.normal(scale=100.0, size=4)
+    jacobian, over_omega, torque_over_states = motor.electrical_jacobian_batch(states, u_in, omega)
+    assert jacobian.shape == (4, num_states, num_states)
+    assert np.allclose(
+        jacobian, finite_differences(lambda x: motor.electrical_ode_batch(x, u_in, omega), states), atol=1e-3
+    )
+    assert np.allclose(
+        over_omega,
+        finite_differences(lambda w: motor.electrical_ode_batch(states, u_in, w[..., 0]), omega[:, np.newaxis])[..., 0],
+        atol=1e-3
+    )
+    assert np.allclose(torque_over_states, finite_differences(motor.torque_batch, states), atol=1e-6)
+
+
+@pytest.mark.parametrize('motor', [
+    em.DcExternallyExcitedMotor(), em.DcPermanentlyExcitedMotor(), em.DcSeriesMotor(), em.DcShuntMotor(),
+    em.PermanentMagnetSynchronousMotor(), em.SynchronousReluctanceMotor(), em.ExternallyExcitedSynchronousMotor(),
+    em.DoublyFedInductionMotor(),
+])
+def test_electrical_jacobian_batch_equals_electrical_jacobian(motor):
+    rng = np.random.default_rng(2)
+    num_states = motor._model_constants.shape[0]
+    states = rng.normal(size=(3, num_states))
+    u_in = rng.normal(size=(3, 2, 2))
+    omega = rng.normal(size=3)
+    batch = motor.electrical_jacobian_batch(states, u_in, omega)
+    for n in range(3):
+        single = motor.electrical_jacobian(states[n], u_in[n], omega[n])
+        for batch_result, single_result in zip(batch, single):
+            assert np.allclose(batch_result[n], single_result)
+
+
+@pytest.mark.parametrize('load', [
+    ml.PolynomialStaticLoad(load_parameter=dict(a=0.01, b=0.05, c=0.1)),
+    ml.ConstantSpeedLoad(omega_fixed=100.0),
+])
+def test_mechanical_jacobian_batch(load):
+    rng = np.random.default_rng(1)
+    omega = rng.normal(scale=10.0, size=(5, 1))
+    omega[0] = 0.0
+    torque = rng.normal(size=5)
+    load_jacobian, over_torque = load.mechanical_jacobian_batch(0.0, omega, torque)
+    assert load_jacobian.shape == (5, 1, 1) and over_torque.shape == (5, 1)
+    for n in range(5):
+        single_jacobian, single_over_torque = load.mechanical_jacobian(0.0, omega[n], torque[n])
+        assert np.allclose(load_jacobian[n], single_jacobian)
+        assert np.allclose(over_torque[n], single_over_torque)
+
+
+@pytest.mark.parametrize('env_id', ['Cont-SC-ExtExDc-v0', 'Cont-SC-PMSM-v0', 'Finite-SC-SCIM-v0', 'Cont-CC-DFIM-v0'])
+def test_system_jacobian(env_id):
+    solver = dict(method='BDF', rtol=1e-10, atol=1e-10)
+    systems, single_systems = [[
+        gem.make(env_id, ode_solver=sv.ScipySolveIvpSolver(**solver)).physical_system.unwrapped for _ in range(3)
+    ] for _ in range(2)]
+    batched_system = BatchedSCMLSystem.make(systems, ode_solver=sv.ScipySolveIvpSolver(**solver))
+    assert batched_system._ode_solver._system_jacobian is not None
+    batched_system.reset()
+    align_single_systems(batched_system, single_systems)
+    action_space = systems[0].action_space
+    action_space.seed(0)
+    for _ in range(10):
+        actions = [action_space.sample() for _ in range(3)]
+        states = batched_system.simulate(actions)
+        single_states = np.array([system.simulate(action) for system, action in zip(single_systems, actions)])
+        assert np.allclose(states, single_states, atol=1e-7)
+
+    ode_state = batched_system._ode_solver.y
+    u_in = batched_system._ode_solver._f_params[0]
+    jacobian = batched_system._system_jacobian(0.0, ode_state, u_in)
+    assert jacobian.shape == (ode_state.size, ode_state.size)
+    expected = finite_differences(lambda y: batched_system._system_equation(0.0, y, u_in), ode_state)
+    assert np.allclose(jacobian, expected, rtol=1e-5, atol=1e-2)
+
+
+def test_system_jacobian_different_parameters():
+    systems = [
+        gem.make(
+            'Cont-SC-PMSM-v0', ode_solver=sv.ScipySolveIvpSolver(method='Radau'),
+            motor=dict(motor_parameter=dict(r_s=r_s)), load=dict(load_parameter=dict(j_load=j_load))
+        ).physical_system.unwrapped
+        for r_s, j_load in zip((15e-3, 18e-3, 21e-3), (1e-3, 2e-3, 3e-3))
+    ]
+    batched_system = BatchedSCMLSystem.make(systems, ode_solver=sv.ScipySolveIvpSolver(method='Radau'))
+    batched_system.reset()
+    batched_system.simulate([np.array([0.5, 0.5, 0.5])] * 3)
+    ode_state = batched_system._ode_solver.y
+    u_in = batched_system._ode_solver._f_params[0]
+    blocks = batched_system._system_jacobian(0.0, ode_state, u_in).reshape(3, 4, 3, 4)
+    for n, system in enumerate(systems):
+        single_jacobian = system._system_jacobian(0.0, ode_state.reshape(3, 4)[n], u_in[n])
+        assert np.allclose(blocks[n, :, n, :], single_jacobian)
+        for m in set(range(3)) - {n}:
+            assert np.all(blocks[n, :, m, :] == 0)
+
+
+def test_calc_jacobian():
+    systems = make_systems('Cont-SC-PMSM-v0', 2)
+    assert BatchedSCMLSystem.make(systems, calc_jacobian=False)._ode_solver._system_jacobian is None
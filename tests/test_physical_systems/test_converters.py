@@ -2,6 +2,7 @@ import gym_electric_motor.physical_systems.converters as cv
 from tests.testing_utils import PowerElectronicConverterWrapper, DummyConverter
 import gym_electric_motor as gem
 from functools import reduce
+import itertools
 import pytest
 import numpy as np
 import tests.conf as cf
@@ -426,15 +427,12 @@ def test_discrete_b6_bridge():
     converter_default_init_1 = make_module(cv.PowerElectronicConverter, 'Finite-B6C')
     converter_default_init_2 = cv.FiniteB6BridgeConverter()
     assert converter_default_init_1._tau == 1E-5
-    for subconverter in converter_default_init_1._sub_converters:
-        assert subconverter._tau == 1E-5
-        assert subconverter._interlocking_time == 0
+    assert converter_default_init_1._interlocking_time == 0
 
     # test default initialized converter
     converters_default = [converter_default_init_1, converter_default_init_2]
     for converter in converters_default:
         assert all(converter.reset() == -0.5 * np.ones(3))
-        assert converter._sub_converters[0].action_space.n == 3
         assert converter.action_space.n == 8
 
         # 1  1  1  1  2  2  2  1  2  1  # Action for the converter
@@ -462,9 +460,7 @@ def test_discrete_b6_bridge():
     converter_init_1 = make_module(cv.PowerElectronicConverter, 'Finite-B6C', **cf.converter_parameter)
     converter_init_2 = cv.FiniteB6BridgeConverter(**cf.converter_parameter)
     assert converter_init_1._tau == cf.converter_parameter['tau']
-    for subconverter in converter_init_1._sub_converters:
-        assert subconverter._tau == cf.converter_parameter['tau']
-        assert subconverter._interlocking_time == cf.converter_parameter['interlocking_time']
+    assert converter_init_1._interlocking_time == cf.converter_parameter['interlocking_time']
     # set parameter
     actions = [6, 6, 4, 5, 1, 2, 3, 7, 0, 4]
     i_ins = [[[0.5], [0.5], [-0.5]],
@@ -514,6 +510,20 @@ def test_discrete_b6_bridge():
                 step_counter += 1
 
 
+@pytest.mark.parametrize('i_out', list(itertools.product([-0.5, 0, 0.5], repeat=3)))
+def test_discrete_b6_bridge_phase_currents(i_out):
+    """Test that the currents can also be passed per phase"""
+    converter = cv.FiniteB6BridgeConverter()
+    converter.reset()
+    for action in range(converter.action_space.n):
+        converter.set_action(action, 0)
+        voltages = converter.convert(list(i_out), 0)
+        i_sup = converter.i_sup(list(i_out))
+        for per_phase in ([[i] for i in i_out], np.array(i_out).reshape(3, 1)):
+            assert converter.convert(per_phase, 0) == voltages
+            assert converter.i_sup(per_phase) == i_sup
+
+
 def test_continuous_b6_bridge():
     converter_default_init_1 = cv.ContB6BridgeConverter()
     converter_default_init_2 = make_module(cv.PowerElectronicConverter, 'Cont-B6C')
@@ -692,6 +702,23 @@ class TestContDynamicallyAveragedConverter(TestPowerElectronicConverter):
         fitting_action = converter.action_space.sample()
         converter.set_action(fitting_action, 0)
         assert np.all(converter._current_action == fitting_action)
+        # The clipped actions are copies of the bounds of the action space
+        low = converter.action_space.low.copy()
+        converter.set_action(low_action, 0)
+        assert converter._current_action is not converter.action_space.low
+        converter._current_action[0] = low[0] + 0.5
+        assert np.all(converter.action_space.low == low)
+
+    @pytest.mark.parametrize('scalar', [float, np.float64, np.array])
+    def test_scalar_action_clipping(self, converter, scalar):
+        low = converter.action_space.low[0]
+        high = converter.action_space.high[0]
+        converter.set_action(scalar(low - 1.0), 0)
+        assert np.all(converter._current_action == converter.action_space.low)
+        converter.set_action(scalar(high + 1.0), 0)
+        assert np.all(converter._current_action == converter.action_space.high)
+        converter.set_action(scalar(0.5 * (low + high)), 0)
+        assert converter._current_action == [0.5 * (low + high)]
 
     @pytest.mark.parametrize("interlocking_time", [0.0, 0.2, 1.0])
     def test_interlock(self, monkeypatch, converter, interlocking_time):
@@ -806,26 +833,7 @@ class TestFiniteFourQuadrantConverter(TestFiniteConverter):
     class_to_test = cv.FiniteFourQuadrantConverter
     key = 'Finite-4QC'
 
-    @pytest.fixture
-    def converter(self):
-        converter = self.class_to_test()
-        tau = converter._tau
-        converter._subconverters = [
-            PowerElectronicConverterWrapper(converter._subconverters[0], tau=tau),
-            PowerElectronicConverterWrapper(converter._subconverters[1], tau=tau)
-        ]
-        return converter
-
     def test_set_action(self, converter, *_):
-        for action in range(converter.action_space.n):
-            t = np.random.rand()
-            converter.set_action(action, t)
-            assert converter._subconverters[0].last_t == t
-            assert converter._subconverters[1].last_t == t
-            assert converter._subconverters[0].last_action == action // 2 + 1
-            assert converter._subconverters[1].last_action == action % 2 + 1
-
-        converter = self.class_to_test()
         time = 0
         with pytest.raises(AssertionError) as assertText:
             converter.set_action(-1, time)
@@ -839,31 +847,30 @@ class TestFiniteFourQuadrantConverter(TestFiniteConverter):
             converter.set_action(np.pi, time)
         assert str(np.pi) in str(assertText.value) and "Discrete(4)" in str(assertText.value)
 
-    @pytest.mark.parametrize('i_out', [[-12], [0], [12]])
-    def test_convert(self, converter, i_out):
-        t = np.random.rand()
-        converter.set_action(converter.action_space.sample(), t)
-        u = converter.convert(i_out, t)
-        assert converter._subconverters[0].last_t == t
-        assert converter._subconverters[0].last_i_out == i_out
-        assert converter._subconverters[1].last_t == t
-        assert converter._subconverters[1].last_i_out == [-i_out[0]]
-        assert u == [converter._subconverters[0].last_u[0] - converter._subconverters[1].last_u[0]]
-
-    def test_reset(self, converter):
-        reset_calls = [conv.reset_calls for conv in converter._subconverters]
-        super().test_reset(converter)
-        assert np.all([conv.reset_calls == reset_calls[0] + 1 for conv in converter._subconverters])
-
-    @pytest.mark.parametrize('i_out', [[-1], [0], [1]])
-    def test_i_sup(self, converter, i_out):
-        for action in range(converter.action_space.n):
-            converter.set_action(action, 0)
-            converter.convert(i_out, 0)
-            i_sup = converter.i_sup(i_out)
-            assert converter._subconverters[0].last_i_out == i_out
-            assert converter._subconverters[1].last_i_out == [-i_out[0]]
-            assert i_sup == converter._subconverters[0].last_i_sup + converter._subconverters[1].last_i_sup
+    @pytest.mark.parametrize('interlocking_time', [0.0, 0.1])
+    def test_half_bridges(self, interlocking_time):
+        """Test the switching times, voltages and supply currents against two finite 2QC as half bridges"""
+        converter = self.class_to_test(tau=1, interlocking_time=interlocking_time)
+        half_bridges = [cv.FiniteTwoQuadrantConverter(tau=1, interlocking_time=interlocking_time) for _ in range(2)]
+        assert converter.reset() == [0.0]
+        for half_bridge in half_bridges:
+            half_bridge.reset()
+        for step, action in enumerate([0, 1, 2, 3, 3, 0, 2, 1, 0, 3, 1, 2, 0]):
+            times = converter.set_action(action, step)
+            half_bridge_times = \
+                half_bridges[0].set_action(action // 2 + 1, step) + half_bridges[1].set_action(action % 2 + 1, step)
+            assert times == sorted(set(half_bridge_times))
+            for t in [step] + times[:-1]:
+                for i_out in [[-1], [0], [1]]:
+                    i_sup = converter.i_sup(i_out)
+                    assert i_sup == half_bridges[0].i_sup(i_out) + half_bridges[1].i_sup([-i_out[0]])
+                    u = converter.convert(i_out, t)
+                    assert u == [half_bridges[0].convert(i_out, t)[0] - half_bridges[1].convert([-i_out[0]], t)[0]]
+
+    def test_tables(self, converter):
+        assert converter._voltage_table is self.class_to_test()._voltage_table
+        assert len(converter._voltage_table) == 9
+        assert all(len(switching_patterns) == 4 for switching_patterns in converter._switching_table.values())
 
 
 class TestContOneQuadrantConverter(TestContDynamicallyAveragedConverter):
@@ -1105,6 +1112,10 @@ class TestContMultiConverter(TestContDynamicallyAveragedConverter):
         # Done by the subconverters
         pass
 
+    def test_scalar_action_clipping(self, *_):
+        # The actions of multi converters are sequences
+        pass
+
     @pytest.mark.parametrize('action', [[0, 0, 0, 0, 0], [0, 0, 1, 1, 1], [-1, 1, -1, 1, -1], [1, 1, 1, 1, 1], []])
     def test_set_action(self, monkeypatch, converter, action):
         t = np.random.randint(10) * converter._tau
@@ -1138,40 +1149,13 @@ class TestFiniteB6BridgeConverter(TestFiniteConverter):
     class_to_test = cv.FiniteB6BridgeConverter
     key = 'Finite-B6C'
 
-    @pytest.fixture
-    def converter(self):
-        conv = self.class_to_test()
-        subconverters = [
-            PowerElectronicConverterWrapper(subconverter, tau=conv._tau) for subconverter in conv._sub_converters
-        ]
-        conv._sub_converters = subconverters
-        return conv
-
-    @pytest.mark.parametrize("tau, interlocking_time, kwargs", [
-        (1, 0.1, {}),
-        (0.1, 0.0, {}),
-    ])
-    def test_subconverter_initialization(self, tau, interlocking_time, kwargs):
-        conv = self.class_to_test(tau=tau, interlocking_time=interlocking_time, **kwargs)
-        for sc in conv._sub_converters:
-            assert sc._interlocking_time == interlocking_time
-            assert sc._tau == tau
-
     def test_reset(self, converter):
         u_init = converter.reset()
-        assert np.all(
-            subconv.reset_counter == 1 for subconv in converter._sub_converters
-        )
         assert u_init == [-0.5] * 3
 
     def test_set_action(self, converter, *_):
         for action in range(converter.action_space.n):
-            t = np.random.rand()
-            converter.set_action(action, t)
-            assert converter._sub_converters[0].last_t == t
-            assert converter._sub_converters[1].last_t == t
-            assert converter._sub_converters[2].last_t == t
-            subactions = [sc.last_action % 2 for sc in converter._sub_converters]
+            subactions = [subaction % 2 for subaction in converter._subactions[action]]
             assert action == reduce(lambda x, y: 2*x+y, subactions)
 
         time = 0
@@ -1187,27 +1171,31 @@ class TestFiniteB6BridgeConverter(TestFiniteConverter):
             converter.set_action(np.pi, time)
         assert str(np.pi) in str(assertText.value) and "Discrete(8)" in str(assertText.value)
 
-    @pytest.mark.parametrize('i_out', [[-1, -1, 0], [1, 1, -2], [0, 0, 1]])
-    def test_convert(self, converter, i_out):
-        t = np.random.rand()
-        sc1, sc2, sc3 = converter._sub_converters
-        for action in range(converter.action_space.n):
-            converter.set_action(action, t)
-            u_out = converter.convert(i_out, t)
-            assert sc1.last_i_out + sc2.last_i_out + sc3.last_i_out == i_out
-            assert sc1.last_t == sc2.last_t == sc3.last_t == t
-            assert sc1.last_u[0] - 0.5 == u_out[0]
-            assert sc2.last_u[0] - 0.5 == u_out[1]
-            assert sc3.last_u[0] - 0.5 == u_out[2]
-
-    @pytest.mark.parametrize('i_out', [[-1, -1, 0], [1, 1, -2], [0, 0, 1]])
-    def test_i_sup(self, converter, i_out):
-        sc1, sc2, sc3 = converter._sub_converters
-        for action in range(converter.action_space.n):
-            converter.set_action(action, converter._tau * action)
-            i_sup = converter.i_sup(i_out)
-            assert sc1.last_i_out + sc2.last_i_out + sc3.last_i_out == i_out
-            assert i_sup == sc1.last_i_sup + sc2.last_i_sup + sc3.last_i_sup
+    @pytest.mark.parametrize('interlocking_time', [0.0, 0.1])
+    def test_half_bridges(self, interlocking_time):
+        """Test the switching times, voltages and supply currents against three finite 2QC as half bridges"""
+        converter = self.class_to_test(tau=1, interlocking_time=interlocking_time)
+        half_bridges = [cv.FiniteTwoQuadrantConverter(tau=1, interlocking_time=interlocking_time) for _ in range(3)]
+        converter.reset()
+        for half_bridge in half_bridges:
+            half_bridge.reset()
+        for step, action in enumerate([0, 7, 1, 6, 2, 5, 3, 4, 4, 0, 5, 2]):
+            times = converter.set_action(action, step)
+            half_bridge_times = []
+            for half_bridge, subaction in zip(half_bridges, converter._subactions[action]):
+                half_bridge_times += half_bridge.set_action(subaction, step)
+            assert times == sorted(set(half_bridge_times))
+            for t in [step] + times[:-1]:
+                for i_out in itertools.product([-1, 0, 1], repeat=3):
+                    i_sup = converter.i_sup(i_out)
+                    assert i_sup == sum(half_bridge.i_sup([i]) for half_bridge, i in zip(half_bridges, i_out))
+                    u_out = converter.convert(i_out, t)
+                    assert u_out == [half_bridge.convert([i], t)[0] - 0.5 for half_bridge, i in zip(half_bridges, i_out)]
+
+    def test_tables(self, converter):
+        assert converter._voltage_table is self.class_to_test()._voltage_table
+        assert len(converter._voltage_table) == 27
+        assert all(len(voltages) == 8 for voltages in converter._voltage_table.values())
 
 
 class TestContB6BridgeConverter(TestContDynamicallyAveragedConverter):
@@ -1227,6 +1215,10 @@ class TestContB6BridgeConverter(TestContDynamicallyAveragedConverter):
         # Done by subconverters
         pass
 
+    def test_scalar_action_clipping(self, *_):
+        # The actions of B6 bridge converters are sequences
+        pass
+
     def test_reset(self, converter):
         u_init = converter.reset()
         assert np.all(
@@ -1271,3 +1263,26 @@ class TestContB6BridgeConverter(TestContDynamicallyAveragedConverter):
 
 
 # endregion
+
+
+@pytest.mark.parametrize('converter', [
+    cv.FiniteOneQuadrantConverter(),
+    cv.FiniteTwoQuadrantConverter(),
+    cv.FiniteFourQuadrantConverter(),
+    cv.FiniteB6BridgeConverter(),
+    cv.FiniteMultiConverter(subconverters=['Finite-2QC', 'Finite-4QC']),
+    cv.FiniteMultiConverter(subconverters=['Finite-B6C', 'Finite-B6C']),
+])
+def test_switching_voltages(converter):
+    """Test that the voltages of all actions equal the converted voltages after setting each action"""
+    converter.reset()
+    space = converter.action_space
+    actions = list(range(space.n)) if isinstance(space, Discrete) else list(np.ndindex(*space.nvec))
+    i_out = np.random.uniform(-1, 1, size=(4, converter.currents.shape[0]))
+    voltages = converter.switching_voltages(i_out)
+    assert voltages.shape == (4, len(actions), converter.voltages.shape[0])
+    for currents, action_voltages in zip(i_out, voltages):
+        assert np.all(converter.switching_voltages(currents) == action_voltages)
+        for action, u_out in zip(actions, action_voltages):
+            converter.set_action(np.array(action) if len(np.shape(action)) > 0 else action, 0.0)
+            assert np.allclose(converter.convert(currents, 0.0), u_out)
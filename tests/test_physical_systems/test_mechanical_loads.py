@@ -1,6 +1,7 @@
 import pytest
 import gym_electric_motor as gem
 from gym_electric_motor.physical_systems import PolynomialStaticLoad, MechanicalLoad, ConstantSpeedLoad, ExternalSpeedLoad
+from gym_electric_motor.physical_systems import StreamedSpeedLoad
 from gym.spaces import Box
 import numpy as np
 from scipy import signal
@@ -313,6 +314,39 @@ class TestExtSpeedLoad(TestMechanicalLoad):
         assert result0 == result1 == expected[1]
 
 
+
+class TestStreamedSpeedLoad(TestMechanicalLoad):
+
+    key = 'StreamedSpeedLoad'
+    class_to_test = StreamedSpeedLoad
+    kwargs = dict(source=dict(omega=np.array([10.0, 20.0, 40.0])), sample_time=1e-4)
+
+    @pytest.fixture
+    def streamed_speed_load(self):
+        return StreamedSpeedLoad(dict(speed=np.array([10.0, 20.0, 40.0, 80.0])), 2e-4, column='speed', tau=1e-4)
+
+    def test_initialization(self, streamed_speed_load):
+        assert streamed_speed_load.omega == 10.0
+        assert all(streamed_speed_load.reset() == np.array([10.0]))
+
+    @pytest.mark.parametrize('t, omega, expected_result', [
+        (0.0, 10.0, 5e4), (1e-4, 15.0, 5e4), (2.5e-4, 20.0, 1.5e5), (1.0, 80.0, 0.0)
+    ])
+    def test_mechanical_ode(self, streamed_speed_load, t, omega, expected_result):
+        # The profile is resampled to tau and the speed is led to the speed of the profile at the next step
+        output_val = streamed_speed_load.mechanical_ode(t, np.array([omega]))
+        assert math.isclose(expected_result, output_val[0], rel_tol=1e-9, abs_tol=1e-6)
+
+    def test_jacobian(self, streamed_speed_load):
+        assert streamed_speed_load.mechanical_jacobian(0.0, np.array([10.0]), 0.0) is None
+
+    def test_close(self, streamed_speed_load):
+        streamed_speed_load.mechanical_ode(0.0, np.array([10.0]))
+        assert streamed_speed_load._stream._executor is not None
+        streamed_speed_load.close()
+        assert streamed_speed_load._stream._executor is None
+        assert len(streamed_speed_load._stream._buffer) == 0
+
 class TestPolyStaticLoad(TestMechanicalLoad):
 
     class_to_test = PolynomialStaticLoad
@@ -1,9 +1,11 @@
 import numpy as np
+import gym_electric_motor as gem
 from ..testing_utils import DummyConverter, DummyLoad, DummyOdeSolver, DummyVoltageSupply, DummyElectricMotor,\
     mock_instantiate, instantiate_dict
 from gym_electric_motor.physical_systems import physical_systems as ps, converters as cv, electric_motors as em,\
     mechanical_loads as ml, voltage_supplies as vs, solvers as sv
 from gym.spaces import Box
+from gym_electric_motor.rollout import all_action_sequences
 import pytest
 
 
@@ -71,6 +73,25 @@ class TestSCMLSystem:
             scml_system.mechanical_load.state_names + scml_system.electrical_motor.CURRENTS, dtype=float
         )), ' The ode solver was not reset correctly'
 
+    def test_index_slices(self, scml_system):
+        """Test that contiguous indices are accessed with slices and other indices with index arrays"""
+        assert scml_system._currents_slice == slice(scml_system.CURRENTS_IDX[0], scml_system.CURRENTS_IDX[-1] + 1)
+        scml_system.CURRENTS_IDX = [4, 2]
+        scml_system.U_SUP_IDX = [1, 3, 5]
+        scml_system._set_slices()
+        state = np.zeros(7)
+        state[scml_system._currents_slice] = [1.0, 2.0]
+        state[scml_system._u_sup_slice] = [3.0, 4.0, 5.0]
+        assert np.all(state == [0.0, 3.0, 2.0, 4.0, 1.0, 5.0, 0.0])
+        assert np.all(state[scml_system._currents_slice] == [1.0, 2.0])
+
+    def test_close(self, scml_system, monkeypatch):
+        """Test that the close is passed to the mechanical load"""
+        closed = []
+        monkeypatch.setattr(scml_system.mechanical_load, 'close', lambda: closed.append(True))
+        scml_system.close()
+        assert closed == [True]
+
     def test_system_equation(self, scml_system):
         """Tests the system equation function"""
         state = np.random.rand(4)
@@ -113,6 +134,16 @@ class TestSCMLSystem:
         assert scml_system.converter.action_set_time == 0, 'The action start time was passed incorrect to the converter'
         assert scml_system.converter.last_i_out == scml_system.electrical_motor.i_in(scml_system._ode_solver.last_y[2:])
 
+    def test_simulate_returns_new_state(self, scml_system):
+        """Test that the returned states are not overwritten in the following simulation steps"""
+        scml_system.reset()
+        scml_system._ode_solver.set_initial_value(np.array([3, 4, 5, 6]))
+        state = scml_system.simulate(scml_system.action_space.sample())
+        state_copy = state.copy()
+        next_state = scml_system.simulate(scml_system.action_space.sample())
+        assert next_state is not state
+        assert np.all(state == state_copy), 'The returned state was changed by the next simulation step'
+
 
     def test_system_jacobian(self, scml_system):
         """Tests for the system jacobian function"""
@@ -134,3 +165,129 @@ class TestSCMLSystem:
         assert np.all(sys_jac[2:, 1] == np.zeros(2))
         assert np.all(sys_jac[:-2, 2:] == np.array([[72, 84], [78, 91]])), 'The derivative of the mech.state ' \
                                                                            'over the currents is false'
+
+
+@pytest.mark.parametrize('env_id', ['Cont-CC-PMSM-v0', 'Finite-CC-EESM-v0', 'Finite-CC-SCIM-v0', 'Cont-CC-DFIM-v0'])
+def test_three_phase_system_equation(env_id):
+    """Test that the system equation concatenates the mechanical and the electrical ode of the three phase systems"""
+    physical_system = gem.make(env_id, visualization=()).physical_system
+    physical_system.reset()
+    state = np.random.rand(len(physical_system._ode_solver.y))
+    u_in = np.random.rand(2, 2) if 'DFIM' in env_id else np.random.rand(3 if 'EESM' in env_id else 2)
+    n_load = len(physical_system.mechanical_load.state_names)
+    motor_state = state[n_load:]
+    expected = np.concatenate((
+        physical_system.mechanical_load.mechanical_ode(
+            0.0, state[:n_load], physical_system.electrical_motor.torque(motor_state)
+        ),
+        physical_system.electrical_motor.electrical_ode(motor_state, u_in, state[0]),
+    ))
+    derivative = physical_system._system_equation(0.0, state, u_in)
+    assert np.all(derivative == expected)
+    assert physical_system._system_equation(0.0, state, u_in) is derivative
+
+
+def test_eesm_system_interlocking():
+    """Test the simulation of the EESM with multiple switching times per step due to the interlocking time"""
+    converter = cv.FiniteMultiConverter(subconverters=[
+        cv.FiniteB6BridgeConverter(interlocking_time=2e-6), cv.FiniteFourQuadrantConverter(interlocking_time=2e-6)
+    ])
+    env = gem.make('Finite-CC-EESM-v0', visualization=(), converter=converter)
+    physical_system = env.physical_system
+    physical_system.reset()
+    env.action_space.seed(0)
+    switching_times = []
+    for _ in range(20):
+        action = env.action_space.sample()
+        state = physical_system.simulate(action)
+        switching_times.append(len(physical_system.converter._sub_converters[0]._switching_pattern))
+        assert np.all(np.isfinite(state))
+    assert max(switching_times) == 2, 'The interlocking time was not simulated'
+
+
+@pytest.mark.parametrize('epsilon', [0.0, 0.5, -2.1, 3.1])
+def test_three_phase_transformation_matrices(epsilon):
+    """Test the combined transformations against the separate Clarke and Park transformations"""
+    motor = em.ThreePhaseMotor
+    dq = np.array([1.3, -0.4])
+    abc = np.array([0.7, -1.5, 0.2])
+    rotation, abc_to_dq, dq_to_abc = motor.transformation_matrices(epsilon)
+    assert np.allclose(rotation.dot(dq), motor.q(dq, epsilon))
+    assert np.allclose(motor.dq_to_abc(dq, epsilon), motor.t_32(motor.q(dq, epsilon)))
+    assert np.allclose(motor.abc_to_dq(abc, epsilon), motor.q_inv(motor.t_23(abc), epsilon))
+    assert np.allclose(abc_to_dq.dot(dq_to_abc), np.eye(2))
+    # Several quantities with the same angle as columns
+    columns = np.column_stack((abc, 2 * abc))
+    assert np.allclose(motor.abc_to_dq(columns, epsilon), np.column_stack((
+        motor.abc_to_dq(abc, epsilon), motor.abc_to_dq(2 * abc, epsilon)
+    )))
+
+
+def test_three_phase_transformation_batch():
+    """Test that the batched transformations of shape (N, 3) equal the transformations of the single angles"""
+    motor = em.ThreePhaseMotor
+    epsilon = np.linspace(-np.pi, np.pi, 7)
+    abc = np.random.rand(7, 3)
+    dq = np.random.rand(7, 2)
+    rotations, abc_to_dq, dq_to_abc = motor.transformation_matrices(epsilon)
+    assert rotations.shape == (7, 2, 2) and abc_to_dq.shape == (7, 2, 3) and dq_to_abc.shape == (7, 3, 2)
+    assert np.allclose(motor.abc_to_dq(abc, epsilon), [motor.abc_to_dq(abc_, eps) for abc_, eps in zip(abc, epsilon)])
+    assert np.allclose(motor.dq_to_abc(dq, epsilon), [motor.dq_to_abc(dq_, eps) for dq_, eps in zip(dq, epsilon)])
+
+
+def test_three_phase_system_transformations():
+    """Test the cached transformations of the three phase systems for single and batched angles"""
+    physical_system = gem.make('Cont-CC-SCIM-v0', visualization=()).physical_system
+    motor = em.ThreePhaseMotor
+    abc = np.array([0.7, -1.5, 0.2])
+    dq = np.array([1.3, -0.4])
+    matrices = physical_system._transformation_matrices(0.5)
+    assert physical_system._transformation_matrices(0.5) is matrices
+    assert physical_system._transformation_matrices(0.6) is not matrices
+    assert np.allclose(physical_system.abc_to_dq_space(abc, 0.5), motor.q_inv(motor.t_23(abc), 0.5))
+    assert np.allclose(physical_system.dq_to_abc_space(dq, 0.5), motor.t_32(motor.q(dq, 0.5)))
+    assert np.allclose(physical_system.alphabeta_to_dq_space(dq, 0.5), motor.q_inv(dq, 0.5))
+    assert np.allclose(physical_system.dq_to_alphabeta_space(dq, 0.5), motor.q(dq, 0.5))
+    assert np.allclose(physical_system.dq_to_abc_space(dq, 0.5, normed_epsilon=True), motor.dq_to_abc(dq, 0.5 * np.pi))
+    epsilon = np.array([0.5, -1.0])
+    assert np.allclose(
+        physical_system.dq_to_abc_space(np.array([dq, 2 * dq]), epsilon),
+        [motor.dq_to_abc(dq, 0.5), motor.dq_to_abc(2 * dq, -1.0)]
+    )
+    assert np.allclose(
+        physical_system.alphabeta_to_dq_space(np.array([dq, dq]), epsilon),
+        [motor.q_inv(dq, 0.5), motor.q_inv(dq, -1.0)]
+    )
+    assert np.all(epsilon == [0.5, -1.0])
+
+
+@pytest.mark.parametrize('env_id, horizon', [
+    ('Finite-CC-PMSM-v0', 2), ('Finite-CC-EESM-v0', 1), ('Finite-CC-SCIM-v0', 2), ('Finite-CC-DFIM-v0', 1),
+    ('Finite-CC-ExtExDc-v0', 2), ('Finite-SC-SeriesDc-v0', 3)
+])
+def test_simulate_all_actions(env_id, horizon):
+    """Test that the predicted states of all action sequences equal the simulated states"""
+    env = gem.make(env_id, ode_solver='euler', visualization=())
+    env.seed(0)
+    env.action_space.seed(0)
+    env.reset()
+    for _ in range(5):
+        env.step(env.action_space.sample())
+    physical_system = env.physical_system
+    snapshot = physical_system.get_state()
+    ode_state = physical_system.ode_solver.y.copy()
+    predictions = physical_system.simulate_all_actions(horizon)
+    sequences = all_action_sequences(physical_system.action_space, horizon)
+    assert predictions.shape == (len(sequences), horizon, len(physical_system.state_names))
+    assert np.all(physical_system.ode_solver.y == ode_state), 'The state of the physical system was changed'
+    for sequence, prediction in list(zip(sequences, predictions))[::max(1, len(sequences) // 20)]:
+        physical_system.set_state(snapshot)
+        for action, predicted_state in zip(sequence, prediction):
+            assert np.allclose(physical_system.simulate(action), predicted_state)
+
+
+def test_simulate_all_actions_continuous_converter():
+    physical_system = gem.make('Cont-CC-PMSM-v0', visualization=()).physical_system
+    physical_system.reset()
+    with pytest.raises(AssertionError):
+        physical_system.simulate_all_actions()
@@ -1,4 +1,5 @@
 import numpy as np
+import gym_electric_motor as gem
 import gym_electric_motor.envs
 from gym_electric_motor.physical_systems.solvers import *
 import gym_electric_motor.physical_systems.solvers as pss
@@ -61,6 +62,61 @@ def test_scipyodeint():
         integration_testing(solver)
 
 
+@pytest.mark.parametrize("solver_class", [HeunSolver, RungeKutta4Solver, RungeKutta45Solver])
+def test_runge_kutta(solver_class):
+    """
+    tests if the fixed step runge kutta solvers work basically
+    :param solver_class: runge kutta solver to test
+    :return:
+    """
+    for nsteps in [1, 5]:
+        solver = solver_class(nsteps)
+        integration_testing(solver)
+
+
+@pytest.mark.parametrize("solver", [
+    EulerSolver(), EulerSolver(5), HeunSolver(), RungeKutta4Solver(3), RungeKutta45Solver(), ZeroOrderHoldSolver(),
+    ScipyOdeSolver('dopri5'), ScipyOdeSolver('lsoda'), ScipyOdeSolver('vode'),
+    ScipySolveIvpSolver(method='RK45'), ScipySolveIvpSolver(method='Radau'),
+    ScipySolveIvpSolver(method='RK45', persistent=True), ScipySolveIvpSolver(method='LSODA', persistent=True),
+])
+def test_nfev(solver):
+    """
+    tests that the exposed number of function evaluations equals the number of calls of the system equation
+    :param solver: initialized integrator
+    :return:
+    """
+    evaluations = [0]
+
+    def system_equation(t, state, u):
+        evaluations[0] += 1
+        return system(t, state, u)
+
+    solver.set_system_equation(system_equation, lambda t, state, u: jacobian(t, state, u))
+    assert solver.nfev == 0
+    for initial_time in [0.0, 1.0]:
+        solver.set_initial_value(g_initial_value, initial_time)
+        for k, u in enumerate([0.0, 0.0, 0.5, -0.5]):
+            solver.set_f_params(u)
+            solver.integrate(initial_time + (k + 1) * 1e-3)
+            assert solver.nfev == evaluations[0]
+    assert evaluations[0] > 0
+
+
+@pytest.mark.parametrize("solver", [ScipyOdeIntSolver(), ScipyOdeSolver('dop853')])
+def test_nfev_not_exposed(solver):
+    """
+    tests that solvers without counted function evaluations return None
+    :param solver: initialized integrator
+    :return:
+    """
+    solver.set_system_equation(system, jacobian)
+    solver.set_initial_value(g_initial_value, 0.0)
+    solver.set_f_params(0.0)
+    solver.integrate(1e-3)
+    assert solver.nfev is None
+
+
 def integration_testing(solver):
     """
     tests if no errors are raised due to the integration
@@ -414,6 +470,7 @@ class TestScipySolveIvpSolver:
             simple class necessary for correct testing
             """
             y = np.array([[7, 1], [4, 6]])
+            nfev = 3
 
         return Result()
 
@@ -476,6 +533,169 @@ class TestScipySolveIvpSolver:
         result = test_object.integrate(self._tau)
         # verify the expected results
         assert all(result == self._state), 'unexpected state after integration'
+        assert test_object.nfev == 3, 'the function evaluations of solve_ivp are not counted'
+
+    @staticmethod
+    def integrate_inputs(solver, inputs, tau=1e-3):
+        """
+        integrates the test system with a new input in each step
+        :param solver: initialized integrator
+        :param inputs: inputs of the steps
+        :param tau: step size
+        :return: states after each step
+        """
+        solver.set_system_equation(system, jacobian)
+        solver.set_initial_value(np.array([1.0, 6.0]), 0.0)
+        states = []
+        for k, u in enumerate(inputs):
+            solver.set_f_params(u)
+            states.append(solver.integrate((k + 1) * tau))
+        return np.array(states)
+
+    @pytest.mark.parametrize('method', ['RK23', 'RK45', 'DOP853', 'Radau', 'BDF', 'LSODA'])
+    def test_persistent_equals_solve_ivp(self, method):
+        """
+        test that the persistent mode calculates the same trajectory as solve_ivp
+        :param method: chosen method of solve_ivp
+        :return:
+        """
+        inputs = [0.0, 0.0, 0.8, 0.8, 0.8, -1.6, 2.4, 2.4]
+        kwargs = dict(method=method, rtol=1e-10, atol=1e-12)
+        expected = self.integrate_inputs(ScipySolveIvpSolver(**kwargs), inputs)
+        states = self.integrate_inputs(ScipySolveIvpSolver(persistent=True, **kwargs), inputs)
+        assert np.allclose(states, expected, rtol=1e-6, atol=1e-8)
+
+    def test_persistent_stepper_reuse(self):
+        """
+        test that the stepper is kept alive between the integrations and only rebuilt after set_initial_value()
+        :return:
+        """
+        test_object = ScipySolveIvpSolver(method='Radau', persistent=True)
+        self.integrate_inputs(test_object, [0.0])
+        stepper = test_object._stepper
+        assert stepper is not None
+        test_object.set_f_params(0.0)
+        test_object.integrate(2e-3)
+        assert test_object._stepper is stepper
+        assert stepper.t == test_object.t == 2e-3
+        # A new input restarts the stepper at the current state, but keeps the stepper and its jacobian
+        jac = stepper.J
+        test_object.set_f_params(1.0)
+        assert test_object._stepper is stepper
+        assert stepper.sol is None
+        assert all(stepper.f == system(stepper.t, stepper.y, 1.0))
+        test_object.integrate(3e-3)
+        assert test_object._stepper is stepper
+        assert stepper.J is jac
+        test_object.set_initial_value(np.array([1.0, 6.0]), 0.0)
+        assert test_object._stepper is None
+
+    def test_persistent_bdf_lu_reuse(self):
+        """
+        test that the BDF stepper keeps its LU factorization across discontinuous inputs with an unchanged step size
+        :return:
+        """
+        test_object = ScipySolveIvpSolver(method='BDF', persistent=True)
+        # The step size is limited to the (binary exact) control period and not changed at the order 1 restarts
+        self.integrate_inputs(test_object, [0.0, 1000.0] * 25, tau=2 ** -14)
+        stepper = test_object._stepper
+        assert stepper.order == 1
+        assert stepper.h_abs == 2 ** -14
+        assert stepper.nlu == 1
+
+    def test_persistent_bdf_order_reuse(self):
+        """
+        test that the BDF stepper keeps its order, history and LU factorization for negligible input changes and only
+        falls back to the first order for discontinuous inputs
+        :return:
+        """
+        test_object = ScipySolveIvpSolver(method='BDF', persistent=True)
+        self.integrate_inputs(test_object, [0.0] * 5)
+        stepper = test_object._stepper
+        order = stepper.order
+        assert order > 1
+        lu = stepper.LU
+        history = np.copy(stepper.D)
+        test_object.set_f_params(1e-9)
+        assert stepper.order == order
+        assert stepper.LU is lu
+        assert np.all(stepper.D == history)
+        test_object.set_f_params(1000.0)
+        assert stepper.order == 1
+        assert stepper.n_equal_steps == 0
+        assert np.all(stepper.D[0] == stepper.y)
+        assert np.all(stepper.D[2:] == 0.0)
+
+    def test_persistent_lsoda_restart(self):
+        """
+        test that LSODA steppers are rebuilt with their last step size after a change of the input
+        :return:
+        """
+        test_object = ScipySolveIvpSolver(method='LSODA', persistent=True)
+        self.integrate_inputs(test_object, [0.0, 0.0])
+        step_size = test_object._stepper.step_size
+        test_object.set_f_params(1.0)
+        assert test_object._stepper is None
+        assert test_object._restart_step_size == step_size
+        test_object.integrate(3e-3)
+        assert test_object._stepper is not None
+        assert test_object.t == 3e-3
+
+    @pytest.mark.parametrize('method', ['RK45', 'Radau', 'BDF'])
+    def test_persistent_restart_fallback(self, monkeypatch, method):
+        """
+        test that steppers without the expected private attributes are rebuilt instead of restarted
+        :param method: chosen method of solve_ivp
+        :return:
+        """
+        stepper_class = ScipySolveIvpSolver._methods[method]
+        monkeypatch.setitem(ScipySolveIvpSolver._restart_attributes, stepper_class, ('missing_attribute',))
+        inputs = [0.0, 0.0, 0.8, 0.8, 0.8, -1.6, 2.4, 2.4]
+        kwargs = dict(method=method, rtol=1e-10, atol=1e-12)
+        test_object = ScipySolveIvpSolver(persistent=True, **kwargs)
+        states = self.integrate_inputs(test_object, inputs)
+        expected = self.integrate_inputs(ScipySolveIvpSolver(**kwargs), inputs)
+        assert np.allclose(states, expected, rtol=1e-6, atol=1e-8)
+        step_size = test_object._stepper.step_size
+        test_object.set_f_params(1.0)
+        assert test_object._stepper is None
+        assert test_object._restart_step_size == step_size
+
+    def test_persistent_continue_fallback(self, monkeypatch):
+        """
+        test that LSODA steppers without the expected private attributes are rebuilt in each integration
+        :return:
+        """
+        lsoda = ScipySolveIvpSolver._methods['LSODA']
+        monkeypatch.setitem(ScipySolveIvpSolver._continue_attributes, lsoda, ('_lsoda_solver.missing_attribute',))
+        test_object = ScipySolveIvpSolver(method='LSODA', persistent=True)
+        self.integrate_inputs(test_object, [0.0])
+        stepper = test_object._stepper
+        test_object.set_f_params(0.0)
+        test_object.integrate(2e-3)
+        assert test_object._stepper is not stepper
+        assert test_object._stepper.t == test_object.t == 2e-3
+        expected = self.integrate_inputs(ScipySolveIvpSolver(method='LSODA'), [0.0, 0.8, 0.8])
+        states = self.integrate_inputs(test_object, [0.0, 0.8, 0.8])
+        assert np.allclose(states, expected, rtol=1e-2)
+
+    def test_persistent_environment(self):
+        """
+        test that the persistent mode calculates the same trajectory as solve_ivp in an environment
+        :return:
+        """
+        states = []
+        for persistent in [False, True]:
+            env = gem.make(
+                'Cont-CC-PMSM-v0', visualization=(),
+                ode_solver=ScipySolveIvpSolver(method='RK45', rtol=1e-10, atol=1e-12, persistent=persistent)
+            )
+            env.action_space.seed(0)
+            physical_system = env.physical_system
+            physical_system.seed(np.random.SeedSequence(1))
+            physical_system.reset()
+            states.append([physical_system.simulate(env.action_space.sample()) for _ in range(50)])
+        assert np.allclose(states[1], states[0], rtol=1e-6, atol=1e-8)
 
 
 class TestScipyOdeIntSolver:
@@ -572,3 +792,175 @@ class TestScipyOdeIntSolver:
 
 
 # endregion
+
+
+class TestExplicitRungeKuttaSolver:
+    """
+    class for testing the fixed step runge kutta solvers
+    """
+
+    @staticmethod
+    def system_equation(t, state, u):
+        return np.array([-state[0] + u * np.sin(t), state[0]])
+
+    def integrate(self, solver, t_end=1.0):
+        solver.set_system_equation(self.system_equation)
+        solver.set_initial_value(np.array([1.0, 0.0]), 0.0)
+        solver.set_f_params(2.0)
+        return solver.integrate(t_end).copy()
+
+    @pytest.mark.parametrize('solver_class, order', [(HeunSolver, 2), (RungeKutta4Solver, 4), (RungeKutta45Solver, 5)])
+    def test_order(self, solver_class, order):
+        """
+        test the convergence order of the solvers by halving the step size
+        """
+        expected = self.integrate(ScipyOdeSolver('dopri5', rtol=1e-13, atol=1e-13))
+        error_coarse = np.max(np.abs(self.integrate(solver_class(nsteps=10)) - expected))
+        error_fine = np.max(np.abs(self.integrate(solver_class(nsteps=20)) - expected))
+        assert np.log2(error_coarse / error_fine) == pytest.approx(order, abs=0.3)
+
+    def test_heun_step(self):
+        """
+        test a single step of the heun solver against the explicit trapezoidal rule
+        """
+        solver = HeunSolver()
+        solver.set_system_equation(system, jacobian)
+        solver.set_initial_value(np.array([1, 6]), 5e-4)
+        solver.set_f_params(2)
+        tau = 1e-3
+        k_1 = system(5e-4, np.array([1.0, 6.0]), 2)
+        k_2 = system(5e-4 + tau, np.array([1.0, 6.0]) + tau * k_1, 2)
+        state = solver.integrate(5e-4 + tau)
+        assert np.allclose(state, np.array([1.0, 6.0]) + tau / 2 * (k_1 + k_2))
+        assert solver.t == 5e-4 + tau
+
+    def test_preallocated_buffers(self):
+        """
+        test that the solver reuses its arrays and that a returned state stays valid for one further integration
+        """
+        solver = RungeKutta4Solver(nsteps=3)
+        solver.set_system_equation(self.system_equation)
+        solver.set_initial_value(np.array([1.0, 0.0]), 0.0)
+        solver.set_f_params(2.0)
+        stages = solver._stages
+        states = solver._states
+        first_state = solver.integrate(1e-3)
+        first_state_copy = first_state.copy()
+        second_state = solver.integrate(2e-3)
+        assert np.all(first_state == first_state_copy)
+        assert second_state is solver.y
+        assert not np.all(second_state == first_state)
+        solver.set_initial_value(np.array([2.0, 1.0]), 0.0)
+        assert solver._stages is stages and solver._states is states
+
+    def test_system_equation_placeholder(self):
+        """
+        test that the stages are copied, if the system equation returns the same array in each call
+        """
+        placeholder = np.zeros(2)
+
+        def system_equation(t, state, u):
+            placeholder[:] = self.system_equation(t, state, u)
+            return placeholder
+
+        solver = RungeKutta45Solver()
+        expected = self.integrate(RungeKutta45Solver(), 1e-2)
+        solver.set_system_equation(system_equation)
+        solver.set_initial_value(np.array([1.0, 0.0]), 0.0)
+        solver.set_f_params(2.0)
+        assert np.all(solver.integrate(1e-2) == expected)
+
+    @pytest.mark.parametrize('key, solver_class', [
+        ('heun', HeunSolver), ('rk4', RungeKutta4Solver), ('rk45', RungeKutta45Solver)
+    ])
+    def test_registered(self, key, solver_class):
+        """
+        test that the solvers can be selected in the environments by their keys
+        """
+        env = gem.make('Cont-CC-PMSM-v0', ode_solver=key)
+        assert isinstance(env.physical_system.unwrapped._ode_solver, solver_class)
+        env.reset()
+        env.step(env.action_space.sample())
+
+
+class TestZeroOrderHoldSolver:
+    """
+    class for testing ZeroOrderHoldSolver
+    """
+    # Linear system with the speed as first state that stays constant
+    _system_matrix = np.array([
+        [0.0, 0.0, 0.0],
+        [0.5, -2.0, 1.0],
+        [0.0, -1.0, -3.0],
+    ])
+    _input_matrix = np.array([0.0, 1.0, 0.5])
+
+    def system_equation(self, t, state, u):
+        return np.matmul(self._system_matrix, state) + self._input_matrix * u
+
+    def system_jacobian(self, t, state, u):
+        return self._system_matrix
+
+    def test_exact_discretization(self):
+        """
+        test that the solution equals the analytic solution of the linear system with constant inputs
+        """
+        solver = ZeroOrderHoldSolver()
+        solver.set_system_equation(self.system_equation, self.system_jacobian)
+        initial_state = np.array([2.0, 1.0, -1.0])
+        solver.set_initial_value(initial_state, 0.0)
+        solver.set_f_params(3.0)
+        tau = 1e-2
+        for k in range(10):
+            state = solver.integrate((k + 1) * tau)
+        expected = ScipyOdeSolver('dopri5', rtol=1e-13, atol=1e-13)
+        expected.set_system_equation(self.system_equation)
+        expected.set_initial_value(initial_state, 0.0)
+        expected.set_f_params(3.0)
+        assert np.allclose(state, expected.integrate(10 * tau), rtol=1e-11, atol=1e-12)
+        assert solver.t == pytest.approx(10 * tau)
+        assert solver.cache_size == 1
+
+    def test_lru_cache(self):
+        """
+        test that the discrete matrices are cached per step size and speed bucket and the least recent ones are evicted
+        """
+        solver = ZeroOrderHoldSolver(omega_resolution=0.1, cache_size=2)
+        solver.set_system_equation(self.system_equation, self.system_jacobian)
+        solver.set_f_params(0.0)
+        for omega in [1.0, 1.02, 2.0, 1.0, 3.0]:
+            solver.set_initial_value(np.array([omega, 0.0, 0.0]), 0.0)
+            solver.integrate(1e-3)
+        assert solver.cache_size == 2
+        assert list(solver._cache.keys())[0][1] == np.round(np.array(1.0) / 0.1).tobytes()
+        solver.integrate(3e-3)
+        assert solver.cache_size == 2
+        solver.clear_cache()
+        assert solver.cache_size == 0
+
+    def test_jacobian_required(self):
+        """
+        test that the solver can not be used without the jacobian of the system
+        """
+        with pytest.raises(AssertionError):
+            ZeroOrderHoldSolver().set_system_equation(self.system_equation)
+
+    @pytest.mark.parametrize('env_id', ['Cont-CC-PMSM-v0', 'Cont-CC-ExtExDc-v0', 'Cont-CC-EESM-v0', 'Cont-CC-SCIM-v0'])
+    def test_constant_speed_environments(self, env_id):
+        """
+        test that the solver is exact in the constant speed environments and calculates only one matrix exponential
+        """
+        physical_systems = [
+            gem.make(env_id, ode_solver=solver).physical_system.unwrapped
+            for solver in ['zoh', ScipyOdeSolver('dopri5', rtol=1e-12, atol=1e-12, nsteps=100000)]
+        ]
+        for physical_system in physical_systems:
+            physical_system.seed(np.random.SeedSequence(1))
+            physical_system.reset()
+        action_space = physical_systems[0].action_space
+        action_space.seed(0)
+        for _ in range(50):
+            action = action_space.sample()
+            state, expected_state = [physical_system.simulate(action) for physical_system in physical_systems]
+            assert np.allclose(state, expected_state, atol=1e-9)
+        assert physical_systems[0]._ode_solver.cache_size == 1
@@ -0,0 +1,119 @@
+import numpy as np
+import pytest
+
+import gym_electric_motor as gem
+from gym_electric_motor.core import Callback
+from gym_electric_motor.physical_system_wrappers import CosSinProcessor, DeadTimeProcessor
+
+
+class CountingCallback(Callback):
+    """Callback that counts its calls to compare them with the profiler."""
+
+    def __init__(self):
+        super().__init__()
+        self.steps = 0
+
+    def on_step_end(self, k, state, reference, reward, done):
+        self.steps += 1
+
+
+def run_episodes(env, steps):
+    """Steps the environment with random actions and resets it, if required."""
+    env.action_space.seed(0)
+    env.reset()
+    resets = 1
+    for _ in range(steps):
+        _, _, done, _ = env.step(env.action_space.sample())
+        if done:
+            env.reset()
+            resets += 1
+    return resets
+
+
+class TestStepProfiler:
+
+    @pytest.fixture
+    def env(self):
+        return gem.make(
+            'Cont-CC-PMSM-v0', visualization=(), callbacks=(CountingCallback(),),
+            physical_system_wrappers=(CosSinProcessor('epsilon'), DeadTimeProcessor()),
+        )
+
+    def test_disabled_by_default(self, env):
+        assert env.profiler is None
+        assert env.disable_profiling() is None
+        assert 'step' not in vars(env)
+
+    def test_report(self, env):
+        profiler = env.enable_profiling()
+        assert env.profiler is profiler and env.enable_profiling() is profiler
+        solver = env.physical_system.unwrapped.ode_solver
+        nfev = solver.nfev
+        resets = run_episodes(env, 50)
+        report = profiler.report()
+        assert report['environment.step']['calls'] == 50
+        assert report['environment.reset']['calls'] == resets
+        for name in [
+            'physical_system_wrappers[0].simulate', 'physical_system_wrappers[1].simulate', 'physical_system.simulate',
+            'ode_solver.integrate', 'reference_generator.get_reference', 'reference_generator.get_reference_observation',
+            'constraint_monitor.check_constraints', 'reward_function.reward', 'callbacks[0].on_step_begin',
+            'callbacks[0].on_step_end',
+        ]:
+            assert report[name]['calls'] == 50, name
+            assert report[name]['time'] > 0.0
+            assert report[name]['mean_time'] == pytest.approx(report[name]['time'] / 50)
+        assert report['physical_system_wrappers[0].simulate']['class'] == 'CosSinProcessor'
+        assert report['physical_system_wrappers[1].simulate']['class'] == 'DeadTimeProcessor'
+        assert report['physical_system.simulate']['class'] == 'SynchronousMotorSystem'
+        assert report['ode_solver.integrate']['nfev'] == solver.nfev - nfev > 0
+        assert report['reward_function.reward']['nfev'] is None
+        assert env._callbacks[0].steps == 50
+        # The self times exclude the inner systems and the ode solver
+        assert report['physical_system_wrappers[1].simulate']['self_time'] == pytest.approx(
+            report['physical_system_wrappers[1].simulate']['time']
+            - report['physical_system_wrappers[0].simulate']['time']
+        )
+        assert report['physical_system.simulate']['self_time'] == pytest.approx(
+            report['physical_system.simulate']['time'] - report['ode_solver.integrate']['time']
+        )
+        assert 'self_time' not in report['reward_function.reward']
+
+    def test_reset(self, env):
+        profiler = env.enable_profiling()
+        run_episodes(env, 10)
+        profiler.reset()
+        report = profiler.report()
+        assert all(entry['calls'] == 0 and entry['time'] == 0.0 for entry in report.values())
+        assert report['ode_solver.integrate']['nfev'] == 0
+
+    def test_disable_restores_methods(self, env):
+        reward_function = env.reward_function
+        custom_reward = reward_function.reward
+        reward_function.reward = custom_reward
+        env.enable_profiling()
+        assert reward_function.reward is not custom_reward
+        run_episodes(env, 10)
+        report = env.disable_profiling()
+        assert env.profiler is None
+        assert report['environment.step']['calls'] == 10
+        assert reward_function.reward is custom_reward
+        assert 'step' not in vars(env) and 'reset' not in vars(env)
+        assert 'simulate' not in vars(env.physical_system)
+        assert 'integrate' not in vars(env.physical_system.unwrapped.ode_solver)
+        assert 'on_step_end' not in vars(env._callbacks[0])
+
+    def test_results_unchanged(self, env):
+        """Test that the profiling does not change the simulated states."""
+        reference_env = gem.make(
+            'Cont-CC-PMSM-v0', visualization=(),
+            physical_system_wrappers=(CosSinProcessor('epsilon'), DeadTimeProcessor()),
+        )
+        env.seed(3)
+        reference_env.seed(3)
+        env.enable_profiling()
+        env.reset()
+        reference_env.reset()
+        for action in np.random.default_rng(0).uniform(-1, 1, (20, 3)):
+            (state, _), reward, _, _ = env.step(action)
+            (reference_state, _), reference_reward, _, _ = reference_env.step(action)
+            assert np.all(state == reference_state) and reward == reference_reward
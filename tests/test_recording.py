@@ -0,0 +1,102 @@
+import os
+
+import matplotlib
+import numpy as np
+import pytest
+
+import gym_electric_motor as gem
+from gym_electric_motor.visualization import MotorDashboard
+from gym_electric_motor.visualization.motor_dashboard_plots import EpisodeLengthPlot, \
+    CumulativeConstraintViolationPlot
+from gym_electric_motor.visualization.recording import DashboardRecorder, load_recording, export_dashboard, \
+    _video_name
+
+matplotlib.use('Agg')
+import matplotlib.image as mpimg  # noqa: E402
+import matplotlib.pyplot as plt  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def close_figures():
+    yield
+    plt.close('all')
+
+
+def run(env, steps):
+    """Steps the environment with random actions and renders it after each step."""
+    env.action_space.seed(0)
+    env.reset()
+    for k in range(steps):
+        _, _, done, _ = env.step(env.action_space.sample())
+        if done or k % 300 == 299:
+            env.reset()
+        env.render()
+
+
+@pytest.mark.parametrize('decimation', [1, 3])
+def test_recorder(tmp_path, decimation):
+    recorder = DashboardRecorder(str(tmp_path / 'recording'), decimation=decimation, chunk_size=64)
+    env = gem.make('Cont-CC-PMSM-v0', visualization=(), callbacks=[recorder])
+    states = []
+    env.action_space.seed(0)
+    env.reset()
+    for k in range(1000):
+        (state, _), _, done, _ = env.step(env.action_space.sample())
+        if (k + 1) % decimation == 0:
+            states.append(state)
+        if done:
+            env.reset()
+    env.close()
+    metadata, records = load_recording(recorder.path)
+    assert metadata['decimation'] == decimation
+    assert metadata['state_names'] == list(env.physical_system.state_names)
+    assert records.shape == (1000 // decimation, metadata['record_width'])
+    num_states = len(metadata['state_names'])
+    assert np.array_equal(records[:, 4:4 + num_states], states)
+
+
+def test_exported_frames_equal_rendered_figures(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    dashboard_kwargs = dict(state_plots=['i_sd', 'omega'], action_plots='all', reward_plot=True)
+    dashboard = MotorDashboard(
+        update_interval=250, additional_plots=[EpisodeLengthPlot(), CumulativeConstraintViolationPlot()],
+        **dashboard_kwargs
+    )
+    env = gem.make('Cont-CC-PMSM-v0', visualization=dashboard, callbacks=[DashboardRecorder('recording')])
+    env.action_space.seed(0)
+    env.reset()
+    rendered = []
+    for k in range(1000):
+        _, _, done, _ = env.step(env.action_space.sample())
+        if done or k % 300 == 299:
+            env.reset()
+        env.render()
+        if (k + 1) % 250 == 0:
+            rendered += dashboard.save_figures(f'rendered_{{figure}}_{k // 250:06d}.png')
+    env.close()
+    frames = export_dashboard(
+        'recording', 'frames', frame_interval=250, processes=2,
+        additional_plots=[EpisodeLengthPlot(), CumulativeConstraintViolationPlot()], **dashboard_kwargs
+    )
+    assert sorted(frames) == sorted(os.path.join('frames', name[len('rendered_'):]) for name in rendered)
+    for name in rendered:
+        frame = os.path.join('frames', name[len('rendered_'):])
+        assert np.array_equal(mpimg.imread(name), mpimg.imread(frame))
+
+
+def test_export_video(tmp_path):
+    recorder = DashboardRecorder(str(tmp_path / 'recording'))
+    env = gem.make('Cont-CC-PMSM-v0', visualization=(), callbacks=[recorder])
+    run(env, 700)
+    env.close()
+    # A frame after every 300 steps and after the last step
+    videos = export_dashboard(recorder.path, str(tmp_path / 'run.gif'), frame_interval=300, processes=2,
+                              state_plots=['omega'])
+    assert videos == [str(tmp_path / 'run_time.gif')]
+    from PIL import Image
+    assert Image.open(videos[0]).n_frames == 3
+
+
+def test_video_name():
+    assert _video_name('run.mp4', 'time') == 'run_time.mp4'
+    assert _video_name('{figure}/run.mp4', 'episode') == 'episode/run.mp4'
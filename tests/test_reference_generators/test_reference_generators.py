@@ -1,3 +1,5 @@
+import copy
+import pickle
 import gym
 from numpy.random import seed
 import numpy.random as rd
@@ -11,6 +13,11 @@ from gym_electric_motor.reference_generators.sinusoidal_reference_generator impo
 from gym_electric_motor.reference_generators.step_reference_generator import StepReferenceGenerator
 from gym_electric_motor.reference_generators.triangle_reference_generator import TriangularReferenceGenerator
 from gym_electric_motor.reference_generators.wiener_process_reference_generator import WienerProcessReferenceGenerator
+from gym_electric_motor.reference_generators.laplace_process_reference_generator import \
+    LaplaceProcessReferenceGenerator
+from gym_electric_motor.reference_generators.reference_bank import ReferenceBankGenerator, create_reference_bank
+from gym_electric_motor.reference_generators.streamed_reference_generator import StreamedReferenceGenerator
+from gym_electric_motor.trajectory_stream import write_columns
 from gym_electric_motor.reference_generators.subepisoded_reference_generator import SubepisodedReferenceGenerator
 from gym_electric_motor.reference_generators.zero_reference_generator import ZeroReferenceGenerator
 import gym_electric_motor.reference_generators.switched_reference_generator as swrg
@@ -298,6 +305,21 @@ class TestSwitchedReferenceGenerator:
                <= test_object._super_episode_length[1]
         assert test_object._current_ref_generator in sub_reference_generators
 
+    def test_state(self):
+        sub_reference_generators = [DummyReferenceGenerator(), DummyReferenceGenerator(), DummyReferenceGenerator()]
+        test_object = SwitchedReferenceGenerator(sub_generators=sub_reference_generators)
+        test_object.seed(np.random.SeedSequence(123))
+        test_object._current_ref_generator = sub_reference_generators[2]
+        state = test_object.get_state()
+        # The active sub generator is stored by its index to restore the snapshot in copies of the generator
+        assert state['_current_ref_generator'] == 2
+        copied_object = copy.deepcopy(test_object)
+        test_object._current_ref_generator = sub_reference_generators[0]
+        test_object.set_state(state)
+        copied_object.set_state(state)
+        assert test_object._current_ref_generator is sub_reference_generators[2]
+        assert copied_object._current_ref_generator is copied_object._sub_generators[2]
+
 
 class TestWienerProcessReferenceGenerator:
     """
@@ -355,6 +377,81 @@ class TestWienerProcessReferenceGenerator:
         assert sum(abs(test_object._reference - expected_reference)) < 1E-6, 'unexpected reference array'
         assert self._monkey_get_current_value_counter == 1, 'get_current_value() not called once'
 
+    @pytest.mark.parametrize('sigma', [1e-3, 1e-2, 1e-1, 1.0])
+    @pytest.mark.parametrize('initial_value', [0.0, 0.9, -2.0])
+    def test_clipped_cumsum(self, sigma, initial_value):
+        increments = np.random.default_rng(1).normal(0, sigma, 2000)
+        low, high = -0.8, 0.9
+        expected = np.zeros_like(increments)
+        value = initial_value
+        for i, increment in enumerate(increments):
+            value += increment
+            if value > high:
+                value = high
+            if value < low:
+                value = low
+            expected[i] = value
+        # The vectorized walk has to be bit-identical to the walk step by step
+        assert np.array_equal(srg.clipped_cumsum(increments, initial_value, low, high), expected)
+
+    @pytest.mark.parametrize('reference_class', [WienerProcessReferenceGenerator, LaplaceProcessReferenceGenerator])
+    def test_generate_subepisodes(self, reference_class):
+        def references(pregenerate):
+            test_object = reference_class(episode_lengths=(10, 50), reference_state='dummy_state_0')
+            test_object.set_modules(DummyPhysicalSystem())
+            test_object.seed(np.random.SeedSequence(123))
+            observations = []
+            for _ in range(2):
+                test_object.reset()
+                test_object.generate_subepisodes(pregenerate)
+                observations += [test_object.get_reference_observation()[0] for _ in range(60)]
+                test_object.generate_subepisodes(pregenerate)
+                observations += [test_object.get_reference_observation()[0] for _ in range(40)]
+            return np.array(observations)
+
+        expected = references(0)
+        # The unused sub episodes at each reset must not change the following episodes
+        assert np.array_equal(references(1), expected)
+        assert np.array_equal(references(5), expected)
+
+    @pytest.mark.parametrize('reference_class', [WienerProcessReferenceGenerator, LaplaceProcessReferenceGenerator])
+    @pytest.mark.parametrize('preview', [2, 7, 60])
+    def test_preview(self, reference_class, preview):
+        def observations(preview_):
+            test_object = reference_class(episode_lengths=(10, 50), reference_state='dummy_state_0', preview=preview_)
+            test_object.set_modules(DummyPhysicalSystem())
+            test_object.seed(np.random.SeedSequence(42))
+            result = []
+            for _ in range(2):
+                result.append(test_object.reset()[1])
+                result += [test_object.get_reference_observation() for _ in range(300)]
+            return test_object, np.array(result)
+
+        test_object, previews = observations(preview)
+        _, expected = observations(1)
+        assert test_object.reference_space.shape == (preview,)
+        # The previews begin with the same references as without preview and show the references of the next steps
+        # across the boundaries of the sub episodes
+        assert previews.shape == (602, preview)
+        assert np.all(previews[:, 0] == expected[:, 0])
+        for start in (0, 301):
+            for k in range(start, start + 301 - preview):
+                assert np.all(previews[k] == expected[k:k + preview, 0])
+        observation = test_object.get_reference_observation()
+        assert not observation.flags.writeable
+        assert observation.base is not None
+
+    def test_multiple_preview(self):
+        test_object = MultipleReferenceGenerator(
+            ['WienerProcessReference', 'SinusReference'], sub_args=[dict(reference_state='dummy_state_0'),
+                                                                  dict(reference_state='dummy_state_1')],
+            preview=4
+        )
+        test_object.set_modules(DummyPhysicalSystem(state_length=2))
+        assert test_object.reference_space.shape == (8,)
+        test_object.reset()
+        assert test_object.get_reference_observation(None).shape == (8,)
+
 
 class TestFurtherReferenceGenerator:
     """
@@ -783,5 +880,114 @@ class TestMultipleReferenceGenerator(TestReferenceGenerator):
             rg = gem.utils.instantiate(ReferenceGenerator, self.key, sub_generators=[DummyReferenceGenerator])
             assert type(rg) == self.class_to_test
 
+class TestReferenceBankGenerator:
+
+    _env_id = 'Cont-SC-PermExDc-v0'
+
+    @pytest.fixture
+    def bank(self, tmp_path):
+        path = str(tmp_path / 'bank')
+        create_reference_bank(path, gem.make(self._env_id, visualization=()), num_episodes=3, episode_length=50, seed=7)
+        return path
+
+    def test_references_equal_generator(self, bank):
+        reference_generator = gem.make(self._env_id, visualization=()).reference_generator
+        reference_generator.seed(np.random.SeedSequence(7))
+        bank_generator = gem.make(
+            self._env_id, visualization=(), reference_generator=ReferenceBankGenerator(bank)
+        ).reference_generator
+        for episode in range(3):
+            expected = reference_generator.reset()
+            actual = bank_generator.reset()
+            assert bank_generator.episode_id == episode
+            assert np.all(expected[0] == actual[0]) and np.all(expected[1] == actual[1])
+            for _ in range(50):
+                assert np.all(reference_generator.get_reference() == bank_generator.get_reference())
+                assert np.all(
+                    reference_generator.get_reference_observation() == bank_generator.get_reference_observation()
+                )
+
+    def test_episodes(self, bank):
+        env = gem.make(self._env_id, visualization=(), reference_generator=ReferenceBankGenerator(bank, episodes=[2, 0]))
+        bank_generator = env.reference_generator
+        assert bank_generator.reference_names == ['omega']
+        episode_ids = []
+        for _ in range(3):
+            env.reset()
+            episode_ids.append(bank_generator.episode_id)
+        assert episode_ids == [2, 0, 2]
+        # The observations are read-only views into the memory-mapped file
+        assert not bank_generator.get_reference_observation().flags.writeable
+        # After the end of the episode in the bank, the last references are held
+        for _ in range(100):
+            observation = bank_generator.get_reference_observation()
+        assert np.all(observation == bank_generator._observations[2, -1])
+        with pytest.raises(AssertionError):
+            ReferenceBankGenerator(bank, episodes=[3])
+
+    def test_set_modules(self, bank):
+        with pytest.raises(AssertionError):
+            gem.make('Cont-SC-ExtExDc-v0', visualization=(), reference_generator=ReferenceBankGenerator(bank))
+
+    def test_pickle(self, bank):
+        bank_generator = ReferenceBankGenerator(bank, episodes=[1])
+        copied_generator = pickle.loads(pickle.dumps(bank_generator))
+        # The copy opens the memory-mapped files again
+        assert copied_generator._observations is not bank_generator._observations
+        assert np.all(copied_generator._observations == bank_generator._observations)
+        assert copied_generator._episodes == [1]
+
+
+class TestStreamedReferenceGenerator:
+
+    _env_id = 'Cont-SC-PermExDc-v0'
+
+    @pytest.fixture
+    def source(self, tmp_path):
+        path = str(tmp_path / 'cycle')
+        write_columns(path, dict(speed=np.linspace(0.0, 100.0, 1001)))
+        return path
+
+    def test_references(self, source):
+        reference_generator = StreamedReferenceGenerator(
+            source, 1e-4, reference_states=['omega'], columns=['speed'], preview=3, chunk_size=64
+        )
+        env = gem.make(self._env_id, visualization=(), reference_generator=reference_generator, tau=1e-4)
+        physical_system = env.physical_system
+        omega_idx = physical_system.state_names.index('omega')
+        expected = np.linspace(0.0, 100.0, 1001) * (1 / physical_system.limits[omega_idx])
+        assert env.observation_space[1].shape == (3,)
+        assert reference_generator.reference_names == ['omega']
+        reference, observation, _ = reference_generator.reset()
+        assert reference[omega_idx] == expected[0]
+        assert np.all(observation == expected[1:4])
+        for k in range(1, 1005):
+            reference = reference_generator.get_reference()
+            assert reference[omega_idx] == expected[min(k, 1000)]
+            assert np.sum(reference != 0) <= 1
+            observation = reference_generator.get_reference_observation()
+            assert np.all(observation == expected[np.minimum(np.arange(k + 1, k + 4), 1000)])
+        # Each reset restarts the trajectory
+        reference_generator.reset()
+        assert reference_generator.get_reference()[omega_idx] == expected[1]
+        env.close()
+
+    def test_normalized_resampled(self, source):
+        reference_generator = StreamedReferenceGenerator(
+            source, 1e-4, reference_states=['omega'], columns=['speed'], normalized=True
+        )
+        env = gem.make(self._env_id, visualization=(), reference_generator=reference_generator, tau=2e-4)
+        _, observation = env.reset()
+        assert np.allclose(observation, [0.2])
+        (_, observation), *_ = env.step(env.action_space.sample())
+        assert np.allclose(observation, [0.4])
+
+    def test_registered(self, source):
+        reference_generator = gem.utils.instantiate(
+            ReferenceGenerator, 'StreamedReference', source=source, sample_time=1e-4, columns=['speed']
+        )
+        assert type(reference_generator) == StreamedReferenceGenerator
+
+
 # endregion
 
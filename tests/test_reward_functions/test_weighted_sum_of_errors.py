@@ -118,3 +118,22 @@ class TestWeightedSumOfErrors(TestRewardFunction):
         rf = self.class_to_test(reward_weights=reward_weights, bias=bias, violation_reward=violation_reward)
         rf.set_modules(ps, rg, cm)
         assert rf.reward(state, reference, violation_degree=violation_degree) == expected_rw
+
+    @pytest.mark.parametrize('reward_power', [1, 2, [1, 2, 0.5]])
+    @pytest.mark.parametrize('ps', [DummyPhysicalSystem(state_length=3)])
+    @pytest.mark.parametrize('rg', [DummyReferenceGenerator()])
+    @pytest.mark.parametrize('cm', [DummyConstraintMonitor()])
+    def test_reward_batch(self, ps, rg, cm, reward_power):
+        rg.set_modules(ps)
+        rf = self.class_to_test(reward_weights=[1, 2, 0.5], reward_power=reward_power, violation_reward=-100.0)
+        rf.set_modules(ps, rg, cm)
+        rng = np.random.default_rng(0)
+        states = rng.uniform(-1, 1, size=(10, 3))
+        references = rng.uniform(-1, 1, size=(10, 3))
+        violation_degrees = rng.choice([0.0, 0.5, 1.0], size=10)
+        rewards = rf.reward_batch(states, references, violation_degrees=violation_degrees)
+        expected = [
+            rf.reward(state, reference, violation_degree=violation_degree)
+            for state, reference, violation_degree in zip(states, references, violation_degrees)
+        ]
+        assert np.allclose(rewards, expected)
@@ -0,0 +1,148 @@
+import functools
+
+import numpy as np
+import pytest
+
+import gym_electric_motor as gem
+from gym_electric_motor.physical_system_wrappers import DeadTimeProcessor
+from gym_electric_motor.rollout import BranchRollout, all_action_sequences
+
+
+def make_env(env_id, **kwargs):
+    kwargs.setdefault('visualization', ())
+    env = gem.make(env_id, **kwargs)
+    env.seed(3)
+    env.reset()
+    env.action_space.seed(3)
+    for _ in range(10):
+        env.step(env.action_space.sample())
+    return env
+
+
+def random_action_sequences(env, branches, horizon):
+    return np.array([[env.action_space.sample() for _ in range(horizon)] for _ in range(branches)])
+
+
+def replay(env, state, actions):
+    """Steps the environment from the snapshot through the actions and returns the observations and rewards."""
+    env.set_state(state)
+    states, references, rewards = [], [], []
+    for action in actions:
+        (state_, reference), reward, done, _ = env.step(action)
+        states.append(state_)
+        references.append(reference)
+        rewards.append(reward)
+        if done:
+            break
+    return np.array(states), np.array(references), np.array(rewards)
+
+
+@pytest.mark.parametrize('env_id', ['Finite-CC-PMSM-v0', 'Cont-CC-PMSM-v0', 'Finite-TC-DFIM-v0', 'Cont-SC-SeriesDc-v0'])
+@pytest.mark.parametrize('mode', ['sequential', 'vectorized', 'processes'])
+def test_rollout_equals_steps(env_id, mode):
+    env = make_env(env_id)
+    action_sequences = random_action_sequences(env, 6, 4)
+    state = env.get_state()
+    rollout = BranchRollout(env, mode=mode, processes=2)
+    result = rollout.rollout(action_sequences)
+    rollout.close()
+    assert result['mode'] == mode
+    assert result['states'].shape == (6, 4, len(env.state_filter))
+    assert result['references'].shape == (6, 4) + env.observation_space[1].shape
+    assert result['rewards'].shape == result['dones'].shape == (6, 4)
+    reference_env = make_env(env_id)
+    for branch, actions in enumerate(action_sequences):
+        states, references, rewards = replay(reference_env, state, actions)
+        assert np.allclose(result['states'][branch], states, atol=1e-10)
+        assert np.allclose(result['references'][branch], references, atol=1e-10)
+        assert np.allclose(result['rewards'][branch], rewards, atol=1e-10)
+    assert np.allclose(result['returns'], result['rewards'].sum(axis=1))
+
+
+@pytest.mark.parametrize('mode', ['sequential', 'vectorized', 'processes'])
+def test_environment_unchanged(mode):
+    env = make_env('Cont-CC-PMSM-v0')
+    reference_env = make_env('Cont-CC-PMSM-v0')
+    rollout = BranchRollout(env, mode=mode, processes=2)
+    rollout.rollout(random_action_sequences(env, 4, 5))
+    rollout.close()
+    for action in random_action_sequences(env, 1, 5)[0]:
+        (state, reference), reward, _, _ = env.step(action)
+        (reference_state, reference_reference), reference_reward, _, _ = reference_env.step(action)
+        assert np.all(state == reference_state) and np.all(reference == reference_reference)
+        assert reward == reference_reward
+
+
+def test_rollout_from_passed_state():
+    env = make_env('Finite-CC-PMSM-v0')
+    state = env.get_state()
+    action_sequences = all_action_sequences(env.action_space, 2)
+    rollout = BranchRollout(env, mode='sequential')
+    expected = rollout.rollout(action_sequences)
+    for _ in range(5):
+        env.step(env.action_space.sample())
+    current_state = env.get_state()
+    result = rollout.rollout(action_sequences, state=state)
+    assert np.all(result['returns'] == expected['returns'])
+    # The environment is restored to its own state and not to the passed one
+    assert env.physical_system.k == current_state['physical_system']['_k']
+
+
+@pytest.mark.parametrize('mode', ['sequential', 'vectorized'])
+def test_termination(mode):
+    env = gem.make('Cont-SC-PermExDc-v0', ode_solver='euler', constraints=('i',), visualization=())
+    env.seed(1)
+    env.reset()
+    horizon = 300
+    action_sequences = np.stack([np.ones((horizon, 1)), np.zeros((horizon, 1))])
+    result = BranchRollout(env, mode=mode, gamma=0.9).rollout(action_sequences)
+    assert np.any(result['dones'][0]) and not np.any(result['dones'][1])
+    terminal_step = np.argmax(result['dones'][0])
+    assert np.all(result['dones'][0, terminal_step:])
+    assert np.any(abs(result['states'][0, terminal_step]) > 1.0)
+    assert np.all(result['states'][0, terminal_step:] == result['states'][0, terminal_step])
+    assert np.all(result['rewards'][0, terminal_step + 1:] == 0.0)
+    assert result['returns'] == pytest.approx(result['rewards'] @ 0.9 ** np.arange(horizon))
+
+
+def test_auto_mode():
+    env = make_env('Finite-CC-PMSM-v0')
+    action_sequences = all_action_sequences(env.action_space, 1)
+    assert BranchRollout(env, processes=1).rollout(action_sequences)['mode'] == 'vectorized'
+    assert BranchRollout(env, processes=1).rollout(action_sequences[:1])['mode'] == 'sequential'
+
+    # The DeadTimeProcessor does not support batches
+    env = make_env('Finite-CC-PMSM-v0', physical_system_wrappers=(DeadTimeProcessor(),))
+    rollout = BranchRollout(env, processes=2)
+    assert not rollout.vectorizable
+    assert rollout.rollout(action_sequences)['mode'] == 'sequential'
+    rollout.process_threshold = 8
+    assert rollout.rollout(action_sequences)['mode'] == 'processes'
+    rollout.close()
+    with pytest.raises(AssertionError):
+        BranchRollout(env, mode='vectorized')
+
+
+def test_env_factory():
+    env_factory = functools.partial(gem.make, 'Finite-CC-PMSM-v0', visualization=())
+    env = make_env('Finite-CC-PMSM-v0')
+    action_sequences = all_action_sequences(env.action_space, 2)
+    rollout = BranchRollout(env, mode='processes', processes=2, env_factory=env_factory)
+    result = rollout.rollout(action_sequences)
+    rollout.close()
+    expected = BranchRollout(env, mode='sequential').rollout(action_sequences)
+    assert np.all(result['states'] == expected['states'])
+    assert np.all(result['returns'] == expected['returns'])
+
+
+def test_all_action_sequences():
+    discrete = gem.make('Finite-CC-PMSM-v0', visualization=()).action_space
+    sequences = all_action_sequences(discrete, 3)
+    assert sequences.shape == (512, 3)
+    assert len(set(map(tuple, sequences))) == 512
+    multi_discrete = gem.make('Finite-CC-DFIM-v0', visualization=()).action_space
+    sequences = all_action_sequences(multi_discrete, 2)
+    assert sequences.shape == (64 ** 2, 2, 2)
+    assert all(multi_discrete.contains(action) for action in sequences[:, 0])
+    with pytest.raises(AssertionError):
+        all_action_sequences(gem.make('Cont-CC-PMSM-v0', visualization=()).action_space)
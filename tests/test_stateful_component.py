@@ -0,0 +1,93 @@
+from collections import deque
+
+import numpy as np
+import pytest
+
+import gym_electric_motor as gem
+
+
+class DummyStatefulComponent(gem.StatefulComponent):
+
+    _state_attributes = ('_array', '_deque', '_value', '_reference')
+    _state_components = ('_sub_component', '_sub_components')
+
+    def __init__(self, sub_components=()):
+        self._array = np.zeros(3)
+        self._deque = deque([1, 2], maxlen=2)
+        self._value = 0.0
+        self._reference = None
+        self._constant = 'constant'
+        self._sub_components = list(sub_components)
+        self._sub_component = sub_components[0] if len(sub_components) > 0 else None
+
+
+class DummyRandomComponent(gem.RandomComponent):
+
+    _state_attributes = ('_value',)
+
+    def __init__(self):
+        super().__init__()
+        self._value = 0
+
+
+class TestStatefulComponent:
+
+    @pytest.fixture
+    def component(self):
+        return DummyStatefulComponent([DummyStatefulComponent(), DummyStatefulComponent()])
+
+    def test_get_state(self, component):
+        component._value = 1.5
+        component._sub_components[1]._value = 2.5
+        state = component.get_state()
+        assert set(state.keys()) == {'_array', '_deque', '_value', '_reference', '_sub_component', '_sub_components'}
+        assert state['_value'] == 1.5
+        # Unset sub components are skipped
+        assert '_sub_component' not in state['_sub_component']
+        assert [sub_state['_value'] for sub_state in state['_sub_components']] == [0.0, 2.5]
+        assert '_constant' not in state
+
+    def test_state_is_copied(self, component):
+        state = component.get_state()
+        component._array[0] = 1.0
+        component._deque.append(3)
+        assert np.all(state['_array'] == 0.0)
+        assert list(state['_deque']) == [1, 2]
+
+    def test_set_state(self, component):
+        """Test, that a snapshot can be restored multiple times and is not modified by the component."""
+        reference = object()
+        component._reference = reference
+        state = component.get_state()
+        for _ in range(2):
+            component._array += 1.0
+            component._deque.append(3)
+            component._value = 5.0
+            component._reference = None
+            component._sub_components[0]._value = 7.0
+            component.set_state(state)
+            assert np.all(component._array == 0.0)
+            assert list(component._deque) == [1, 2] and component._deque.maxlen == 2
+            assert component._value == 0.0
+            assert component._reference is reference
+            assert component._sub_components[0]._value == 0.0
+            assert component._array is not state['_array']
+
+
+class TestRandomComponentState:
+
+    def test_random_state(self):
+        component = DummyRandomComponent()
+        component.seed(np.random.SeedSequence(123))
+        component.next_generator()
+        component.random_generator.random(10)
+        state = component.get_state()
+        expected = component.random_generator.random(10)
+        component.next_generator()
+        expected_next_episode = component.random_generator.random(10)
+        component.next_generator()
+        component.set_state(state)
+        assert np.all(component.random_generator.random(10) == expected)
+        component.next_generator()
+        assert np.all(component.random_generator.random(10) == expected_next_episode)
+        assert component.seed_sequence.entropy == 123
@@ -0,0 +1,102 @@
+import sys
+
+import matplotlib
+import numpy as np
+import pytest
+
+import gym_electric_motor as gem
+from gym_electric_motor.visualization.telemetry import TelemetryRingBuffer, TelemetryCallback, TelemetryViewer, \
+    _arguments, _parse_arguments
+
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt  # noqa: E402
+
+
+requires_shared_memory = pytest.mark.skipif(
+    sys.version_info < (3, 8), reason='The shared memory requires Python 3.8 or newer.'
+)
+
+
+@pytest.fixture(autouse=True)
+def close_figures():
+    yield
+    plt.close('all')
+
+
+@requires_shared_memory
+def test_ring_buffer():
+    writer = TelemetryRingBuffer(record_width=3, capacity=4, metadata=dict(answer=42))
+    reader = TelemetryRingBuffer(writer.name)
+    try:
+        assert reader.metadata == dict(answer=42)
+        assert reader.capacity == 4
+        assert reader.read().shape == (0, 3)
+        for i in range(3):
+            writer.write([i, i, i])
+        assert np.array_equal(reader.read()[:, 0], [0, 1, 2])
+        assert reader.dropped == 0
+        # The writer overwrites the oldest records, if the reader falls behind.
+        for i in range(3, 10):
+            writer.write([i, i, i])
+        assert np.array_equal(reader.read()[:, 0], [6, 7, 8, 9])
+        assert reader.dropped == 3
+        assert reader.write_count == 10
+        assert not reader.closed
+    finally:
+        reader.close()
+        writer.close()
+
+
+@requires_shared_memory
+def test_ring_buffer_closed_flag():
+    writer = TelemetryRingBuffer(record_width=1, capacity=2)
+    reader = TelemetryRingBuffer(writer.name)
+    assert not reader.closed
+    writer.close()
+    assert reader.closed
+    reader.close()
+
+
+@requires_shared_memory
+@pytest.mark.parametrize('decimation', [1, 5])
+def test_callback_and_viewer(decimation):
+    telemetry = TelemetryCallback(capacity=10000, decimation=decimation)
+    env = gem.make('Cont-CC-PMSM-v0', visualization=(), callbacks=[telemetry])
+    viewer = TelemetryViewer(telemetry.name, state_plots=['omega', 'i_sd'], reward_plot=True)
+    env.action_space.seed(0)
+    env.reset()
+    states, rewards = [], []
+    for k in range(1000):
+        (state, _), reward, done, _ = env.step(env.action_space.sample())
+        # The callback is called in every decimation-th step.
+        if (k + 1) % decimation == 0:
+            states.append(state)
+            rewards.append(reward)
+        if done:
+            env.reset()
+    assert telemetry.buffer.metadata['tau'] == pytest.approx(env.physical_system.tau * decimation)
+    assert viewer.poll() == len(states) == 1000 // decimation
+    assert viewer.dropped == 0
+    omega = env.physical_system.state_positions['omega']
+    recorded = viewer.dashboard._time_plots[0]._state_data[1:len(states) + 1]
+    assert np.allclose(recorded, np.array(states)[:, omega] * env.physical_system.limits[omega])
+    assert np.allclose(viewer.dashboard._reward_plot._reward_data[:len(rewards)], rewards)
+    env.close()
+    assert telemetry.buffer is None
+    viewer.dashboard.render()
+
+
+@pytest.mark.parametrize('viewer_kwargs', [
+    dict(),
+    dict(state_plots=['i_sd', 'i_sq'], action_plots=[1], reward_plot=True, time_plot_width=500, poll_interval=0.5),
+    dict(state_plots=[], action_plots=[]),
+])
+def test_arguments(viewer_kwargs):
+    default_kwargs = dict(state_plots='all', action_plots='all', reward_plot=False, time_plot_width=10000,
+                          poll_interval=0.05)
+    name, parsed_kwargs = _parse_arguments(['telemetry', *_arguments(**viewer_kwargs)])
+    assert name == 'telemetry'
+    expected = {**default_kwargs, **viewer_kwargs}
+    for key in ('state_plots', 'action_plots'):
+        parsed_kwargs[key] = parsed_kwargs[key] if parsed_kwargs[key] == 'all' else list(parsed_kwargs[key])
+    assert parsed_kwargs == expected
@@ -0,0 +1,57 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from gym_electric_motor.trajectory_stream import TrajectoryStream, write_columns
+
+
+class TestTrajectoryStream:
+
+    @pytest.fixture
+    def source(self, tmp_path):
+        path = str(tmp_path / 'cycle')
+        write_columns(path, dict(omega=np.arange(1000.0), torque=-np.arange(1000.0)))
+        return path
+
+    @pytest.mark.parametrize('read_ahead', [True, False])
+    def test_window(self, source, read_ahead):
+        stream = TrajectoryStream(source, 1e-4, ['torque', 'omega'], chunk_size=16, read_ahead=read_ahead)
+        assert stream.num_samples == 1000
+        for k in range(0, 990, 3):
+            window = stream.window(k, 5)
+            assert np.all(window == np.stack([-np.arange(k, k + 5), np.arange(k, k + 5)], axis=1))
+            assert not window.flags.writeable
+        # Steps after the end of the source hold the last samples
+        assert np.all(stream.window(998, 4)[:, 1] == [998, 999, 999, 999])
+        # Jumps backwards read the source again
+        assert np.all(stream.window(2, 2)[:, 1] == [2, 3])
+        stream.close()
+
+    def test_chunks_are_views(self, source):
+        stream = TrajectoryStream(source, 1e-4, ['omega'], chunk_size=16)
+        first = stream.window(0, 4)
+        assert np.shares_memory(first, stream.window(3, 4))
+        assert len(stream._buffer) == 16 + 3
+
+    @pytest.mark.parametrize('tau, start_time, expected', [
+        (2e-4, 0.0, [10.0, 12.0, 14.0]),
+        (5e-5, 0.0, [2.5, 3.0, 3.5]),
+        (1e-4, 2e-4, [7.0, 8.0, 9.0]),
+    ])
+    def test_resampling(self, tau, start_time, expected):
+        stream = TrajectoryStream(dict(omega=np.arange(100.0)), 1e-4, ['omega'], start_time=start_time, chunk_size=8)
+        stream.set_output(tau, scale=0.5)
+        assert np.allclose(stream.window(5, 3)[:, 0], np.array(expected) * 0.5)
+
+    def test_value_at(self):
+        stream = TrajectoryStream(dict(omega=np.arange(100.0) ** 2), 1.0, ['omega'], chunk_size=8)
+        assert stream.value_at(3.0)[0] == 9.0
+        assert stream.value_at(7.5)[0] == 56.5
+
+    def test_pickle(self, source):
+        stream = TrajectoryStream(source, 1e-4, ['omega'], chunk_size=16)
+        stream.window(20, 2)
+        copied_stream = pickle.loads(pickle.dumps(stream))
+        assert len(copied_stream._buffer) == 0
+        assert np.all(copied_stream.window(20, 2) == stream.window(20, 2))
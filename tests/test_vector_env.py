@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+
+import gym_electric_motor as gem
+from gym_electric_motor import VectorElectricMotorEnvironment
+from gym_electric_motor.physical_system_wrappers import CosSinProcessor, DeadTimeProcessor
+
+
+@pytest.mark.parametrize('env_id', [
+    'Cont-CC-PMSM-v0', 'Finite-SC-ExtExDc-v0', 'Cont-TC-SCIM-v0', 'Finite-CC-DFIM-v0', 'Cont-SC-EESM-v0',
+    'Cont-CC-ShuntDc-v0'
+])
+def test_vector_env_equals_single_envs(env_id):
+    num_envs = 3
+    vector_env = gem.make_vec(env_id, num_envs=num_envs, ode_solver='euler')
+    envs = [gem.make(env_id, ode_solver='euler', visualization=()) for _ in range(num_envs)]
+    assert isinstance(vector_env, VectorElectricMotorEnvironment)
+    assert vector_env.num_envs == num_envs
+    assert vector_env.state_names == envs[0].state_names
+    assert np.all(vector_env.limits == np.array([env.limits for env in envs]))
+
+    states, references = vector_env.reset(seed=7)
+    for n, env in enumerate(envs):
+        env.seed(7 + n)
+    single_observations = [env.reset() for env in envs]
+    assert np.allclose(states, [observation[0] for observation in single_observations])
+    assert np.allclose(references, [observation[1] for observation in single_observations])
+
+    vector_env.action_space.seed(0)
+    for _ in range(50):
+        actions = vector_env.action_space.sample()
+        (states, references), rewards, dones, infos = vector_env.step(actions)
+        assert states.shape == (num_envs, len(vector_env.state_names))
+        for n, env in enumerate(envs):
+            (state, reference), reward, done, _ = env.step(actions[n])
+            assert done == dones[n]
+            if done:
+                terminal_state, terminal_reference = infos[n]['terminal_observation']
+                assert np.allclose(terminal_state, state)
+                assert np.allclose(terminal_reference, reference)
+                state, reference = env.reset()
+            assert np.allclose(states[n], state, atol=1e-12)
+            assert np.allclose(references[n], reference, atol=1e-12)
+            assert rewards[n] == pytest.approx(reward)
+
+
+def test_auto_reset():
+    vector_env = gem.make_vec(
+        'Cont-SC-PermExDc-v0', num_envs=4, ode_solver='euler', constraints=('i',)
+    )
+    vector_env.reset(seed=1)
+    done_seen = False
+    for _ in range(500):
+        (states, references), rewards, dones, infos = vector_env.step(np.ones((4, 1)))
+        for n in np.flatnonzero(dones):
+            done_seen = True
+            terminal_state, _ = infos[n]['terminal_observation']
+            assert np.any(abs(terminal_state) > 1.0)
+            assert vector_env.physical_system.k[n] == 0
+        assert np.all(abs(states[:, vector_env.state_names.index('i')]) <= 1.0)
+    assert done_seen
+
+
+def test_sub_environments_do_not_share_modules():
+    vector_env = gem.make_vec('Cont-CC-PMSM-v0', num_envs=2, converter=dict(interlocking_time=1e-6))
+    converters = [env.physical_system.converter for env in vector_env.envs]
+    assert converters[0] is not converters[1]
+    assert vector_env.envs[0].reference_generator is not vector_env.envs[1].reference_generator
+
+
+def test_batched_physical_system_wrappers():
+    vector_env = gem.make_vec(
+        'Cont-CC-PMSM-v0', num_envs=2, ode_solver='euler', physical_system_wrappers=(CosSinProcessor('epsilon'),)
+    )
+    states, _ = vector_env.reset()
+    assert states.shape == (2, len(vector_env.state_names))
+    epsilon_idx = vector_env.state_names.index('epsilon')
+    epsilon = states[:, epsilon_idx] * vector_env.limits[:, epsilon_idx]
+    assert np.allclose(states[:, -2], np.cos(epsilon))
+    assert np.allclose(states[:, -1], np.sin(epsilon))
+
+
+def test_unsupported_physical_system_wrappers():
+    with pytest.raises(AssertionError):
+        gem.make_vec('Cont-CC-PMSM-v0', num_envs=2, physical_system_wrappers=(DeadTimeProcessor(),))